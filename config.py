@@ -92,9 +92,38 @@ class Settings(BaseModel):
     max_workers: int = Field(default_factory=lambda: _parse_int_env('MAX_WORKERS', 5))
     batch_size: int = Field(default_factory=lambda: _parse_int_env('BATCH_SIZE', 100))
 
+    # Run feature engineering and model training in worker processes (0 workers = one per core)
+    use_process_pool: bool = Field(default_factory=lambda: bool(int(os.getenv('USE_PROCESS_POOL', '1'))))
+    cpu_workers: int = Field(default_factory=lambda: _parse_int_env('CPU_WORKERS', 0))
+
+    # Staged controller: bounded queue between stages, workers per CPU stage (0 = compute pool size)
+    stage_queue_size: int = Field(default_factory=lambda: _parse_int_env('STAGE_QUEUE_SIZE', 4))
+    engineer_workers: int = Field(default_factory=lambda: _parse_int_env('ENGINEER_WORKERS', 0))
+    train_workers: int = Field(default_factory=lambda: _parse_int_env('TRAIN_WORKERS', 0))
+    store_workers: int = Field(default_factory=lambda: _parse_int_env('STORE_WORKERS', 2))
+
+    # Batch profile upserts from all workers into unordered bulk writes (flushed by size or age)
+    mongo_write_behind: bool = Field(default_factory=lambda: bool(int(os.getenv('MONGO_WRITE_BEHIND', '1'))))
+    mongo_write_batch_size: int = Field(default_factory=lambda: _parse_int_env('MONGO_WRITE_BATCH_SIZE', 100))
+    mongo_write_flush_ms: int = Field(default_factory=lambda: _parse_int_env('MONGO_WRITE_FLUSH_MS', 500))
+
+    # Minute bars in the minute_bars time-series collection: OHLCV plus these processed_df columns
+    store_minute_bars: bool = Field(default_factory=lambda: bool(int(os.getenv('STORE_MINUTE_BARS', '1'))))
+    bar_feature_columns: str = Field(default_factory=lambda: os.getenv(
+        'BAR_FEATURE_COLUMNS', 'sma_20,sma_50,ema_20,bb_upper_20,bb_lower_20,rsi_14,macd,macd_signal,atr_14,vwap,obv'
+    ))
+
+    # Dashboard: background MongoDB query threads and connection health-check interval
+    dashboard_db_workers: int = Field(default_factory=lambda: _parse_int_env('DASHBOARD_DB_WORKERS', 4))
+    dashboard_health_check_seconds: int = Field(default_factory=lambda: _parse_int_env('DASHBOARD_HEALTH_CHECK_SECONDS', 30))
+
+    # Store derived feature columns as float32 / int8 (about half the memory per symbol)
+    feature_compact_dtypes: bool = Field(default_factory=lambda: bool(int(os.getenv('FEATURE_COMPACT_DTYPES', '0'))))
+
     # History Backfill Settings
     history_chunk_days: int = Field(default_factory=lambda: _parse_int_env('HISTORY_CHUNK_DAYS', 30))  # Changed from 30 to 30 for better API efficiency
     max_history_years: int = Field(default_factory=lambda: _parse_int_env('MAX_HISTORY_YEARS', 25))
+    history_fetch_concurrency: int = Field(default_factory=lambda: _parse_int_env('HISTORY_FETCH_CONCURRENCY', 8))  # Chunk requests in flight per symbol
 
     # Rate limiting
     api_calls_per_minute: int = Field(default_factory=lambda: _parse_int_env('API_CALLS_PER_MINUTE', 80))
@@ -102,6 +131,8 @@ class Settings(BaseModel):
     backoff_on_error: bool = Field(default_factory=lambda: bool(int(os.getenv('BACKOFF_ON_ERROR', '1'))))
     initial_retry_delay: int = Field(default_factory=lambda: _parse_int_env('INITIAL_RETRY_DELAY', 5))
     max_retry_delay: int = Field(default_factory=lambda: _parse_int_env('MAX_RETRY_DELAY', 300))
+    # Shared SQLite quota ledger so concurrent processes respect one budget ("" disables)
+    api_quota_ledger_path: str = Field(default_factory=lambda: os.path.expanduser(os.getenv('API_QUOTA_LEDGER_PATH', '~/.pipeline_api_quota.db')))
     store_backfill_metadata: bool = Field(default_factory=lambda: bool(int(os.getenv('STORE_BACKFILL_METADATA', '1'))))
     backfill_log_path: str = Field(default_factory=lambda: os.getenv('BACKFILL_LOG_PATH', 'logs/backfill.log'))
 
@@ -1,19 +1,32 @@
 """
 Database Controller - MongoDB Operations Wrapper
 Thread-safe database operations with caching
+
+Every query has a blocking form (get_profile, load_profile_page, ...) and can
+be run in the background with submit(), which executes it on the
+controller's worker pool and hands the result to a callback on the GUI
+thread. Identical queries already in flight share one execution, and the
+connection is health-checked on a timer instead of before every call.
 """
+import re
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from PyQt6.QtCore import QObject
-from typing import List, Dict, Optional
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal, pyqtSlot
+from typing import Any, Callable, List, Dict, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from threading import Lock
 from datetime import datetime
+import pandas as pd
 
-from mongodb_storage import MongoDBStorage
+from config import settings
+from mongodb_storage import MongoDBStorage, PROFILE_SUMMARY_FIELDS
 from dashboard.utils.qt_signals import DatabaseSignals
 
+# Methods that change stored profiles: never shared, and later queries wait for them
+WRITE_METHODS = frozenset({'save_profile', 'update_profile', 'delete_profile'})
+
 
 class DatabaseController(QObject):
     """
@@ -21,51 +34,130 @@ class DatabaseController(QObject):
     Provides caching and signal emission for UI updates
     """
 
+    # (callback, future) from a pool thread, delivered on the GUI thread
+    _deliver = pyqtSignal(object, object)
+
     def __init__(self):
         super().__init__()
         self.storage = None
         self.signals = DatabaseSignals()
-        self.lock = Lock()
+        self.lock = Lock()  # Guards the caches; queries run outside it
+        self._connect_lock = Lock()
 
-        # Cache for profiles (reduces DB queries)
+        # Cache for profiles (reduces DB queries): listing summaries and full documents loaded on demand
+        self.summary_cache = {}
         self.profile_cache = {}
         self.cache_timestamp = None
         self.cache_ttl = 60  # seconds
+        self._write_generation = 0  # Bumped by every write; reads overlapping one do not fill the cache
+
+        # Background queries; identical in-flight queries share one future
+        self.executor = ThreadPoolExecutor(max_workers=max(1, settings.dashboard_db_workers),
+                                           thread_name_prefix='db-query')
+        self._inflight: Dict[Tuple, Future] = {}
+        self._pending_writes = set()
+        self._inflight_lock = Lock()
+        self._deliver.connect(self._on_deliver, Qt.ConnectionType.QueuedConnection)
+
+        # Connect and test in the background, then re-check periodically. The first check waits
+        # for the event loop so the owning panel has connected connection_status by then.
+        self.health_timer = QTimer(self)
+        self.health_timer.setInterval(max(1, settings.dashboard_health_check_seconds) * 1000)
+        self.health_timer.timeout.connect(self.check_connection)
+        self.health_timer.start()
+        QTimer.singleShot(0, self.check_connection)
+
+    def submit(self, method: str, *args, callback: Optional[Callable[[Any], None]] = None, **kwargs) -> Future:
+        """
+        Run a blocking controller method on the worker pool
 
-        # Initialize connection
-        self._ensure_connection()
-
-        # Test connection
-        self._test_connection()
+        Args:
+            method: Name of the method (e.g. 'get_profile')
+            *args, **kwargs: Its arguments
+            callback: Called with the result on the GUI thread
 
-    def _ensure_connection(self):
-        """Ensure database connection is active, reconnect if needed"""
-        try:
-            # Check if storage exists and connection is alive
+        Returns:
+            Future of the result (a read is shared with an identical read still in flight)
+        """
+        write = method in WRITE_METHODS
+        key = (method, repr(args), repr(sorted(kwargs.items())))
+        with self._inflight_lock:
+            future = None if write else self._inflight.get(key)
+            joined = future is not None
+            if not joined:
+                # Runs after every write submitted before it (the pool starts tasks in order, so
+                # those writes are already running when this one waits)
+                future = self.executor.submit(self._run_after, list(self._pending_writes),
+                                              getattr(self, method), args, kwargs)
+                if write:
+                    self._pending_writes.add(future)
+                    # Reads in flight may return the pre-write state: later reads start afresh
+                    self._inflight.clear()
+                else:
+                    self._inflight[key] = future
+
+        if not joined:
+            future.add_done_callback(lambda f: self._finish(key, f))
+        if callback is not None:
+            future.add_done_callback(lambda f: self._deliver.emit(callback, f))
+        return future
+
+    @staticmethod
+    def _run_after(writes: List[Future], function: Callable, args: Tuple, kwargs: Dict):
+        if writes:
+            wait(writes)
+        return function(*args, **kwargs)
+
+    def _finish(self, key: Tuple, future: Future):
+        with self._inflight_lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            self._pending_writes.discard(future)
+
+    @pyqtSlot(object, object)
+    def _on_deliver(self, callback: Callable[[Any], None], future: Future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self.signals.database_error.emit(f"Database query failed: {error}")
+            return
+        callback(future.result())
+
+    @pyqtSlot()
+    def check_connection(self):
+        """Health-check the connection in the background (emits connection_status)"""
+        self.submit('_test_connection')
+
+    def close(self):
+        """Stop the health checks and drop queued queries"""
+        self.health_timer.stop()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _ensure_connection(self) -> Optional[MongoDBStorage]:
+        """Storage handle, connecting on first use (None if the database is unreachable)"""
+        if self.storage is not None:
+            return self.storage
+        with self._connect_lock:
             if self.storage is None:
-                self.storage = MongoDBStorage()
-            else:
-                # Test if connection is still alive
                 try:
-                    self.storage.client.admin.command('ping')
-                except:
-                    # Connection is dead, recreate
+                    # The shared client reconnects by itself once connected
                     self.storage = MongoDBStorage()
-        except Exception as e:
-            self.signals.database_error.emit(f"Connection error: {str(e)}")
-            self.storage = None
+                except Exception as e:
+                    self.signals.database_error.emit(f"Connection error: {str(e)}")
+        return self.storage
 
     def _test_connection(self):
         """Test database connection and emit status"""
         try:
-            self._ensure_connection()
             if self.storage is None:
-                self.signals.connection_status.emit(False, "Not connected")
-                return
+                with self._connect_lock:
+                    if self.storage is None:
+                        self.storage = MongoDBStorage()
+            self.storage.client.admin.command('ping')
 
-            # Try to list profiles
-            profiles = self.storage.list_all_profiles()
-            count = len(profiles)
+            # Count profiles (collection metadata, no documents transferred)
+            count = self.storage.count_profiles()
 
             self.signals.connection_status.emit(
                 True,
@@ -79,43 +171,48 @@ class DatabaseController(QObject):
 
     def load_all_profiles(self, force_refresh: bool = False) -> List[Dict]:
         """
-        Load all profiles from database
+        Load summaries of all profiles from database
+
+        Only PROFILE_SUMMARY_FIELDS are transferred; use get_profile() for a
+        full document.
 
         Args:
             force_refresh: Force refresh from database (bypass cache)
 
         Returns:
-            List of profile dictionaries
+            List of profile summary dictionaries
         """
+        # Check cache
         with self.lock:
-            # Check cache
-            if (not force_refresh and
-                self.cache_timestamp and
-                (datetime.now() - self.cache_timestamp).seconds < self.cache_ttl):
-                profiles = list(self.profile_cache.values())
+            if not force_refresh and self._cache_fresh():
+                profiles = list(self.summary_cache.values())
                 self.signals.profiles_loaded.emit(profiles)
                 return profiles
+            generation = self._write_generation
 
-            try:
-                # Ensure connection is alive
-                self._ensure_connection()
-                if self.storage is None:
-                    self.signals.database_error.emit("Database connection not available")
-                    return []
+        try:
+            if self._ensure_connection() is None:
+                self.signals.database_error.emit("Database connection not available")
+                return []
 
-                # Fetch from database
-                profiles = self.storage.list_all_profiles()
+            # Fetch from database
+            profiles = self.storage.list_profile_summaries()
 
-                # Update cache
-                self.profile_cache = {p['symbol']: p for p in profiles}
-                self.cache_timestamp = datetime.now()
+            # Update cache
+            with self.lock:
+                if self._write_generation == generation:
+                    self.summary_cache = {p['symbol']: p for p in profiles}
+                    self.cache_timestamp = datetime.now()
 
-                self.signals.profiles_loaded.emit(profiles)
-                return profiles
+            self.signals.profiles_loaded.emit(profiles)
+            return profiles
 
-            except Exception as e:
-                self.signals.database_error.emit(f"Failed to load profiles: {str(e)}")
-                return []
+        except Exception as e:
+            self.signals.database_error.emit(f"Failed to load profiles: {str(e)}")
+            return []
+
+    def _cache_fresh(self) -> bool:
+        return bool(self.cache_timestamp) and (datetime.now() - self.cache_timestamp).seconds < self.cache_ttl
 
     def get_profile(self, symbol: str, use_cache: bool = True) -> Optional[Dict]:
         """
@@ -128,31 +225,121 @@ class DatabaseController(QObject):
         Returns:
             Profile dictionary or None
         """
+        # Check cache first
         with self.lock:
-            # Check cache first
             if use_cache and symbol in self.profile_cache:
                 return self.profile_cache[symbol].copy()  # Return copy to prevent modification
+            generation = self._write_generation
 
-            try:
-                # Ensure connection is alive
-                self._ensure_connection()
-                if self.storage is None:
-                    self.signals.database_error.emit("Database connection not available")
-                    return None
+        try:
+            if self._ensure_connection() is None:
+                self.signals.database_error.emit("Database connection not available")
+                return None
 
-                profile = self.storage.get_profile(symbol)
+            profile = self.storage.get_profile(symbol)
 
-                # Update cache
-                if profile:
-                    self.profile_cache[symbol] = profile.copy()
+            # Update cache (unless a write landed meanwhile; the document may predate it)
+            if profile:
+                with self.lock:
+                    if self._write_generation == generation:
+                        self.profile_cache[symbol] = profile.copy()
 
-                return profile
+            return profile
 
-            except Exception as e:
-                self.signals.database_error.emit(f"Failed to get profile for {symbol}: {str(e)}")
-                # Try to return from cache as fallback
+        except Exception as e:
+            self.signals.database_error.emit(f"Failed to get profile for {symbol}: {str(e)}")
+            # Try to return from cache as fallback
+            with self.lock:
                 return self.profile_cache.get(symbol, None)
 
+    def load_profile_page(self, skip: int, limit: int, sort: Optional[List] = None,
+                          query: Optional[Dict] = None) -> List[Dict]:
+        """
+        One page of profile summaries, straight from the database
+
+        Args:
+            skip: Profiles to skip
+            limit: Page size
+            sort: pymongo sort specification (default: by symbol)
+            query: Optional filter
+
+        Returns:
+            List of profile summary dictionaries
+        """
+        try:
+            if self._ensure_connection() is None:
+                self.signals.database_error.emit("Database connection not available")
+                return []
+
+            return self.storage.list_profile_summaries(skip=skip, limit=limit, sort=sort, query=query)
+
+        except Exception as e:
+            self.signals.database_error.emit(f"Failed to load profiles: {str(e)}")
+            return []
+
+    def count_profiles(self, query: Optional[Dict] = None) -> int:
+        """
+        Number of stored profiles (matching ``query``)
+
+        Returns:
+            Profile count (0 if the database is unavailable)
+        """
+        try:
+            if self._ensure_connection() is None:
+                return 0
+            return self.storage.count_profiles(query)
+        except Exception as e:
+            self.signals.database_error.emit(f"Failed to count profiles: {str(e)}")
+            return 0
+
+    def load_symbols(self) -> List[str]:
+        """
+        Symbols of all stored profiles (served from the summary cache when fresh)
+
+        Returns:
+            Sorted list of symbols
+        """
+        with self.lock:
+            if self._cache_fresh():
+                return sorted(self.summary_cache)
+
+        try:
+            if self._ensure_connection() is None:
+                self.signals.database_error.emit("Database connection not available")
+                return []
+
+            return self.storage.list_symbols()
+
+        except Exception as e:
+            self.signals.database_error.emit(f"Failed to load symbols: {str(e)}")
+            return []
+
+    def get_bars(self, symbol: str, start=None, end=None,
+                 columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """
+        Stored minute bars of a symbol from the time-series collection
+
+        Args:
+            symbol: Ticker symbol
+            start: Inclusive start time (None = first stored bar)
+            end: Exclusive end time (None = last stored bar)
+            columns: Fields to read (default: all stored fields)
+
+        Returns:
+            DataFrame with a datetime column, or None if no bars are stored
+        """
+        try:
+            if self._ensure_connection() is None:
+                self.signals.database_error.emit("Database connection not available")
+                return None
+
+            bars = self.storage.get_bars(symbol, start=start, end=end, columns=columns)
+            return pd.DataFrame(bars) if bars else None
+
+        except Exception as e:
+            self.signals.database_error.emit(f"Failed to load bars for {symbol}: {str(e)}")
+            return None
+
     def save_profile(self, profile: Dict):
         """
         Save profile to database
@@ -160,21 +347,23 @@ class DatabaseController(QObject):
         Args:
             profile: Profile dictionary with 'symbol' key
         """
-        with self.lock:
-            try:
-                symbol = profile.get('symbol')
-                if not symbol:
-                    raise ValueError("Profile must have 'symbol' field")
+        try:
+            symbol = profile.get('symbol')
+            if not symbol:
+                raise ValueError("Profile must have 'symbol' field")
 
-                self.storage.save_profile(profile)
+            self._ensure_connection().save_profile(profile)
 
-                # Update cache
+            # Update cache
+            with self.lock:
                 self.profile_cache[symbol] = profile
+                self.summary_cache[symbol] = _summary(profile)
+                self._write_generation += 1
 
-                self.signals.profile_updated.emit(symbol, profile)
+            self.signals.profile_updated.emit(symbol, profile)
 
-            except Exception as e:
-                self.signals.database_error.emit(f"Failed to save profile: {str(e)}")
+        except Exception as e:
+            self.signals.database_error.emit(f"Failed to save profile: {str(e)}")
 
     def update_profile(self, symbol: str, profile: Dict):
         """
@@ -184,17 +373,19 @@ class DatabaseController(QObject):
             symbol: Ticker symbol
             profile: Updated profile dictionary
         """
-        with self.lock:
-            try:
-                self.storage.update_profile(symbol, profile)
+        try:
+            self._ensure_connection().update_profile(symbol, profile)
 
-                # Update cache
+            # Update cache
+            with self.lock:
                 self.profile_cache[symbol] = profile
+                self.summary_cache[symbol] = _summary(profile)
+                self._write_generation += 1
 
-                self.signals.profile_updated.emit(symbol, profile)
+            self.signals.profile_updated.emit(symbol, profile)
 
-            except Exception as e:
-                self.signals.database_error.emit(f"Failed to update profile for {symbol}: {str(e)}")
+        except Exception as e:
+            self.signals.database_error.emit(f"Failed to update profile for {symbol}: {str(e)}")
 
     def delete_profile(self, symbol: str):
         """
@@ -203,18 +394,19 @@ class DatabaseController(QObject):
         Args:
             symbol: Ticker symbol
         """
-        with self.lock:
-            try:
-                self.storage.delete_profile(symbol)
+        try:
+            self._ensure_connection().delete_profile(symbol)
 
-                # Remove from cache
-                if symbol in self.profile_cache:
-                    del self.profile_cache[symbol]
+            # Remove from cache
+            with self.lock:
+                self.profile_cache.pop(symbol, None)
+                self.summary_cache.pop(symbol, None)
+                self._write_generation += 1
 
-                self.signals.profile_deleted.emit(symbol)
+            self.signals.profile_deleted.emit(symbol)
 
-            except Exception as e:
-                self.signals.database_error.emit(f"Failed to delete profile for {symbol}: {str(e)}")
+        except Exception as e:
+            self.signals.database_error.emit(f"Failed to delete profile for {symbol}: {str(e)}")
 
     def search_profiles(self, query: str) -> List[Dict]:
         """
@@ -226,24 +418,30 @@ class DatabaseController(QObject):
         Returns:
             List of matching profiles
         """
-        with self.lock:
-            try:
-                # Use cache if available
-                if not self.profile_cache:
-                    self.load_all_profiles()
-
-                # Filter by query
-                query_upper = query.upper()
-                matching = [
-                    profile for symbol, profile in self.profile_cache.items()
-                    if query_upper in symbol.upper()
-                ]
-
-                return matching
-
-            except Exception as e:
-                self.signals.database_error.emit(f"Search failed: {str(e)}")
-                return []
+        try:
+            with self.lock:
+                summaries = list(self.summary_cache.values())
+
+            if not summaries:
+                # Nothing listed yet: let the server filter the summaries
+                if self._ensure_connection() is None:
+                    return []
+                return self.storage.list_profile_summaries(
+                    query={'symbol': {'$regex': re.escape(query), '$options': 'i'}}
+                )
+
+            # Filter by query
+            query_upper = query.upper()
+            matching = [
+                profile for profile in summaries
+                if query_upper in profile['symbol'].upper()
+            ]
+
+            return matching
+
+        except Exception as e:
+            self.signals.database_error.emit(f"Search failed: {str(e)}")
+            return []
 
     def get_profiles_by_date_range(
         self,
@@ -260,14 +458,13 @@ class DatabaseController(QObject):
         Returns:
             List of profiles
         """
-        with self.lock:
-            try:
-                profiles = self.storage.get_profiles_by_date_range(start_date, end_date)
-                return profiles
+        try:
+            profiles = self._ensure_connection().get_profiles_by_date_range(start_date, end_date)
+            return profiles
 
-            except Exception as e:
-                self.signals.database_error.emit(f"Failed to get profiles by date: {str(e)}")
-                return []
+        except Exception as e:
+            self.signals.database_error.emit(f"Failed to get profiles by date: {str(e)}")
+            return []
 
     def get_database_stats(self) -> Dict:
         """
@@ -276,26 +473,34 @@ class DatabaseController(QObject):
         Returns:
             Dictionary with stats
         """
-        with self.lock:
-            try:
-                profiles = self.load_all_profiles()
+        try:
+            if self._ensure_connection() is None:
+                self.signals.database_error.emit("Database connection not available")
+                return {}
 
-                total_data_points = sum(p.get('data_points_count', 0) for p in profiles)
+            # Aggregated by the server instead of summing over every profile
+            stats = self.storage.get_profile_stats()
 
+            with self.lock:
                 return {
-                    'total_profiles': len(profiles),
-                    'total_data_points': total_data_points,
-                    'cache_size': len(self.profile_cache),
+                    'total_profiles': stats['total_profiles'],
+                    'total_data_points': stats['total_data_points'],
+                    'cache_size': len(self.summary_cache),
                     'last_refresh': self.cache_timestamp.isoformat() if self.cache_timestamp else None
                 }
 
-            except Exception as e:
-                self.signals.database_error.emit(f"Failed to get stats: {str(e)}")
-                return {}
+        except Exception as e:
+            self.signals.database_error.emit(f"Failed to get stats: {str(e)}")
+            return {}
 
     def invalidate_cache(self):
         """Invalidate the profile cache"""
         with self.lock:
+            self.summary_cache.clear()
             self.profile_cache.clear()
             self.cache_timestamp = None
 
+
+def _summary(profile: Dict) -> Dict:
+    """Listing fields of a full profile (as returned by list_profile_summaries)"""
+    return {field: profile[field] for field in PROFILE_SUMMARY_FIELDS if field in profile}
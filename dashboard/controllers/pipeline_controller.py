@@ -1,6 +1,7 @@
 """
 Pipeline Controller - True Parallel Processing with GPU Acceleration
-Each worker processes symbols independently with its own rate limiter
+Symbols flow through fetch -> engineer -> train -> store stages connected by bounded queues;
+each stage has its own workers, and all fetch workers draw from one shared rate limiter
 Optimized for Ryzen 5 7600 (6 cores, 12 threads)
 GPU-accelerated feature engineering for 1M+ datapoints
 """
@@ -9,14 +10,20 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from PyQt6.QtCore import QThread, QTimer
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Callable
+from typing import List, Dict, Callable, Optional
+import queue
 import time
 from datetime import datetime
 
 from config import settings
 from pipeline import MinuteDataPipeline
-from utils.rate_limiter import AdaptiveRateLimiter
+from mongodb_storage import MongoDBStorage
+from utils.rate_limiter import TokenBucketRateLimiter
+from utils.quota_ledger import get_quota_ledger
+from utils.indicator_state import IndicatorState
+from utils.stage_pipeline import Stage, StagedPipeline
+from dashboard.services.incremental_update import IncrementalUpdateStrategy
+from dashboard.services.compute_pool import ComputePool, FrameExchange
 from dashboard.utils.qt_signals import PipelineSignals
 from dashboard.services import MetricsCalculator
 
@@ -28,11 +35,40 @@ except ImportError:
     GPU_AVAILABLE = False
 
 
+class SymbolJob:
+    """State of one symbol as it moves through the pipeline stages"""
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.pipeline: Optional[MinuteDataPipeline] = None
+        self.progress: Optional[Callable] = None
+        self.existing_profile: Optional[Dict] = None
+        self.incremental = False
+        self.date_range = '-'
+        self.df = None
+        self.indicator_state: Optional[IndicatorState] = None
+        self.exchange: Optional[FrameExchange] = None
+        self.features: Optional[Dict] = None
+        self.ml_profile: Optional[Dict] = None
+        self.stat_profile: Optional[Dict] = None
+        self.profile: Optional[Dict] = None
+
+    def release(self):
+        """Drop the frames held for the later stages"""
+        if self.exchange is not None:
+            self.exchange.close()
+            self.exchange = None
+        self.df = None
+        self.features = None
+
+
 class PipelineController(QThread):
     """
     Manages truly parallel processing of symbols
-    Each worker has independent rate limiter and processes symbols end-to-end
-    Updates metrics every 10 seconds
+    Symbols pass through fetch, engineer, train and store stages; each stage has its own
+    workers and bounded input queue, so quota waits and CPU work overlap.
+    API quota is a single shared token bucket
+    Updates metrics every 2 seconds
     """
 
     def __init__(self, symbols: List[str], config: Dict, parent=None):
@@ -55,17 +91,40 @@ class PipelineController(QThread):
             'end_time': None
         }
 
-        # Thread pool
-        max_workers = config.get('max_workers', 10)
-        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        # Process pool for the CPU-bound stages (feature engineering, model training)
+        self.compute_pool = None
+        if config.get('use_process_pool', settings.use_process_pool):
+            self.compute_pool = ComputePool(config.get('cpu_workers', settings.cpu_workers) or None)
+
+        # Stage concurrency: fetch workers wait on the API, engineer/train workers feed the compute pool
+        cpu_default = self.compute_pool.max_workers if self.compute_pool else 1
+        queue_size = config.get('stage_queue_size', settings.stage_queue_size)
+        self.stages = StagedPipeline(
+            [
+                Stage('fetch', self._fetch_stage, config.get('max_workers', 10)),
+                Stage('engineer', self._engineer_stage,
+                      config.get('engineer_workers', settings.engineer_workers) or cpu_default, queue_size),
+                Stage('train', self._train_stage,
+                      config.get('train_workers', settings.train_workers) or cpu_default, queue_size),
+                Stage('store', self._store_stage, config.get('store_workers', settings.store_workers), queue_size),
+            ],
+            on_result=lambda job: self._results.put((job, None)),
+            on_error=self._on_stage_error,
+            # Symbols still in a stage when the pipeline is stopped
+            on_release=lambda job: job.release()
+        )
+        self._results: queue.Queue = queue.Queue()
 
-        # Calculate per-worker rate limits (independent for each worker)
+        # One token bucket shared by all workers - idle workers leave their share to busy ones
         total_minute_limit = config.get('api_calls_per_minute', 80)
         total_daily_limit = config.get('api_calls_per_day', 95000)
-
-        # Distribute limits across workers with safety margin
-        self.per_worker_minute_limit = max(1, int(total_minute_limit / max_workers * 0.9))
-        self.per_worker_daily_limit = max(10, int(total_daily_limit / max_workers * 0.9))
+        self.rate_limiter = TokenBucketRateLimiter(
+            calls_per_minute=total_minute_limit,
+            calls_per_day=total_daily_limit,
+            burst=config.get('api_burst'),
+            # Shared with other processes (backfill script, quick_start) on this machine
+            ledger=get_quota_ledger(settings.api_quota_ledger_path) if settings.api_quota_ledger_path else None
+        )
 
         # Metrics update timer (2 seconds for real-time feel)
         self.last_update_time = time.time()
@@ -105,25 +164,30 @@ class PipelineController(QThread):
         # Initialize metrics calculator
         self.metrics_calc.initialize(len(self.symbols), self.stats['start_time'])
 
-        self.signals.log_message.emit('INFO', f'Starting pipeline for {len(self.symbols)} symbols with {self.executor._max_workers} workers')
-        self.signals.log_message.emit('INFO', f'Per-worker rate limits: {self.per_worker_minute_limit}/min, {self.per_worker_daily_limit}/day')
+        # Connect and create indexes once up front; every symbol's pipeline reuses the shared client
+        storage = None
+        try:
+            storage = MongoDBStorage()
+        except Exception as e:
+            self.signals.log_message.emit('ERROR', f'MongoDB unavailable: {e}')
+
+        workers = ', '.join(f'{stage.name} {stage.workers}' for stage in self.stages.stages)
+        self.signals.log_message.emit('INFO', f'Starting pipeline for {len(self.symbols)} symbols (workers: {workers})')
+        if self.compute_pool:
+            self.signals.log_message.emit('INFO', f'Feature engineering and ML training on {self.compute_pool.max_workers} worker processes')
+        self.signals.log_message.emit('INFO', f'Shared rate limit: {self.rate_limiter.calls_per_minute}/min (burst {self.rate_limiter.capacity}), {self.rate_limiter.calls_per_day}/day')
         self.signals.pipeline_started.emit(len(self.symbols))
 
-        # Submit all symbols to thread pool at once
-        # Each thread processes one symbol completely independently
-        futures = {}
+        # Queue every symbol for the fetch stage; later stages are fed as earlier ones finish
+        self.stages.start()
+        submitted = 0
         for symbol in self.symbols:
             if self.is_stopped:
                 break
 
             self.symbol_start_times[symbol] = time.time()
-
-            future = self.executor.submit(
-                self._process_symbol_worker,
-                symbol,
-                self.config
-            )
-            futures[future] = symbol
+            self.stages.submit(SymbolJob(symbol))
+            submitted += 1
 
             # Track symbol start time for metrics
             self.metrics_calc.mark_symbol_started(symbol, time.time())
@@ -132,49 +196,33 @@ class PipelineController(QThread):
             self.signals.symbol_started.emit(symbol)
             self.signals.log_message.emit('INFO', f'Starting {symbol}')
 
-        # Monitor completion with periodic updates
-        for future in as_completed(futures):
-            symbol = futures[future]
-
-            if self.is_stopped:
-                break
-
+        # Collect results as symbols leave the last stage, with periodic metric updates
+        finished = 0
+        while finished < submitted and not self.is_stopped:
             try:
-                result = future.result()
-
-                if result['status'] == 'success':
-                    self.stats['completed'] += 1
-                    # Mark completion in metrics
-                    self.metrics_calc.mark_symbol_completed(symbol)
-                    with self.symbol_lock:
-                        self.symbol_control[symbol]['status'] = 'completed'
-                    self.signals.symbol_completed.emit(symbol, result['profile'])
-                    self.signals.log_message.emit('SUCCESS', f'{symbol} completed successfully')
-                else:
-                    self.stats['failed'] += 1
-                    error_msg = result.get('error', 'Unknown error')
-                    with self.symbol_lock:
-                        self.symbol_control[symbol]['status'] = 'failed'
-                    self.signals.symbol_failed.emit(symbol, error_msg)
-                    self.signals.log_message.emit('ERROR', f'{symbol}: {error_msg}')
-
-                # Aggregate API stats
-                if 'api_calls' in result:
-                    self.total_api_calls += result['api_calls']
-                    self.total_daily_calls += result.get('daily_calls', 0)
+                job, error = self._results.get(timeout=self.update_interval)
+            except queue.Empty:
+                job = None
 
-            except Exception as e:
-                self.stats['failed'] += 1
-                error_msg = str(e)
-                self.signals.symbol_failed.emit(symbol, error_msg)
-                self.signals.log_message.emit('ERROR', f'{symbol}: {error_msg}')
+            if job is not None:
+                finished += 1
+                self._handle_result(job, error)
 
-            # Update metrics every 10 seconds
             current_time = time.time()
             if current_time - self.last_update_time >= self.update_interval:
                 self._emit_progress_update()
                 self.last_update_time = current_time
 
+        if self.is_stopped:
+            self._abort_stages()
+        else:
+            self.stages.close()
+        if self.compute_pool:
+            self.compute_pool.shutdown(wait=False)
+        # Profiles queued by the store stage are written in the background
+        if storage is not None and not storage.flush(timeout=60):
+            self.signals.log_message.emit('WARNING', 'Timed out waiting for queued profile writes')
+
         # Final update
         self.stats['end_time'] = time.time()
         start_time_val = self.stats.get('start_time') or self.metrics_calc.start_time or time.time()
@@ -195,6 +243,39 @@ class PipelineController(QThread):
             f'{self.stats["failed"]} failed, {self.stats["skipped"]} skipped'
         )
 
+    def _handle_result(self, job: SymbolJob, error: Optional[str]):
+        """Update stats and emit signals for a symbol that left the pipeline"""
+        symbol = job.symbol
+        api_calls = job.pipeline.data_fetcher.api_calls if job.pipeline else 0
+        self.total_api_calls += api_calls
+        self.total_daily_calls += api_calls
+
+        if error is None:
+            self.stats['completed'] += 1
+            # Mark completion in metrics
+            self.metrics_calc.mark_symbol_completed(symbol)
+            with self.symbol_lock:
+                self.symbol_control[symbol]['status'] = 'completed'
+            self.signals.symbol_completed.emit(symbol, job.profile)
+            self.signals.log_message.emit('SUCCESS', f'{symbol} completed successfully')
+        else:
+            self.stats['failed'] += 1
+            with self.symbol_lock:
+                self.symbol_control[symbol]['status'] = 'failed'
+            self.signals.symbol_failed.emit(symbol, error)
+            self.signals.log_message.emit('ERROR', f'{symbol}: {error}')
+
+    def _on_stage_error(self, job: SymbolJob, error: Exception, stage: str):
+        """Stage failure: free the symbol's frames and report it as failed"""
+        job.release()
+        self.signals.log_message.emit('ERROR', f'{job.symbol}: {stage} stage failed: {error}')
+        self._results.put((job, str(error)))
+
+    def _abort_stages(self):
+        """Drop the queued symbols and free the frames they hold"""
+        for job in self.stages.abort():
+            job.release()
+
     def _emit_progress_update(self):
         """Emit progress updates for ETA and metrics using MetricsCalculator"""
         # Determine processing count as total - completed - failed
@@ -216,129 +297,102 @@ class PipelineController(QThread):
             'eta_seconds': eta_seconds,
             'eta_string': metrics_stats.get('eta_string', 'Calculating...'),
             'throughput': metrics_stats.get('throughput_symbols_per_minute', 0),
-            'elapsed': metrics_stats.get('elapsed_seconds', 0)
+            'elapsed': metrics_stats.get('elapsed_seconds', 0),
+            'stage_queues': self.stages.depths()
         }
         self.signals.metrics_updated.emit(metrics_data)
 
-        # Emit aggregated API stats
+        # Emit API stats straight from the shared limiter
+        limiter_stats = self.rate_limiter.get_stats()
         api_stats = {
-            'minute_calls': 0,  # Can't track per-minute across workers easily
-            'daily_calls': self.total_daily_calls,
-            'daily_remaining': self.config.get('api_calls_per_day', 95000) - self.total_daily_calls
+            'minute_calls': limiter_stats['minute_calls'],
+            'daily_calls': limiter_stats['daily_calls'],
+            'daily_remaining': limiter_stats['daily_remaining']
         }
         self.signals.api_stats_updated.emit(api_stats)
 
-    def _process_symbol_worker(self, symbol: str, config: Dict) -> Dict:
-        """
-        Worker function - processes ONE symbol completely from start to finish
-        This runs in a separate thread with its own independent rate limiter
+    def _check_cancelled(self, job: SymbolJob):
+        """Raise if the pipeline or this symbol was cancelled (checked between stages)"""
+        if self._cancel_event.is_set() or self.symbol_control[job.symbol]['cancelled'].is_set():
+            raise RuntimeError('Cancelled')
 
-        Args:
-            symbol: Ticker symbol
-            config: Configuration dictionary
+    def _fetch_stage(self, job: SymbolJob) -> Optional[SymbolJob]:
+        """
+        Stage 1 (I/O): set up the symbol and fetch its bars
 
-        Returns:
-            Result dictionary with status, profile, and API stats
+        Draws API calls from the shared rate limiter. Returns None when an
+        incremental update finds no new bars (the symbol is then complete).
         """
-        api_calls_used = 0
+        symbol = job.symbol
+        self._check_cancelled(job)
 
-        try:
-            # Create independent pipeline for this worker
-            pipeline = MinuteDataPipeline()
+        # Independent pipeline for this symbol
+        pipeline = job.pipeline = MinuteDataPipeline()
 
-            # Create independent rate limiter for this worker
-            worker_rate_limiter = AdaptiveRateLimiter(
-                calls_per_minute=self.per_worker_minute_limit,
-                calls_per_day=self.per_worker_daily_limit
-            )
+        # Inject the shared rate limiter
+        pipeline.data_fetcher.rate_limiter = self.rate_limiter
 
-            # Inject the independent rate limiter
-            pipeline.data_fetcher.rate_limiter = worker_rate_limiter
+        # Inject cooperative events
+        pipeline.data_fetcher.pause_event = self._pause_event
+        pipeline.data_fetcher.cancel_event = self._cancel_event
+        # Inject per-symbol control events
+        pipeline.data_fetcher.symbol_pause_event = self.symbol_control[symbol]['paused']
+        pipeline.data_fetcher.symbol_cancel_event = self.symbol_control[symbol]['cancelled']
 
-            # Inject cooperative events
-            pipeline.data_fetcher.pause_event = self._pause_event
-            pipeline.data_fetcher.cancel_event = self._cancel_event
-            # Inject per-symbol control events
-            pipeline.data_fetcher.symbol_pause_event = self.symbol_control[symbol]['paused']
-            pipeline.data_fetcher.symbol_cancel_event = self.symbol_control[symbol]['cancelled']
+        # Update status to running
+        with self.symbol_lock:
+            self.symbol_control[symbol]['status'] = 'running'
 
-            # Update status to running
-            with self.symbol_lock:
-                self.symbol_control[symbol]['status'] = 'running'
-
-            # Progress callback with micro-stage updates
-            def progress_callback(status: str, progress: int, micro_stage: str = '-', data_points: int = 0, date_range: str = '-'):
-                # Gather API stats
-                stats = worker_rate_limiter.get_stats()
-                api_used = stats.get('daily_calls', 0)
-                duration_seconds = time.time() - self.symbol_start_times[symbol]
-
-                # Check if paused
-                is_paused = self.symbol_control[symbol]['paused'].is_set()
-
-                # Log the update
-                if micro_stage and micro_stage != '-':
-                    self.signals.log_message.emit('INFO', f'{symbol}: {status} - {micro_stage} ({progress}%)')
-                else:
-                    self.signals.log_message.emit('INFO', f'{symbol}: {status} ({progress}%)')
-
-                # Emit positional args with pause state and date range
-                self.signals.symbol_progress.emit(symbol, status, int(progress), micro_stage or '-', int(data_points), int(api_used), float(duration_seconds), is_paused, date_range or '-')
-
-            # Log start
-            self.signals.log_message.emit('INFO', f'Processing {symbol}...')
-            progress_callback('Starting', 0, micro_stage='Initialization')
-
-            # Check mode
-            mode = config.get('mode', 'incremental')
-            existing_profile = pipeline.storage.get_profile(symbol)
-
-            if mode == 'incremental' and existing_profile:
-                self.signals.log_message.emit('INFO', f'{symbol}: Updating existing profile')
-                profile = self._incremental_update(pipeline, symbol, existing_profile, progress_callback)
+        # Progress callback with micro-stage updates
+        def progress_callback(status: str, progress: int, micro_stage: str = '-', data_points: int = 0, date_range: str = None):
+            # API calls made for this symbol
+            api_used = pipeline.data_fetcher.api_calls
+            duration_seconds = time.time() - self.symbol_start_times[symbol]
+
+            # Check if paused
+            is_paused = self.symbol_control[symbol]['paused'].is_set()
+
+            # Log the update
+            if micro_stage and micro_stage != '-':
+                self.signals.log_message.emit('INFO', f'{symbol}: {status} - {micro_stage} ({progress}%)')
             else:
-                self.signals.log_message.emit('INFO', f'{symbol}: Creating new profile')
-                max_years = config.get('max_years', 2)
-                # max_years can be None when "All Available" is selected - this is handled in _full_backfill
-                profile = self._full_backfill(pipeline, symbol, max_years, progress_callback)
-
-            # Get final API stats
-            final_stats = worker_rate_limiter.get_stats()
-
-            return {
-                'status': 'success',
-                'profile': profile,
-                'api_calls': final_stats.get('daily_calls', 0),
-                'daily_calls': final_stats.get('daily_calls', 0)
-            }
+                self.signals.log_message.emit('INFO', f'{symbol}: {status} ({progress}%)')
 
-        except Exception as e:
-            self.signals.log_message.emit('ERROR', f'{symbol}: {str(e)}')
-            return {
-                'status': 'failed',
-                'error': str(e),
-                'api_calls': api_calls_used
-            }
+            # Emit positional args with pause state and date range
+            self.signals.symbol_progress.emit(symbol, status, int(progress), micro_stage or '-', int(data_points), int(api_used), float(duration_seconds), is_paused, date_range or job.date_range)
+
+        job.progress = progress_callback
+
+        # Log start
+        self.signals.log_message.emit('INFO', f'Processing {symbol}...')
+        progress_callback('Starting', 0, micro_stage='Initialization')
+
+        # Check mode
+        mode = self.config.get('mode', 'incremental')
+        job.existing_profile = pipeline.storage.get_profile(symbol)
+        job.incremental = mode == 'incremental' and bool(job.existing_profile)
 
-    def _full_backfill(
-        self,
-        pipeline: MinuteDataPipeline,
-        symbol: str,
-        max_years: int,
-        progress_callback: Callable
-    ) -> Dict:
+        if job.incremental:
+            self.signals.log_message.emit('INFO', f'{symbol}: Updating existing profile')
+            return self._fetch_new_bars(job)
+
+        self.signals.log_message.emit('INFO', f'{symbol}: Creating new profile')
+        # max_years can be None when "All Available" is selected - this is handled in _fetch_history
+        return self._fetch_history(job, self.config.get('max_years', 2))
+
+    def _fetch_history(self, job: SymbolJob, max_years: int) -> SymbolJob:
         """
-        Full backfill of historical data with micro-stage updates
+        Full backfill: fetch the symbol's history with micro-stage updates
 
         Args:
-            pipeline: MinuteDataPipeline instance
-            symbol: Ticker symbol
+            job: Symbol job (pipeline and progress callback set up)
             max_years: Number of years to fetch (None means all available since establishment)
-            progress_callback: Callback for progress updates
 
         Returns:
-            Company profile dictionary
+            The job with the fetched bars
         """
+        symbol, pipeline, progress_callback = job.symbol, job.pipeline, job.progress
+
         from datetime import datetime, timedelta
         import time
 
@@ -434,7 +488,7 @@ class PipelineController(QThread):
         start_date = end_date - timedelta(days=365 * max_years)
 
         # Display date range BEFORE fetching starts
-        date_range_str = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
+        date_range_str = job.date_range = f"{start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}"
         expected_days = (end_date - start_date).days
         progress_callback('Initializing', 10, micro_stage=f'Range: {date_range_str} ({max_years}yr)', date_range=date_range_str)
         self.signals.log_message.emit('INFO', f'{symbol}: Date range: {date_range_str} (~{expected_days} days)')
@@ -444,106 +498,46 @@ class PipelineController(QThread):
         batch_days = 30
         total_batches = (total_days // batch_days) + 1
 
-        # Fetch data in chunks with micro-stage updates
-        all_data = []
+        # Fetch data in chunks (several in flight, within the shared rate budget)
+        windows = []
         for batch_num in range(total_batches):
             batch_start = start_date + timedelta(days=batch_num * batch_days)
-            batch_end = min(batch_start + timedelta(days=batch_days), end_date)
+            windows.append((batch_start, min(batch_start + timedelta(days=batch_days), end_date)))
 
-            # Calculate progress
-            progress = int((batch_num / max(1,total_batches)) * 45)
-            micro_stage = f'Fetch batch {batch_num+1}/{total_batches}'
+        def on_batch(batch_num, total, df_batch):
+            progress = int(((batch_num + 1) / max(1, total)) * 45)
+            micro_stage = f'Fetched batch {batch_num+1}/{total}'
             progress_callback('Fetching', progress, micro_stage=micro_stage, date_range=date_range_str)
 
-            # Fetch this batch
-            df_batch = pipeline.data_fetcher.fetch_intraday_data(
+        progress_callback('Fetching', 0, micro_stage=f'Fetch {total_batches} batches', date_range=date_range_str)
+        df = pipeline.data_fetcher.fetch_windows(
+            windows,
+            lambda batch_start, batch_end: pipeline.data_fetcher.fetch_intraday_data(
                 symbol=symbol,
                 from_date=batch_start.strftime('%Y-%m-%d'),
                 to_date=batch_end.strftime('%Y-%m-%d')
-            )
-
-            if not df_batch.empty:
-                all_data.append(df_batch)
+            ),
+            max_concurrency=self.config.get('fetch_concurrency'),
+            on_chunk=on_batch,
+            raise_errors=True
+        )
 
-        # Combine all data
-        if not all_data:
+        if df.empty:
             raise ValueError(f"No data retrieved for {symbol}")
 
-        import pandas as pd
-        df = pd.concat(all_data, ignore_index=True).drop_duplicates().reset_index(drop=True)
-
         # Report actual data points received
         actual_start = str(df['datetime'].min())[:10] if 'datetime' in df.columns and len(df) > 0 else '?'
         actual_end = str(df['datetime'].max())[:10] if 'datetime' in df.columns and len(df) > 0 else '?'
         progress_callback('Fetching', 48, micro_stage=f'Retrieved {len(df):,} data points', data_points=len(df))
         self.signals.log_message.emit('INFO', f'{symbol}: Fetched {len(df):,} data points ({actual_start} to {actual_end})')
-        # Engineering features with micro-stage updates
-        total_features = 200  # Approximate
-        progress_callback('Engineering', 50, micro_stage='Starting feature pipeline', data_points=len(df))
-
-        # Create feature-specific progress callback that includes date_range
-        def feature_progress(stage_name, progress_pct):
-            if progress_pct:
-                progress_callback('Engineering', progress_pct, micro_stage=stage_name, data_points=len(df), date_range=date_range_str)
-
-        # Inject progress callback into feature engineer
-        pipeline.feature_engineer.progress_callback = feature_progress
-
-        # Calculate all features with periodic updates (GPU or CPU)
-        features = pipeline.feature_engineer.process_full_pipeline(df)
-
-        progress_callback('Engineering', 68, micro_stage='Features complete', data_points=len(df), date_range=date_range_str)
-        progress_callback('Creating', 70, micro_stage='Building profile object', date_range=date_range_str)
-
-        # Train ML models
-        progress_callback('ML Training', 71, micro_stage='Initializing ML trainer', date_range=date_range_str)
-        from dashboard.services.ml_model_trainer import MLModelTrainer
-
-        def ml_progress(stage, progress):
-            progress_callback('ML Training', progress, micro_stage=stage, date_range=date_range_str)
-
-        ml_trainer = MLModelTrainer(progress_callback=ml_progress)
-        models_result = ml_trainer.train_models(features, df, symbol)
-
-        progress_callback('ML Training', 75, micro_stage='Models trained successfully', date_range=date_range_str)
-
-        # Create ML profile
-        ml_profile = ml_trainer.create_ml_profile(symbol, models_result, features)
-
-        # Create statistical profile
-        stat_profile = ml_trainer.create_statistical_profile(symbol, features)
-
-        # Create company profile (original profile)
-        profile = pipeline.storage.create_company_profile(
-            symbol=symbol,
-            exchange='US',
-            raw_data=df,
-            features=features,
-            fundamental_data={}
-        )
-
-        progress_callback('Storing', 85, micro_stage='Saving profiles', date_range=date_range_str)
-
-        # Save all three profile types to database
-        pipeline.storage.save_profile(profile)  # Original profile
-        pipeline.storage.save_ml_profile(ml_profile)  # ML profile
-        pipeline.storage.save_statistical_profile(stat_profile)  # Statistical profile
 
-        self.signals.log_message.emit('SUCCESS', f'{symbol}: Saved 3 profile types (original, ML, statistical)')
+        job.df = df
+        return job
 
-        progress_callback('Complete', 100, micro_stage='Done', date_range=date_range_str)
-
-        return profile
-
-    def _incremental_update(
-        self,
-        pipeline: MinuteDataPipeline,
-        symbol: str,
-        existing_profile: Dict,
-        progress_callback: Callable
-    ) -> Dict:
-        """Incremental update of existing profile"""
-        progress_callback('Fetching', 10, micro_stage='Incremental new data')
+    def _fetch_new_bars(self, job: SymbolJob) -> Optional[SymbolJob]:
+        """Incremental update: fetch the bars after the stored profile (None if there are none)"""
+        symbol, pipeline, existing_profile = job.symbol, job.pipeline, job.existing_profile
+        job.progress('Fetching', 10, micro_stage='Incremental new data')
 
         # Get last update date - handle both "YYYY-MM-DD HH:MM:SS" and "YYYY-MM-DD" formats
         last_date = existing_profile.get('data_date_range', {}).get('end')
@@ -559,49 +553,150 @@ class PipelineController(QThread):
             from_date=last_date
         )
 
-        if df.empty:
-            progress_callback('Complete', 100, micro_stage='No new data')
-            return existing_profile
+        # Resume the frame indicators from the state stored with the profile
+        job.indicator_state = IndicatorState.from_dict(existing_profile.get('indicator_state'))
+        if job.indicator_state is not None:
+            df = job.indicator_state.new_rows(df)
+        else:
+            self.signals.log_message.emit('WARNING', f'{symbol}: profile has no indicator state, indicators start cold on new data')
 
-        progress_callback('Engineering', 50, micro_stage='Recomputing features', data_points=len(df))
-
-        # Recalculate features
-        features = pipeline.feature_engineer.process_full_pipeline(df)
-
-        progress_callback('Creating', 70, micro_stage='Merging profile')
+        if df.empty:
+            job.progress('Complete', 100, micro_stage='No new data')
+            job.profile = existing_profile
+            return None
+
+        job.df = df
+        return job
+
+    def _engineer_stage(self, job: SymbolJob) -> SymbolJob:
+        """Stage 2 (CPU): feature engineering, on the compute pool when enabled"""
+        self._check_cancelled(job)
+        symbol, pipeline, df, progress_callback = job.symbol, job.pipeline, job.df, job.progress
+
+        if job.incremental:
+            progress_callback('Engineering', 50, micro_stage='Resuming features' if job.indicator_state else 'Recomputing features',
+                              data_points=len(df))
+        else:
+            progress_callback('Engineering', 50, micro_stage='Starting feature pipeline', data_points=len(df))
+
+            # Create feature-specific progress callback (in-thread engineering only)
+            def feature_progress(stage_name, progress_pct):
+                if progress_pct:
+                    progress_callback('Engineering', progress_pct, micro_stage=stage_name, data_points=len(df))
+
+            pipeline.feature_engineer.progress_callback = feature_progress
+
+        # Frames handed to the worker processes live in the exchange until the symbol is stored
+        if self.compute_pool:
+            job.exchange = self.compute_pool.exchange()
+
+        # Calculate all features (GPU or CPU)
+        job.features = self._engineer_features(pipeline, job.exchange, df, job.indicator_state)
+        if job.incremental:
+            # Features for the new bars only, statistics merged with the stored history
+            job.features = IncrementalUpdateStrategy().merge_historical_features(job.existing_profile, job.features)
+            progress_callback('Creating', 70, micro_stage='Merging profile')
+        else:
+            progress_callback('Engineering', 68, micro_stage='Features complete', data_points=len(df))
+            progress_callback('Creating', 70, micro_stage='Building profile object')
+        return job
+
+    def _train_stage(self, job: SymbolJob) -> SymbolJob:
+        """Stage 3 (CPU): train the ML models and build the ML/statistical profiles"""
+        self._check_cancelled(job)
+        symbol, features, progress_callback = job.symbol, job.features, job.progress
 
         # Train ML models
+        progress_callback('ML Training', 71, micro_stage='Initializing ML trainer')
         from dashboard.services.ml_model_trainer import MLModelTrainer
 
         def ml_progress(stage, progress):
             progress_callback('ML Training', progress, micro_stage=stage)
 
         ml_trainer = MLModelTrainer(progress_callback=ml_progress)
-        models_result = ml_trainer.train_models(features, df, symbol)
+        models_result = self._train_models(ml_trainer, job.exchange, features, job.df, symbol)
 
-        # Create profiles
-        ml_profile = ml_trainer.create_ml_profile(symbol, models_result, features)
-        stat_profile = ml_trainer.create_statistical_profile(symbol, features)
+        progress_callback('ML Training', 75, micro_stage='Models trained successfully')
 
-        # Create updated profile
-        profile = pipeline.storage.create_company_profile(
-            symbol=symbol,
-            exchange='US',
-            raw_data=df,
-            features=features,
-            fundamental_data={}
-        )
+        # Create ML profile
+        job.ml_profile = ml_trainer.create_ml_profile(symbol, models_result, features)
+
+        # Create statistical profile
+        job.stat_profile = ml_trainer.create_statistical_profile(symbol, features)
+        return job
 
-        progress_callback('Storing', 85, micro_stage='Updating MongoDB')
+    def _store_stage(self, job: SymbolJob) -> SymbolJob:
+        """Stage 4 (I/O): build the company profile and save all three profile types"""
+        self._check_cancelled(job)
+        symbol, pipeline, features, progress_callback = job.symbol, job.pipeline, job.features, job.progress
 
-        # Update all profiles in database
-        pipeline.storage.update_profile(symbol, profile)
-        pipeline.storage.save_ml_profile(ml_profile)
-        pipeline.storage.save_statistical_profile(stat_profile)
+        try:
+            # Create company profile (original profile)
+            profile = pipeline.storage.create_company_profile(
+                symbol=symbol,
+                exchange='US',
+                raw_data=job.df,
+                features=features,
+                fundamental_data={}
+            )
+            if settings.store_minute_bars:
+                # Before release(): processed_df may be mapped from the exchange
+                progress_callback('Storing', 82, micro_stage='Storing minute bars')
+                processed = features.get('processed_df')
+                bars = processed if processed is not None and not processed.empty else job.df
+                pipeline.storage.save_bars(symbol, bars, replace=not job.incremental)
+        finally:
+            job.release()
+
+        if job.incremental:
+            # Statistics and risk metrics describe the full history when sketches were merged
+            if features.get('risk_metrics'):
+                profile['risk_metrics'].update(features['risk_metrics'])
+            if job.indicator_state is not None and features.get('cumulative_data_range'):
+                cumulative = features['cumulative_data_range']
+                profile['data_points_count'] = cumulative['total_points']
+                profile['data_date_range']['start'] = cumulative['first_point']
+
+            progress_callback('Storing', 85, micro_stage='Updating MongoDB')
+            profile['last_updated'] = datetime.utcnow()
+        else:
+            progress_callback('Storing', 85, micro_stage='Saving profiles')
+
+        # Queued for the shared bulk writer; failures are reported per document
+        storage = pipeline.storage
+        self._watch_write(symbol, 'profile', storage.queue_profile(profile))  # Original profile
+        self._watch_write(symbol, 'ML profile', storage.queue_ml_profile(job.ml_profile))
+        self._watch_write(symbol, 'statistical profile', storage.queue_statistical_profile(job.stat_profile))
+
+        if not job.incremental:
+            self.signals.log_message.emit('SUCCESS', f'{symbol}: Queued 3 profile types (original, ML, statistical)')
 
         progress_callback('Complete', 100, micro_stage='Done')
 
-        return profile
+        job.profile = profile
+        return job
+
+    def _watch_write(self, symbol: str, kind: str, future):
+        """Log an error if a queued profile write fails"""
+        def done(f):
+            if not f.result():
+                self.signals.log_message.emit('ERROR', f'{symbol}: Failed to save {kind}')
+        future.add_done_callback(done)
+
+    def _engineer_features(self, pipeline: MinuteDataPipeline, exchange: Optional[FrameExchange],
+                           df, indicator_state: Optional[IndicatorState] = None) -> Dict:
+        """process_full_pipeline on the compute pool, or in this thread without one"""
+        if exchange is None:
+            return pipeline.feature_engineer.process_full_pipeline(df, indicator_state=indicator_state)
+        return self.compute_pool.process_full_pipeline(
+            exchange, df, indicator_state=indicator_state, compact_dtypes=settings.feature_compact_dtypes
+        )
+
+    def _train_models(self, ml_trainer, exchange: Optional[FrameExchange], features: Dict, df, symbol: str) -> Dict:
+        """train_models on the compute pool, or in this thread without one"""
+        if exchange is None:
+            return ml_trainer.train_models(features, df, symbol)
+        return self.compute_pool.train_models(exchange, features, df, symbol)
 
     # ==================== GLOBAL PIPELINE CONTROL ====================
 
@@ -626,10 +721,9 @@ class PipelineController(QThread):
         self._cancel_event.set()
         self._pause_event.clear()
         self.signals.log_message.emit('ERROR', 'Pipeline stopped - terminating all workers')
-        try:
-            self.executor.shutdown(wait=False, cancel_futures=True)
-        except:
-            pass
+        self._abort_stages()
+        if self.compute_pool:
+            self.compute_pool.shutdown(wait=False)
         self.signals.pipeline_stopped.emit()
 
     def clear(self):
@@ -640,11 +734,10 @@ class PipelineController(QThread):
         self._cancel_event.set()
         self._pause_event.clear()
 
-        # Stop executor
-        try:
-            self.executor.shutdown(wait=False, cancel_futures=True)
-        except:
-            pass
+        # Drop queued work
+        self._abort_stages()
+        if self.compute_pool:
+            self.compute_pool.shutdown(wait=False)
         
         # Reset stats
         self.stats = {
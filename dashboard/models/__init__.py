@@ -1,4 +1,7 @@
 """Dashboard data models"""
 from .cache_store import CacheStore
+from .log_model import LogBuffer, LogRecord, LogTableModel
+from .table_models import SORT_ROLE, Column, ColumnarTableModel, PagedTableModel, sort_filter_proxy
 
-__all__ = ['CacheStore']
+__all__ = ['CacheStore', 'LogBuffer', 'LogRecord', 'LogTableModel', 'SORT_ROLE', 'Column', 'ColumnarTableModel',
+           'PagedTableModel', 'sort_filter_proxy']
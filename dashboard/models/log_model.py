@@ -0,0 +1,304 @@
+"""
+Bounded log storage for the live log view
+
+A long run logs hundreds of thousands of lines. LogBuffer keeps the newest
+``capacity`` records in a ring, so memory stays flat however long the
+session runs, together with per-level, per-category and per-symbol indexes
+of the records' sequence numbers. Switching the view's filter then costs
+the number of matching records instead of a scan of everything logged.
+LogTableModel renders the buffer through a QTableView, which only asks for
+the rows on screen.
+"""
+import re
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt6.QtGui import QColor
+
+LEVEL_COLORS = {
+    'DEBUG': QColor(150, 150, 150),
+    'INFO': QColor(220, 220, 220),
+    'WARNING': QColor(255, 200, 0),
+    'ERROR': QColor(255, 100, 100),
+    'CRITICAL': QColor(255, 0, 0),
+    'SUCCESS': QColor(100, 255, 100),
+}
+
+# Controller messages lead with the ticker: "AAPL: Fetching ...", "⏸ AAPL: NOW PAUSED"
+_SYMBOL_PREFIX = re.compile(r'^\W{0,3}([A-Z0-9][A-Z0-9.\-]{0,11}):\s')
+
+
+def categorize(message: str) -> str:
+    """Component a message belongs to (MongoDB, Pipeline, API or General)"""
+    text = message.lower()
+    if 'mongodb' in text:
+        return 'MongoDB'
+    if 'pipeline' in text:
+        return 'Pipeline'
+    if 'fetcher' in text or 'api' in text:
+        return 'API'
+    return 'General'
+
+
+def extract_symbol(message: str) -> str:
+    """Ticker a message is about ('' if none)"""
+    match = _SYMBOL_PREFIX.match(message)
+    return match.group(1) if match else ''
+
+
+class LogRecord:
+    """One structured log line"""
+
+    __slots__ = ('seq', 'timestamp', 'level', 'category', 'symbol', 'message')
+
+    def __init__(self, seq: int, timestamp: float, level: str, category: str, symbol: str, message: str):
+        self.seq = seq
+        self.timestamp = timestamp
+        self.level = level
+        self.category = category
+        self.symbol = symbol
+        self.message = message
+
+    def keys(self) -> Tuple[Tuple[str, str], ...]:
+        """Index keys of the record"""
+        keys = (('level', self.level), ('category', self.category))
+        return keys + (('symbol', self.symbol),) if self.symbol else keys
+
+
+class SeqList:
+    """Increasing sequence numbers with O(1) append, random access and removal from the front"""
+
+    def __init__(self, items: Iterable[int] = ()):
+        self._items = list(items)
+        self._head = 0
+
+    def __len__(self) -> int:
+        return len(self._items) - self._head
+
+    def __getitem__(self, i: int) -> int:
+        return self._items[self._head + i]
+
+    def append(self, seq: int):
+        self._items.append(seq)
+
+    def extend(self, seqs: Iterable[int]):
+        self._items.extend(seqs)
+
+    def count_below(self, seq: int) -> int:
+        """Number of leading items smaller than ``seq``"""
+        return bisect_left(self._items, seq, self._head) - self._head
+
+    def drop_front(self, count: int):
+        """Remove the first ``count`` items"""
+        self._head += count
+        # Compact once the dead prefix outweighs the live items (amortized O(1))
+        if self._head > 1024 and self._head * 2 > len(self._items):
+            del self._items[:self._head]
+            self._head = 0
+
+
+class LogBuffer:
+    """
+    Ring buffer of the newest ``capacity`` log records with filter indexes
+
+    Records are numbered by an increasing ``seq``; the buffer holds
+    ``first_seq`` .. ``next_seq - 1``.
+    """
+
+    def __init__(self, capacity: int = 100_000):
+        self.capacity = capacity
+        self._slots: List[Optional[LogRecord]] = [None] * capacity
+        self._indexes: Dict[Tuple[str, str], SeqList] = {}
+        self.first_seq = 0
+        self.next_seq = 0
+
+    def __len__(self) -> int:
+        return self.next_seq - self.first_seq
+
+    def record(self, seq: int) -> LogRecord:
+        """Record by sequence number (must still be buffered)"""
+        return self._slots[seq % self.capacity]
+
+    def extend(self, entries: Sequence[Tuple[str, str]], timestamp: Optional[float] = None) -> List[LogRecord]:
+        """
+        Append (level, message) entries, evicting the oldest records as needed
+
+        Returns:
+            The new records (only the newest ``capacity`` if more were given)
+        """
+        overflow = len(self) + len(entries) - self.capacity
+        if overflow > 0:
+            self.evict(overflow)
+        if len(entries) > self.capacity:
+            # Lines that would be evicted right away still take their sequence numbers
+            self.next_seq += len(entries) - self.capacity
+            self.first_seq = self.next_seq
+            entries = entries[-self.capacity:]
+
+        timestamp = time.time() if timestamp is None else timestamp
+        added = []
+        for level, message in entries:
+            record = LogRecord(self.next_seq, timestamp, level, categorize(message), extract_symbol(message), message)
+            self._slots[record.seq % self.capacity] = record
+            for key in record.keys():
+                index = self._indexes.get(key)
+                if index is None:
+                    index = self._indexes[key] = SeqList()
+                index.append(record.seq)
+            self.next_seq += 1
+            added.append(record)
+        return added
+
+    def evict(self, count: int):
+        """Drop the ``count`` oldest records"""
+        count = min(count, len(self))
+        for seq in range(self.first_seq, self.first_seq + count):
+            slot = seq % self.capacity
+            for key in self._slots[slot].keys():
+                index = self._indexes[key]
+                index.drop_front(1)
+                if not len(index):
+                    del self._indexes[key]
+            self._slots[slot] = None
+        self.first_seq += count
+
+    def count(self, kind: str, value: str) -> int:
+        """Buffered records with level/category/symbol ``value``"""
+        index = self._indexes.get((kind, value))
+        return len(index) if index is not None else 0
+
+    def select(self, level: Optional[str] = None, category: Optional[str] = None,
+               symbol: Optional[str] = None) -> SeqList:
+        """
+        Sequence numbers of the records matching every given criterion
+
+        Walks the smallest of the relevant indexes only.
+        """
+        keys = [key for key in (('level', level), ('category', category), ('symbol', symbol)) if key[1]]
+        if not keys:
+            return SeqList(range(self.first_seq, self.next_seq))
+        indexes = [self._indexes.get(key) for key in keys]
+        if any(index is None for index in indexes):
+            return SeqList()
+        smallest = min(indexes, key=len)
+        seqs = (smallest[i] for i in range(len(smallest)))
+        if len(keys) == 1:
+            return SeqList(seqs)
+        return SeqList(seq for seq in seqs if matches(self.record(seq), level, category, symbol))
+
+    def clear(self):
+        """Drop every record"""
+        self._slots = [None] * self.capacity
+        self._indexes = {}
+        self.first_seq = self.next_seq
+
+
+def matches(record: LogRecord, level: Optional[str], category: Optional[str], symbol: Optional[str]) -> bool:
+    """Whether a record passes a filter (None/'' criteria match everything)"""
+    return ((not level or record.level == level) and (not category or record.category == category)
+            and (not symbol or record.symbol == symbol))
+
+
+class LogTableModel(QAbstractTableModel):
+    """
+    Filtered table view of a LogBuffer
+
+    The model keeps the sequence numbers of the matching records and updates
+    them incrementally on append and eviction, emitting row inserts/removals
+    so the view keeps its scroll position.
+    """
+
+    HEADERS = ['Time', 'Level', 'Category', 'Symbol', 'Message']
+
+    def __init__(self, capacity: int = 100_000, parent=None):
+        super().__init__(parent)
+        self.buffer = LogBuffer(capacity)
+        self._filter: Tuple[Optional[str], Optional[str], Optional[str]] = (None, None, None)
+        self._rows: Optional[SeqList] = None  # None: unfiltered, rows map directly onto the buffer
+
+    @property
+    def filter(self) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Active (level, category, symbol) filter"""
+        return self._filter
+
+    def set_filter(self, level: Optional[str] = None, category: Optional[str] = None, symbol: Optional[str] = None):
+        """Show only records matching every given criterion"""
+        self.beginResetModel()
+        self._filter = (level or None, category or None, symbol or None)
+        self._rows = self.buffer.select(*self._filter) if any(self._filter) else None
+        self.endResetModel()
+
+    def append(self, entries: Sequence[Tuple[str, str]]):
+        """Append (level, message) entries"""
+        if not entries:
+            return
+        if len(entries) >= self.buffer.capacity:
+            self.beginResetModel()
+            self.buffer.extend(entries)
+            self._rows = self.buffer.select(*self._filter) if self._rows is not None else None
+            self.endResetModel()
+            return
+
+        overflow = len(self.buffer) + len(entries) - self.buffer.capacity
+        if overflow > 0:
+            removed = overflow if self._rows is None else self._rows.count_below(self.buffer.first_seq + overflow)
+            if removed:
+                self.beginRemoveRows(QModelIndex(), 0, removed - 1)
+            if self._rows is not None:
+                self._rows.drop_front(removed)
+            self.buffer.evict(overflow)
+            if removed:
+                self.endRemoveRows()
+
+        first = self.rowCount()
+        if self._rows is None:
+            self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+            self.buffer.extend(entries)
+            self.endInsertRows()
+            return
+
+        added = [r.seq for r in self.buffer.extend(entries) if matches(r, *self._filter)]
+        if added:
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            self._rows.extend(added)
+            self.endInsertRows()
+
+    def clear(self):
+        """Drop every record"""
+        self.beginResetModel()
+        self.buffer.clear()
+        self._rows = SeqList() if self._rows is not None else None
+        self.endResetModel()
+
+    def record(self, row: int) -> LogRecord:
+        """Record shown in ``row``"""
+        seq = self.buffer.first_seq + row if self._rows is None else self._rows[row]
+        return self.buffer.record(seq)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self.buffer) if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            record = self.record(index.row())
+            column = index.column()
+            if column == 0:
+                return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(record.timestamp))
+            return (record.level, record.category, record.symbol, record.message)[column - 1]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return LEVEL_COLORS.get(self.record(index.row()).level, LEVEL_COLORS['INFO'])
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
@@ -0,0 +1,226 @@
+"""
+Table models for large result sets
+
+QTableWidget creates an item per cell up front, which stalls the GUI thread
+for thousands of profiles or a large frame. These models hand the view only
+the cells it paints: rows are formatted on demand and added in chunks as the
+view scrolls (canFetchMore/fetchMore), so opening a view costs one chunk
+however large the data is. Sort and filter through a QSortFilterProxyModel
+using SORT_ROLE, which carries the raw (comparable) cell values.
+"""
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+
+# Raw cell value for sorting (display text sorts "10" before "9")
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+_RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+
+
+class Column:
+    """
+    One column of a PagedTableModel
+
+    Args:
+        header: Header text
+        value: Row dict -> raw value (used for SORT_ROLE; keep one comparable type per column)
+        display: Raw value -> display text (default: str)
+        alignment: Optional Qt alignment of the cells
+    """
+
+    def __init__(self, header: str, value: Callable[[Dict], Any], display: Callable[[Any], str] = str,
+                 alignment: Optional[Qt.AlignmentFlag] = None):
+        self.header = header
+        self.value = value
+        self.display = display
+        self.alignment = alignment
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Rows pulled page by page from a paged source (e.g. a Mongo listing)
+
+    ``fetch_page(skip, limit)`` returns the next rows; a short page marks the
+    end. Only the first page is loaded on reset(), later ones as the view
+    scrolls to the bottom.
+
+    With ``asynchronous=True`` the source is called as
+    ``fetch_page(skip, limit, deliver)`` and must start the query and return;
+    ``deliver(rows)`` is then called on the GUI thread once the page is in.
+    Pages requested before the last reset() are dropped.
+    """
+
+    def __init__(self, columns: Sequence[Column], fetch_page: Optional[Callable] = None,
+                 page_size: int = 200, parent=None, asynchronous: bool = False):
+        super().__init__(parent)
+        self.columns = list(columns)
+        self.page_size = page_size
+        self.asynchronous = asynchronous
+        self._fetch_page = fetch_page
+        self._rows: List[Dict] = []
+        self._exhausted = fetch_page is None
+        self._loading = False
+        self._generation = 0
+
+    def reset(self, fetch_page: Optional[Callable] = None):
+        """Drop the loaded rows and load the first page (optionally from a new source)"""
+        self.beginResetModel()
+        if fetch_page is not None:
+            self._fetch_page = fetch_page
+        self._rows = []
+        self._exhausted = self._fetch_page is None
+        self._loading = False
+        self._generation += 1
+        self.endResetModel()
+        if self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def row_data(self, row: int) -> Dict:
+        """Source row dictionary"""
+        return self._rows[row]
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columns)
+
+    @property
+    def loading(self) -> bool:
+        """Whether an asynchronous page request is outstanding"""
+        return self._loading
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        if self.asynchronous:
+            self._loading = True
+            generation = self._generation
+            self._fetch_page(len(self._rows), self.page_size, lambda page: self._add_page(page, generation))
+        else:
+            self._add_page(self._fetch_page(len(self._rows), self.page_size))
+
+    def _add_page(self, page: Optional[List[Dict]], generation: Optional[int] = None):
+        if generation is not None:
+            if generation != self._generation:
+                return  # Requested before a reset
+            self._loading = False
+        page = page or []
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if page:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._rows.extend(page)
+            self.endInsertRows()
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        column = self.columns[index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return column.display(column.value(self._rows[index.row()]))
+        if role == SORT_ROLE:
+            return column.value(self._rows[index.row()])
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            return column.alignment
+        return None
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section].header
+        return super().headerData(section, orientation, role)
+
+
+class ColumnarTableModel(QAbstractTableModel):
+    """
+    Read-only view of columnar arrays (e.g. a DataFrame's columns)
+
+    Cells are formatted when painted; rows are exposed in chunks of
+    ``batch_rows`` as the view scrolls, so a proxy model never has to sort or
+    filter more rows than were shown.
+    """
+
+    def __init__(self, batch_rows: int = 1000, decimals: int = 2, parent=None):
+        super().__init__(parent)
+        self.batch_rows = batch_rows
+        self.decimals = decimals
+        self._names: List[str] = []
+        self._arrays: List[np.ndarray] = []
+        self._rows = 0
+        self._loaded = 0
+
+    def set_frame(self, df: Optional[pd.DataFrame], columns: Optional[Sequence[str]] = None):
+        """Show ``columns`` of ``df`` (all columns by default); None clears the model"""
+        self.beginResetModel()
+        if df is None:
+            self._names, self._arrays = [], []
+        else:
+            self._names = [c for c in (columns or df.columns) if c in df.columns]
+            self._arrays = [df[c].to_numpy() for c in self._names]
+        self._rows = len(df) if df is not None else 0
+        self._loaded = min(self._rows, self.batch_rows)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._names)
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < self._rows
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.batch_rows, self._rows - self._loaded)
+        if count > 0:
+            self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+            self._loaded += count
+            self.endInsertRows()
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        values = self._arrays[index.column()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self._format(values[index.row()], values.dtype)
+        if role == SORT_ROLE:
+            value = values[index.row()]
+            if np.issubdtype(values.dtype, np.datetime64):
+                return int(value.astype('datetime64[ns]').astype(np.int64))
+            return value.item() if isinstance(value, np.generic) else value
+        if role == Qt.ItemDataRole.TextAlignmentRole and np.issubdtype(values.dtype, np.number):
+            return _RIGHT
+        return None
+
+    def _format(self, value, dtype) -> str:
+        if pd.isna(value):
+            return "N/A"
+        if np.issubdtype(dtype, np.datetime64):
+            return str(pd.Timestamp(value))
+        if np.issubdtype(dtype, np.floating):
+            return f"{value:.{self.decimals}f}"
+        return str(value)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self._names[section]
+        return super().headerData(section, orientation, role)
+
+
+def sort_filter_proxy(source: QAbstractTableModel, filter_column: int = 0, parent=None) -> QSortFilterProxyModel:
+    """Proxy sorting on SORT_ROLE and filtering ``filter_column`` case-insensitively"""
+    proxy = QSortFilterProxyModel(parent)
+    proxy.setSourceModel(source)
+    proxy.setSortRole(SORT_ROLE)
+    proxy.setFilterKeyColumn(filter_column)
+    proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+    return proxy
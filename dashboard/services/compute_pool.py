@@ -0,0 +1,217 @@
+"""
+Process pool for the CPU-bound pipeline stages
+
+Feature engineering and model training hold the GIL for long stretches, so
+running them on the controller's thread pool serializes the symbols. The
+ComputePool runs them in worker processes instead, while fetching and storage
+stay on threads.
+
+Frames cross the process boundary as memory-mapped columnar files: every
+column is written once as an ``.npy`` file (under /dev/shm when available) and
+the receiving side maps it copy-on-write instead of unpickling a copy. Only
+the small result dictionaries are pickled.
+"""
+import os
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+SHM_DIR = '/dev/shm'
+
+
+class FrameExchange:
+    """
+    Directory of memory-mapped frames shared with worker processes
+
+    Use as a context manager; the files are removed on exit. Frames read back
+    with get() are mapped from these files, so keep the exchange open while
+    they are in use (or copy them).
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        if root is None and os.path.isdir(SHM_DIR):
+            root = SHM_DIR
+        self.path = Path(tempfile.mkdtemp(prefix='pipeline_frames_', dir=root))
+        # id(frame) -> (frame, handle) for frames already in the exchange
+        self._handles: Dict[int, tuple] = {}
+
+    def __enter__(self) -> 'FrameExchange':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._handles.clear()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def put(self, df: pd.DataFrame) -> Dict:
+        """Write ``df`` column by column (once per frame) and return a picklable handle"""
+        known = self._handles.get(id(df))
+        if known is not None and known[0] is df:
+            return known[1]
+        handle = write_frame(df, self.path)
+        self._handles[id(df)] = (df, handle)
+        return handle
+
+    def get(self, handle: Dict) -> pd.DataFrame:
+        """Map a frame written by put() or by a worker"""
+        df = read_frame(handle)
+        self._handles[id(df)] = (df, handle)
+        return df
+
+
+def write_frame(df: pd.DataFrame, directory: Path) -> Dict:
+    """
+    Store ``df`` as one ``.npy`` file per column
+
+    Returns:
+        Handle with the file names, column names and index
+    """
+    name = uuid.uuid4().hex
+    columns = []
+    for pos, col in enumerate(df.columns):
+        series = df[col]
+        tz = None
+        if isinstance(series.dtype, pd.DatetimeTZDtype):
+            tz = str(series.dt.tz)
+            series = series.dt.tz_convert('UTC').dt.tz_localize(None)
+        values = series.to_numpy()
+        if values.dtype == object:
+            raise TypeError(f"Column '{col}' has object dtype and cannot be memory-mapped")
+        path = Path(directory) / f'{name}_{pos}.npy'
+        np.save(path, values, allow_pickle=False)
+        columns.append((col, str(path), tz))
+    index = df.index
+    if isinstance(index, pd.RangeIndex):
+        index = (index.start, index.stop, index.step)
+    else:
+        index = index.to_numpy()
+    return {'columns': columns, 'index': index, 'rows': len(df)}
+
+
+def read_frame(handle: Dict) -> pd.DataFrame:
+    """Map a frame stored by write_frame() (copy-on-write, files stay untouched)"""
+    index = handle['index']
+    index = pd.RangeIndex(*index) if isinstance(index, tuple) else pd.Index(index)
+    data = {}
+    for col, path, tz in handle['columns']:
+        # Plain ndarray view of the mapping (the memmap stays alive as its base)
+        values = np.load(path, mmap_mode='c').view(np.ndarray)
+        data[col] = values if tz is None else pd.Series(values, index=index).dt.tz_localize('UTC').dt.tz_convert(tz)
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+# Per-process engineers, reused across the tasks a worker runs
+_engineers: Dict[bool, object] = {}
+
+
+def _feature_engineer(compact_dtypes: bool):
+    engineer = _engineers.get(compact_dtypes)
+    if engineer is None:
+        from feature_engineering import FeatureEngineer
+        engineer = _engineers[compact_dtypes] = FeatureEngineer(compact_dtypes=compact_dtypes)
+    return engineer
+
+
+def _engineer_task(frame: Dict, directory: str, indicator_state, compact_dtypes: bool) -> Dict:
+    """Worker side of ComputePool.process_full_pipeline"""
+    df = read_frame(frame)
+    features = _feature_engineer(compact_dtypes).process_full_pipeline(df, indicator_state=indicator_state)
+    processed = features.get('processed_df')
+    if processed is not None:
+        features['processed_df'] = write_frame(processed, Path(directory))
+    return features
+
+
+def _train_task(features: Dict, frame: Dict, symbol: str) -> Dict:
+    """Worker side of ComputePool.train_models"""
+    from dashboard.services.ml_model_trainer import MLModelTrainer
+    if isinstance(features.get('processed_df'), dict):
+        features = {**features, 'processed_df': read_frame(features['processed_df'])}
+    # One job per worker: the pool already spreads symbols over the cores
+    return MLModelTrainer(n_jobs=1).train_models(features, read_frame(frame), symbol)
+
+
+class ComputePool:
+    """
+    Worker processes for process_full_pipeline and MLModelTrainer.train_models
+
+    Workers are started on first use with the 'spawn' method (safe next to Qt
+    and the controller's threads) and keep their imports warm between tasks.
+    Stage progress is not streamed back from the workers; callers report it
+    around each call.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Args:
+            max_workers: Worker processes (default: one per CPU core)
+        """
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = Lock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context('spawn'))
+                logger.info(f"Started compute pool with {self.max_workers} worker processes")
+            return self._executor
+
+    def exchange(self) -> FrameExchange:
+        """New FrameExchange for one symbol's frames"""
+        return FrameExchange()
+
+    def process_full_pipeline(self, exchange: FrameExchange, df: pd.DataFrame, indicator_state=None,
+                              compact_dtypes: bool = False) -> Dict:
+        """
+        FeatureEngineer.process_full_pipeline in a worker process
+
+        Args:
+            exchange: Exchange holding this symbol's frames (keep open while using the result)
+            df: Raw minute bars
+            indicator_state: Optional IndicatorState to resume from
+            compact_dtypes: Build processed_df with float32/int8 columns
+
+        Returns:
+            Feature dictionary; processed_df is mapped from the exchange
+        """
+        features = self.executor.submit(_engineer_task, exchange.put(df), str(exchange.path), indicator_state,
+                                        compact_dtypes).result()
+        if isinstance(features.get('processed_df'), dict):
+            features['processed_df'] = exchange.get(features['processed_df'])
+        return features
+
+    def train_models(self, exchange: FrameExchange, features: Dict, df: pd.DataFrame, symbol: str) -> Dict:
+        """
+        MLModelTrainer.train_models in a worker process
+
+        Frames already in the exchange (the raw bars and a processed_df returned
+        by process_full_pipeline) are not written again.
+
+        Returns:
+            models_result as returned by train_models
+        """
+        shared = dict(features)
+        processed = shared.get('processed_df')
+        if isinstance(processed, pd.DataFrame):
+            shared['processed_df'] = exchange.put(processed)
+        return self.executor.submit(_train_task, shared, exchange.put(df), symbol).result()
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes (pending tasks are cancelled)"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait, cancel_futures=True)
+                self._executor = None
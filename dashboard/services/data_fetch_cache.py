@@ -1,27 +1,206 @@
 """
 Data Fetch Cache System
-Caches fetched market data for 24 hours, up to 50MB
+Caches fetched market data for 30 days, up to 2GB
 Prevents redundant API calls and speeds up re-runs
+
+Storage layout (columnar, when pyarrow is available):
+    {cache_dir}/partitions/{SYMBOL}/{YYYY-MM}.parquet   <- one zstd-compressed file per symbol per month
+    {cache_dir}/cache_metadata.json                    <- coverage entries (which date ranges were fetched)
+
+Entries written by older versions ({md5}.pkl) are still readable and expire normally.
 """
 import os
 import json
 import pickle
+import shutil
 import hashlib
-from datetime import datetime, timedelta
+import threading
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Tuple
+from typing import Optional, Dict, Tuple, List
 import pandas as pd
 from loguru import logger
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:  # fall back to legacy pickle files
+    PARQUET_AVAILABLE = False
+
+
+PARTITION_DIR = 'partitions'
+PARTITION_COMPRESSION = 'zstd'
+
+
+def _date_ordinal(value: str) -> int:
+    """'YYYY-MM-DD' (optionally followed by a time) -> proleptic day ordinal"""
+    return date.fromisoformat(str(value)[:10]).toordinal()
+
+
+def _day_after(value) -> pd.Timestamp:
+    """Midnight after the day of ``value``: exclusive upper bound covering all of an end date's bars"""
+    return pd.to_datetime(value).normalize() + pd.Timedelta(days=1)
+
+
+def _ordinal_date(ordinal: int) -> str:
+    """Day ordinal -> 'YYYY-MM-DD'"""
+    return date.fromordinal(ordinal).strftime('%Y-%m-%d')
+
+
+class _SymbolCoverage:
+    """Sorted coverage intervals of one symbol (day ordinals, inclusive bounds)"""
+
+    def __init__(self):
+        self.entries: Dict[str, Tuple[int, int, float]] = {}  # key -> (start, end, expires_at)
+        self.dirty = True
+        self.next_expiry = float('inf')
+        # Rebuilt from entries when dirty
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.keys: List[str] = []
+        self.max_ends: List[int] = []       # running max of ends, monotonic -> bisectable
+        self.merged_starts: List[int] = []  # union of intervals, disjoint and sorted
+        self.merged_ends: List[int] = []
+
+    def rebuild(self):
+        ordered = sorted((start, end, key) for key, (start, end, _) in self.entries.items())
+        self.starts = [e[0] for e in ordered]
+        self.ends = [e[1] for e in ordered]
+        self.keys = [e[2] for e in ordered]
+        self.max_ends = list(accumulate(self.ends, max))
+
+        merged_starts, merged_ends = [], []
+        for start, end, _ in ordered:
+            # Whole inclusive days: adjacent intervals ([a, b] and [b + 1, c]) form continuous coverage
+            if merged_ends and start <= merged_ends[-1] + 1:
+                merged_ends[-1] = max(merged_ends[-1], end)
+            else:
+                merged_starts.append(start)
+                merged_ends.append(end)
+        self.merged_starts = merged_starts
+        self.merged_ends = merged_ends
+
+        self.next_expiry = min((exp for _, _, exp in self.entries.values()), default=float('inf'))
+        self.dirty = False
+
+
+class CoverageIndex:
+    """
+    Per-symbol interval index over cache coverage entries
+
+    Built once from metadata and maintained on set/remove, so coverage and
+    gap queries bisect sorted arrays instead of scanning (and re-parsing)
+    every metadata entry. Expired entries are dropped lazily on query.
+    """
+
+    def __init__(self):
+        self._symbols: Dict[str, _SymbolCoverage] = {}
+        self._key_symbol: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def add(self, symbol: str, key: str, start_date: str, end_date: str, expires_at: float):
+        """Insert or replace an entry"""
+        start, end = _date_ordinal(start_date), _date_ordinal(end_date)
+        with self._lock:
+            self._discard(key)
+            coverage = self._symbols.setdefault(symbol, _SymbolCoverage())
+            coverage.entries[key] = (start, end, expires_at)
+            coverage.dirty = True
+            self._key_symbol[key] = symbol
+
+    def remove(self, key: str):
+        with self._lock:
+            self._discard(key)
+
+    def remove_symbol(self, symbol: str):
+        with self._lock:
+            coverage = self._symbols.pop(symbol, None)
+            if coverage:
+                for key in coverage.entries:
+                    self._key_symbol.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._symbols.clear()
+            self._key_symbol.clear()
+
+    def _discard(self, key: str):
+        symbol = self._key_symbol.pop(key, None)
+        if symbol is None:
+            return
+        coverage = self._symbols.get(symbol)
+        if coverage and coverage.entries.pop(key, None) is not None:
+            coverage.dirty = True
+            if not coverage.entries:
+                del self._symbols[symbol]
+
+    def _coverage(self, symbol: str, now: float) -> Optional[_SymbolCoverage]:
+        """Up-to-date coverage for a symbol (caller holds the lock)"""
+        coverage = self._symbols.get(symbol)
+        if coverage is None:
+            return None
+        if coverage.next_expiry <= now:
+            expired = [k for k, (_, _, exp) in coverage.entries.items() if exp <= now]
+            for key in expired:
+                coverage.entries.pop(key)
+                self._key_symbol.pop(key, None)
+            coverage.dirty = True
+            if not coverage.entries:
+                del self._symbols[symbol]
+                return None
+        if coverage.dirty:
+            coverage.rebuild()
+        return coverage
+
+    def covering(self, symbol: str, from_date: str, to_date: str, now: Optional[float] = None) -> List[str]:
+        """Keys of live entries overlapping [from_date, to_date], ordered by start"""
+        lo_day, hi_day = _date_ordinal(from_date), _date_ordinal(to_date)
+        now = datetime.now().timestamp() if now is None else now
+        with self._lock:
+            coverage = self._coverage(symbol, now)
+            if coverage is None:
+                return []
+            # Entries [lo, hi) start no later than hi_day and some entry from lo onward reaches lo_day
+            lo = bisect_left(coverage.max_ends, lo_day)
+            hi = bisect_right(coverage.starts, hi_day)
+            return [coverage.keys[i] for i in range(lo, hi) if coverage.ends[i] >= lo_day]
+
+    def gaps(self, symbol: str, from_date: str, to_date: str, now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """Uncovered days of [from_date, to_date] as inclusive ('YYYY-MM-DD', 'YYYY-MM-DD') ranges"""
+        lo_day, hi_day = _date_ordinal(from_date), _date_ordinal(to_date)
+        now = datetime.now().timestamp() if now is None else now
+        with self._lock:
+            coverage = self._coverage(symbol, now)
+            if coverage is None:
+                return [(from_date, to_date)]
+            lo = bisect_left(coverage.merged_ends, lo_day)
+            hi = bisect_right(coverage.merged_starts, hi_day)
+            if lo >= hi:
+                return [(from_date, to_date)]
+
+            gaps = []
+            cursor = lo_day  # first day not yet known to be covered
+            for i in range(lo, hi):
+                if coverage.merged_starts[i] > cursor:
+                    gaps.append((cursor, coverage.merged_starts[i] - 1))
+                cursor = max(cursor, coverage.merged_ends[i] + 1)
+            if cursor <= hi_day:
+                gaps.append((cursor, hi_day))
+        return [(_ordinal_date(a), _ordinal_date(b)) for a, b in gaps]
+
+
 class DataFetchCache:
     """
     Caches raw market data from EODHD API by date range
 
     Features:
     - 30-day cache TTL (default)
-    - 1GB max storage (10-15 symbols)
-    - Per-symbol, per-daterange caching
-    - Store complete date ranges (not individual batches)
+    - 2GB max storage
+    - Per-symbol, per-month columnar partitions (Parquet, zstd)
+    - Column and row pruning on read (only requested columns / date window are decoded)
     - Auto-cleanup after 30 days
     - Cross-session persistence
     """
@@ -32,7 +211,7 @@ class DataFetchCache:
 
         Args:
             cache_dir: Directory to store cache (default: ~/.pipeline_data_cache)
-            max_size_mb: Maximum cache size in MB (default: 2GB = 2048 MB - supports 10-15 symbols)
+            max_size_mb: Maximum cache size in MB (default: 2GB = 2048 MB)
             ttl_hours: Time to live in hours (default: 720 = 30 days)
         """
         # Use user home directory for cache
@@ -41,16 +220,25 @@ class DataFetchCache:
 
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.partition_root = self.cache_dir / PARTITION_DIR
 
         self.max_size_bytes = max_size_mb * 1024 * 1024
         self.ttl_hours = ttl_hours
         self.metadata_file = self.cache_dir / 'cache_metadata.json'
+        self.storage_format = 'parquet' if PARQUET_AVAILABLE else 'pickle'
 
-        logger.info(f"Data cache initialized at {self.cache_dir}")
+        # Guards metadata and read-modify-write of monthly partitions across worker threads
+        self._lock = threading.RLock()
+
+        logger.info(f"Data cache initialized at {self.cache_dir} ({self.storage_format})")
         logger.info(f"Cache settings: Max {max_size_mb}MB ({max_size_mb/1024:.1f}GB), TTL {ttl_hours}h ({ttl_hours/24:.0f} days)")
 
+        # Coverage lookups go through the interval index, not a metadata scan
+        self.coverage_index = CoverageIndex()
+
         self._load_metadata()
         self._cleanup_expired()
+        self._build_index()
 
         # Track which symbols are cached
         self.cached_symbols = {}  # symbol -> {'date_ranges': [(start, end), ...], 'total_rows': int}
@@ -76,7 +264,6 @@ class DataFetchCache:
     def _rebuild_metadata(self):
         """Rebuild metadata from actual cache files"""
         try:
-            import os
             for cache_file in self.cache_dir.glob("*.pkl"):
                 if cache_file.is_file():
                     key = cache_file.stem
@@ -86,6 +273,27 @@ class DataFetchCache:
                         'created_at': datetime.now().isoformat(),
                         'size_bytes': file_size
                     }
+
+            # Each partition covers exactly the minutes it holds
+            if PARQUET_AVAILABLE and self.partition_root.exists():
+                for part_file in self.partition_root.glob("*/*.parquet"):
+                    symbol = part_file.parent.name
+                    dt = pq.read_table(part_file, columns=['datetime']).column('datetime').to_pandas()
+                    if dt.empty:
+                        continue
+                    start_date = dt.min().strftime('%Y-%m-%d')
+                    end_date = dt.max().strftime('%Y-%m-%d')
+                    key = self._get_cache_key(symbol, start_date, end_date)
+                    self.metadata[key] = {
+                        'symbol': symbol,
+                        'start_date': start_date,
+                        'end_date': end_date,
+                        'created_at': datetime.now().isoformat(),
+                        'rows': len(dt),
+                        'size_bytes': part_file.stat().st_size,
+                        'format': 'parquet',
+                        'partitions': [part_file.stem]
+                    }
             logger.info(f"Rebuilt metadata for {len(self.metadata)} cache files")
         except Exception as e:
             logger.warning(f"Failed to rebuild metadata: {e}")
@@ -95,7 +303,7 @@ class DataFetchCache:
         try:
             # Convert all numpy types to native Python types for JSON serialization
             serializable_metadata = {}
-            for key, info in self.metadata.items():
+            for key, info in list(self.metadata.items()):
                 serializable_info = {}
                 for k, v in info.items():
                     # Convert numpy types to Python native types
@@ -112,74 +320,241 @@ class DataFetchCache:
         except Exception as e:
             logger.error(f"Failed to save metadata: {e}")
 
+    def _expires_at(self, info: Dict) -> float:
+        """Expiry timestamp of an entry (entries without created_at never expire)"""
+        if 'created_at' not in info:
+            return float('inf')
+        created = datetime.fromisoformat(info['created_at'])
+        return created.timestamp() + self.ttl_hours * 3600
+
+    def _index_entry(self, key: str, info: Dict):
+        """Add a metadata entry to the coverage index (legacy entries may lack a range)"""
+        symbol, start, end = info.get('symbol'), info.get('start_date'), info.get('end_date')
+        if not (symbol and start and end):
+            return
+        try:
+            self.coverage_index.add(symbol, key, start, end, self._expires_at(info))
+        except ValueError:
+            logger.warning(f"Skipping cache entry {key} with invalid date range {start} -> {end}")
+
+    def _build_index(self):
+        """Build the coverage index from metadata (once, at load)"""
+        for key, info in list(self.metadata.items()):
+            self._index_entry(key, info)
+
     def _get_cache_key(self, symbol: str, start_date: str, end_date: str) -> str:
         """Generate cache key for symbol + date range"""
         key_str = f"{symbol}_{start_date}_{end_date}"
         return hashlib.md5(key_str.encode()).hexdigest()
 
+    # ==================== Partition Storage ====================
+
+    def _partition_path(self, symbol: str, month: str) -> Path:
+        """Path of the monthly partition file for a symbol ('YYYY-MM')"""
+        return self.partition_root / symbol / f"{month}.parquet"
+
+    @staticmethod
+    def _months_between(start_date: str, end_date: str) -> List[str]:
+        """List 'YYYY-MM' partition names spanned by an inclusive date range"""
+        try:
+            periods = pd.period_range(pd.to_datetime(start_date), pd.to_datetime(end_date), freq='M')
+            return [str(p) for p in periods]
+        except Exception:
+            return []
+
+    def _entry_files(self, key: str, info: Dict) -> List[Path]:
+        """Files holding the data of a cache entry"""
+        if info.get('format') == 'parquet':
+            symbol = info.get('symbol', '')
+            return [self._partition_path(symbol, month) for month in info.get('partitions', [])]
+        return [self.cache_dir / f"{key}.pkl"]
+
+    def _write_partitions(self, symbol: str, df: pd.DataFrame) -> Tuple[List[str], int]:
+        """
+        Merge a batch into the symbol's monthly partitions
+
+        Returns:
+            (months written, bytes added on disk)
+        """
+        symbol_dir = self.partition_root / symbol
+        symbol_dir.mkdir(parents=True, exist_ok=True)
+
+        df = df.copy()
+        df['datetime'] = pd.to_datetime(df['datetime'])
+        months = df['datetime'].dt.strftime('%Y-%m')
+
+        written = []
+        bytes_added = 0
+        for month, part in df.groupby(months, sort=True):
+            path = self._partition_path(symbol, month)
+            old_size = 0
+            if path.exists():
+                old_size = path.stat().st_size
+                existing = pq.read_table(path).to_pandas()
+                part = pd.concat([existing, part], ignore_index=True)
+            part = (part.drop_duplicates(subset=['datetime'], keep='last')
+                        .sort_values('datetime')
+                        .reset_index(drop=True))
+
+            table = pa.Table.from_pandas(part, preserve_index=False)
+            tmp_path = path.with_suffix('.parquet.tmp')
+            pq.write_table(table, tmp_path, compression=PARTITION_COMPRESSION)
+            os.replace(tmp_path, path)
+
+            bytes_added += path.stat().st_size - old_size
+            written.append(month)
+
+        return written, max(0, bytes_added)
+
+    def _read_partitions(
+        self,
+        symbol: str,
+        months: List[str],
+        from_dt: pd.Timestamp,
+        to_dt: pd.Timestamp,
+        columns: Optional[List[str]] = None
+    ) -> List[pd.DataFrame]:
+        """Read only the requested columns and date window (``to_dt`` exclusive) from monthly partitions"""
+        if columns is not None:
+            columns = ['datetime'] + [c for c in columns if c != 'datetime']
+
+        filters = [('datetime', '>=', from_dt), ('datetime', '<', to_dt)]
+        frames = []
+        for month in months:
+            path = self._partition_path(symbol, month)
+            if not path.exists():
+                continue
+            try:
+                file_columns = columns
+                if columns is not None:
+                    available = set(pq.read_schema(path).names)
+                    file_columns = [c for c in columns if c in available]
+                table = pq.read_table(path, columns=file_columns, filters=filters)
+                frames.append(table.to_pandas())
+                logger.debug(f"Loaded partition {symbol}/{month} ({table.num_rows:,} rows)")
+            except Exception as e:
+                logger.warning(f"Failed to load partition {symbol}/{month}: {e}")
+        return frames
+
+    def _remove_entries(self, keys: List[str]) -> int:
+        """
+        Drop metadata entries, delete legacy files and unreferenced partitions
+
+        Returns:
+            Bytes freed on disk
+        """
+        freed = 0
+        with self._lock:
+            affected_symbols = set()
+            for key in keys:
+                info = self.metadata.pop(key, None)
+                if info is None:
+                    continue
+                self.coverage_index.remove(key)
+                if info.get('format') == 'parquet':
+                    affected_symbols.add(info.get('symbol', ''))
+                    continue
+                cache_file = self.cache_dir / f"{key}.pkl"
+                if cache_file.exists():
+                    try:
+                        size = cache_file.stat().st_size
+                        cache_file.unlink()
+                        freed += size
+                    except Exception as e:
+                        logger.warning(f"Failed to delete cache {key}: {e}")
+
+            for symbol in affected_symbols:
+                freed += self._gc_partitions(symbol)
+        return freed
+
+    def _gc_partitions(self, symbol: str) -> int:
+        """Delete monthly partitions of a symbol that no live entry references (returns bytes freed)"""
+        symbol_dir = self.partition_root / symbol
+        if not symbol or not symbol_dir.exists():
+            return 0
+
+        live_months = set()
+        for info in list(self.metadata.values()):
+            if info.get('symbol') == symbol and info.get('format') == 'parquet':
+                live_months.update(info.get('partitions', []))
+
+        freed = 0
+        for part_file in symbol_dir.glob("*.parquet"):
+            if part_file.stem not in live_months:
+                try:
+                    size = part_file.stat().st_size
+                    part_file.unlink()
+                    freed += size
+                except Exception as e:
+                    logger.warning(f"Failed to delete partition {symbol}/{part_file.stem}: {e}")
+
+        if not live_months:
+            shutil.rmtree(symbol_dir, ignore_errors=True)
+        return freed
+
+    def _total_size_bytes(self) -> int:
+        """On-disk size of all cached data (partitions + legacy pickles)"""
+        total_size = 0
+        for cache_file in self.cache_dir.glob("*.pkl"):
+            total_size += cache_file.stat().st_size
+        if self.partition_root.exists():
+            for part_file in self.partition_root.glob("*/*.parquet"):
+                total_size += part_file.stat().st_size
+        return total_size
+
+    def _is_expired(self, info: Dict, now: Optional[datetime] = None) -> bool:
+        """Check whether an entry is older than the TTL"""
+        if 'created_at' not in info:
+            return False
+        now = now or datetime.now()
+        created = datetime.fromisoformat(info['created_at'])
+        return (now - created).total_seconds() / 3600 > self.ttl_hours
+
     def _cleanup_expired(self):
         """Remove expired cache entries"""
         now = datetime.now()
-        expired_keys = []
 
         # Create snapshot to avoid "dictionary changed size" error
-        metadata_items = list(self.metadata.items())
-
-        for key, info in metadata_items:
-            if 'created_at' in info:
-                created = datetime.fromisoformat(info['created_at'])
-                age_hours = (now - created).total_seconds() / 3600
-
-                if age_hours > self.ttl_hours:
-                    expired_keys.append(key)
-                    # Delete cache file
-                    cache_file = self.cache_dir / f"{key}.pkl"
-                    if cache_file.exists():
-                        try:
-                            cache_file.unlink()
-                            logger.info(f"Deleted expired cache: {key}")
-                        except Exception as e:
-                            logger.warning(f"Failed to delete expired cache {key}: {e}")
-
-        # Update metadata
-        for key in expired_keys:
-            del self.metadata[key]
+        expired_keys = [
+            key for key, info in list(self.metadata.items())
+            if self._is_expired(info, now)
+        ]
 
         if expired_keys:
+            self._remove_entries(expired_keys)
+            logger.info(f"Deleted {len(expired_keys)} expired cache entries")
             self._save_metadata()
 
     def _check_size_limit(self):
         """Ensure cache doesn't exceed size limit"""
-        # Create copy to avoid "dictionary changed size during iteration" error
-        metadata_keys = list(self.metadata.keys())
-
-        total_size = sum(
-            (self.cache_dir / f"{key}.pkl").stat().st_size
-            for key in metadata_keys
-            if (self.cache_dir / f"{key}.pkl").exists()
-        )
+        total_size = self._total_size_bytes()
 
         if total_size > self.max_size_bytes:
             logger.warning(f"Cache size {total_size / 1024 / 1024:.1f}MB exceeds limit. Cleaning...")
 
-            # Sort by creation time, remove oldest
+            # Sort by creation time, evict oldest first until under budget
             sorted_entries = sorted(
                 list(self.metadata.items()),
-                key=lambda x: x[1].get('created_at', ''),
-                reverse=True
+                key=lambda x: x[1].get('created_at', '')
             )
 
-            for key, _ in sorted_entries[:-5]:  # Keep last 5, delete oldest
-                cache_file = self.cache_dir / f"{key}.pkl"
-                if cache_file.exists():
-                    try:
-                        cache_file.unlink()
-                        del self.metadata[key]
-                    except:
-                        pass
+            # The disk is scanned once; each eviction subtracts what it freed
+            for key, _ in sorted_entries:
+                if total_size <= self.max_size_bytes:
+                    break
+                total_size -= self._remove_entries([key])
 
             self._save_metadata()
 
+    def _load_legacy_entry(self, key: str) -> Optional[pd.DataFrame]:
+        """Load an entry written by the pickle backend"""
+        cache_file = self.cache_dir / f"{key}.pkl"
+        if not cache_file.exists():
+            logger.warning(f"Cache file missing for {key}")
+            return None
+        with open(cache_file, 'rb') as f:
+            return pickle.load(f)
+
     def get(self, symbol: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
         """
         Get cached data if available and not expired
@@ -208,14 +583,22 @@ class DataFetchCache:
             return None
 
         # Load from disk
-        cache_file = self.cache_dir / f"{cache_key}.pkl"
         try:
-            if not cache_file.exists():
-                logger.warning(f"Cache file missing for {cache_key}")
-                return None
-
-            with open(cache_file, 'rb') as f:
-                df = pickle.load(f)
+            if info.get('rows') == 0 and not info.get('partitions'):
+                df = pd.DataFrame()  # range known to have no bars
+            elif info.get('format') == 'parquet':
+                frames = self._read_partitions(
+                    symbol, info.get('partitions', []),
+                    pd.to_datetime(start_date), _day_after(end_date)
+                )
+                if not frames:
+                    logger.warning(f"Cache partitions missing for {cache_key}")
+                    return None
+                df = pd.concat(frames, ignore_index=True).sort_values('datetime').reset_index(drop=True)
+            else:
+                df = self._load_legacy_entry(cache_key)
+                if df is None:
+                    return None
 
             logger.info(f"✓ Cache hit for {symbol}: {len(df):,} rows, {age_hours:.1f}h old")
             return df
@@ -241,7 +624,6 @@ class DataFetchCache:
             return False
 
         cache_key = self._get_cache_key(symbol, start_date, end_date)
-        cache_file = self.cache_dir / f"{cache_key}.pkl"
 
         try:
             # Check size before saving
@@ -250,45 +632,88 @@ class DataFetchCache:
                 logger.warning(f"Skipping cache for {symbol}: {df_size / 1024 / 1024:.1f}MB exceeds limit")
                 return False
 
-            # Save to disk
-            with open(cache_file, 'wb') as f:
-                pickle.dump(df, f)
+            with self._lock:
+                if self.storage_format == 'parquet' and 'datetime' in df.columns:
+                    months, disk_size = self._write_partitions(symbol, df)
+                    entry = {'format': 'parquet', 'partitions': months}
+                else:
+                    cache_file = self.cache_dir / f"{cache_key}.pkl"
+                    with open(cache_file, 'wb') as f:
+                        pickle.dump(df, f)
+                    disk_size = cache_file.stat().st_size
+                    entry = {}
+
+                # Update metadata
+                entry.update({
+                    'symbol': symbol,
+                    'start_date': start_date,
+                    'end_date': end_date,
+                    'created_at': datetime.now().isoformat(),
+                    'rows': len(df),
+                    'size_bytes': int(disk_size)
+                })
+                self.metadata[cache_key] = entry
+                self._index_entry(cache_key, entry)
+
+                self._save_metadata()
+                self._check_size_limit()
+
+            logger.info(f"✓ Cached {symbol}: {len(df):,} rows, {disk_size / 1024 / 1024:.2f}MB on disk "
+                        f"({df_size / 1024 / 1024:.2f}MB in memory)")
+            return True
 
-            # Update metadata
-            self.metadata[cache_key] = {
-                'symbol': symbol,
-                'start_date': start_date,
-                'end_date': end_date,
-                'created_at': datetime.now().isoformat(),
-                'rows': len(df),
-                'size_bytes': df_size
-            }
+        except Exception as e:
+            logger.error(f"Failed to cache {symbol}: {e}")
+            return False
 
-            self._save_metadata()
-            self._check_size_limit()
+    def mark_empty(self, symbol: str, start_date: str, end_date: str) -> bool:
+        """
+        Record that the API has no data for a date range
 
-            logger.info(f"✓ Cached {symbol}: {len(df):,} rows, {df_size / 1024 / 1024:.2f}MB")
-            return True
+        The range counts as covered (so it is not requested again until the
+        entry expires) without writing any partition.
+
+        Args:
+            symbol: Stock symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
 
+        Returns:
+            True if recorded
+        """
+        cache_key = self._get_cache_key(symbol, start_date, end_date)
+        try:
+            with self._lock:
+                entry = {
+                    'format': 'parquet',
+                    'partitions': [],
+                    'symbol': symbol,
+                    'start_date': start_date,
+                    'end_date': end_date,
+                    'created_at': datetime.now().isoformat(),
+                    'rows': 0,
+                    'size_bytes': 0
+                }
+                self.metadata[cache_key] = entry
+                self._index_entry(cache_key, entry)
+                self._save_metadata()
+            logger.info(f"✓ Cached empty range for {symbol} ({start_date} to {end_date})")
+            return True
         except Exception as e:
-            logger.error(f"Failed to cache {symbol}: {e}")
+            logger.error(f"Failed to record empty range for {symbol}: {e}")
             return False
 
     def clear_symbol(self, symbol: str) -> bool:
         """Clear all cache entries for a symbol"""
         keys_to_delete = [
-            key for key, info in self.metadata.items()
+            key for key, info in list(self.metadata.items())
             if info.get('symbol') == symbol
         ]
 
-        for key in keys_to_delete:
-            cache_file = self.cache_dir / f"{key}.pkl"
-            try:
-                if cache_file.exists():
-                    cache_file.unlink()
-                del self.metadata[key]
-            except Exception as e:
-                logger.error(f"Failed to delete cache {key}: {e}")
+        try:
+            self._remove_entries(keys_to_delete)
+        except Exception as e:
+            logger.error(f"Failed to delete cache for {symbol}: {e}")
 
         if keys_to_delete:
             self._save_metadata()
@@ -299,10 +724,13 @@ class DataFetchCache:
     def clear_all(self) -> bool:
         """Clear all cache"""
         try:
-            for file in self.cache_dir.glob("*.pkl"):
-                file.unlink()
-            self.metadata = {}
-            self._save_metadata()
+            with self._lock:
+                for file in self.cache_dir.glob("*.pkl"):
+                    file.unlink()
+                shutil.rmtree(self.partition_root, ignore_errors=True)
+                self.metadata = {}
+                self.coverage_index.clear()
+                self._save_metadata()
             logger.info("Cleared all cache")
             return True
         except Exception as e:
@@ -346,51 +774,46 @@ class DataFetchCache:
             to_date: End date (YYYY-MM-DD)
 
         Returns:
-            List of cache keys that cover this date range
+            List of cache keys that cover this date range, ordered by start date
         """
-        from_dt = datetime.strptime(from_date, '%Y-%m-%d')
-        to_dt = datetime.strptime(to_date, '%Y-%m-%d')
-
-        covering_keys = []
-
-        # Create snapshot to avoid "dictionary changed size" error
-        metadata_items = list(self.metadata.items())
+        return self.coverage_index.covering(symbol, from_date, to_date)
 
-        for key, info in metadata_items:
-            if info.get('symbol') != symbol:
-                continue
-
-            # Check expiration
-            created = datetime.fromisoformat(info.get('created_at', datetime.now().isoformat()))
-            age_hours = (datetime.now() - created).total_seconds() / 3600
-            if age_hours > self.ttl_hours:
-                continue
-
-            # Check if this cache entry overlaps with requested range
-            try:
-                cache_start = datetime.strptime(info.get('start_date', ''), '%Y-%m-%d')
-                cache_end = datetime.strptime(info.get('end_date', ''), '%Y-%m-%d')
-
-                # Check overlap: cache_start <= to_dt AND cache_end >= from_dt
-                if cache_start <= to_dt and cache_end >= from_dt:
-                    covering_keys.append(key)
-            except:
-                pass
+    def get_uncovered_ranges(self, symbol: str, from_date: str, to_date: str) -> List[Tuple[str, str]]:
+        """
+        Get the sub-ranges of a date range that no live cache entry covers
 
-        return sorted(covering_keys)
+        Args:
+            symbol: Stock symbol
+            from_date: Start date (YYYY-MM-DD)
+            to_date: End date (YYYY-MM-DD)
 
-    def get_data_for_date_range(self, symbol: str, from_date: str, to_date: str) -> Optional[pd.DataFrame]:
+        Returns:
+            Inclusive (start_date, end_date) ranges of the missing days in ascending order;
+            empty if fully cached
+        """
+        return self.coverage_index.gaps(symbol, from_date, to_date)
+
+    def get_data_for_date_range(
+        self,
+        symbol: str,
+        from_date: str,
+        to_date: str,
+        columns: Optional[List[str]] = None
+    ) -> Optional[pd.DataFrame]:
         """
         Get cached data for a date range by merging all covering cache entries
-        This is the key method - it loads multiple cached batches and combines them
+        This is the key method - only the partitions overlapping the window are opened,
+        and only the requested columns / rows inside the window are decoded
 
         Args:
             symbol: Stock symbol
             from_date: Start date (YYYY-MM-DD)
             to_date: End date (YYYY-MM-DD)
+            columns: Optional subset of columns to load ('datetime' is always included)
 
         Returns:
-            Combined DataFrame if any cached data covers the range, None otherwise
+            Combined DataFrame if any cached data covers the range (empty if the
+            range is covered only by entries known to have no bars), None otherwise
         """
         covering_keys = self.get_covering_cache_entries(symbol, from_date, to_date)
 
@@ -398,33 +821,57 @@ class DataFetchCache:
             logger.debug(f"No cached entries cover {symbol} {from_date} to {to_date}")
             return None
 
-        # Load all covering cache entries
+        # End dates are whole days: bars up to (excluding) the following midnight
+        from_dt = pd.to_datetime(from_date)
+        to_dt = _day_after(to_date)
+
         all_dfs = []
+        covered_ranges = []
+        months = set()
+        expects_rows = False
         for key in covering_keys:
-            cache_file = self.cache_dir / f"{key}.pkl"
+            info = self.metadata.get(key)
+            if info is None:
+                continue
+            expects_rows = expects_rows or info.get('rows') != 0
+            if info.get('format') == 'parquet':
+                months.update(info.get('partitions', []))
+                covered_ranges.append((pd.to_datetime(info['start_date']), _day_after(info['end_date'])))
+                continue
+            # Legacy pickle entry: must be loaded in full
             try:
-                if cache_file.exists():
-                    with open(cache_file, 'rb') as f:
-                        df = pickle.load(f)
+                df = self._load_legacy_entry(key)
+                if df is not None:
+                    if columns is not None:
+                        df = df[[c for c in ['datetime'] + list(columns) if c in df.columns]]
                     all_dfs.append(df)
                     logger.debug(f"Loaded cache batch: {key} ({len(df):,} rows)")
             except Exception as e:
                 logger.warning(f"Failed to load cache batch {key}: {e}")
 
+        if months:
+            # Only months inside the requested window need to be opened
+            wanted = set(self._months_between(from_date, to_date))
+            frames = self._read_partitions(symbol, sorted(months & wanted), from_dt, to_dt, columns)
+            if frames:
+                part_df = pd.concat(frames, ignore_index=True)
+                # Partitions are shared across entries; keep rows from live coverage only
+                in_coverage = pd.Series(False, index=part_df.index)
+                for start, end in covered_ranges:
+                    in_coverage |= (part_df['datetime'] >= start) & (part_df['datetime'] < end)
+                all_dfs.append(part_df[in_coverage])
+
         if not all_dfs:
-            return None
+            return None if expects_rows else pd.DataFrame()
 
         # Combine all batches
-        import pandas as pd
         combined_df = pd.concat(all_dfs, ignore_index=True)
 
         # Filter to requested date range
         if 'datetime' in combined_df.columns:
-            from_dt = pd.to_datetime(from_date)
-            to_dt = pd.to_datetime(to_date)
             combined_df = combined_df[
                 (combined_df['datetime'] >= from_dt) &
-                (combined_df['datetime'] <= to_dt)
+                (combined_df['datetime'] < to_dt)
             ]
 
         # Remove duplicates and sort
@@ -445,58 +892,19 @@ class DataFetchCache:
         Returns:
             True if covered by cache, False otherwise
         """
-        covering_keys = self.get_covering_cache_entries(symbol, from_date, to_date)
-
-        if not covering_keys:
-            return False
-
-        # Check if we have continuous coverage
-        from_dt = datetime.strptime(from_date, '%Y-%m-%d')
-        to_dt = datetime.strptime(to_date, '%Y-%m-%d')
-
-        # Get coverage info
-        coverage_ranges = []
-        for key in covering_keys:
-            info = self.metadata[key]
-            try:
-                start = datetime.strptime(info.get('start_date', ''), '%Y-%m-%d')
-                end = datetime.strptime(info.get('end_date', ''), '%Y-%m-%d')
-                coverage_ranges.append((start, end))
-            except:
-                pass
-
-        # Sort coverage ranges
-        coverage_ranges.sort()
-
-        # Check if we have complete coverage
-        current_coverage = from_dt
-        for start, end in coverage_ranges:
-            if start > current_coverage:
-                # Gap in coverage
-                return False
-            current_coverage = max(current_coverage, end)
-            if current_coverage >= to_dt:
-                return True
-
-        return current_coverage >= to_dt
+        return not self.get_uncovered_ranges(symbol, from_date, to_date)
 
     def get_stats(self) -> Dict:
         """Get cache statistics"""
-        # Create copy to avoid "dictionary changed size during iteration" error
-        metadata_keys = list(self.metadata.keys())
-
-        total_size = 0
-        for key in metadata_keys:
-            cache_file = self.cache_dir / f"{key}.pkl"
-            if cache_file.exists():
-                total_size += cache_file.stat().st_size
+        total_size = self._total_size_bytes()
 
         return {
             'entries': len(self.metadata),
             'total_size_mb': round(total_size / 1024 / 1024, 2),
             'max_size_mb': self.max_size_bytes / 1024 / 1024,
             'usage_percent': round((total_size / self.max_size_bytes) * 100, 1),
-            'cache_dir': str(self.cache_dir)
+            'cache_dir': str(self.cache_dir),
+            'storage_format': self.storage_format
         }
 
 
@@ -510,4 +918,3 @@ def get_data_cache() -> DataFetchCache:
     if _cache_instance is None:
         _cache_instance = DataFetchCache()
     return _cache_instance
-
@@ -7,6 +7,8 @@ from datetime import datetime, timedelta
 from typing import Dict, Optional, Tuple
 from loguru import logger
 
+from utils.mergeable_stats import StatisticalSketches
+
 
 class IncrementalUpdateStrategy:
     """
@@ -80,34 +82,50 @@ class IncrementalUpdateStrategy:
             # Copy new features as base
             merged_features.update(new_features)
 
-            # Preserve important historical aggregates
-            if 'statistical_features' in current_profile:
-                old_stat_features = current_profile['statistical_features']
-                new_stat_features = new_features.get('statistical_features', {})
-
-                # Update statistics that can be incrementally computed
-                preserved_stats = {}
-
-                # Price statistics - update with new values
-                if 'price_min' in old_stat_features and 'price_min' in new_stat_features:
-                    preserved_stats['price_min'] = min(
-                        old_stat_features['price_min'],
-                        new_stat_features['price_min']
-                    )
-
-                if 'price_max' in old_stat_features and 'price_max' in new_stat_features:
-                    preserved_stats['price_max'] = max(
-                        old_stat_features['price_max'],
-                        new_stat_features['price_max']
-                    )
-
-                # Volatility - keep historical as it's more stable
-                if 'returns_std' in old_stat_features:
-                    preserved_stats['returns_std_historical'] = old_stat_features['returns_std']
-
-                # Merge preserved stats
-                if 'statistical_features' in merged_features:
-                    merged_features['statistical_features'].update(preserved_stats)
+            # Full-history statistics: fold the new bars' sketches into the stored ones (O(1))
+            old_sketches = StatisticalSketches.from_dict(current_profile.get('statistical_sketches'))
+            new_sketches = new_features.get('statistical_sketches')
+            if old_sketches is not None and new_sketches is not None:
+                merged_sketches = old_sketches.merge(new_sketches)
+                merged_features['statistical_sketches'] = merged_sketches
+                merged_features['statistical_features'] = {
+                    **new_features.get('statistical_features', {}),
+                    **merged_sketches.features()
+                }
+                merged_features['risk_metrics'] = merged_sketches.risk_metrics()
+            else:
+                # Sketches of the new bars alone do not describe the full history: keep the
+                # stored ones (if any); a profile without them is only seeded by a full backfill
+                merged_features['statistical_sketches'] = old_sketches
+
+                # Without stored sketches, preserve what can be merged from the old aggregates
+                if 'statistical_features' in current_profile:
+                    old_stat_features = current_profile['statistical_features']
+                    new_stat_features = new_features.get('statistical_features', {})
+
+                    # Update statistics that can be incrementally computed
+                    preserved_stats = {}
+
+                    # Price statistics - update with new values
+                    if 'price_min' in old_stat_features and 'price_min' in new_stat_features:
+                        preserved_stats['price_min'] = min(
+                            old_stat_features['price_min'],
+                            new_stat_features['price_min']
+                        )
+
+                    if 'price_max' in old_stat_features and 'price_max' in new_stat_features:
+                        preserved_stats['price_max'] = max(
+                            old_stat_features['price_max'],
+                            new_stat_features['price_max']
+                        )
+
+                    # Volatility - keep historical as it's more stable
+                    if 'returns_std' in old_stat_features:
+                        preserved_stats['returns_std_historical'] = old_stat_features['returns_std']
+
+                    # Merge preserved stats
+                    if 'statistical_features' in merged_features:
+                        merged_features['statistical_features'].update(preserved_stats)
 
             # Preserve technical indicators (latest values from new features)
             if 'technical_indicators' in new_features:
@@ -117,7 +135,7 @@ class IncrementalUpdateStrategy:
             if 'data_date_range' in current_profile and 'summary' in new_features:
                 merged_features['cumulative_data_range'] = {
                     'first_point': current_profile['data_date_range'].get('start'),
-                    'last_point': new_features.get('summary', {}).get('last_datetime'),
+                    'last_point': new_features.get('summary', {}).get('date_range', {}).get('end'),
                     'total_points': (
                         current_profile.get('data_points_count', 0) +
                         new_features.get('summary', {}).get('total_records', 0)
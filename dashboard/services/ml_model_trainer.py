@@ -23,14 +23,16 @@ class MLModelTrainer:
     Creates both regression (price prediction) and classification (direction prediction) models
     """
 
-    def __init__(self, progress_callback=None):
+    def __init__(self, progress_callback=None, n_jobs: int = -1):
         """
         Initialize model trainer
 
         Args:
             progress_callback: Optional callback function(stage: str, progress: int) for progress updates
+            n_jobs: Parallel jobs for the random forests (-1 = all cores)
         """
         self.progress_callback = progress_callback
+        self.n_jobs = n_jobs
         self.models = {}
         self.scalers = {}
         self.metrics = {}
@@ -143,7 +145,7 @@ class MLModelTrainer:
                     n_estimators=50,
                     max_depth=10,
                     random_state=42,
-                    n_jobs=-1
+                    n_jobs=self.n_jobs
                 )
                 # Use features from entire dataset for training
                 rf_reg.fit(X, y_regression)
@@ -173,7 +175,7 @@ class MLModelTrainer:
                     n_estimators=50,
                     max_depth=10,
                     random_state=42,
-                    n_jobs=-1
+                    n_jobs=self.n_jobs
                 )
                 rf_clf.fit(X, y_classification)
 
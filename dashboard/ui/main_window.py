@@ -17,6 +17,7 @@ from dashboard.ui.panels.settings_panel import SettingsPanel
 from dashboard.ui.panels.visualization_panel import VisualizationPanel
 from dashboard.ui.widgets.cache_manager_widget import CacheManagerWidget
 from dashboard.controllers.pipeline_controller import PipelineController
+from dashboard.utils.signal_hub import SignalHub
 from dashboard.services.email_alert import EmailAlerter
 from typing import List, Dict, Optional
 
@@ -32,6 +33,7 @@ class MainWindow(QMainWindow):
 
         self.cache_store = cache_store
         self.pipeline_controller: Optional[PipelineController] = None
+        self.signal_hub: Optional[SignalHub] = None
 
         self.setWindowTitle("Minute Data Pipeline Control Dashboard")
         self.setGeometry(100, 100, 1400, 900)
@@ -182,52 +184,59 @@ class MainWindow(QMainWindow):
         # Create pipeline controller
         self.pipeline_controller = PipelineController(symbols, settings)
 
+        # Worker signals reach the UI through the hub, coalesced once per frame
+        if self.signal_hub:
+            self.signal_hub.close()
+            self.signal_hub.deleteLater()
+        self.signal_hub = SignalHub(self.pipeline_controller.signals, parent=self)
+        signals = self.signal_hub.signals
+
         # Connect signals
-        self.pipeline_controller.signals.symbol_started.connect(
+        signals.symbol_started.connect(
             lambda symbol: self.monitor_panel.append_log('INFO', f'Starting {symbol}')
         )
 
-        self.pipeline_controller.signals.symbol_progress.connect(
-            self.monitor_panel.update_progress
+        self.signal_hub.progress_batch.connect(
+            self.monitor_panel.update_progress_batch
         )
 
-        self.pipeline_controller.signals.symbol_completed.connect(
+        signals.symbol_completed.connect(
             self.monitor_panel.mark_completed
         )
 
-        self.pipeline_controller.signals.symbol_failed.connect(
+        signals.symbol_failed.connect(
             self.monitor_panel.mark_failed
         )
 
-        self.pipeline_controller.signals.symbol_skipped.connect(
+        signals.symbol_skipped.connect(
             self.monitor_panel.mark_skipped
         )
 
-        self.pipeline_controller.signals.api_stats_updated.connect(
+        signals.api_stats_updated.connect(
             self.monitor_panel.update_api_stats
         )
 
-        self.pipeline_controller.signals.metrics_updated.connect(
+        signals.metrics_updated.connect(
             self.monitor_panel.on_metrics_updated
         )
 
-        self.pipeline_controller.signals.eta_updated.connect(
+        signals.eta_updated.connect(
             self.monitor_panel.update_eta
         )
 
-        self.pipeline_controller.signals.log_message.connect(
-            self._on_log_message
+        self.signal_hub.log_batch.connect(
+            self._on_log_batch
         )
 
-        self.pipeline_controller.signals.pipeline_completed.connect(
+        signals.pipeline_completed.connect(
             self._on_pipeline_completed
         )
 
-        self.pipeline_controller.signals.pipeline_stopped.connect(
+        signals.pipeline_stopped.connect(
             self._on_pipeline_stopped
         )
 
-        self.pipeline_controller.signals.pipeline_cleared.connect(
+        signals.pipeline_cleared.connect(
             lambda: self.status_bar.showMessage('Pipeline cleared')
         )
 
@@ -282,6 +291,8 @@ class MainWindow(QMainWindow):
         if self.pipeline_controller and self.pipeline_controller.isRunning():
             self.pipeline_controller.clear()
             self.pipeline_controller.wait()
+        if self.signal_hub:
+            self.signal_hub.clear()
         self.monitor_panel.clear()
         self.control_panel.reset()
         try:
@@ -329,16 +340,17 @@ class MainWindow(QMainWindow):
         self.status_bar.showMessage("Settings updated", 3000)
         self.email_alerter.update_config(self.settings_panel.get_email_settings())
 
-    @pyqtSlot(str, str)
-    def _on_log_message(self, level: str, message: str):
-        """Forward log to monitor and trigger email alerts if configured."""
-        self.monitor_panel.append_log(level, message)
-        if level in ('ERROR','CRITICAL'):
-            self.email_alerter.send_alert(
-                subject=f"Pipeline {level} Alert",
-                message=message,
-                window=self
-            )
+    @pyqtSlot(list)
+    def _on_log_batch(self, records: List[tuple]):
+        """Forward a frame of logs to monitor and trigger email alerts if configured."""
+        self.monitor_panel.append_logs(records)
+        for level, message in records:
+            if level in ('ERROR','CRITICAL'):
+                self.email_alerter.send_alert(
+                    subject=f"Pipeline {level} Alert",
+                    message=message,
+                    window=self
+                )
 
     def _refresh_profiles(self):
         """Refresh profile browser"""
@@ -404,6 +416,11 @@ class MainWindow(QMainWindow):
         else:
             event.accept()
 
+        if event.isAccepted():
+            # Stop background health checks and drop queued database queries
+            self.profile_browser.db_controller.close()
+            self.visualization_panel.db_controller.close()
+
     # ==================== PER-SYMBOL CONTROL HANDLERS ====================
 
     @pyqtSlot(str)
@@ -7,7 +7,7 @@ from PyQt6.QtCore import pyqtSlot, Qt
 from dashboard.ui.widgets.symbol_queue_table import SymbolQueueTable
 from dashboard.ui.widgets.log_viewer import LogViewer
 from dashboard.ui.widgets.api_usage_widget import APIUsageWidget
-from typing import Dict
+from typing import Dict, List
 import time
 
 
@@ -71,6 +71,12 @@ class MonitorPanel(QWidget):
         self.eta_label.setStyleSheet("font-weight: bold; color: #007acc; font-size: 11px;")
         metrics_layout.addWidget(self.eta_label)
 
+        # Per-stage queue depth (queued / in progress)
+        self.stages_label = QLabel("Stages: --")
+        self.stages_label.setStyleSheet("color: #888; font-size: 11px;")
+        self.stages_label.setToolTip("Symbols waiting / in progress per pipeline stage")
+        metrics_layout.addWidget(self.stages_label)
+
         metrics_layout.addStretch()
 
         # API usage indicator
@@ -167,6 +173,22 @@ class MonitorPanel(QWidget):
             # Silently handle errors to prevent crashes
             print(f"Error updating progress for {symbol}: {e}")
 
+    @pyqtSlot(list)
+    def update_progress_batch(self, updates: List[tuple]):
+        """
+        Apply a frame of progress updates with a single repaint
+
+        Args:
+            updates: update_progress argument tuples (latest per symbol)
+        """
+        table = self.queue_table.table
+        table.setUpdatesEnabled(False)
+        try:
+            for update in updates:
+                self.update_progress(*update)
+        finally:
+            table.setUpdatesEnabled(True)
+
     @pyqtSlot(str, dict)
     def mark_completed(self, symbol: str, profile: Dict):
         """
@@ -262,6 +284,16 @@ class MonitorPanel(QWidget):
         """
         self.log_viewer.append_log(level, message)
 
+    @pyqtSlot(list)
+    def append_logs(self, records: List[tuple]):
+        """
+        Append a batch of log messages
+
+        Args:
+            records: (level, message) tuples
+        """
+        self.log_viewer.append_logs(records)
+
     @pyqtSlot(int)
     def update_eta(self, seconds: int):
         """
@@ -336,6 +368,13 @@ class MonitorPanel(QWidget):
         # Update ETA label
         self.eta_label.setText(f"⏱ ETA: {eta_string}")
 
+        # Update per-stage queue depth
+        stage_queues = metrics.get('stage_queues')
+        if stage_queues:
+            self.stages_label.setText('Stages: ' + ' › '.join(
+                f"{name} {depth['queued']}/{depth['active']}" for name, depth in stage_queues.items()
+            ))
+
         # Update total label with progress
         self.total_label.setText(f"Progress: {progress_pct}%")
 
@@ -386,3 +425,4 @@ class MonitorPanel(QWidget):
 
         self._update_stats_display()
         self.eta_label.setText("⏱ ETA: --")
+        self.stages_label.setText("Stages: --")
@@ -5,17 +5,64 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableWidget,
-                              QTableWidgetItem, QLineEdit, QPushButton, QComboBox,
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTableView,
+                              QLineEdit, QPushButton, QComboBox,
                               QLabel, QMessageBox, QHeaderView, QAbstractItemView,
                               QFileDialog)
-from PyQt6.QtCore import pyqtSlot, Qt
+from PyQt6.QtCore import pyqtSlot, Qt, QTimer
 from typing import List, Dict, Optional
 import json
+import re
 
 from dashboard.controllers.database_controller import DatabaseController
+from dashboard.models.table_models import Column, PagedTableModel, sort_filter_proxy
 from dashboard.ui.widgets.profile_editor import ProfileEditor
 
+_ASC, _DESC = Qt.SortOrder.AscendingOrder, Qt.SortOrder.DescendingOrder
+
+# Sort option -> (table column, order, server-side sort of the pages)
+SORT_OPTIONS = {
+    'Last Updated (Newest)': (4, _DESC, [('last_updated', -1)]),
+    'Last Updated (Oldest)': (4, _ASC, [('last_updated', 1)]),
+    'Symbol (A-Z)': (0, _ASC, [('symbol', 1)]),
+    'Symbol (Z-A)': (0, _DESC, [('symbol', -1)]),
+    'Data Points (Most)': (2, _DESC, [('data_points_count', -1)]),
+    'Data Points (Least)': (2, _ASC, [('data_points_count', 1)]),
+}
+
+
+def _date_text(value) -> str:
+    """Date part of a string or datetime"""
+    if isinstance(value, str):
+        return value[:10]
+    if hasattr(value, 'strftime'):
+        return value.strftime('%Y-%m-%d')
+    return 'N/A' if value is None else str(value)
+
+
+def _date_range_text(profile: Dict) -> str:
+    date_range = profile.get('data_date_range') or {}
+    return f"{_date_text(date_range.get('start', 'N/A'))} to {_date_text(date_range.get('end', 'N/A'))}"
+
+
+def _last_updated_text(profile: Dict) -> str:
+    last_updated = profile.get('last_updated', 'N/A')
+    if isinstance(last_updated, str):
+        return last_updated[:19]  # Truncate to datetime part
+    if hasattr(last_updated, 'strftime'):
+        return last_updated.strftime('%Y-%m-%d %H:%M:%S')
+    return str(last_updated)
+
+
+PROFILE_COLUMNS = [
+    Column('Symbol', lambda p: p.get('symbol', 'N/A'), alignment=Qt.AlignmentFlag.AlignCenter),
+    Column('Exchange', lambda p: p.get('exchange', 'US'), alignment=Qt.AlignmentFlag.AlignCenter),
+    Column('Data Points', lambda p: int(p.get('data_points_count') or 0), display=lambda v: f"{v:,}",
+           alignment=Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter),
+    Column('Date Range', _date_range_text),
+    Column('Last Updated', _last_updated_text),
+]
+
 
 class ProfileBrowser(QWidget):
     """
@@ -26,8 +73,17 @@ class ProfileBrowser(QWidget):
         super().__init__(parent)
 
         self.db_controller = DatabaseController()
-        self.all_profiles = []
-        self.filtered_profiles = []
+        # Profile summaries are paged in from the database as the table scrolls
+        self.model = PagedTableModel(PROFILE_COLUMNS, self._fetch_page, parent=self, asynchronous=True)
+        self.proxy = sort_filter_proxy(self.model, parent=self)
+        self.server_query = None  # Server-side symbol search
+        self.total_profiles = 0
+
+        # Typing filters the loaded rows at once and queries the database when it pauses
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self._search_profiles)
 
         self.init_ui()
         self._load_profiles()
@@ -72,11 +128,9 @@ class ProfileBrowser(QWidget):
         layout.addWidget(self.status_label)
 
         # Profiles table
-        self.table = QTableWidget()
-        self.table.setColumnCount(5)
-        self.table.setHorizontalHeaderLabels([
-            'Symbol', 'Exchange', 'Data Points', 'Date Range', 'Last Updated'
-        ])
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.verticalHeader().setVisible(False)
 
         # Table settings
         self.table.setAlternatingRowColors(True)
@@ -135,6 +189,10 @@ class ProfileBrowser(QWidget):
 
         self.setLayout(layout)
 
+        self.model.rowsInserted.connect(self._update_stats)
+        self.model.modelReset.connect(self._update_stats)
+        self.proxy.layoutChanged.connect(self._update_stats)
+
         # Connect database signals
         self.db_controller.signals.connection_status.connect(self._on_connection_status)
         self.db_controller.signals.profiles_loaded.connect(self._on_profiles_loaded)
@@ -142,145 +200,98 @@ class ProfileBrowser(QWidget):
         self.db_controller.signals.database_error.connect(self._on_database_error)
 
     def _load_profiles(self):
-        """Load all profiles from database"""
-        self.all_profiles = self.db_controller.load_all_profiles()
-        self.filtered_profiles = self.all_profiles.copy()
-        self._populate_table()
-
-    def _populate_table(self):
-        """Populate table with profiles"""
-        self.table.setRowCount(0)
-
-        for profile in self.filtered_profiles:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-
-            # Symbol
-            symbol_item = QTableWidgetItem(profile.get('symbol', 'N/A'))
-            symbol_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 0, symbol_item)
-
-            # Exchange
-            exchange_item = QTableWidgetItem(profile.get('exchange', 'US'))
-            exchange_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
-            self.table.setItem(row, 1, exchange_item)
-
-            # Data Points
-            data_points = profile.get('data_points_count', 0)
-            data_points_item = QTableWidgetItem(f"{data_points:,}")
-            data_points_item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            self.table.setItem(row, 2, data_points_item)
-
-            # Date Range
-            date_range = profile.get('data_date_range', {})
-            start = date_range.get('start', 'N/A')
-            end = date_range.get('end', 'N/A')
-
-            # Handle string vs datetime for start/end
-            if isinstance(start, str):
-                start = start[:10]
-            elif hasattr(start, 'strftime'):
-                start = start.strftime('%Y-%m-%d')
-
-            if isinstance(end, str):
-                end = end[:10]
-            elif hasattr(end, 'strftime'):
-                end = end.strftime('%Y-%m-%d')
-
-            date_range_item = QTableWidgetItem(f"{start} to {end}")
-            self.table.setItem(row, 3, date_range_item)
-
-            # Last Updated
-            last_updated = profile.get('last_updated', 'N/A')
-
-            # Handle datetime object or string
-            if isinstance(last_updated, str):
-                last_updated_str = last_updated[:19]  # Truncate to datetime part
-            elif hasattr(last_updated, 'strftime'):
-                # It's a datetime object
-                last_updated_str = last_updated.strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                last_updated_str = str(last_updated)
-
-            last_updated_item = QTableWidgetItem(last_updated_str)
-            self.table.setItem(row, 4, last_updated_item)
-
-        self.stats_label.setText(f"Loaded {len(self.filtered_profiles)} profiles")
+        """Load the first page of profiles from database (more pages load on scroll)"""
+        column, order, _ = SORT_OPTIONS[self.sort_combo.currentText()]
+        query = self.server_query
+        self.db_controller.submit('count_profiles', query,
+                                  callback=lambda count: self._on_profiles_counted(query, count))
+        self.model.reset()
+        self.table.sortByColumn(column, order)
+
+    def _on_profiles_counted(self, query: Optional[Dict], count: int):
+        if query == self.server_query:
+            self.total_profiles = count
+            self._update_stats()
+
+    def _fetch_page(self, skip: int, limit: int, deliver):
+        """Page source of the table model (queried in the background)"""
+        _, _, sort = SORT_OPTIONS[self.sort_combo.currentText()]
+        def on_page(page: List[Dict]):
+            deliver(page)
+            self._update_stats()
+
+        self.db_controller.submit('load_profile_page', skip, limit, sort=sort, query=self.server_query,
+                                  callback=on_page)
+        self._update_stats()
+
+    def _update_stats(self, *args):
+        """Show loaded / total profile counts"""
+        shown, loaded = self.proxy.rowCount(), self.model.rowCount()
+        text = f"Loaded {loaded} of {self.total_profiles} profiles"
+        if shown != loaded:
+            text += f" ({shown} shown)"
+        if self.model.loading:
+            text += " - loading..."
+        self.stats_label.setText(text)
 
     def _on_search_changed(self, text: str):
         """Handle search text change"""
-        if not text:
-            self.filtered_profiles = self.all_profiles.copy()
-        else:
-            text_upper = text.upper()
-            self.filtered_profiles = [
-                p for p in self.all_profiles
-                if text_upper in p.get('symbol', '').upper()
-            ]
-
-        self._populate_table()
+        self.proxy.setFilterFixedString(text)
+        self._update_stats()
+        self.search_timer.start()
 
     def _search_profiles(self):
-        """Execute search"""
+        """Execute search (an empty query lists all profiles again)"""
+        self.search_timer.stop()
         query = self.search_input.text().strip()
+        server_query = {'symbol': {'$regex': re.escape(query), '$options': 'i'}} if query else None
 
-        if query:
-            self.filtered_profiles = self.db_controller.search_profiles(query)
-            self._populate_table()
+        if server_query != self.server_query:
+            self.server_query = server_query
+            self._load_profiles()
 
     def _on_sort_changed(self, sort_option: str):
-        """Handle sort change"""
-        if 'Last Updated (Newest)' in sort_option:
-            self.filtered_profiles.sort(key=lambda p: p.get('last_updated', ''), reverse=True)
-        elif 'Last Updated (Oldest)' in sort_option:
-            self.filtered_profiles.sort(key=lambda p: p.get('last_updated', ''))
-        elif 'Symbol (A-Z)' in sort_option:
-            self.filtered_profiles.sort(key=lambda p: p.get('symbol', ''))
-        elif 'Symbol (Z-A)' in sort_option:
-            self.filtered_profiles.sort(key=lambda p: p.get('symbol', ''), reverse=True)
-        elif 'Data Points (Most)' in sort_option:
-            self.filtered_profiles.sort(key=lambda p: p.get('data_points_count', 0), reverse=True)
-        elif 'Data Points (Least)' in sort_option:
-            self.filtered_profiles.sort(key=lambda p: p.get('data_points_count', 0))
-
-        self._populate_table()
+        """Handle sort change (pages are re-queried in the new order)"""
+        self._load_profiles()
 
     def _get_selected_symbol(self) -> Optional[str]:
         """Get currently selected symbol"""
-        current_row = self.table.currentRow()
+        index = self.table.currentIndex()
 
-        if current_row < 0:
+        if not index.isValid():
             QMessageBox.warning(self, "No Selection", "Please select a profile")
             return None
 
-        symbol_item = self.table.item(current_row, 0)
-        return symbol_item.text() if symbol_item else None
+        return self.model.row_data(self.proxy.mapToSource(index).row()).get('symbol')
 
     def _view_profile(self):
-        """View selected profile"""
+        """View selected profile (opened once it has been loaded in the background)"""
         symbol = self._get_selected_symbol()
 
         if symbol:
-            try:
-                profile = self.db_controller.get_profile(symbol)
-
-                if profile:
-                    # Show in editor (read-only mode could be added)
-                    editor = ProfileEditor(symbol, profile, self)
-                    editor.profile_updated.connect(self._on_profile_updated)
-                    editor.exec()
-                else:
-                    QMessageBox.warning(
-                        self,
-                        "Profile Not Found",
-                        f"Profile for {symbol} could not be loaded.\n\nIt may have been deleted or the database connection failed."
-                    )
-            except Exception as e:
-                QMessageBox.critical(
+            self.db_controller.submit('get_profile', symbol,
+                                      callback=lambda profile: self._show_profile(symbol, profile))
+
+    def _show_profile(self, symbol: str, profile: Optional[Dict]):
+        """Open a loaded profile in the editor"""
+        try:
+            if profile:
+                # Show in editor (read-only mode could be added)
+                editor = ProfileEditor(symbol, profile, self)
+                editor.profile_updated.connect(self._on_profile_updated)
+                editor.exec()
+            else:
+                QMessageBox.warning(
                     self,
-                    "Error Loading Profile",
-                    f"Failed to load profile for {symbol}:\n\n{str(e)}\n\nTry refreshing the profiles list."
+                    "Profile Not Found",
+                    f"Profile for {symbol} could not be loaded.\n\nIt may have been deleted or the database connection failed."
                 )
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "Error Loading Profile",
+                f"Failed to load profile for {symbol}:\n\n{str(e)}\n\nTry refreshing the profiles list."
+            )
 
     def _edit_profile(self):
         """Edit selected profile"""
@@ -300,8 +311,8 @@ class ProfileBrowser(QWidget):
                 )
 
                 if reply == QMessageBox.StandardButton.Yes:
-                    self.db_controller.delete_profile(symbol)
-                    self._refresh_profiles()
+                    # profile_deleted refreshes the list once the delete went through
+                    self.db_controller.submit('delete_profile', symbol)
             except Exception as e:
                 QMessageBox.critical(
                     self,
@@ -310,60 +321,63 @@ class ProfileBrowser(QWidget):
                 )
 
     def _export_profile(self):
-        """Export selected profile to JSON"""
+        """Export selected profile to JSON (once it has been loaded in the background)"""
         symbol = self._get_selected_symbol()
 
         if symbol:
-            try:
-                profile = self.db_controller.get_profile(symbol)
-
-                if profile:
-                    file_path, _ = QFileDialog.getSaveFileName(
-                        self,
-                        "Export Profile",
-                        f"{symbol}_profile.json",
-                        "JSON Files (*.json)"
-                    )
-
-                    if file_path:
-                        try:
-                            # Convert datetime objects to strings for JSON serialization
-                            import json
-                            from datetime import datetime
-
-                            def json_serial(obj):
-                                """JSON serializer for objects not serializable by default json code"""
-                                if isinstance(obj, datetime):
-                                    return obj.isoformat()
-                                raise TypeError(f"Type {type(obj)} not serializable")
-
-                            with open(file_path, 'w') as f:
-                                json.dump(profile, f, indent=2, default=json_serial)
-
-                            QMessageBox.information(
-                                self,
-                                "Success",
-                                f"Profile exported to:\n{file_path}"
-                            )
-                        except Exception as e:
-                            QMessageBox.critical(
-                                self,
-                                "Export Failed",
-                                f"Failed to export profile:\n{str(e)}"
-                            )
-                else:
-                    QMessageBox.warning(
-                        self,
-                        "Profile Not Found",
-                        f"Profile for {symbol} could not be loaded."
-                    )
-            except Exception as e:
-                QMessageBox.critical(
+            self.db_controller.submit('get_profile', symbol,
+                                      callback=lambda profile: self._save_profile_json(symbol, profile))
+
+    def _save_profile_json(self, symbol: str, profile: Optional[Dict]):
+        """Write a loaded profile to a JSON file chosen by the user"""
+        try:
+            if profile:
+                file_path, _ = QFileDialog.getSaveFileName(
                     self,
-                    "Error Loading Profile",
-                    f"Failed to load profile for export:\n\n{str(e)}"
+                    "Export Profile",
+                    f"{symbol}_profile.json",
+                    "JSON Files (*.json)"
                 )
 
+                if file_path:
+                    try:
+                        # Convert datetime objects to strings for JSON serialization
+                        import json
+                        from datetime import datetime
+
+                        def json_serial(obj):
+                            """JSON serializer for objects not serializable by default json code"""
+                            if isinstance(obj, datetime):
+                                return obj.isoformat()
+                            raise TypeError(f"Type {type(obj)} not serializable")
+
+                        with open(file_path, 'w') as f:
+                            json.dump(profile, f, indent=2, default=json_serial)
+
+                        QMessageBox.information(
+                            self,
+                            "Success",
+                            f"Profile exported to:\n{file_path}"
+                        )
+                    except Exception as e:
+                        QMessageBox.critical(
+                            self,
+                            "Export Failed",
+                            f"Failed to export profile:\n{str(e)}"
+                        )
+            else:
+                QMessageBox.warning(
+                    self,
+                    "Profile Not Found",
+                    f"Profile for {symbol} could not be loaded."
+                )
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "Error Loading Profile",
+                f"Failed to load profile for export:\n\n{str(e)}"
+            )
+
     def _refresh_profiles(self):
         """Refresh profiles from database"""
         self.db_controller.invalidate_cache()
@@ -382,9 +396,7 @@ class ProfileBrowser(QWidget):
     @pyqtSlot(list)
     def _on_profiles_loaded(self, profiles: List[Dict]):
         """Handle profiles loaded"""
-        self.all_profiles = profiles
-        self.filtered_profiles = profiles.copy()
-        self._populate_table()
+        self._load_profiles()
 
     @pyqtSlot(str)
     def _on_profile_deleted(self, symbol: str):
@@ -400,8 +412,7 @@ class ProfileBrowser(QWidget):
     @pyqtSlot(str, dict)
     def _on_profile_updated(self, symbol: str, profile: Dict):
         """Handle profile updated"""
-        self.db_controller.update_profile(symbol, profile)
-        self._refresh_profiles()
+        self.db_controller.submit('update_profile', symbol, profile, callback=lambda _: self._refresh_profiles())
 
     def _on_table_double_click(self, index):
         """Handle double-click on table row"""
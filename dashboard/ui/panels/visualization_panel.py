@@ -8,9 +8,9 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                               QComboBox, QLabel, QSplitter, QMessageBox,
                               QGroupBox, QGridLayout, QCheckBox, QTextEdit,
-                              QTableWidget, QTableWidgetItem, QHeaderView,
+                              QTableView, QHeaderView,
                               QFileDialog, QTabWidget)
-from PyQt6.QtCore import Qt, pyqtSlot, pyqtSignal
+from PyQt6.QtCore import Qt, QDateTime, QEvent, QPointF, QTimeZone, QTimer, pyqtSlot, pyqtSignal
 from PyQt6.QtCharts import (QChart, QChartView, QLineSeries, QDateTimeAxis, 
                              QValueAxis, QScatterSeries, QBarSeries, QBarSet)
 from PyQt6.QtGui import QPainter, QColor
@@ -20,6 +20,17 @@ import numpy as np
 from datetime import datetime
 
 from dashboard.controllers.database_controller import DatabaseController
+from dashboard.models.table_models import ColumnarTableModel, sort_filter_proxy
+from utils.downsample import downsample
+
+# Stored bar fields loaded for the charts and the data preview
+CHART_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'sma_20']
+
+# Points drawn per series for the visible range, whatever its length
+CHART_MAX_POINTS = 2000
+
+# Fraction of the plot width panned per arrow key press
+CHART_PAN_STEP = 0.1
 
 
 class VisualizationPanel(QWidget):
@@ -33,9 +44,19 @@ class VisualizationPanel(QWidget):
         super().__init__(parent)
         
         self.db_controller = DatabaseController()
+        self._loading_symbol = None
         self.current_symbol = None
         self.current_profile = None
         self.current_dataframe = None
+
+        # Chart data as arrays (x in epoch ms) and the series drawn from it
+        self._chart_x = np.empty(0)
+        self._chart_series = {}  # column -> (QLineSeries, y values)
+        self._resample_timer = QTimer(self)
+        self._resample_timer.setSingleShot(True)
+        self._resample_timer.setInterval(50)
+        self._resample_timer.timeout.connect(self._resample_visible)
+        self._pan_origin = None  # x of the last middle-button drag position
         
         self.init_ui()
         
@@ -125,10 +146,17 @@ class VisualizationPanel(QWidget):
         # Main price chart
         self.price_chart = QChart()
         self.price_chart.setTitle("Price & Volume")
-        self.price_chart.setAnimationOptions(QChart.AnimationOption.SeriesAnimations)
+        # Series are redrawn on every zoom, animating them would only add lag
+        self.price_chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
         
         self.price_chart_view = QChartView(self.price_chart)
         self.price_chart_view.setRenderHint(QPainter.RenderHint.Antialiasing)
+        # Drag to zoom into a time range, right-click to zoom back out;
+        # arrow keys or a middle-button drag pan along the time axis
+        self.price_chart_view.setRubberBand(QChartView.RubberBand.HorizontalRubberBand)
+        self.price_chart_view.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.price_chart_view.installEventFilter(self)
+        self.price_chart_view.viewport().installEventFilter(self)
         self.chart_tabs.addTab(self.price_chart_view, "Price Chart")
         
         # Technical indicators chart
@@ -203,9 +231,14 @@ class VisualizationPanel(QWidget):
         # Data table preview
         table_group = QGroupBox("Data Preview")
         table_layout = QVBoxLayout()
-        self.data_table = QTableWidget()
+        # Backed by the frame's columns; rows are formatted only when scrolled into view
+        self.data_model = ColumnarTableModel(parent=self)
+        self.data_table = QTableView()
+        self.data_table.setModel(sort_filter_proxy(self.data_model, parent=self))
+        self.data_table.setSortingEnabled(True)
         self.data_table.setMaximumHeight(200)
         self.data_table.setAlternatingRowColors(True)
+        self.data_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         table_layout.addWidget(self.data_table)
         table_group.setLayout(table_layout)
         layout.addWidget(table_group)
@@ -216,13 +249,19 @@ class VisualizationPanel(QWidget):
         return widget
         
     def _refresh_symbols(self):
-        """Refresh the symbol list from database"""
+        """Refresh the symbol list from database (in the background)"""
+        self.status_label.setText("Loading symbols...")
+        self.status_label.setStyleSheet("color: #ca5010; padding: 5px;")
+        self.db_controller.submit('load_symbols', callback=self._on_symbols_loaded)
+
+    def _on_symbols_loaded(self, symbols: List[str]):
+        """Fill the symbol list"""
         try:
-            profiles = self.db_controller.load_all_profiles()
+            current = self.symbol_combo.currentText()
             self.symbol_combo.clear()
-            
-            symbols = sorted([p.get('symbol', '') for p in profiles if p.get('symbol')])
             self.symbol_combo.addItems(symbols)
+            if current in symbols:
+                self.symbol_combo.setCurrentText(current)
             
             self.status_label.setText(f"Loaded {len(symbols)} symbols")
             self.status_label.setStyleSheet("color: #0e7c0e; padding: 5px;")
@@ -244,25 +283,45 @@ class VisualizationPanel(QWidget):
             QMessageBox.warning(self, "No Symbol", "Please select a symbol first")
             return
             
+        # Profile and bars are read in the background; the displays update when both are in
+        self._loading_symbol = symbol
+        self.status_label.setText(f"Loading {symbol}...")
+        self.status_label.setStyleSheet("color: #ca5010; padding: 5px;")
+        self.db_controller.submit('get_profile', symbol,
+                                  callback=lambda profile: self._on_profile_loaded(symbol, profile))
+
+    def _on_profile_loaded(self, symbol: str, profile: Optional[Dict]):
+        """Show a loaded profile, reading its bars first if it holds none"""
+        if symbol != self._loading_symbol:
+            return  # Another symbol was requested meanwhile
+        if not profile:
+            QMessageBox.warning(self, "Profile Not Found", 
+                               f"Profile for {symbol} not found in database")
+            self.status_label.setText(f"Profile for {symbol} not found")
+            self.status_label.setStyleSheet("color: #c50f1f; padding: 5px;")
+            return
+
+        # Extract dataframe from profile
+        if 'processed_df' in profile and profile['processed_df'] is not None:
+            # If stored as dict, convert to DataFrame
+            if isinstance(profile['processed_df'], dict):
+                self._show_profile(symbol, profile, pd.DataFrame(profile['processed_df']))
+            else:
+                self._show_profile(symbol, profile, profile['processed_df'])
+        else:
+            # Profiles hold snapshots only; read the bars from the minute bar collection
+            self.db_controller.submit('get_bars', symbol, columns=CHART_COLUMNS,
+                                      callback=lambda df: self._show_profile(symbol, profile, df))
+
+    def _show_profile(self, symbol: str, profile: Dict, df: Optional[pd.DataFrame]):
+        """Update every display for a loaded profile"""
+        if symbol != self._loading_symbol:
+            return
+
         try:
-            profile = self.db_controller.get_profile(symbol)
-            if not profile:
-                QMessageBox.warning(self, "Profile Not Found", 
-                                   f"Profile for {symbol} not found in database")
-                return
-                
             self.current_symbol = symbol
             self.current_profile = profile
-            
-            # Extract dataframe from profile
-            if 'processed_df' in profile and profile['processed_df'] is not None:
-                # If stored as dict, convert to DataFrame
-                if isinstance(profile['processed_df'], dict):
-                    self.current_dataframe = pd.DataFrame(profile['processed_df'])
-                else:
-                    self.current_dataframe = profile['processed_df']
-            else:
-                self.current_dataframe = None
+            self.current_dataframe = df
                 
             # Update displays
             self._update_metadata_display()
@@ -353,85 +412,114 @@ class VisualizationPanel(QWidget):
         try:
             # Clear existing series
             self.price_chart.removeAllSeries()
+            for axis in self.price_chart.axes():
+                self.price_chart.removeAxis(axis)
+            self._chart_series = {}
             
-            # Create price series
-            df = self.current_dataframe.head(500)  # Limit to 500 points for performance
-            
-            if 'close' not in df.columns:
+            df = self.current_dataframe
+            if 'close' not in df.columns or 'datetime' not in df.columns:
                 return
-            
-            # Helper function to add series efficiently
-            def add_series_to_chart(df, column, series_name, color=None):
-                """Add a series to chart using vectorized operations"""
+
+            # Whole history as arrays; only the downsampled visible range is drawn
+            order = np.argsort(pd.to_datetime(df['datetime']).to_numpy(), kind='stable')
+            times = pd.to_datetime(df['datetime']).to_numpy()[order]
+            self._chart_x = times.astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+
+            columns = [('close', "Close Price", None)]
+            if self.show_sma_cb.isChecked() and 'sma_20' in df.columns:
+                columns.append(('sma_20', "SMA 20", QColor(255, 165, 0)))
+
+            axis_x = QDateTimeAxis()
+            axis_x.setFormat("yyyy-MM-dd hh:mm")
+            axis_x.setTitleText("Time")
+            axis_y = QValueAxis()
+            self.price_chart.addAxis(axis_x, Qt.AlignmentFlag.AlignBottom)
+            self.price_chart.addAxis(axis_y, Qt.AlignmentFlag.AlignLeft)
+
+            for column, series_name, color in columns:
                 series = QLineSeries()
                 series.setName(series_name)
                 if color:
                     series.setColor(color)
-                
-                # Convert datetime column once
-                if 'datetime' in df.columns:
-                    df_temp = df.copy()
-                    df_temp['datetime'] = pd.to_datetime(df_temp['datetime'])
-                    df_temp['timestamp'] = df_temp['datetime'].apply(lambda x: x.timestamp() * 1000)
-                    
-                    # Filter valid data
-                    valid_data = df_temp[df_temp[column].notna()][['timestamp', column]]
-                    
-                    # Bulk append points
-                    for _, row in valid_data.iterrows():
-                        try:
-                            series.append(float(row['timestamp']), float(row[column]))
-                        except Exception:
-                            continue
-                            
-                return series
-            
-            # Add price series
-            price_series = add_series_to_chart(df, 'close', "Close Price")
-            self.price_chart.addSeries(price_series)
-            
-            # Add SMA if checked
-            if self.show_sma_cb.isChecked() and 'sma_20' in df.columns:
-                sma_series = add_series_to_chart(df, 'sma_20', "SMA 20", QColor(255, 165, 0))
-                self.price_chart.addSeries(sma_series)
-                
-            # Create axes
-            self.price_chart.createDefaultAxes()
+                self.price_chart.addSeries(series)
+                series.attachAxis(axis_x)
+                series.attachAxis(axis_y)
+                values = pd.to_numeric(df[column], errors='coerce').to_numpy(dtype=np.float64)[order]
+                self._chart_series[column] = (series, values)
+
+            if len(self._chart_x):
+                axis_x.setRange(_to_qdatetime(self._chart_x[0]), _to_qdatetime(self._chart_x[-1]))
+            # Zoom (rubber band), zoom-out and panning change the range; redraw at the new resolution
+            axis_x.rangeChanged.connect(lambda *_: self._resample_timer.start())
+            self._resample_visible()
+
             self.price_chart.legend().setVisible(True)
             self.price_chart.legend().setAlignment(Qt.AlignmentFlag.AlignBottom)
             
         except Exception as e:
             print(f"Error updating chart: {e}")
+
+    def eventFilter(self, obj, event):
+        """Pan the price chart with the arrow keys or a middle-button drag"""
+        view = self.price_chart_view
+        if obj is view and event.type() == QEvent.Type.KeyPress:
+            step = self.price_chart.plotArea().width() * CHART_PAN_STEP
+            if event.key() == Qt.Key.Key_Left:
+                self._pan_chart(-step)
+                return True
+            if event.key() == Qt.Key.Key_Right:
+                self._pan_chart(step)
+                return True
+        elif obj is view.viewport():
+            kind = event.type()
+            if kind == QEvent.Type.MouseButtonPress and event.button() == Qt.MouseButton.MiddleButton:
+                self._pan_origin = event.position().x()
+                return True
+            if kind == QEvent.Type.MouseMove and self._pan_origin is not None:
+                x = event.position().x()
+                # Dragging right brings earlier bars into view
+                self._pan_chart(self._pan_origin - x)
+                self._pan_origin = x
+                return True
+            if kind == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.MiddleButton:
+                self._pan_origin = None
+                return True
+        return super().eventFilter(obj, event)
+
+    def _pan_chart(self, dx: float):
+        """Scroll the price chart horizontally by ``dx`` pixels (the series follow via rangeChanged)"""
+        if self._chart_series:
+            self.price_chart.scroll(dx, 0)
+
+    def _resample_visible(self):
+        """Redraw every series from the bars in the visible time range, downsampled"""
+        axes = self.price_chart.axes(Qt.Orientation.Horizontal)
+        if not self._chart_series or not axes or not len(self._chart_x):
+            return
+        axis_x = axes[0]
+        lo = np.searchsorted(self._chart_x, axis_x.min().toMSecsSinceEpoch(), side='left')
+        hi = np.searchsorted(self._chart_x, axis_x.max().toMSecsSinceEpoch(), side='right')
+        # One bar either side keeps the line running to the plot edges
+        lo, hi = max(lo - 1, 0), min(hi + 1, len(self._chart_x))
+
+        y_min, y_max = np.inf, -np.inf
+        for series, values in self._chart_series.values():
+            x, y = downsample(self._chart_x[lo:hi], values[lo:hi], CHART_MAX_POINTS)
+            series.replace([QPointF(px, py) for px, py in zip(x.tolist(), y.tolist())])
+            if len(y):
+                y_min, y_max = min(y_min, y.min()), max(y_max, y.max())
+
+        if np.isfinite(y_min):
+            pad = (y_max - y_min) * 0.05 or abs(y_max) * 0.01 or 1.0
+            self.price_chart.axes(Qt.Orientation.Vertical)[0].setRange(y_min - pad, y_max + pad)
             
     def _update_data_table(self):
         """Update the data preview table"""
         if self.current_dataframe is None or self.current_dataframe.empty:
+            self.data_model.set_frame(None)
             return
-            
-        df = self.current_dataframe.head(20)  # Show first 20 rows
-        
-        # Set up table
-        self.data_table.setRowCount(len(df))
-        cols = ['datetime', 'open', 'high', 'low', 'close', 'volume']
-        available_cols = [c for c in cols if c in df.columns]
-        self.data_table.setColumnCount(len(available_cols))
-        self.data_table.setHorizontalHeaderLabels(available_cols)
-        
-        # Populate table
-        for row_idx, (_, row) in enumerate(df.iterrows()):
-            for col_idx, col in enumerate(available_cols):
-                value = row[col]
-                if pd.notna(value):
-                    if col == 'datetime':
-                        item = QTableWidgetItem(str(value))
-                    else:
-                        item = QTableWidgetItem(f"{float(value):.2f}")
-                else:
-                    item = QTableWidgetItem("N/A")
-                self.data_table.setItem(row_idx, col_idx, item)
-                
-        # Resize columns
-        self.data_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+
+        self.data_model.set_frame(self.current_dataframe, ['datetime', 'open', 'high', 'low', 'close', 'volume'])
         
     @pyqtSlot(str)
     def _on_chart_type_changed(self, chart_type: str):
@@ -469,3 +557,8 @@ class VisualizationPanel(QWidget):
         """
         self.symbol_combo.setCurrentText(symbol)
         self._load_profile()
+
+
+def _to_qdatetime(msecs: float):
+    """Epoch milliseconds -> QDateTime (UTC)"""
+    return QDateTime.fromMSecsSinceEpoch(int(msecs), QTimeZone.utc())
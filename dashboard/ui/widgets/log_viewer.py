@@ -1,31 +1,41 @@
 """
 Live log viewer with color-coded messages, auto-scroll, and categorization
 """
-from PyQt6.QtWidgets import (QTextEdit, QWidget, QVBoxLayout, QHBoxLayout,
-                              QComboBox, QCheckBox, QLabel, QPushButton, QMessageBox)
-from PyQt6.QtGui import QTextCharFormat, QColor, QFont, QTextCursor
+from PyQt6.QtWidgets import (QTableView, QWidget, QVBoxLayout, QHBoxLayout, QHeaderView,
+                              QComboBox, QCheckBox, QLabel, QLineEdit, QPushButton, QAbstractItemView)
+from PyQt6.QtGui import QFont, QFontMetrics
 from PyQt6.QtCore import pyqtSlot, Qt
-from datetime import datetime
+from typing import List, Tuple
 import logging
 
+from dashboard.models.log_model import LogTableModel
+
 logger = logging.getLogger(__name__)
 
+LEVELS = ['INFO', 'WARNING', 'ERROR', 'CRITICAL', 'SUCCESS', 'DEBUG']
+CATEGORIES = ['Pipeline', 'MongoDB', 'API', 'General']
+
+# Records kept in memory (oldest dropped first)
+LOG_CAPACITY = 100_000
+
 
 class LogViewer(QWidget):
     """
     Color-coded log viewer with filtering, auto-scroll, and categorization
     Supports categorizing logs by component (mongodb, pipeline, fetcher, etc.)
+
+    Records live in a bounded ring buffer (LogTableModel) and are painted by
+    a QTableView, so only the visible rows cost anything however long the
+    session runs.
     """
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, capacity: int = LOG_CAPACITY):
         super().__init__(parent)
-        self.max_lines = 2000
         self.auto_scroll = True
         self.current_filter = "All"
         self.font_size = 11  # Increased from 9
 
-        # Log storage by category
-        self.logs_by_category = {}
+        self.model = LogTableModel(capacity, parent=self)
 
         self.init_ui()
 
@@ -34,24 +44,24 @@ class LogViewer(QWidget):
         layout = QVBoxLayout()
         layout.setContentsMargins(5, 5, 5, 5)
 
-        # Text edit for logs - resizable and with larger font
-        self.text_edit = QTextEdit()
-        self.text_edit.setReadOnly(True)
-        self.text_edit.setFont(QFont('Consolas', self.font_size))
-        self.text_edit.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
-        self.text_edit.setMinimumHeight(200)  # Resizable minimum
-
-        # Color formats
-        self.formats = {
-            'DEBUG': self._create_format(QColor(150, 150, 150)),
-            'INFO': self._create_format(QColor(220, 220, 220)),
-            'WARNING': self._create_format(QColor(255, 200, 0)),
-            'ERROR': self._create_format(QColor(255, 100, 100)),
-            'CRITICAL': self._create_format(QColor(255, 0, 0)),
-            'SUCCESS': self._create_format(QColor(100, 255, 100))
-        }
-
-        layout.addWidget(self.text_edit, 1)
+        # Virtualized log table: fixed row height, no wrapping
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setShowGrid(False)
+        self.table.setWordWrap(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.table.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+        self.table.setMinimumHeight(200)  # Resizable minimum
+        self._apply_font(self.font_size)
+
+        layout.addWidget(self.table, 1)
 
         # Control bar - enhanced with font size and clear button
         control_layout = QHBoxLayout()
@@ -59,13 +69,16 @@ class LogViewer(QWidget):
         control_layout.addWidget(QLabel("Filter:"))
 
         self.filter_combo = QComboBox()
-        self.filter_combo.addItems([
-            'All', 'INFO', 'WARNING', 'ERROR', 'CRITICAL', 'SUCCESS', 'DEBUG',
-            'Pipeline', 'MongoDB', 'API'
-        ])
+        self.filter_combo.addItems(['All'] + LEVELS + CATEGORIES)
         self.filter_combo.currentTextChanged.connect(self._on_filter_changed)
         control_layout.addWidget(self.filter_combo)
 
+        self.symbol_filter = QLineEdit()
+        self.symbol_filter.setPlaceholderText("Symbol")
+        self.symbol_filter.setMaximumWidth(90)
+        self.symbol_filter.textChanged.connect(self._apply_filter)
+        control_layout.addWidget(self.symbol_filter)
+
         control_layout.addWidget(QLabel("Font:"))
         self.font_size_combo = QComboBox()
         self.font_size_combo.addItems(['9', '10', '11', '12', '13', '14'])
@@ -84,26 +97,21 @@ class LogViewer(QWidget):
 
         control_layout.addStretch()
 
+        self.count_label = QLabel()
+        control_layout.addWidget(self.count_label)
+
         layout.addLayout(control_layout)
 
         self.setLayout(layout)
 
-    def _create_format(self, color: QColor) -> QTextCharFormat:
-        """Create text format with color"""
-        fmt = QTextCharFormat()
-        fmt.setForeground(color)
-        fmt.setFont(QFont('Consolas', self.font_size))
-        return fmt
-
-    def _extract_category(self, message: str) -> str:
-        """Extract category/component from log message"""
-        if 'mongodb' in message.lower():
-            return 'MongoDB'
-        if 'pipeline' in message.lower():
-            return 'Pipeline'
-        if 'fetcher' in message.lower() or 'api' in message.lower():
-            return 'API'
-        return 'General'
+    def _apply_font(self, size: int):
+        """Set the table font and the matching fixed row height and column widths"""
+        font = QFont('Consolas', size)
+        self.table.setFont(font)
+        metrics = QFontMetrics(font)
+        self.table.verticalHeader().setDefaultSectionSize(metrics.height() + 4)
+        for column, sample in enumerate(['0000-00-00 00:00:00', 'CRITICAL', 'Pipeline', 'XXXXXXXX']):
+            self.table.setColumnWidth(column, metrics.horizontalAdvance(sample) + 16)
 
     @pyqtSlot(str, str)
     def append_log(self, level: str, message: str):
@@ -114,45 +122,31 @@ class LogViewer(QWidget):
             level: Log level (DEBUG, INFO, WARNING, ERROR, CRITICAL, SUCCESS)
             message: Log message
         """
-        # Extract category
-        category = self._extract_category(message)
-
-        # Filter check
-        if self.current_filter not in ['All', level]:
-            if self.current_filter not in ['Pipeline', 'MongoDB', 'API', 'General'] or category != self.current_filter:
-                return
-
-        # Limit total lines
-        if self.text_edit.document().lineCount() > self.max_lines:
-            cursor = self.text_edit.textCursor()
-            cursor.movePosition(QTextCursor.MoveOperation.Start)
-            cursor.select(QTextCursor.SelectionType.LineUnderCursor)
-            cursor.removeSelectedText()
-            cursor.deleteChar()  # Remove newline
-
-        # Format message with category
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        formatted = f"[{timestamp}] {level:8s} | [{category}] {message}\n"
-
-        # Append with color
-        cursor = self.text_edit.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-
-        # Set format and insert text
-        fmt = self.formats.get(level, self.formats['INFO'])
-        cursor.setCharFormat(fmt)
-        cursor.insertText(formatted)
+        self.append_logs([(level, message)])
+
+    @pyqtSlot(list)
+    def append_logs(self, records: List[Tuple[str, str]]):
+        """
+        Append a batch of log messages
+
+        Args:
+            records: (level, message) tuples
+        """
+        self.model.append(records)
+        self._update_count()
 
         # Auto-scroll
         if self.auto_scroll:
-            scrollbar = self.text_edit.verticalScrollBar()
-            scrollbar.setValue(scrollbar.maximum())
+            self.table.scrollToBottom()
+
+    def _update_count(self):
+        shown, total = self.model.rowCount(), len(self.model.buffer)
+        self.count_label.setText(f"{total:,} lines" if shown == total else f"{shown:,} of {total:,} lines")
 
     @pyqtSlot()
     def _clear_logs(self):
         """Clear all logs"""
-        self.text_edit.clear()
-        self.logs_by_category.clear()
+        self.clear()
         logger.info("Logs cleared by user")
 
     @pyqtSlot(str)
@@ -161,20 +155,24 @@ class LogViewer(QWidget):
         try:
             size = int(size_str)
             self.font_size = size
-            font = QFont('Consolas', size)
-            self.text_edit.setFont(font)
-
-            # Update format fonts
-            for level in self.formats:
-                fmt = self.formats[level]
-                fmt.setFont(font)
-
+            self._apply_font(size)
         except ValueError:
             pass
 
     def _on_filter_changed(self, filter_text: str):
         """Handle filter change"""
         self.current_filter = filter_text
+        self._apply_filter()
+
+    def _apply_filter(self):
+        """Re-select the visible records from the buffer indexes"""
+        level = self.current_filter if self.current_filter in LEVELS else None
+        category = self.current_filter if self.current_filter in CATEGORIES else None
+        symbol = self.symbol_filter.text().strip().upper() or None
+        self.model.set_filter(level, category, symbol)
+        self._update_count()
+        if self.auto_scroll:
+            self.table.scrollToBottom()
 
     def _on_auto_scroll_changed(self, state: int):
         """Handle auto-scroll toggle"""
@@ -182,5 +180,5 @@ class LogViewer(QWidget):
 
     def clear(self):
         """Clear all logs"""
-        self.text_edit.clear()
-
+        self.model.clear()
+        self._update_count()
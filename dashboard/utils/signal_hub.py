@@ -0,0 +1,156 @@
+"""
+Coalesced delivery of pipeline signals to the UI
+
+Every worker progress callback emits a log line and a progress update. With
+many workers that is hundreds of queued signals per second, each repainting
+the queue table or the log view. SignalHub sits between the controller's
+PipelineSignals and the UI:
+
+- progress updates keep only the latest state per symbol,
+- log lines are collected into a batch (bounded; the oldest are dropped),
+- other signals (started, completed, ...) are kept in order,
+
+and a GUI-thread timer hands everything to the UI once per frame. Workers
+only take a short lock and never post Qt events themselves.
+"""
+import threading
+from collections import deque
+from typing import Dict, List, Tuple
+
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+
+from dashboard.utils.qt_signals import PipelineSignals
+
+FLUSH_INTERVAL_MS = 100  # 10 frames per second
+MAX_PENDING_LOGS = 10000
+
+# Replayed before the frame's progress/log batch; all other events after it,
+# so a completion is never overwritten by a progress update from the same frame
+_LEADING = ('symbol_started', 'pipeline_started')
+_COALESCED = ('symbol_progress', 'log_message')
+
+
+class SignalHub(QObject):
+    """
+    Frame-rate batching of a PipelineSignals source
+
+    Create it on the GUI thread. Connect the UI to ``progress_batch``,
+    ``log_batch`` and to ``self.signals`` (a PipelineSignals replaying every
+    other source signal) instead of the source itself.
+
+    Args:
+        source: Signals emitted from worker threads
+        interval_ms: Flush interval
+        max_pending_logs: Log lines kept between two flushes
+    """
+
+    progress_batch = pyqtSignal(list)  # [symbol_progress argument tuples], one per symbol
+    log_batch = pyqtSignal(list)  # [(level, message)]
+
+    def __init__(self, source: PipelineSignals, interval_ms: int = FLUSH_INTERVAL_MS,
+                 max_pending_logs: int = MAX_PENDING_LOGS, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.signals = PipelineSignals()
+
+        self._lock = threading.Lock()
+        self._progress: Dict[str, Tuple] = {}
+        self._logs = deque(maxlen=max_pending_logs)
+        self._dropped_logs = 0
+        self._leading: List[Tuple[str, Tuple]] = []
+        self._trailing: List[Tuple[str, Tuple]] = []
+
+        # Direct connections: the slots run in the emitting (worker) thread and only buffer
+        self._connections = [
+            (source.symbol_progress, source.symbol_progress.connect(self._on_progress, Qt.ConnectionType.DirectConnection)),
+            (source.log_message, source.log_message.connect(self._on_log, Qt.ConnectionType.DirectConnection)),
+        ]
+        for name in _signal_names(source):
+            if name in _COALESCED:
+                continue
+            signal = getattr(source, name)
+            slot = (lambda *args, name=name: self._on_event(name, args))
+            self._connections.append((signal, signal.connect(slot, Qt.ConnectionType.DirectConnection)))
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self.flush)
+        self._timer.start()
+
+    @property
+    def pending(self) -> int:
+        """Buffered items not yet delivered"""
+        with self._lock:
+            return len(self._progress) + len(self._logs) + len(self._leading) + len(self._trailing)
+
+    def _on_progress(self, symbol: str, *args):
+        with self._lock:
+            self._progress[symbol] = (symbol, *args)
+
+    def _on_log(self, level: str, message: str):
+        with self._lock:
+            if len(self._logs) == self._logs.maxlen:
+                self._dropped_logs += 1
+            self._logs.append((level, message))
+
+    def _on_event(self, name: str, args: Tuple):
+        with self._lock:
+            (self._leading if name in _LEADING else self._trailing).append((name, args))
+
+    def flush(self):
+        """Deliver everything buffered since the last flush (GUI thread)"""
+        with self._lock:
+            if not (self._progress or self._logs or self._leading or self._trailing):
+                return
+            progress = list(self._progress.values())
+            logs = list(self._logs)
+            dropped = self._dropped_logs
+            leading, trailing = self._leading, self._trailing
+            self._progress = {}
+            self._logs.clear()
+            self._dropped_logs = 0
+            self._leading, self._trailing = [], []
+
+        if dropped:
+            logs.insert(0, ('WARNING', f'{dropped} log lines dropped (UI could not keep up)'))
+
+        self._replay(leading)
+        if progress:
+            self.progress_batch.emit(progress)
+        if logs:
+            self.log_batch.emit(logs)
+        self._replay(trailing)
+
+    def _replay(self, events: List[Tuple[str, Tuple]]):
+        for name, args in events:
+            getattr(self.signals, name).emit(*args)
+
+    def clear(self):
+        """Drop everything buffered (e.g. when the queue view is cleared)"""
+        with self._lock:
+            self._progress = {}
+            self._logs.clear()
+            self._dropped_logs = 0
+            self._leading, self._trailing = [], []
+
+    def close(self):
+        """Flush what is left and detach from the source"""
+        self._timer.stop()
+        for signal, connection in self._connections:
+            try:
+                signal.disconnect(connection)
+            except (TypeError, RuntimeError):
+                pass
+        self._connections = []
+        self.flush()
+
+
+def _signal_names(signals: QObject) -> List[str]:
+    """Names of the signals declared on a QObject subclass"""
+    meta = signals.metaObject()
+    names = []
+    for i in range(meta.methodOffset(), meta.methodCount()):
+        method = meta.method(i)
+        if method.methodType() == method.MethodType.Signal:
+            names.append(bytes(method.name()).decode())
+    return names
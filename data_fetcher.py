@@ -2,15 +2,24 @@
 Data fetcher module for EODHD API
 """
 import requests
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Callable, Sequence, Tuple
 import pandas as pd
 from loguru import logger
 import time
 from config import settings
-from utils.rate_limiter import AdaptiveRateLimiter
+from utils.rate_limiter import AdaptiveRateLimiter, TokenBucketRateLimiter
+from utils.quota_ledger import get_quota_ledger
+from utils.intraday_parser import parse_intraday_response
+from utils.resource_pool import get_http_session
 import logging
-from threading import Event
+from threading import Event, Lock, local
+
+
+class _WindowsStopped(Exception):
+    """Raised in a fetch_windows worker once the batch no longer needs its window"""
 
 
 class EODHDDataFetcher:
@@ -25,14 +34,25 @@ class EODHDDataFetcher:
         """
         self.api_key = api_key or settings.eodhd_api_key
         self.base_url = settings.eodhd_base_url
-        self.session = requests.Session()
-        self.rate_limiter = AdaptiveRateLimiter(settings.api_calls_per_minute, settings.api_calls_per_day)
+        # Process-wide keep-alive session, pooled for concurrent chunk fetches across symbols
+        self.session = get_http_session(max(10, settings.history_fetch_concurrency * settings.max_workers))
+        self.rate_limiter = AdaptiveRateLimiter(
+            settings.api_calls_per_minute,
+            settings.api_calls_per_day,
+            ledger=get_quota_ledger(settings.api_quota_ledger_path) if settings.api_quota_ledger_path else None
+        )
+        # API calls made by this fetcher (the rate limiter may be shared between fetchers)
+        self.api_calls = 0
+        # Guards the non-thread-safe AdaptiveRateLimiter state during concurrent chunk fetches
+        self._limiter_lock = Lock()
         # Cooperative control flags (injected by controller)
         self.cancel_event: Optional[Event] = None
         self.pause_event: Optional[Event] = None
         # Per-symbol control (injected by controller)
         self.symbol_pause_event: Optional[Event] = None
         self.symbol_cancel_event: Optional[Event] = None
+        # Stop flag of the fetch_windows batch the current thread works for
+        self._window_batch = local()
         self.logger = logging.getLogger(__name__)
 
     def _respect_pause_cancel(self):
@@ -52,17 +72,68 @@ class EODHDDataFetcher:
         if self.cancel_event is not None and self.cancel_event.is_set():
             raise RuntimeError("Operation cancelled")
 
+    def _is_cancelled(self) -> bool:
+        """True if the global or per-symbol cancel flag is set"""
+        return any(
+            event is not None and event.is_set()
+            for event in (self.symbol_cancel_event, self.cancel_event)
+        )
+
+    def _window_stopped(self) -> bool:
+        """True if the fetch_windows batch of this thread has stopped"""
+        stopped = getattr(self._window_batch, 'stopped', None)
+        return stopped is not None and stopped.is_set()
+
+    def _respect_window_stop(self):
+        if self._window_stopped():
+            raise _WindowsStopped()
+
     def _throttle_before_call(self):
         """Apply rate limiting and pause/cancel before a network call"""
         self._respect_pause_cancel()
+        self._respect_window_stop()
         # Rate limiter wait
         if hasattr(self, 'rate_limiter') and self.rate_limiter:
-            self.rate_limiter.wait_if_needed()
+            if isinstance(self.rate_limiter, TokenBucketRateLimiter):
+                # Shared limiter: leave the queue promptly if cancelled while waiting
+                if not self.rate_limiter.wait_if_needed(
+                        should_abort=lambda: self._is_cancelled() or self._window_stopped()):
+                    self._respect_pause_cancel()
+            else:
+                self._wait_for_adaptive_limiter()
+            self._respect_window_stop()
+
+    def _wait_for_adaptive_limiter(self):
+        """Wait for the AdaptiveRateLimiter; the lock guards its state, never a sleep"""
+        limiter = self.rate_limiter
+        if limiter.ledger is not None:
+            # The shared ledger serializes reservations itself
+            limiter.wait_if_needed()
+            return
+        warned = False
+        while True:
+            with self._limiter_lock:
+                wait = limiter.pending_delay()
+                backoff = limiter.current_delay
+            if wait <= 0:
+                break
+            if wait > 60 and not warned:
+                self.logger.warning(f"Daily limit reached. Waiting {wait:.0f}s")
+                warned = True
+            # Short slices so pause/cancel and a stopped batch are noticed while waiting
+            time.sleep(min(wait, 1.0))
+            self._respect_pause_cancel()
+            self._respect_window_stop()
+        if backoff > 0:
+            self.logger.info(f"Backoff delay: {backoff}s")
+            time.sleep(backoff)
 
     def _record_after_call(self):
         """Record API call and re-check control flags"""
-        if hasattr(self, 'rate_limiter') and self.rate_limiter:
-            self.rate_limiter.record_call()
+        with self._limiter_lock:
+            self.api_calls += 1
+            if hasattr(self, 'rate_limiter') and self.rate_limiter:
+                self.rate_limiter.record_call()
         self._respect_pause_cancel()
 
     def fetch_intraday_data(
@@ -76,6 +147,9 @@ class EODHDDataFetcher:
         """
         Fetch intraday minute-by-minute data with caching
 
+        Only the date sub-ranges missing from the cache are requested from the API;
+        fresh and cached rows are stitched into one frame.
+
         Args:
             symbol: Stock symbol (e.g., 'AAPL')
             interval: Time interval ('1m', '5m', '1h')
@@ -95,15 +169,95 @@ class EODHDDataFetcher:
         if not to_date:
             to_date = datetime.now().strftime('%Y-%m-%d')
 
-        # Try intelligent cache lookup - NO RATE LIMIT NEEDED
-        # This will find and merge ALL cached batches covering the date range
-        cached_df = cache.get_data_for_date_range(symbol, from_date, to_date)
-        if cached_df is not None:
-            logger.info(f"✓ Loaded {len(cached_df):,} rows from {len(cached_df.index)} cached batches ({from_date} to {to_date})")
+        # Work out which sub-ranges the cache is missing - NO RATE LIMIT NEEDED
+        full_window = [(from_date, to_date)]
+        try:
+            gaps = cache.get_uncovered_ranges(symbol, from_date, to_date)
+        except ValueError:
+            gaps = full_window
+
+        cached_df = None
+        if gaps != full_window:
+            # This will find and merge ALL cached batches covering the date range
+            cached_df = cache.get_data_for_date_range(symbol, from_date, to_date)
+            if cached_df is None:
+                gaps = full_window
+
+        if not gaps:
+            logger.info(f"✓ Loaded {len(cached_df):,} cached rows for {symbol} ({from_date} to {to_date})")
             return cached_df
 
-        logger.info(f"No cache coverage for {symbol} ({from_date} to {to_date}), fetching from API...")
+        if cached_df is None:
+            logger.info(f"No cache coverage for {symbol} ({from_date} to {to_date}), fetching from API...")
+        else:
+            gap_str = ', '.join(f"{a}..{b}" for a, b in gaps)
+            logger.info(f"Partial cache hit for {symbol}: {len(cached_df):,} cached rows, fetching {len(gaps)} gap(s) from API: {gap_str}")
+
+        # Today's bars may still arrive, so only complete days are recorded as covered
+        last_complete_day = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+
+        fresh = []
+        for gap_from, gap_to in gaps:
+            # Narrow-window fallbacks only make sense when the whole request is uncached
+            df_gap = self._fetch_intraday_range(
+                symbol, interval, exchange, gap_from, gap_to,
+                allow_fallback=cached_df is None
+            )
+            covered_to = min(gap_to, last_complete_day)
+            if df_gap.empty:
+                # Remember ranges without bars (holidays, before listing) so they are not requested again
+                if covered_to >= gap_from:
+                    cache.mark_empty(symbol, gap_from, covered_to)
+                continue
+
+            # Cache the fetched bars of complete days; all of them are returned
+            if covered_to >= gap_from:
+                complete = df_gap[pd.to_datetime(df_gap['datetime']) < pd.Timestamp(covered_to) + pd.Timedelta(days=1)]
+                if not complete.empty:
+                    cache.set(symbol, gap_from, covered_to, complete)
+                else:
+                    cache.mark_empty(symbol, gap_from, covered_to)
+            fresh.append(df_gap)
+
+        if fresh:
+            stats = cache.get_stats()
+            logger.info(f"Cache: {stats['entries']} entries, {stats['total_size_mb']}MB / {stats['max_size_mb']}MB")
+
+        frames = ([cached_df] if cached_df is not None and not cached_df.empty else []) + fresh
+        if not frames:
+            return pd.DataFrame()
+        if len(frames) == 1:
+            return frames[0]
+
+        # Stitch cached and fresh rows
+        df = pd.concat(frames, ignore_index=True)
+        df = df.drop_duplicates(subset=['datetime'], keep='last').sort_values('datetime').reset_index(drop=True)
+        logger.info(f"Stitched {len(df):,} rows for {symbol} ({sum(len(f) for f in fresh):,} fresh)")
+        return df
+
+    def _fetch_intraday_range(
+        self,
+        symbol: str,
+        interval: str,
+        exchange: str,
+        from_date: str,
+        to_date: str,
+        allow_fallback: bool = True
+    ) -> pd.DataFrame:
+        """
+        Request one date range from the EODHD intraday endpoint (no caching)
+
+        Args:
+            symbol: Stock symbol
+            interval: Time interval
+            exchange: Exchange code
+            from_date: Start date in 'YYYY-MM-DD' format
+            to_date: Last date in 'YYYY-MM-DD' format (all of its bars are requested)
+            allow_fallback: Retry without/with a narrower range on 422 or empty responses
 
+        Returns:
+            DataFrame with OHLCV data
+        """
         # Only apply rate limiting for API calls (not cache)
         url = f"{self.base_url}/intraday/{symbol}.{exchange}"
 
@@ -115,7 +269,8 @@ class EODHDDataFetcher:
         # Convert to unix timestamps (seconds) as per EODHD intraday spec
         try:
             from_ts = int(pd.to_datetime(from_date).timestamp())
-            to_ts = int(pd.to_datetime(to_date).timestamp())
+            # Through the last second of the end date, like the cache's whole-day coverage
+            to_ts = int((pd.to_datetime(to_date).normalize() + pd.Timedelta(days=1)).timestamp()) - 1
         except Exception:
             from_ts = int((datetime.now() - timedelta(days=settings.data_fetch_interval_days)).timestamp())
             to_ts = int(datetime.now().timestamp())
@@ -124,10 +279,12 @@ class EODHDDataFetcher:
         def _request(params):
             # Apply rate limit ONLY for API calls
             self._throttle_before_call()
-            response = self.session.get(url, params=params, timeout=30)
+            response = self.session.get(url, params=params, timeout=30, stream=True)
             self._record_after_call()
+            if response.status_code >= 400:
+                response.close()
             response.raise_for_status()
-            return response.json()
+            return parse_intraday_response(response)
 
         try:
             logger.info(f"Fetching intraday data for {symbol} from {from_date} to {to_date}")
@@ -135,14 +292,14 @@ class EODHDDataFetcher:
                 data = _request(ranged_params)
             except requests.exceptions.HTTPError as http_err:
                 status = getattr(http_err.response, 'status_code', None)
-                if status == 422:
+                if status == 422 and allow_fallback:
                     logger.warning(f"422 from EODHD with from/to range; retrying without date range for {symbol}")
                     # Retry without from/to to let API decide default recent window
                     data = _request(base_params)
                 else:
                     raise
 
-            if not data:
+            if data.empty and allow_fallback:
                 logger.warning(f"No data returned for {symbol}; attempting narrower range")
                 # Progressive backoff: try last 3 days, then last 1 day
                 for days in (3, 1):
@@ -151,7 +308,7 @@ class EODHDDataFetcher:
                         narrow_to_ts = int(datetime.now().timestamp())
                         narrow_params = {**base_params,'from': narrow_from_ts,'to': narrow_to_ts}
                         data = _request(narrow_params)
-                        if data:
+                        if not data.empty:
                             logger.info(f"Fetched data for {symbol} with last {days} days")
                             break
                     except requests.exceptions.HTTPError as http_err:
@@ -162,50 +319,13 @@ class EODHDDataFetcher:
                         else:
                             raise
 
-            if not data:
-                logger.warning(f"No data returned for {symbol} after fallbacks")
-                return pd.DataFrame()
-
-            # Convert to DataFrame
-            df = pd.DataFrame(data)
-
-            if df.empty:
-                logger.warning(f"Empty dataframe for {symbol}")
-                return df
-
-            # Process the dataframe
-            # Choose datetime-like column explicitly
-            dt_col = None
-            if 'datetime' in df.columns:
-                dt_col = 'datetime'
-            elif 'date' in df.columns:
-                dt_col = 'date'
-            elif 'timestamp' in df.columns:
-                dt_col = 'timestamp'
-
-            if dt_col is None:
-                logger.warning(f"No datetime-like column found in response for {symbol}")
-                return pd.DataFrame()
-
-            df[dt_col] = pd.to_datetime(df[dt_col], errors='coerce')
-            df = df.rename(columns={dt_col: 'datetime'})
-            df = df.dropna(subset=['datetime']).sort_values('datetime').reset_index(drop=True)
-
-            # Ensure numeric columns
-            numeric_cols = ['open', 'high', 'low', 'close', 'volume']
-            for col in numeric_cols:
-                if col in df.columns:
-                    df[col] = pd.to_numeric(df[col], errors='coerce')
-
-            logger.info(f"Successfully fetched {len(df)} records for {symbol}")
-
-            # Cache the fetched data
-            if not df.empty:
-                cache.set(symbol, from_date, to_date, df)
-                stats = cache.get_stats()
-                logger.info(f"Cache: {stats['entries']} entries, {stats['total_size_mb']}MB / {stats['max_size_mb']}MB")
+            if data.empty:
+                logger.warning(f"No data returned for {symbol} ({from_date} to {to_date})")
+                return data
 
-            return df
+            # Body was parsed straight into typed columns (int64 epoch, float64 OHLCV)
+            logger.info(f"Successfully fetched {len(data)} records for {symbol}")
+            return data
 
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching data for {symbol}: {e}")
@@ -226,9 +346,12 @@ class EODHDDataFetcher:
                     'to': int(to_dt.timestamp()),
                     'fmt': 'json'
                 }
-                resp = self.session.get(url, params=params, timeout=30)
+                resp = self.session.get(url, params=params, timeout=30, stream=True)
                 self._record_after_call()
 
+                if resp.status_code != 200:
+                    error_text = resp.text[:200]
+                    resp.close()
                 if resp.status_code == 429:
                     self.logger.warning(f"429 Rate limit for {symbol}; backing off")
                     self.rate_limiter.record_error(settings.initial_retry_delay, settings.max_retry_delay)
@@ -237,23 +360,12 @@ class EODHDDataFetcher:
                     self.logger.warning(f"Symbol {symbol} not found")
                     return pd.DataFrame()
                 if resp.status_code != 200:
-                    self.logger.error(f"API error {resp.status_code}: {resp.text[:200]}")
+                    self.logger.error(f"API error {resp.status_code}: {error_text}")
                     self.rate_limiter.record_error(settings.initial_retry_delay, settings.max_retry_delay)
                     continue
-                data = resp.json()
-                if not data:
-                    return pd.DataFrame()
-                df = pd.DataFrame(data)
-                # Normalize
-                dt_col = 'datetime' if 'datetime' in df.columns else ('date' if 'date' in df.columns else ('timestamp' if 'timestamp' in df.columns else None))
-                if dt_col is None:
-                    return pd.DataFrame()
-                df[dt_col] = pd.to_datetime(df[dt_col], errors='coerce')
-                df = df.rename(columns={dt_col: 'datetime'})
-                for col in ['open','high','low','close','volume']:
-                    if col in df.columns:
-                        df[col] = pd.to_numeric(df[col], errors='coerce')
-                return df.dropna(subset=['datetime']).sort_values('datetime').reset_index(drop=True)
+                return parse_intraday_response(resp)
+            except _WindowsStopped:
+                raise
             except requests.exceptions.Timeout:
                 self.logger.warning(f"Timeout attempt {attempt+1}/{max_retries} for {symbol}")
                 self.rate_limiter.record_error(settings.initial_retry_delay, settings.max_retry_delay)
@@ -360,39 +472,125 @@ class EODHDDataFetcher:
         now = datetime.now()
         if start_year is None:
             start_year = now.year - max_years
+        # Backward windows, newest first
+        windows = []
         end_cursor = now
-        all_chunks: List[pd.DataFrame] = []
-        consecutive_empty = 0
-        total_chunks = 0
-        start_time = datetime.now()
-        while end_cursor.year >= start_year and consecutive_empty < 5:
-            # Cooperatively pause/cancel between chunks
-            self._respect_pause_cancel()
+        while end_cursor.year >= start_year:
             start_cursor = end_cursor - timedelta(days=chunk_days)
-            from_date = start_cursor.strftime('%Y-%m-%d')
-            to_date = end_cursor.strftime('%Y-%m-%d')
-            try:
-                df_chunk = self.fetch_intraday_with_retry(symbol, start_cursor, end_cursor, interval=interval, exchange=exchange)
-                if df_chunk.empty:
-                    logger.warning(f"No data for {symbol} in chunk {from_date} -> {to_date}")
-                    consecutive_empty += 1
-                else:
-                    consecutive_empty = 0
-                    all_chunks.append(df_chunk)
-                    logger.info(f"Accumulated {sum(len(c) for c in all_chunks)} rows for {symbol}")
-                    total_chunks += 1
-            except Exception as e:
-                logger.error(f"Chunk fetch failed for {symbol} {from_date}->{to_date}: {e}")
-                consecutive_empty += 1
+            windows.append((start_cursor, end_cursor))
             end_cursor = start_cursor - timedelta(days=1)
-        if not all_chunks:
-            return pd.DataFrame()
-        full = pd.concat(all_chunks, ignore_index=True).drop_duplicates(subset=['datetime']).sort_values('datetime').reset_index(drop=True)
+        start_time = datetime.now()
+        rows = [0]
+
+        def on_chunk(index, total, df_chunk):
+            if df_chunk.empty:
+                start_cursor, end_cursor = windows[index]
+                logger.warning(f"No data for {symbol} in chunk {start_cursor:%Y-%m-%d} -> {end_cursor:%Y-%m-%d}")
+            else:
+                rows[0] += len(df_chunk)
+                logger.info(f"Accumulated {rows[0]} rows for {symbol}")
+
+        full = self.fetch_windows(
+            windows,
+            lambda start_cursor, end_cursor: self.fetch_intraday_with_retry(symbol, start_cursor, end_cursor, interval=interval, exchange=exchange),
+            stop_after_empty=5,
+            on_chunk=on_chunk
+        )
+        if full.empty:
+            return full
         logger.info(f"Full history assembled for {symbol}: {len(full)} rows from {full['datetime'].min()} to {full['datetime'].max()}")
         duration = (datetime.now() - start_time).total_seconds()
-        self.logger.info(f"Backfill duration {duration:.1f}s, chunks {total_chunks}, API calls today {self.rate_limiter.get_stats()['daily_calls']}")
+        self.logger.info(f"Backfill duration {duration:.1f}s, chunks {len(windows)}, API calls today {self.rate_limiter.get_stats()['daily_calls']}")
         return full
 
+    def fetch_windows(
+        self,
+        windows: Sequence[Tuple[datetime, datetime]],
+        fetch_window: Callable[[datetime, datetime], pd.DataFrame],
+        max_concurrency: Optional[int] = None,
+        stop_after_empty: Optional[int] = None,
+        on_chunk: Optional[Callable[[int, int, pd.DataFrame], None]] = None,
+        raise_errors: bool = False
+    ) -> pd.DataFrame:
+        """Fetch many date windows concurrently within the rate budget.
+
+        Up to ``max_concurrency`` requests are in flight over the pooled session;
+        every request still passes through the rate limiter, so throughput is
+        bounded by the quota rather than by round-trip latency. Responses are
+        parsed in the worker threads as they arrive but consumed in window order.
+
+        Args:
+            windows: Ordered (start, end) windows
+            fetch_window: Callable returning the DataFrame for one window
+            max_concurrency: Requests in flight (default settings.history_fetch_concurrency)
+            stop_after_empty: Stop submitting after this many consecutive empty windows (in order)
+            on_chunk: Optional callback(index, total, df) called in window order
+            raise_errors: Re-raise a failed window instead of treating it as empty
+        Returns:
+            Concatenated DataFrame sorted by datetime without duplicate timestamps.
+        """
+        windows = list(windows)
+        max_concurrency = max(1, max_concurrency or settings.history_fetch_concurrency)
+        frames: List[pd.DataFrame] = []
+        consecutive_empty = 0
+        stopped = Event()
+
+        def run(index):
+            # Once the batch stops, windows still queued or waiting for the rate
+            # limiter return empty instead of spending quota
+            if stopped.is_set():
+                return pd.DataFrame()
+            self._window_batch.stopped = stopped
+            try:
+                start, end = windows[index]
+                return fetch_window(start, end)
+            except _WindowsStopped:
+                return pd.DataFrame()
+            finally:
+                self._window_batch.stopped = None
+
+        with ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='fetch-window') as pool:
+            in_flight = deque()
+            next_index = 0
+            try:
+                while next_index < len(windows) or in_flight:
+                    # Cooperatively pause/cancel between submissions
+                    self._respect_pause_cancel()
+                    while next_index < len(windows) and len(in_flight) < max_concurrency:
+                        in_flight.append((next_index, pool.submit(run, next_index)))
+                        next_index += 1
+                    index, future = in_flight.popleft()
+                    try:
+                        df_chunk = future.result()
+                    except Exception as e:
+                        if raise_errors or self._is_cancelled():
+                            raise
+                        start, end = windows[index]
+                        logger.error(f"Chunk fetch failed {start:%Y-%m-%d}->{end:%Y-%m-%d}: {e}")
+                        df_chunk = pd.DataFrame()
+                    if on_chunk is not None:
+                        on_chunk(index, len(windows), df_chunk)
+                    if df_chunk is None or df_chunk.empty:
+                        consecutive_empty += 1
+                        if stop_after_empty and consecutive_empty >= stop_after_empty:
+                            break
+                    else:
+                        consecutive_empty = 0
+                        frames.append(df_chunk)
+            finally:
+                stopped.set()
+                for _, future in in_flight:
+                    future.cancel()
+
+        if not frames:
+            return pd.DataFrame()
+        return (
+            pd.concat(frames, ignore_index=True)
+            .drop_duplicates(subset=['datetime'], keep='last')
+            .sort_values('datetime')
+            .reset_index(drop=True)
+        )
+
     def fetch_exchange_symbols(self, exchange: str = 'US', skip_delisted: bool = True) -> List[Dict]:
         """
         Fetch all symbols listed on an exchange from EODHD
@@ -428,8 +626,3 @@ class EODHDDataFetcher:
         except Exception as e:
             logger.error(f"Failed to fetch {exchange} symbols: {e}")
             return []
-
-    def __del__(self):
-        """Close the session when the object is destroyed"""
-        if hasattr(self, 'session'):
-            self.session.close()
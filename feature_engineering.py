@@ -13,6 +13,11 @@ warnings.filterwarnings('ignore')
 import statsmodels.api as sm
 from statsmodels.tsa.stattools import adfuller, acf
 from datetime import datetime
+from utils import indicator_kernels
+from utils.feature_columns import FeatureColumns
+from utils.feature_graph import FeatureGraph, FeatureRun
+from utils.indicator_state import EMA_SPANS, TAIL_COLUMNS, TAIL_ROWS, IndicatorState
+from utils.mergeable_stats import RunningMoments, StatisticalSketches
 
 try:
     import pandas_ta as pta  # optional advanced TA
@@ -20,29 +25,71 @@ except ImportError:  # safe fallback
     pta = None
 
 
+# Primitives shared by several feature stages; each is computed once per run
+SHARED_FEATURES = FeatureGraph()
+SHARED_FEATURES.add('close', lambda df: df['close'], ['df'])
+SHARED_FEATURES.add('returns', lambda close: close.pct_change(), ['close'])
+SHARED_FEATURES.add('close_diff', lambda close: close.diff(), ['close'])
+SHARED_FEATURES.add('datetime', lambda df: pd.to_datetime(df['datetime']), ['df'])
+SHARED_FEATURES.add('hour', lambda dt: dt.dt.hour, ['datetime'])
+for _w in (5, 10, 20, 50, 100, 200):
+    SHARED_FEATURES.add(f'close_mean_{_w}', lambda close, w=_w: close.rolling(window=w).mean(), ['close'])
+for _w in (10, 20, 50):
+    SHARED_FEATURES.add(f'close_std_{_w}', lambda close, w=_w: close.rolling(window=w).std(), ['close'])
+    SHARED_FEATURES.add(f'close_min_{_w}', lambda close, w=_w: close.rolling(window=w).min(), ['close'])
+    SHARED_FEATURES.add(f'close_max_{_w}', lambda close, w=_w: close.rolling(window=w).max(), ['close'])
+for _w in (1, 5, 15, 30, 60):
+    SHARED_FEATURES.add(f'returns_std_{_w}', lambda returns, w=_w: returns.rolling(w).std(), ['returns'])
+# Recursive filters are nodes too, so their final state can be captured for resuming
+for _w in EMA_SPANS:
+    SHARED_FEATURES.add(f'close_ema_{_w}', lambda close, w=_w: close.ewm(span=w, adjust=False).mean(), ['close'])
+del _w
+SHARED_FEATURES.add('macd', lambda ema_12, ema_26: ema_12 - ema_26, ['close_ema_12', 'close_ema_26'])
+SHARED_FEATURES.add('macd_signal', lambda macd: macd.ewm(span=9, adjust=False).mean(), ['macd'])
+SHARED_FEATURES.add('kama_10_30', lambda close: indicator_kernels.kama(close.to_numpy(), window=10, fast=2, slow=30,
+                                                                      return_state=True), ['close'])
+SHARED_FEATURES.add('obv', lambda df: indicator_kernels.obv(df['close'].to_numpy(), df['volume'].to_numpy()), ['df'])
+
+
 class FeatureEngineer:
     """Derives comprehensive statistical and ML features from minute data"""
 
-    def __init__(self, progress_callback=None):
+    # Float columns added by the frame-enriching stages (FeatureColumns capacity)
+    TECHNICAL_WIDTH = 37
+    ML_WIDTH = 33
+    ADVANCED_WIDTH = 5
+
+    def __init__(self, progress_callback=None, compact_dtypes: bool = False):
         """Initialize the feature engineer
 
         Args:
             progress_callback: Optional callback function(stage_name: str, progress: int) for progress updates
+            compact_dtypes: Store derived indicator columns as float32 and pattern flags as int8
+                (source OHLCV columns and all aggregates stay float64)
         """
         self.scaler = StandardScaler()
         self.progress_callback = progress_callback
+        self.compact_dtypes = compact_dtypes
+        self.column_dtype = np.float32 if compact_dtypes else np.float64
+        self.flag_dtype = np.int8 if compact_dtypes else int
 
     def _report_progress(self, stage: str, progress: int = None):
         """Report progress if callback is set"""
         if self.progress_callback:
             self.progress_callback(stage, progress)
 
-    def calculate_technical_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    @staticmethod
+    def _shared(df: pd.DataFrame, run: Optional[FeatureRun]) -> FeatureRun:
+        """Shared-intermediate run for df (a fresh one for standalone calls)"""
+        return run if run is not None else SHARED_FEATURES.run(df)
+
+    def calculate_technical_indicators(self, df: pd.DataFrame, run: Optional[FeatureRun] = None) -> pd.DataFrame:
         """
         Calculate technical indicators
 
         Args:
             df: DataFrame with OHLCV data
+            run: Shared-intermediate run over the same bars (see process_full_pipeline)
 
         Returns:
             DataFrame with added technical indicators
@@ -50,84 +97,93 @@ class FeatureEngineer:
         if df.empty:
             return df
 
-        df = df.copy()
+        columns = FeatureColumns(df, self.TECHNICAL_WIDTH, self.column_dtype)
+        self._technical_columns(df, self._shared(df, run), columns)
+        return columns.to_frame()
+
+    def _technical_columns(self, df: pd.DataFrame, run: FeatureRun, out: FeatureColumns):
+        """Write the technical indicator columns for df into out"""
+        close = run.get('close')
 
         self._report_progress('Technical: Moving Averages', 52)
 
         # Moving Averages
         for window in [5, 10, 20, 50, 100, 200]:
-            df[f'sma_{window}'] = df['close'].rolling(window=window).mean()
-            df[f'ema_{window}'] = df['close'].ewm(span=window, adjust=False).mean()
+            out[f'sma_{window}'] = run.get(f'close_mean_{window}')
+            out[f'ema_{window}'] = run.get(f'close_ema_{window}')
 
         self._report_progress('Technical: Bollinger Bands', 54)
 
         # Bollinger Bands
         for window in [20, 50]:
-            rolling_mean = df['close'].rolling(window=window).mean()
-            rolling_std = df['close'].rolling(window=window).std()
-            df[f'bb_upper_{window}'] = rolling_mean + (rolling_std * 2)
-            df[f'bb_lower_{window}'] = rolling_mean - (rolling_std * 2)
-            df[f'bb_middle_{window}'] = rolling_mean
-            df[f'bb_width_{window}'] = (df[f'bb_upper_{window}'] - df[f'bb_lower_{window}']) / rolling_mean
+            rolling_mean = run.get(f'close_mean_{window}')
+            rolling_std = run.get(f'close_std_{window}')
+            upper = rolling_mean + (rolling_std * 2)
+            lower = rolling_mean - (rolling_std * 2)
+            out[f'bb_upper_{window}'] = upper
+            out[f'bb_lower_{window}'] = lower
+            out[f'bb_middle_{window}'] = rolling_mean
+            out[f'bb_width_{window}'] = (upper - lower) / rolling_mean
 
         self._report_progress('Technical: RSI', 56)
 
         # RSI (Relative Strength Index)
         for period in [14, 28]:
-            delta = df['close'].diff()
+            delta = run.get('close_diff')
             gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
             loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
             rs = gain / loss
-            df[f'rsi_{period}'] = 100 - (100 / (1 + rs))
+            out[f'rsi_{period}'] = 100 - (100 / (1 + rs))
 
         self._report_progress('Technical: MACD', 58)
 
         # MACD
-        exp1 = df['close'].ewm(span=12, adjust=False).mean()
-        exp2 = df['close'].ewm(span=26, adjust=False).mean()
-        df['macd'] = exp1 - exp2
-        df['macd_signal'] = df['macd'].ewm(span=9, adjust=False).mean()
-        df['macd_histogram'] = df['macd'] - df['macd_signal']
+        macd = run.get('macd')
+        macd_signal = run.get('macd_signal')
+        out['macd'] = macd
+        out['macd_signal'] = macd_signal
+        out['macd_histogram'] = macd - macd_signal
 
         self._report_progress('Technical: ATR & Stochastic', 60)
 
         # ATR (Average True Range)
         high_low = df['high'] - df['low']
-        high_close = np.abs(df['high'] - df['close'].shift())
-        low_close = np.abs(df['low'] - df['close'].shift())
+        high_close = np.abs(df['high'] - close.shift())
+        low_close = np.abs(df['low'] - close.shift())
         ranges = pd.concat([high_low, high_close, low_close], axis=1)
         true_range = np.max(ranges, axis=1)
-        df['atr_14'] = true_range.rolling(14).mean()
+        out['atr_14'] = true_range.rolling(14).mean()
 
         # Stochastic Oscillator
         for period in [14]:
             low_min = df['low'].rolling(window=period).min()
             high_max = df['high'].rolling(window=period).max()
-            df[f'stoch_{period}'] = 100 * (df['close'] - low_min) / (high_max - low_min)
-            df[f'stoch_{period}_sma'] = df[f'stoch_{period}'].rolling(window=3).mean()
+            stoch = 100 * (close - low_min) / (high_max - low_min)
+            out[f'stoch_{period}'] = stoch
+            out[f'stoch_{period}_sma'] = stoch.rolling(window=3).mean()
 
         self._report_progress('Technical: Volume & Momentum', 62)
 
         # Volume indicators
-        df['volume_sma_20'] = df['volume'].rolling(window=20).mean()
-        df['volume_ratio'] = df['volume'] / df['volume_sma_20']
+        volume_sma = df['volume'].rolling(window=20).mean()
+        out['volume_sma_20'] = volume_sma
+        out['volume_ratio'] = df['volume'] / volume_sma
 
         # Price momentum
         for period in [1, 5, 10, 20, 60]:
-            df[f'momentum_{period}'] = df['close'].pct_change(period)
+            out[f'momentum_{period}'] = run.get('returns') if period == 1 else close.pct_change(period)
 
         # Rate of Change (ROC)
         for period in [10, 20]:
-            df[f'roc_{period}'] = ((df['close'] - df['close'].shift(period)) / df['close'].shift(period)) * 100
-
-        return df
+            out[f'roc_{period}'] = ((close - close.shift(period)) / close.shift(period)) * 100
 
-    def calculate_statistical_features(self, df: pd.DataFrame) -> Dict:
+    def calculate_statistical_features(self, df: pd.DataFrame, run: Optional[FeatureRun] = None) -> Dict:
         """
         Calculate statistical features from the data
 
         Args:
             df: DataFrame with price data
+            run: Shared-intermediate run over the same bars
 
         Returns:
             Dictionary of statistical features
@@ -135,6 +191,7 @@ class FeatureEngineer:
         if df.empty:
             return {}
 
+        run = self._shared(df, run)
         features = {}
 
         self._report_progress('Statistical: Basic stats', 64)
@@ -153,7 +210,7 @@ class FeatureEngineer:
 
         # Returns statistics
         self._report_progress('Statistical: Computing returns', 65)
-        returns = df['close'].pct_change().dropna()
+        returns = run.get('returns').dropna()
         features['returns_mean'] = returns.mean()
         features['returns_std'] = returns.std()
         features['returns_skewness'] = skew(returns)
@@ -170,7 +227,7 @@ class FeatureEngineer:
         # Volatility measures
         self._report_progress('Statistical: Computing volatility', 67)
         features['volatility_intraday'] = ((df['high'] - df['low']) / df['close']).mean()
-        features['volatility_close_to_close'] = df['close'].pct_change().std()
+        features['volatility_close_to_close'] = run.get('returns').std()
 
         # Trend statistics
         self._report_progress('Statistical: Computing trend', 68)
@@ -191,12 +248,13 @@ class FeatureEngineer:
 
         return features
 
-    def calculate_time_based_features(self, df: pd.DataFrame) -> Dict:
+    def calculate_time_based_features(self, df: pd.DataFrame, run: Optional[FeatureRun] = None) -> Dict:
         """
         Calculate time-based features
 
         Args:
             df: DataFrame with datetime index
+            run: Shared-intermediate run over the same bars
 
         Returns:
             Dictionary of time-based features
@@ -205,31 +263,29 @@ class FeatureEngineer:
             return {}
 
         features = {}
-
-        df = df.copy()
-        df['hour'] = pd.to_datetime(df['datetime']).dt.hour
-        df['minute'] = pd.to_datetime(df['datetime']).dt.minute
-        df['day_of_week'] = pd.to_datetime(df['datetime']).dt.dayofweek
+        hour = self._shared(df, run).get('hour')
+        morning = hour < 12
 
         # Trading session patterns
-        features['morning_avg_volume'] = df[df['hour'] < 12]['volume'].mean()
-        features['afternoon_avg_volume'] = df[df['hour'] >= 12]['volume'].mean()
+        features['morning_avg_volume'] = df['volume'][morning].mean()
+        features['afternoon_avg_volume'] = df['volume'][~morning].mean()
 
-        features['morning_volatility'] = df[df['hour'] < 12]['close'].pct_change().std()
-        features['afternoon_volatility'] = df[df['hour'] >= 12]['close'].pct_change().std()
+        features['morning_volatility'] = df['close'][morning].pct_change().std()
+        features['afternoon_volatility'] = df['close'][~morning].pct_change().std()
 
         # First and last hour statistics
-        features['first_hour_return'] = df[df['hour'] == df['hour'].min()]['close'].pct_change().sum()
-        features['last_hour_return'] = df[df['hour'] == df['hour'].max()]['close'].pct_change().sum()
+        features['first_hour_return'] = df['close'][hour == hour.min()].pct_change().sum()
+        features['last_hour_return'] = df['close'][hour == hour.max()].pct_change().sum()
 
         return features
 
-    def calculate_ml_features(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_ml_features(self, df: pd.DataFrame, run: Optional[FeatureRun] = None) -> pd.DataFrame:
         """
         Calculate ML-ready features
 
         Args:
             df: DataFrame with technical indicators
+            run: Shared-intermediate run over the same bars
 
         Returns:
             DataFrame with ML features
@@ -237,53 +293,63 @@ class FeatureEngineer:
         if df.empty:
             return df
 
-        df = df.copy()
+        columns = FeatureColumns(df, self.ML_WIDTH, self.column_dtype)
+        self._ml_columns(df, self._shared(df, run), columns)
+        return columns.to_frame()
+
+    def _ml_columns(self, df: pd.DataFrame, run: FeatureRun, out: FeatureColumns):
+        """Write the ML feature columns for df into out"""
+        close = run.get('close')
 
         # Lagged features
+        returns = run.get('returns')
         for lag in [1, 5, 10, 20]:
-            df[f'close_lag_{lag}'] = df['close'].shift(lag)
-            df[f'volume_lag_{lag}'] = df['volume'].shift(lag)
-            df[f'return_lag_{lag}'] = df['close'].pct_change().shift(lag)
+            out[f'close_lag_{lag}'] = close.shift(lag)
+            out[f'volume_lag_{lag}'] = df['volume'].shift(lag)
+            out[f'return_lag_{lag}'] = returns.shift(lag)
 
         # Rolling statistics
         for window in [10, 20, 50]:
-            df[f'rolling_mean_{window}'] = df['close'].rolling(window=window).mean()
-            df[f'rolling_std_{window}'] = df['close'].rolling(window=window).std()
-            df[f'rolling_min_{window}'] = df['close'].rolling(window=window).min()
-            df[f'rolling_max_{window}'] = df['close'].rolling(window=window).max()
+            out[f'rolling_mean_{window}'] = run.get(f'close_mean_{window}')
+            out[f'rolling_std_{window}'] = run.get(f'close_std_{window}')
+            out[f'rolling_min_{window}'] = run.get(f'close_min_{window}')
+            out[f'rolling_max_{window}'] = run.get(f'close_max_{window}')
 
         # Price position indicators
         for window in [20, 50]:
-            rolling_min = df['close'].rolling(window=window).min()
-            rolling_max = df['close'].rolling(window=window).max()
-            df[f'price_position_{window}'] = ((df['close'] - rolling_min) /
-                                              (rolling_max - rolling_min))
+            rolling_min = run.get(f'close_min_{window}')
+            rolling_max = run.get(f'close_max_{window}')
+            out[f'price_position_{window}'] = ((close - rolling_min) /
+                                               (rolling_max - rolling_min))
 
         # Volume changes
-        df['volume_change'] = df['volume'].pct_change()
-        df['volume_acceleration'] = df['volume_change'].diff()
+        volume_change = df['volume'].pct_change()
+        out['volume_change'] = volume_change
+        out['volume_acceleration'] = volume_change.diff()
 
         # Price patterns
-        df['higher_high'] = ((df['high'] > df['high'].shift(1)) &
-                            (df['high'].shift(1) > df['high'].shift(2))).astype(int)
-        df['lower_low'] = ((df['low'] < df['low'].shift(1)) &
-                          (df['low'].shift(1) < df['low'].shift(2))).astype(int)
+        out['higher_high'] = ((df['high'] > df['high'].shift(1)) &
+                              (df['high'].shift(1) > df['high'].shift(2))).astype(self.flag_dtype)
+        out['lower_low'] = ((df['low'] < df['low'].shift(1)) &
+                            (df['low'].shift(1) < df['low'].shift(2))).astype(self.flag_dtype)
 
         # Candlestick features
-        df['body'] = df['close'] - df['open']
-        df['body_pct'] = df['body'] / df['open']
-        df['upper_shadow'] = df['high'] - df[['open', 'close']].max(axis=1)
-        df['lower_shadow'] = df[['open', 'close']].min(axis=1) - df['low']
-        df['shadow_ratio'] = (df['upper_shadow'] + df['lower_shadow']) / df['body'].abs()
-
-        return df
-
-    def calculate_granular_minute_features(self, df: pd.DataFrame) -> Dict:
+        body = close - df['open']
+        upper_shadow = df['high'] - np.fmax(df['open'], close)
+        lower_shadow = np.fmin(df['open'], close) - df['low']
+        out['body'] = body
+        out['body_pct'] = body / df['open']
+        out['upper_shadow'] = upper_shadow
+        out['lower_shadow'] = lower_shadow
+        out['shadow_ratio'] = (upper_shadow + lower_shadow) / body.abs()
+
+    def calculate_granular_minute_features(self, df: pd.DataFrame, run: Optional[FeatureRun] = None) -> Dict:
         """
         Calculate granular minute-level analysis features
         
         Args:
             df: DataFrame with OHLCV minute data
+            run: Shared-intermediate run over the same bars
             
         Returns:
             Dictionary of granular minute-level features
@@ -292,13 +358,13 @@ class FeatureEngineer:
             return {}
         
         features = {}
+        run = self._shared(df, run)
         
         # Intraday volatility patterns
         df_temp = df.copy()
-        df_temp['datetime'] = pd.to_datetime(df_temp['datetime'])
-        df_temp['hour'] = df_temp['datetime'].dt.hour
-        df_temp['minute'] = df_temp['datetime'].dt.minute
-        df_temp['returns'] = df_temp['close'].pct_change()
+        df_temp['datetime'] = run.get('datetime')
+        df_temp['hour'] = run.get('hour')
+        df_temp['returns'] = run.get('returns')
         
         # Volume-weighted volatility by hour
         hourly_vwap_vol = {}
@@ -379,12 +445,13 @@ class FeatureEngineer:
         
         return features
 
-    def calculate_market_microstructure(self, df: pd.DataFrame) -> Dict:
+    def calculate_market_microstructure(self, df: pd.DataFrame, run: Optional[FeatureRun] = None) -> Dict:
         """
         Calculate market microstructure features
 
         Args:
             df: DataFrame with OHLCV data
+            run: Shared-intermediate run over the same bars
 
         Returns:
             Dictionary of microstructure features
@@ -393,6 +460,7 @@ class FeatureEngineer:
             return {}
 
         features = {}
+        returns = self._shared(df, run).get('returns')
 
         # Spread measures
         df['spread'] = df['high'] - df['low']
@@ -404,11 +472,11 @@ class FeatureEngineer:
         features['avg_price_impact'] = (df['price_change'] / df['volume']).mean()
 
         # Liquidity measures
-        features['amihud_illiquidity'] = (df['close'].pct_change().abs() / df['volume']).mean()
+        features['amihud_illiquidity'] = (returns.abs() / df['volume']).mean()
         features['volume_weighted_price'] = (df['close'] * df['volume']).sum() / df['volume'].sum()
 
         # Order flow imbalance (approximation)
-        df['returns'] = df['close'].pct_change()
+        df['returns'] = returns
         df['volume_signed'] = df['volume'] * np.sign(df['returns'])
         features['order_flow_imbalance'] = df['volume_signed'].sum() / df['volume'].sum()
 
@@ -451,42 +519,32 @@ class FeatureEngineer:
     def calculate_advanced_technical(self, df: pd.DataFrame) -> pd.DataFrame:
         if df.empty:
             return df
-        df = df.copy()
+        columns = FeatureColumns(df, self.ADVANCED_WIDTH, self.column_dtype)
+        self._advanced_columns(df, self._shared(df, None), columns)
+        return columns.to_frame()
+
+    def _advanced_columns(self, df: pd.DataFrame, run: FeatureRun, out: FeatureColumns):
+        """Write the advanced technical columns for df into out"""
         # VWAP
         if all(c in df.columns for c in ['high','low','close','volume']):
             typical = (df['high'] + df['low'] + df['close']) / 3
-            df['vwap'] = (typical * df['volume']).cumsum() / df['volume'].cumsum()
+            out['vwap'] = (typical * df['volume']).cumsum() / df['volume'].cumsum()
         # OBV
         if 'close' in df.columns and 'volume' in df.columns:
-            direction = df['close'].diff().apply(lambda x: 1 if x>0 else (-1 if x<0 else 0))
-            df['obv'] = (direction * df['volume']).cumsum()
+            out['obv'] = run.get('obv')
         # Chaikin Money Flow (CMF)
         if all(c in df.columns for c in ['high','low','close','volume']):
             mfm = ((df['close'] - df['low']) - (df['high'] - df['close'])) / (df['high'] - df['low']).replace(0, np.nan)
-            df['cmf_20'] = (mfm * df['volume']).rolling(20).sum() / df['volume'].rolling(20).sum()
+            out['cmf_20'] = (mfm * df['volume']).rolling(20).sum() / df['volume'].rolling(20).sum()
         # KAMA (Efficiency Ratio based EMA)
         if 'close' in df.columns:
-            window = 10
-            change = abs(df['close'] - df['close'].shift(window))
-            volatility = df['close'].diff().abs().rolling(window).sum()
-            er = (change / volatility).replace([np.inf, -np.inf], np.nan)
-            sc = (er * (2/(2+1) - 2/(30+1)) + 2/(30+1))**2
-            kama = []
-            prev = df['close'].iloc[0]
-            for i, (price, s) in enumerate(zip(df['close'], sc)):
-                if i == 0 or pd.isna(s):
-                    kama.append(price)
-                else:
-                    prev = prev + s * (price - prev)
-                    kama.append(prev)
-            df['kama_10_30'] = kama
+            out['kama_10_30'] = run.get('kama_10_30')[0]
         # If pandas_ta available add a couple extra indicators
         if pta is not None:
             try:
-                df['pvo'] = pta.pvo(df['volume']).iloc[:,0]
+                out['pvo'] = pta.pvo(df['volume']).iloc[:,0]
             except Exception:
                 pass
-        return df
 
     def calculate_multi_timeframe_features(self, df: pd.DataFrame) -> Dict:
         # (legacy kept for backward compat) wrapper now calls new method
@@ -571,16 +629,17 @@ class FeatureEngineer:
         
         return metrics, frames
 
-    def generate_predictive_label_series(self, df: pd.DataFrame, horizons=None) -> pd.DataFrame:
+    def generate_predictive_label_series(self, df: pd.DataFrame, horizons=None, run: Optional[FeatureRun] = None) -> pd.DataFrame:
         if horizons is None:
             horizons = [1,5,15,30]
         if df.empty or 'close' not in df.columns:
             return pd.DataFrame(index=df.index)
+        run = self._shared(df, run)
         out = pd.DataFrame(index=df.index)
         close = df['close'].astype(float)
         high = df.get('high', close)
         low = df.get('low', close)
-        returns = close.pct_change()
+        returns = run.get('returns')
         for h in horizons:
             # Forward return series: shift(-h)
             fr = (close.shift(-h) - close) / close
@@ -591,29 +650,19 @@ class FeatureEngineer:
             # Parkinson volatility next h (use future high/low window)
             hl = (np.log(high/low)**2).shift(-1).rolling(h).sum()
             out[f'next_{h}m_parkinson_vol'] = np.sqrt(hl/(4*h*np.log(2)))
-            # Max drawdown next h: compute using future window prices (vectorized)
-            future_prices = close.shift(-1).fillna(method='ffill').values
-
-            # Vectorized max drawdown calculation
-            md_series = np.full(len(close), np.nan)
-            for i in range(len(close) - h):
-                window = future_prices[i:i+h]
-                if len(window) == h:
-                    cum = np.cumprod(1 + np.diff(window, prepend=window[0])/np.maximum(window[0], 1e-10))
-                    run_max = np.maximum.accumulate(cum)
-                    dd = (cum - run_max) / np.maximum(run_max, 1e-10)
-                    md_series[i] = np.min(dd)
-            out[f'next_{h}m_max_drawdown'] = md_series
-            # VaR 95 proxy using past returns (no leakage)
-            past_ret_window = returns.iloc[:].rolling(h).apply(lambda x: np.nanquantile(x,0.05), raw=False)
+            # Max drawdown next h: all future windows at once on strided views
+            future_prices = close.shift(-1).ffill().to_numpy()
+            out[f'next_{h}m_max_drawdown'] = indicator_kernels.forward_max_drawdown(future_prices, h)
+            # VaR 95 proxy using past returns (no leakage); order-statistic rolling window
+            past_ret_window = returns.rolling(h).quantile(0.05, interpolation='linear')
             out[f'next_{h}m_var_95'] = past_ret_window.shift(1)  # ensure not using current bar forward data
-            # Direction classification (−1/0/1)
-            out[f'next_{h}m_direction'] = out[f'next_{h}m_return'].apply(lambda x: np.nan if pd.isna(x) else (1 if x>0 else (-1 if x<0 else 0)))
+            # Direction classification (−1/0/1, NaN where the forward return is unknown)
+            out[f'next_{h}m_direction'] = np.sign(fr)
             # Breakout flag (>2σ of past h returns, no forward leak)
-            past_std = returns.rolling(h).std()
+            past_std = run.get(f'returns_std_{h}') if f'returns_std_{h}' in SHARED_FEATURES.nodes else returns.rolling(h).std()
             out[f'next_{h}m_breakout'] = (out[f'next_{h}m_return'].abs() > 2*past_std).astype(int)
         # Regime conditional example for 30m low/high vol
-        roll_vol = returns.rolling(60).std()
+        roll_vol = run.get('returns_std_60')
         q_low, q_high = roll_vol.quantile(0.3), roll_vol.quantile(0.7)
         cond_low = (roll_vol <= q_low)
         cond_high = (roll_vol >= q_high)
@@ -623,79 +672,13 @@ class FeatureEngineer:
         out['next_30m_return_high_vol'] = fr30.where(cond_high)
         return out
 
-    def calculate_regime_features(self, df: pd.DataFrame) -> Dict:
-        if df.empty or 'close' not in df.columns:
-            return {}
-        regimes = {}
-        # Volatility regimes via rolling std of returns
-        returns = df['close'].pct_change()
-        roll_vol = returns.rolling(60).std()
-        if roll_vol.dropna().empty:
-            return {}
-        q_low, q_med = roll_vol.quantile(0.33), roll_vol.quantile(0.66)
-        latest_vol = roll_vol.iloc[-1]
-        if latest_vol <= q_low:
-            vol_regime = 'low'
-        elif latest_vol <= q_med:
-            vol_regime = 'medium'
-        else:
-            vol_regime = 'high'
-        regimes['volatility_regime'] = vol_regime
-        regimes['volatility_regime_probability'] = float((roll_vol <= latest_vol).mean())  # empirical CDF proxy
-        # Trend regime via slope & MACD sign
-        if 'macd' in df.columns and len(df) > 30:
-            slope = stats.linregress(np.arange(len(df.tail(120))), df['close'].tail(120)).slope if len(df) >= 120 else stats.linregress(np.arange(len(df)), df['close']).slope
-            macd_latest = df['macd'].iloc[-1]
-            if slope > 0 and macd_latest > 0:
-                regimes['trend_regime'] = 'strong_uptrend'
-            elif slope < 0 and macd_latest < 0:
-                regimes['trend_regime'] = 'strong_downtrend'
-            elif abs(slope) < 1e-6:
-                regimes['trend_regime'] = 'choppy'
-            else:
-                regimes['trend_regime'] = 'weak_trend'
-        # Liquidity regime via volume z-score
-        vol_mean = df['volume'].rolling(120).mean().iloc[-1] if len(df) >= 120 else df['volume'].mean()
-        vol_std = df['volume'].rolling(120).std().iloc[-1] if len(df) >= 120 else df['volume'].std()
-        latest_volume = df['volume'].iloc[-1]
-        if vol_std and vol_std != 0:
-            z = (latest_volume - vol_mean)/vol_std
-            if z < -1:
-                regimes['liquidity_regime'] = 'illiquid'
-            elif z > 1:
-                regimes['liquidity_regime'] = 'high_liquidity'
-            else:
-                regimes['liquidity_regime'] = 'normal'
-        # Session regime (US market heuristic)
-        if 'datetime' in df.columns:
-            hour = pd.to_datetime(df['datetime'].iloc[-1]).hour
-            if hour < 9:
-                regimes['session_regime'] = 'pre_market'
-            elif 9 <= hour < 10:
-                regimes['session_regime'] = 'open'
-            elif 10 <= hour < 15:
-                regimes['session_regime'] = 'midday'
-            elif 15 <= hour < 16:
-                regimes['session_regime'] = 'power_hour'
-            else:
-                regimes['session_regime'] = 'close'
-        # Add numeric codes mapping
-        regime_codes = {
-            'volatility_regime_code': {'low':0,'medium':1,'high':2}.get(regimes.get('volatility_regime'), None),
-            'trend_regime_code': {'choppy':0,'weak_trend':1,'strong_uptrend':2,'strong_downtrend':3}.get(regimes.get('trend_regime'), None),
-            'liquidity_regime_code': {'illiquid':0,'normal':1,'high_liquidity':2}.get(regimes.get('liquidity_regime'), None),
-            'session_regime_code': {'pre_market':0,'open':1,'midday':2,'power_hour':3,'close':4}.get(regimes.get('session_regime'), None)
-        }
-        regimes.update(regime_codes)
-        return regimes
-
-    def calculate_predictive_labels(self, df: pd.DataFrame, horizons: List[int] = None) -> Dict:
+    def calculate_predictive_labels(self, df: pd.DataFrame, horizons: List[int] = None, run: Optional[FeatureRun] = None) -> Dict:
         if horizons is None:
             horizons = [1,5,10,20,60]
         if df.empty:
             return {}
         labels = {}
-        returns = df['close'].pct_change()
+        returns = self._shared(df, run).get('returns')
         for h in horizons:
             if len(returns) > h:
                 fr = (df['close'].shift(-h) - df['close']) / df['close']
@@ -711,13 +694,12 @@ class FeatureEngineer:
             labels['next_move_down'] = int(next_ret.iloc[-2] < -threshold) if len(next_ret.dropna())>2 else int(next_ret.iloc[0] < -threshold)
         return labels
 
-    def calculate_regime_features(self, df: pd.DataFrame) -> Dict:
+    def calculate_regime_features(self, df: pd.DataFrame, run: Optional[FeatureRun] = None) -> Dict:
         if df.empty or 'close' not in df.columns:
             return {}
         regimes = {}
         # Volatility regimes via rolling std of returns
-        returns = df['close'].pct_change()
-        roll_vol = returns.rolling(60).std()
+        roll_vol = self._shared(df, run).get('returns_std_60')
         if roll_vol.dropna().empty:
             return {}
         q_low, q_med = roll_vol.quantile(0.33), roll_vol.quantile(0.66)
@@ -778,16 +760,104 @@ class FeatureEngineer:
         return regimes
 
 
-    def process_full_pipeline(self, df: pd.DataFrame) -> Dict:
+    @staticmethod
+    def _capture_indicator_state(df: pd.DataFrame, run: FeatureRun) -> Optional[IndicatorState]:
+        """Indicator state after the last bar of a full run"""
+        if 'datetime' not in df.columns or not all(col in df.columns for col in TAIL_COLUMNS):
+            return None
+        obv = pd.Series(run.get('obv')).ffill()
+        typical = (df['high'] + df['low'] + df['close']) / 3
+        return IndicatorState(
+            tail=df[['datetime', *TAIL_COLUMNS]].tail(TAIL_ROWS).reset_index(drop=True),
+            ema={span: run.get(f'close_ema_{span}').iloc[-1] for span in EMA_SPANS},
+            macd_signal=run.get('macd_signal').iloc[-1],
+            kama=run.get('kama_10_30')[1],
+            obv=obv.iloc[-1] if obv.notna().any() else 0.0,
+            vwap_pv=float((typical * df['volume']).sum()),
+            vwap_volume=float(df['volume'].sum()),
+            returns=RunningMoments().update(run.get('returns')),
+            rows=len(df)
+        )
+
+    @staticmethod
+    def _resume_indicator_columns(frame: pd.DataFrame, n_tail: int, state: IndicatorState,
+                                  out: FeatureColumns) -> IndicatorState:
+        """
+        Recompute the recursive columns of the new rows (frame[n_tail:]) from the
+        stored state and return the advanced state
+
+        Args:
+            frame: Stored tail followed by the new bars
+            n_tail: Number of tail rows at the start of frame
+            state: State after the last stored bar
+            out: Enriched columns of frame (overwritten from row n_tail on)
+        """
+        def overwrite(name, values):
+            column = out[name].to_numpy(dtype=np.float64, copy=True)
+            column[n_tail:] = values
+            out[name] = column
+
+        new = frame.iloc[n_tail:]
+        close = new['close'].to_numpy(dtype=np.float64)
+        volume = new['volume'].to_numpy(dtype=np.float64)
+
+        ema = {span: indicator_kernels.ema(close, span, state.ema.get(span), return_state=True)
+               for span in EMA_SPANS}
+        for window in [5, 10, 20, 50, 100, 200]:
+            overwrite(f'ema_{window}', ema[window][0])
+        macd = ema[12][0] - ema[26][0]
+        macd_signal, signal_state = indicator_kernels.ema(macd, 9, state.macd_signal, return_state=True)
+        overwrite('macd', macd)
+        overwrite('macd_signal', macd_signal)
+        overwrite('macd_histogram', macd - macd_signal)
+
+        # KAMA smoothing needs the previous `window` closes: take it from the warm frame
+        alpha = indicator_kernels.kama_smoothing(frame['close'].to_numpy(dtype=np.float64), 10, 2, 30)[n_tail:]
+        kama, kama_state = indicator_kernels.adaptive_ema(close, alpha, state.kama, return_state=True)
+        overwrite('kama_10_30', kama)
+
+        prev_close = state.tail['close'].iloc[-1] if not state.tail.empty else None
+        obv = indicator_kernels.obv(close, volume, initial=state.obv, prev_close=prev_close)
+        overwrite('obv', obv)
+        valid_obv = obv[~np.isnan(obv)]
+
+        typical = ((new['high'] + new['low'] + new['close']) / 3).to_numpy(dtype=np.float64)
+        pv = typical * volume
+        cum_pv = state.vwap_pv + np.nancumsum(pv)
+        cum_volume = state.vwap_volume + np.nancumsum(volume)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            vwap = np.where(np.isnan(pv) | np.isnan(volume), np.nan, cum_pv / cum_volume)
+        overwrite('vwap', vwap)
+
+        returns = frame['close'].pct_change().to_numpy()[n_tail:]
+        return IndicatorState(
+            tail=frame[['datetime', *TAIL_COLUMNS]].tail(TAIL_ROWS).reset_index(drop=True),
+            ema={span: value for span, (_, value) in ema.items()},
+            macd_signal=signal_state,
+            kama=kama_state,
+            obv=float(valid_obv[-1]) if valid_obv.size else state.obv,
+            vwap_pv=float(cum_pv[-1]),
+            vwap_volume=float(cum_volume[-1]),
+            returns=state.returns.copy().update(returns),
+            rows=state.rows + len(new)
+        )
+
+    def process_full_pipeline(self, df: pd.DataFrame, indicator_state: Optional[IndicatorState] = None) -> Dict:
         """
         Run the complete feature engineering pipeline
 
         Args:
             df: Raw OHLCV DataFrame
+            indicator_state: State stored by the previous run; when given, only bars
+                after it are processed and the frame indicators resume from it
 
         Returns:
             Dictionary containing processed dataframe and all features
+            (plus 'indicator_state' for the next incremental run)
         """
+        if indicator_state is not None:
+            df = indicator_state.new_rows(df)
+
         if df.empty:
             logger.warning("Empty dataframe provided to feature pipeline")
             return {
@@ -801,32 +871,76 @@ class FeatureEngineer:
                 'quality_metrics': {},
                 'labels': {},
                 'technical_extended_latest': {},
-                'feature_metadata': {}
+                'feature_metadata': {},
+                'indicator_state': indicator_state,
+                'statistical_sketches': None
             }
 
-        logger.info(f"Processing {len(df)} rows of data")
+        logger.info(f"Processing {len(df)} rows of data"
+                    + (f" (resuming after {indicator_state.last_datetime})" if indicator_state else ""))
+
+        # Shared intermediates (returns, rolling windows, parsed datetimes) are computed
+        # once for the whole run; stages and nodes are timed for the profile
+        run = SHARED_FEATURES.run(df)
+
+        # Frame indicators of a resumed run are computed over the stored tail + new bars,
+        # so every rolling window starts warm; the tail rows are dropped afterwards
+        if indicator_state is not None:
+            frame = indicator_state.warm_frame(df)
+            n_tail = len(frame) - len(df)
+            frame_run = SHARED_FEATURES.run(frame)
+        else:
+            frame, n_tail, frame_run = df, 0, run
+
+        # Indicator, ML and advanced columns are written into one preallocated block
+        # together with the source columns; the enriched frame is built from it once
+        enriched = FeatureColumns(frame, self.TECHNICAL_WIDTH + self.ML_WIDTH + self.ADVANCED_WIDTH,
+                                  self.column_dtype)
 
         # Calculate technical indicators
-        df_with_indicators = self.calculate_technical_indicators(df)
+        with run.timed('stage:technical_indicators'):
+            self._technical_columns(frame, frame_run, enriched)
 
         # Calculate ML features
-        df_with_ml = self.calculate_ml_features(df_with_indicators)
+        with run.timed('stage:ml_features'):
+            self._ml_columns(frame, frame_run, enriched)
 
         # Calculate statistical features
-        statistical_features = self.calculate_statistical_features(df)
+        with run.timed('stage:statistical_features'):
+            statistical_features = self.calculate_statistical_features(df, run=run)
+            # Mergeable summary of the same statistics, combined with the stored one on updates
+            statistical_sketches = None
+            if all(col in df.columns for col in TAIL_COLUMNS):
+                prev_close = (indicator_state.tail['close'].iloc[-1]
+                              if indicator_state is not None and not indicator_state.tail.empty else None)
+                statistical_sketches = StatisticalSketches.from_frame(df, run.get('returns'), prev_close)
 
         # Calculate time-based features
-        time_features = self.calculate_time_based_features(df)
+        with run.timed('stage:time_features'):
+            time_features = self.calculate_time_based_features(df, run=run)
 
         # Calculate microstructure features
-        microstructure_features = self.calculate_market_microstructure(df)
+        with run.timed('stage:microstructure'):
+            microstructure_features = self.calculate_market_microstructure(df, run=run)
         
         # Calculate granular minute-level features
         self._report_progress('Granular Analysis', 70)
-        granular_features = self.calculate_granular_minute_features(df)
+        with run.timed('stage:granular_minute'):
+            granular_features = self.calculate_granular_minute_features(df, run=run)
 
         # Advanced technical indicators
-        df_adv = self.calculate_advanced_technical(df_with_ml)
+        with run.timed('stage:advanced_technical'):
+            self._advanced_columns(frame, frame_run, enriched)
+
+        # Recursive indicators (EMA, MACD, KAMA, OBV, VWAP) continue from the stored state
+        with run.timed('stage:indicator_state'):
+            if indicator_state is not None:
+                next_state = self._resume_indicator_columns(frame, n_tail, indicator_state, enriched)
+            else:
+                next_state = self._capture_indicator_state(frame, frame_run)
+            df_adv = enriched.to_frame()
+            if n_tail:
+                df_adv = df_adv.iloc[n_tail:].set_axis(df.index)
 
         # Extract latest extended indicators
         latest_ext = {}
@@ -837,7 +951,8 @@ class FeatureEngineer:
                     latest_ext[col] = float(latest_row[col])
 
         # Multi timeframe
-        multi_tf, multi_frames = self._multi_timeframe_metrics_and_frames(df)
+        with run.timed('stage:multi_timeframe'):
+            multi_tf, multi_frames = self._multi_timeframe_metrics_and_frames(df)
 
         # Quality metrics (basic implementation)
         quality = {
@@ -848,10 +963,16 @@ class FeatureEngineer:
         }
 
         # Regime features
-        regime_features = self.calculate_regime_features(df_adv)
+        with run.timed('stage:regime'):
+            regime_features = self.calculate_regime_features(df_adv, run=run)
 
         # Predictive labels (extended)
-        predictive_labels = self.calculate_predictive_labels(df_adv)
+        with run.timed('stage:predictive_labels'):
+            predictive_labels = self.calculate_predictive_labels(df_adv, run=run)
+            label_series = self.generate_predictive_label_series(df_adv, run=run)
+
+        profile = run.profile()
+        logger.debug(f"Feature profile (ms, slowest first): {dict(list(profile.items())[:10])}")
 
         # Metadata
         feature_metadata = {
@@ -859,7 +980,8 @@ class FeatureEngineer:
             'generation_timestamp': datetime.utcnow().isoformat(),
             'source_intervals': 'minute',
             'multi_timeframes': list(multi_tf.keys()),
-            'label_horizons': [1,5,10,20,60]
+            'label_horizons': [1,5,10,20,60],
+            'node_timings_ms': profile
         }
 
         # Merge into final return
@@ -886,7 +1008,9 @@ class FeatureEngineer:
             'regime_features': regime_features,
             'predictive_labels': predictive_labels,
             'multi_timeframe_frames': multi_frames,
-            'predictive_label_series': self.generate_predictive_label_series(df_adv)
+            'predictive_label_series': label_series,
+            'indicator_state': next_state,
+            'statistical_sketches': statistical_sketches
         }
         logger.info("Feature engineering completed successfully")
 
@@ -3,17 +3,42 @@ MongoDB storage module for company profiles
 """
 from pymongo import MongoClient, ASCENDING, DESCENDING
 from pymongo.errors import ConnectionFailure, DuplicateKeyError
+from concurrent.futures import Future
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Sequence
+import numpy as np
 import pandas as pd
 from loguru import logger
 from config import settings
+from utils.resource_pool import ensure_indexes, ensure_timeseries, get_mongo_client
+from utils.bulk_writer import BulkWriteBatcher, get_bulk_writer
+
+# Indexes of the profile collection: (keys, create_index options)
+PROFILE_INDEXES = [
+    ([("symbol", ASCENDING), ("exchange", ASCENDING)], {'unique': True}),  # symbol and exchange
+    ([("last_updated", DESCENDING)], {}),  # last updated
+    ([("company_name", ASCENDING)], {}),  # company name for text search
+]
+
+# Fields of a profile listing (everything else is fetched on demand with get_profile)
+PROFILE_SUMMARY_FIELDS = ('symbol', 'exchange', 'company_name', 'sector', 'data_points_count',
+                          'data_date_range', 'last_updated')
+
+ML_COLLECTION = 'ml_profiles'
+STATISTICAL_COLLECTION = 'statistical_profiles'
+SYMBOL_INDEXES = [([('symbol', ASCENDING)], {'unique': True})]
+
+# Minute bars: time-series collection bucketed per symbol (metaField) and time
+BARS_COLLECTION = 'minute_bars'
+BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+BAR_INDEXES = [([('symbol', ASCENDING), ('datetime', ASCENDING)], {})]
 
 
 class MongoDBStorage:
     """Handles storage and retrieval of company profiles in MongoDB"""
 
-    def __init__(self, uri: Optional[str] = None, database: Optional[str] = None, collection: Optional[str] = None):
+    def __init__(self, uri: Optional[str] = None, database: Optional[str] = None, collection: Optional[str] = None,
+                 shared: bool = True):
         """
         Initialize MongoDB connection
 
@@ -21,16 +46,23 @@ class MongoDBStorage:
             uri: MongoDB connection URI
             database: Database name
             collection: Collection name
+            shared: Use the process-wide client (False opens a private one, closed by close())
+                and, if MONGO_WRITE_BEHIND is set, the process-wide write-behind batcher
         """
         self.uri = uri or settings.mongodb_uri
         self.database_name = database or settings.mongodb_database
         self.collection_name = collection or settings.mongodb_collection
+        self.shared = shared
 
         try:
-            self.client = MongoClient(self.uri, serverSelectionTimeoutMS=5000)
-            # Test connection
-            self.client.admin.command('ping')
-            logger.info(f"Successfully connected to MongoDB at {self.uri}")
+            if shared:
+                # Pinged once per process
+                self.client = get_mongo_client(self.uri)
+            else:
+                self.client = MongoClient(self.uri, serverSelectionTimeoutMS=5000)
+                # Test connection
+                self.client.admin.command('ping')
+            logger.debug(f"Connected to MongoDB at {self.uri}")
 
             self.db = self.client[self.database_name]
             self.collection = self.db[self.collection_name]
@@ -38,23 +70,26 @@ class MongoDBStorage:
             # Create indexes
             self._create_indexes()
 
+            # Upserts from every worker share unordered bulk batches
+            self.writer: Optional[BulkWriteBatcher] = None
+            if shared and settings.mongo_write_behind:
+                self.writer = get_bulk_writer(self.db, settings.mongo_write_batch_size,
+                                              settings.mongo_write_flush_ms / 1000)
+
         except ConnectionFailure as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             raise
 
     def _create_indexes(self):
-        """Create indexes for efficient querying"""
+        """Create indexes for efficient querying (once per process and collection)"""
         try:
-            # Index on symbol and exchange
-            self.collection.create_index([("symbol", ASCENDING), ("exchange", ASCENDING)], unique=True)
-
-            # Index on last updated
-            self.collection.create_index([("last_updated", DESCENDING)])
-
-            # Index on company name for text search
-            self.collection.create_index([("company_name", ASCENDING)])
-
-            logger.info("Indexes created successfully")
+            created = ensure_indexes(self.collection, PROFILE_INDEXES)
+            ensure_indexes(self.db[ML_COLLECTION], SYMBOL_INDEXES)
+            ensure_indexes(self.db[STATISTICAL_COLLECTION], SYMBOL_INDEXES)
+            ensure_timeseries(self.db, BARS_COLLECTION, time_field='datetime', meta_field='symbol')
+            ensure_indexes(self.db[BARS_COLLECTION], BAR_INDEXES)
+            if created:
+                logger.info("Indexes created successfully")
         except Exception as e:
             logger.warning(f"Error creating indexes: {e}")
 
@@ -128,7 +163,13 @@ class MongoDBStorage:
             'technical_extended_latest': features.get('technical_extended_latest', {}),
             'feature_metadata': features.get('feature_metadata', {}),
             'regime_features': features.get('regime_features', {}),
-            'predictive_labels': features.get('predictive_labels', {})
+            'predictive_labels': features.get('predictive_labels', {}),
+
+            # Streaming indicator state and mergeable statistics for incremental updates
+            'indicator_state': (features['indicator_state'].to_dict()
+                                if features.get('indicator_state') is not None else None),
+            'statistical_sketches': (features['statistical_sketches'].to_dict()
+                                     if features.get('statistical_sketches') is not None else None)
         }
 
         return profile
@@ -324,6 +365,72 @@ class MongoDBStorage:
         """
         return self.get_all_profiles(limit)
 
+    def list_profile_summaries(self, skip: int = 0, limit: Optional[int] = None,
+                               sort: Optional[List] = None, query: Optional[Dict] = None,
+                               fields=PROFILE_SUMMARY_FIELDS) -> List[Dict]:
+        """
+        Page of profile summaries (server-side projection, no feature or fundamental blobs)
+
+        Args:
+            skip: Profiles to skip (page offset)
+            limit: Page size (None = all remaining)
+            sort: pymongo sort specification (default: by symbol)
+            query: Optional filter
+            fields: Profile fields to return
+
+        Returns:
+            List of summary dictionaries
+        """
+        try:
+            cursor = self.collection.find(query or {}, {'_id': 0, **{f: 1 for f in fields}},
+                                          sort=sort or [('symbol', ASCENDING)], skip=skip)
+            if limit:
+                cursor = cursor.limit(limit)
+            summaries = list(cursor)
+            logger.debug(f"Retrieved {len(summaries)} profile summaries")
+            return summaries
+        except Exception as e:
+            logger.error(f"Error listing profiles: {e}")
+            return []
+
+    def count_profiles(self, query: Optional[Dict] = None) -> int:
+        """Number of profiles (matching ``query``)"""
+        if not query:
+            # Collection metadata, no scan
+            return self.collection.estimated_document_count()
+        return self.collection.count_documents(query)
+
+    def list_symbols(self) -> List[str]:
+        """Sorted symbols of all stored profiles"""
+        return sorted(s for s in self.collection.distinct('symbol') if s)
+
+    def get_profile_stats(self) -> Dict:
+        """
+        Profile collection statistics computed by the server
+
+        Returns:
+            total_profiles, total_data_points, oldest_update, most_recent_update
+            and sector_distribution (sector -> profiles)
+        """
+        result = next(self.collection.aggregate([{'$facet': {
+            'totals': [{'$group': {
+                '_id': None,
+                'count': {'$sum': 1},
+                'data_points': {'$sum': {'$ifNull': ['$data_points_count', 0]}},
+                'oldest_update': {'$min': '$last_updated'},
+                'most_recent_update': {'$max': '$last_updated'},
+            }}],
+            'sectors': [{'$group': {'_id': {'$ifNull': ['$sector', 'Unknown']}, 'count': {'$sum': 1}}}],
+        }}]), {})
+        totals = (result.get('totals') or [{}])[0]
+        return {
+            'total_profiles': totals.get('count', 0),
+            'total_data_points': totals.get('data_points', 0),
+            'oldest_update': totals.get('oldest_update'),
+            'most_recent_update': totals.get('most_recent_update'),
+            'sector_distribution': {doc['_id']: doc['count'] for doc in result.get('sectors', [])},
+        }
+
     def update_profile(self, symbol: str, profile: Dict, exchange: str = 'US') -> bool:
         """
         Update an existing profile
@@ -400,9 +507,7 @@ class MongoDBStorage:
             True if successful, False otherwise
         """
         try:
-            ml_collection = self.db['ml_profiles']
-            ml_collection.create_index([('symbol', ASCENDING)], unique=True)
-
+            ml_collection = self.db[ML_COLLECTION]
             result = ml_collection.update_one(
                 {'symbol': ml_profile['symbol']},
                 {'$set': ml_profile},
@@ -425,9 +530,7 @@ class MongoDBStorage:
             True if successful, False otherwise
         """
         try:
-            stat_collection = self.db['statistical_profiles']
-            stat_collection.create_index([('symbol', ASCENDING)], unique=True)
-
+            stat_collection = self.db[STATISTICAL_COLLECTION]
             result = stat_collection.update_one(
                 {'symbol': stat_profile['symbol']},
                 {'$set': stat_profile},
@@ -439,6 +542,188 @@ class MongoDBStorage:
             logger.error(f"Error saving statistical profile for {stat_profile['symbol']}: {e}")
             return False
 
+    # ==================== WRITE-BEHIND ====================
+
+    def _upsert(self, collection: str, filter: Dict, fields: Dict) -> Future:
+        """Upsert through the batcher, or synchronously without one (Future of success)"""
+        if self.writer is not None:
+            return self.writer.upsert(collection, filter, fields)
+        future = Future()
+        try:
+            self.db[collection].update_one(filter, {'$set': fields}, upsert=True)
+            future.set_result(True)
+        except Exception as e:
+            logger.error(f"Error saving {filter} to {collection}: {e}")
+            future.set_result(False)
+        return future
+
+    def queue_profile(self, profile: Dict) -> Future:
+        """
+        Queue a company profile upsert without waiting for it
+
+        With MONGO_WRITE_BEHIND the write joins the next bulk batch; the
+        save_* methods still write (and wait) immediately.
+
+        Returns:
+            Future resolving to True once stored (False if this document failed)
+        """
+        return self._upsert(self.collection_name, {'symbol': profile['symbol'], 'exchange': profile['exchange']},
+                            profile)
+
+    def queue_ml_profile(self, ml_profile: Dict) -> Future:
+        """Queue an ML profile upsert (see queue_profile)"""
+        return self._upsert(ML_COLLECTION, {'symbol': ml_profile['symbol']}, ml_profile)
+
+    def queue_statistical_profile(self, stat_profile: Dict) -> Future:
+        """Queue a statistical profile upsert (see queue_profile)"""
+        return self._upsert(STATISTICAL_COLLECTION, {'symbol': stat_profile['symbol']}, stat_profile)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued write is stored
+
+        Returns:
+            False if the writes did not finish within ``timeout``
+        """
+        return self.writer.flush(timeout) if self.writer is not None else True
+
+    # ==================== MINUTE BARS ====================
+
+    def save_bars(self, symbol: str, df: pd.DataFrame, columns: Optional[Sequence[str]] = None,
+                  replace: bool = False, batch_size: int = 10000) -> int:
+        """
+        Store minute bars in the time-series collection with bulk inserts
+
+        Without ``replace`` only bars outside the stored time range are
+        inserted, so re-runs and backfills do not duplicate bars.
+
+        Args:
+            symbol: Stock symbol
+            df: Bars with a datetime column (raw bars or processed_df)
+            columns: Enriched columns stored next to OHLCV (default: BAR_FEATURE_COLUMNS)
+            replace: Delete the symbol's stored bars first (full rebuild)
+            batch_size: Documents per insert_many
+
+        Returns:
+            Number of bars inserted
+        """
+        if df is None or df.empty or 'datetime' not in df.columns:
+            return 0
+        if columns is None:
+            columns = [c.strip() for c in settings.bar_feature_columns.split(',') if c.strip()]
+        fields = [c for c in dict.fromkeys((*BAR_COLUMNS, *columns)) if c in df.columns]
+
+        inserted = 0
+        try:
+            bars = self.db[BARS_COLLECTION]
+            times = pd.to_datetime(df['datetime'])
+            if times.dt.tz is not None:
+                times = times.dt.tz_convert('UTC').dt.tz_localize(None)
+
+            if replace:
+                bars.delete_many({'symbol': symbol})
+            else:
+                first, last = self.get_bar_range(symbol)
+                if first is not None:
+                    keep = ((times < first) | (times > last)).to_numpy()
+                    df, times = df[keep], times[keep]
+
+            stamps = pd.DatetimeIndex(times).to_pydatetime()
+            values = [df[c].to_numpy(dtype=np.float64, na_value=np.nan) for c in fields]
+            for start in range(0, len(df), batch_size):
+                stop = start + batch_size
+                rows = zip(stamps[start:stop], *(v[start:stop].tolist() for v in values))
+                # NaN fields (indicator warm-up) are left out and read back as NaN
+                docs = [
+                    {'symbol': symbol, 'datetime': row[0],
+                     **{name: value for name, value in zip(fields, row[1:]) if value == value}}
+                    for row in rows
+                ]
+                bars.insert_many(docs, ordered=False)
+                inserted += len(docs)
+
+            logger.info(f"Stored {inserted} minute bars for {symbol}")
+        except Exception as e:
+            logger.error(f"Error storing minute bars for {symbol}: {e}")
+        return inserted
+
+    def get_bar_range(self, symbol: str):
+        """
+        First and last stored bar times of ``symbol``
+
+        Returns:
+            (first, last) Timestamps, or (None, None) without stored bars
+        """
+        bars = self.db[BARS_COLLECTION]
+        projection = {'_id': 0, 'datetime': 1}
+        first = bars.find_one({'symbol': symbol}, projection, sort=[('datetime', ASCENDING)])
+        if first is None:
+            return None, None
+        last = bars.find_one({'symbol': symbol}, projection, sort=[('datetime', DESCENDING)])
+        return pd.Timestamp(first['datetime']), pd.Timestamp(last['datetime'])
+
+    def iter_bars(self, symbol: str, start=None, end=None, columns: Optional[Sequence[str]] = None,
+                  chunk_size: int = 50000) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Stream stored bars of ``symbol`` in time order as columnar chunks
+
+        Args:
+            symbol: Stock symbol
+            start: Inclusive start time (anything pd.Timestamp accepts, naive = UTC)
+            end: Exclusive end time
+            columns: Fields to read (default: all stored fields)
+            chunk_size: Bars per yielded chunk
+
+        Yields:
+            {'datetime': datetime64[ns] array, column: float64 array, ...}
+        """
+        query = {'symbol': symbol}
+        time_range = {}
+        if start is not None:
+            time_range['$gte'] = pd.Timestamp(start).to_pydatetime()
+        if end is not None:
+            time_range['$lt'] = pd.Timestamp(end).to_pydatetime()
+        if time_range:
+            query['datetime'] = time_range
+
+        projection = {'_id': 0, 'symbol': 0}
+        if columns is not None:
+            projection = {'_id': 0, 'datetime': 1, **{c: 1 for c in columns}}
+
+        cursor = self.db[BARS_COLLECTION].find(query, projection, sort=[('datetime', ASCENDING)],
+                                               batch_size=min(chunk_size, 10000))
+        docs = []
+        for doc in cursor:
+            docs.append(doc)
+            if len(docs) >= chunk_size:
+                yield _bars_to_columns(docs, columns)
+                docs = []
+        if docs:
+            yield _bars_to_columns(docs, columns)
+
+    def get_bars(self, symbol: str, start=None, end=None,
+                 columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Stored bars of ``symbol`` in [start, end) as columnar arrays (see iter_bars)
+
+        Returns:
+            {'datetime': array, column: array, ...}, empty if no bars are stored
+        """
+        try:
+            chunks = list(self.iter_bars(symbol, start, end, columns))
+        except Exception as e:
+            logger.error(f"Error reading minute bars for {symbol}: {e}")
+            return {}
+        if not chunks:
+            return {}
+        names = list(dict.fromkeys(name for chunk in chunks for name in chunk))
+        return {
+            name: np.concatenate([
+                chunk[name] if name in chunk else np.full(len(chunk['datetime']), np.nan) for chunk in chunks
+            ])
+            for name in names
+        }
+
     def get_ml_profile(self, symbol: str) -> Optional[Dict]:
         """
         Retrieve ML profile for a symbol
@@ -450,7 +735,7 @@ class MongoDBStorage:
             ML profile or None if not found
         """
         try:
-            ml_collection = self.db['ml_profiles']
+            ml_collection = self.db[ML_COLLECTION]
             profile = ml_collection.find_one({'symbol': symbol})
             if profile:
                 logger.info(f"Retrieved ML profile for {symbol}")
@@ -472,7 +757,7 @@ class MongoDBStorage:
             Statistical profile or None if not found
         """
         try:
-            stat_collection = self.db['statistical_profiles']
+            stat_collection = self.db[STATISTICAL_COLLECTION]
             profile = stat_collection.find_one({'symbol': symbol})
             if profile:
                 logger.info(f"Retrieved statistical profile for {symbol}")
@@ -484,15 +769,24 @@ class MongoDBStorage:
             return None
 
     def close(self):
-        """Close the MongoDB connection"""
-        if hasattr(self, 'client'):
+        """Close the MongoDB connection (the shared client stays open for other users)"""
+        if getattr(self, 'client', None) is None:
+            return
+        if not getattr(self, 'shared', False):
             self.client.close()
             logger.info("MongoDB connection closed")
+        self.client = None
 
     def __del__(self):
         """Ensure connection is closed when object is destroyed"""
         self.close()
 
 
-# Import numpy for risk calculations
-import numpy as np
+def _bars_to_columns(docs: List[Dict], columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+    """Bar documents -> columnar arrays (fields missing from a document become NaN)"""
+    if columns is None:
+        columns = [name for name in dict.fromkeys(k for doc in docs for k in doc) if name != 'datetime']
+    out = {'datetime': np.array([doc['datetime'] for doc in docs], dtype='datetime64[ns]')}
+    for name in columns:
+        out[name] = np.fromiter((doc.get(name, np.nan) for doc in docs), dtype=np.float64, count=len(docs))
+    return out
@@ -37,7 +37,7 @@ class MinuteDataPipeline:
         logger.info("Initializing Minute Data Pipeline")
 
         self.data_fetcher = EODHDDataFetcher()
-        self.feature_engineer = FeatureEngineer()
+        self.feature_engineer = FeatureEngineer(compact_dtypes=settings.feature_compact_dtypes)
         self.storage = MongoDBStorage()
 
         logger.info("Pipeline initialized successfully")
@@ -107,6 +107,7 @@ class MinuteDataPipeline:
             # Step 5: Save to MongoDB
             logger.info(f"Step 5: Saving profile for {symbol} to MongoDB")
             success = self.storage.save_profile(profile)
+            self._store_bars(symbol, df, features)
 
             if success:
                 logger.info(f"Successfully processed and saved {symbol}")
@@ -169,6 +170,14 @@ class MinuteDataPipeline:
 
         return results
 
+    def _store_bars(self, symbol: str, df: pd.DataFrame, features: dict, replace: bool = False):
+        """Store the processed bars (raw bars without processed_df) in the minute bar collection"""
+        if not settings.store_minute_bars:
+            return
+        processed = features.get('processed_df')
+        self.storage.save_bars(symbol, processed if processed is not None and not processed.empty else df,
+                               replace=replace)
+
     def get_profile(self, symbol: str, exchange: str = 'US') -> Optional[dict]:
         """
         Retrieve a company profile from storage
@@ -217,27 +226,22 @@ class MinuteDataPipeline:
         Returns:
             Dictionary with pipeline statistics
         """
-        all_profiles = self.get_all_profiles()
+        # Counts and dates are aggregated by the server; no profile documents are loaded
+        profile_stats = self.storage.get_profile_stats()
 
         stats = {
-            'total_profiles': len(all_profiles),
+            'total_profiles': profile_stats['total_profiles'],
             'last_run': datetime.utcnow().isoformat(),
-            'symbols_tracked': [p['symbol'] for p in all_profiles],
+            'symbols_tracked': self.storage.list_symbols(),
         }
 
-        if all_profiles:
-            # Sector distribution
-            sectors = {}
-            for profile in all_profiles:
-                sector = profile.get('sector', 'Unknown')
-                sectors[sector] = sectors.get(sector, 0) + 1
-            stats['sector_distribution'] = sectors
+        if profile_stats['total_profiles']:
+            stats['sector_distribution'] = profile_stats['sector_distribution']
 
             # Last updated times
-            updates = [p.get('last_updated') for p in all_profiles if 'last_updated' in p]
-            if updates:
-                stats['most_recent_update'] = max(updates).isoformat()
-                stats['oldest_update'] = min(updates).isoformat()
+            if profile_stats['most_recent_update'] is not None:
+                stats['most_recent_update'] = profile_stats['most_recent_update'].isoformat()
+                stats['oldest_update'] = profile_stats['oldest_update'].isoformat()
 
         return stats
 
@@ -286,6 +290,7 @@ class MinuteDataPipeline:
                 fundamentals = self.data_fetcher.fetch_fundamental_data(symbol, exchange) if fetch_fundamentals else {}
                 profile = self.storage.create_company_profile(symbol, exchange, combined, features, fundamentals)
                 saved = self.storage.save_profile(profile)
+                self._store_bars(symbol, combined, features)
                 return saved
             else:
                 logger.info(f"Full history fetch for {symbol}")
@@ -299,6 +304,7 @@ class MinuteDataPipeline:
                 features = self.feature_engineer.process_full_pipeline(full_df)
                 profile = self.storage.create_company_profile(symbol, exchange, full_df, features, fundamentals)
                 saved = self.storage.save_profile(profile)
+                self._store_bars(symbol, full_df, features, replace=True)
                 return saved
         except Exception as e:
             logger.error(f"Full history processing failed for {symbol}: {e}", exc_info=True)
@@ -59,6 +59,27 @@ def qapp_with_cleanup(qapp):
 # Database and Cache Fixtures
 # ============================================================================
 
+@pytest.fixture(scope="session", autouse=True)
+def isolated_quota_ledger(tmp_path_factory):
+    """
+    Point the cross-process API quota ledger at a temporary file,
+    so test runs never create or consume ~/.pipeline_api_quota.db
+    """
+    from config import settings
+
+    path = str(tmp_path_factory.mktemp('quota') / 'api_quota.db')
+    previous_env = os.environ.get('API_QUOTA_LEDGER_PATH')
+    previous = settings.api_quota_ledger_path
+    os.environ['API_QUOTA_LEDGER_PATH'] = path
+    settings.api_quota_ledger_path = path
+    yield path
+    settings.api_quota_ledger_path = previous
+    if previous_env is None:
+        os.environ.pop('API_QUOTA_LEDGER_PATH', None)
+    else:
+        os.environ['API_QUOTA_LEDGER_PATH'] = previous_env
+
+
 @pytest.fixture
 def in_memory_cache():
     """Provide an in-memory SQLite cache for testing"""
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import time
+
+from pymongo.errors import AutoReconnect, BulkWriteError
+from utils.bulk_writer import BulkWriteBatcher
+
+
+class RecordingDatabase:
+    """Database double: collections record their bulk_write calls"""
+
+    def __init__(self, failures=None):
+        self.calls = []
+        # Exceptions raised by the next bulk_write calls, in order
+        self.failures = list(failures or [])
+
+    def __getitem__(self, name):
+        database = self
+
+        class Collection:
+            def bulk_write(self, requests, ordered=True):
+                assert not ordered
+                database.calls.append((name, [(r._filter, r._doc['$set']) for r in requests]))
+                if database.failures:
+                    raise database.failures.pop(0)
+
+        return Collection()
+
+
+def test_batches_by_size_and_merges_same_document():
+    db = RecordingDatabase()
+    writer = BulkWriteBatcher(db, batch_size=3, flush_interval=60)
+    try:
+        first = writer.upsert('profiles', {'symbol': 'AAPL'}, {'a': 1})
+        second = writer.upsert('profiles', {'symbol': 'AAPL'}, {'b': 2})
+        assert writer.pending == 1
+        futures = [writer.upsert('profiles', {'symbol': s}, {'a': 0}) for s in ('MSFT', 'NVDA')]
+
+        assert all(f.result(timeout=5) for f in [first, second, *futures])
+        assert db.calls == [('profiles', [({'symbol': 'AAPL'}, {'a': 1, 'b': 2}),
+                                          ({'symbol': 'MSFT'}, {'a': 0}),
+                                          ({'symbol': 'NVDA'}, {'a': 0})])]
+    finally:
+        writer.close()
+
+
+def test_flushes_by_age_and_on_request():
+    db = RecordingDatabase()
+    writer = BulkWriteBatcher(db, batch_size=100, flush_interval=0.05)
+    try:
+        assert writer.upsert('ml_profiles', {'symbol': 'AAPL'}, {'x': 1}).result(timeout=5)
+        assert len(db.calls) == 1
+
+        writer.flush_interval = 60
+        future = writer.upsert('ml_profiles', {'symbol': 'MSFT'}, {'x': 2})
+        time.sleep(0.1)
+        assert not future.done()
+        assert writer.flush(timeout=5)
+        assert future.result(timeout=0)
+        assert writer.pending == 0
+    finally:
+        writer.close()
+
+
+def test_failed_documents_and_retries():
+    error = BulkWriteError({'writeErrors': [{'index': 1, 'code': 11000, 'errmsg': 'duplicate key'}]})
+    db = RecordingDatabase(failures=[AutoReconnect('primary stepped down'), error])
+    writer = BulkWriteBatcher(db, batch_size=100, flush_interval=60, retry_delay=0.01)
+    try:
+        good = writer.upsert('profiles', {'symbol': 'AAPL'}, {'a': 1})
+        bad = writer.upsert('profiles', {'symbol': 'MSFT'}, {'a': 1})
+        assert writer.flush(timeout=5)
+
+        # Retried once after the connection error; only the rejected document fails
+        assert len(db.calls) == 2
+        assert good.result() is True
+        assert bad.result() is False
+        assert writer.stats['retries'] == 1
+        assert writer.stats['failed'] == 1
+    finally:
+        writer.close()
@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+from dashboard.services.compute_pool import ComputePool, FrameExchange
+from dashboard.services.ml_model_trainer import MLModelTrainer
+from feature_engineering import FeatureEngineer
+
+
+def make_bars(n=1500):
+    rng = np.random.default_rng(5)
+    close = 100 + np.cumsum(rng.normal(0, 0.05, n))
+    return pd.DataFrame({
+        'timestamp': np.arange(n, dtype=np.int64) * 60,
+        'datetime': pd.date_range('2024-01-02 09:30', periods=n, freq='1min'),
+        'open': close + rng.normal(0, 0.02, n),
+        'high': close + 0.1,
+        'low': close - 0.1,
+        'close': close,
+        'volume': rng.integers(1000, 50000, n).astype(float)
+    })
+
+
+def test_frame_exchange_round_trip():
+    df = make_bars(50)
+    df['local_time'] = df['datetime'].dt.tz_localize('US/Eastern')
+    with FrameExchange() as exchange:
+        handle = exchange.put(df)
+        assert exchange.put(df) is handle  # written once per frame
+
+        mapped = exchange.get(handle)
+        pd.testing.assert_frame_equal(mapped, df)
+        base = mapped['close'].to_numpy()
+        while base.base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        assert isinstance(base, np.memmap)
+
+        # Copy-on-write: writes stay private to the mapping
+        mapped.loc[0, 'close'] = -1.0
+        assert exchange.get(handle)['close'].iloc[0] == df['close'].iloc[0]
+
+        shifted = df.set_index(df.index + 10)
+        pd.testing.assert_frame_equal(exchange.get(exchange.put(shifted)), shifted)
+
+        with pytest.raises(TypeError):
+            exchange.put(pd.DataFrame({'name': ['a', 'b']}))
+    assert not exchange.path.exists()
+
+
+def test_pool_matches_in_process_results():
+    df = make_bars()
+    expected = FeatureEngineer().process_full_pipeline(df.copy())
+    expected_models = MLModelTrainer(n_jobs=1).train_models(expected, df, 'TEST')
+
+    pool = ComputePool(max_workers=1)
+    try:
+        with pool.exchange() as exchange:
+            features = pool.process_full_pipeline(exchange, df, indicator_state=None)
+            pd.testing.assert_frame_equal(features['processed_df'], expected['processed_df'])
+            assert features['statistical_features'] == pytest.approx(expected['statistical_features'], nan_ok=True)
+            assert features['indicator_state'].rows == expected['indicator_state'].rows
+
+            models = pool.train_models(exchange, features, df, 'TEST')
+            models.pop('trained_at', None)
+            expected_models.pop('trained_at', None)
+            assert models == expected_models
+    finally:
+        pool.shutdown()
@@ -0,0 +1,171 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pandas as pd
+import numpy as np
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from dashboard.services.data_fetch_cache import DataFetchCache
+
+
+def make_bars(start, end):
+    dt_index = pd.date_range(start, end, freq='1min', inclusive='left')
+    rows = len(dt_index)
+    close = 100 + np.cumsum(np.random.normal(0, 0.05, rows))
+    return pd.DataFrame({
+        'datetime': dt_index,
+        'open': close,
+        'high': close + 0.1,
+        'low': close - 0.1,
+        'close': close,
+        'volume': np.random.randint(1000, 50000, rows)
+    })
+
+
+def test_batches_stored_as_monthly_partitions(tmp_path):
+    cache = DataFetchCache(cache_dir=str(tmp_path))
+    cache.set('TEST', '2024-01-20', '2024-02-10', make_bars('2024-01-20', '2024-02-10'))
+    cache.set('TEST', '2024-02-10', '2024-03-05', make_bars('2024-02-10', '2024-03-05'))
+
+    parts = sorted(p.name for p in (tmp_path / 'partitions' / 'TEST').glob('*.parquet'))
+    assert parts == ['2024-01.parquet', '2024-02.parquet', '2024-03.parquet']
+    assert not list(tmp_path.glob('*.pkl'))
+
+
+def test_date_range_read_prunes_rows_and_columns(tmp_path):
+    cache = DataFetchCache(cache_dir=str(tmp_path))
+    df = make_bars('2024-01-01', '2024-03-01')
+    cache.set('TEST', '2024-01-01', '2024-03-01', df)
+
+    out = cache.get_data_for_date_range('TEST', '2024-01-10', '2024-01-20', columns=['close', 'volume'])
+    assert list(out.columns) == ['datetime', 'close', 'volume']
+    assert out['datetime'].min() == pd.Timestamp('2024-01-10')
+    assert out['datetime'].max() == pd.Timestamp('2024-01-20 23:59')  # the end date is a whole day
+    expected = df[(df['datetime'] >= '2024-01-10') & (df['datetime'] < '2024-01-21')]
+    assert np.allclose(out['close'].values, expected['close'].values)
+
+
+def session_bars(days):
+    """Regular-session minute bars (14:30-21:00 UTC, 390 per day)"""
+    stamps = [pd.date_range(f'{day} 14:30', periods=390, freq='1min') for day in days]
+    return pd.DataFrame({'datetime': stamps[0].append(stamps[1:]), 'close': np.arange(390.0 * len(days))})
+
+
+def test_intraday_bars_of_the_end_date_round_trip(tmp_path):
+    cache = DataFetchCache(cache_dir=str(tmp_path))
+    first, second = session_bars(['2024-01-02', '2024-01-03']), session_bars(['2024-01-04', '2024-01-05'])
+    cache.set('TEST', '2024-01-02', '2024-01-03', first)
+    cache.set('TEST', '2024-01-04', '2024-01-05', second)
+
+    assert len(cache.get('TEST', '2024-01-02', '2024-01-03')) == 780
+    out = cache.get_data_for_date_range('TEST', '2024-01-02', '2024-01-08')
+    assert len(out) == 1560
+    assert sorted(out['datetime'].dt.strftime('%Y-%m-%d').unique()) == [
+        '2024-01-02', '2024-01-03', '2024-01-04', '2024-01-05']
+    assert len(cache.get_data_for_date_range('TEST', '2024-01-03', '2024-01-04')) == 780
+
+
+def test_overlapping_batches_are_deduplicated(tmp_path):
+    cache = DataFetchCache(cache_dir=str(tmp_path))
+    df = make_bars('2024-01-01', '2024-01-05')
+    cache.set('TEST', '2024-01-01', '2024-01-03', df[df['datetime'] < '2024-01-03'])
+    cache.set('TEST', '2024-01-02', '2024-01-05', df[df['datetime'] >= '2024-01-02'])
+
+    out = cache.get_data_for_date_range('TEST', '2024-01-01', '2024-01-05')
+    assert len(out) == len(df)
+    assert out['datetime'].is_monotonic_increasing
+
+
+def test_clear_symbol_removes_partitions(tmp_path):
+    cache = DataFetchCache(cache_dir=str(tmp_path))
+    cache.set('TEST', '2024-01-01', '2024-02-01', make_bars('2024-01-01', '2024-02-01'))
+    assert cache.clear_symbol('TEST')
+    assert not (tmp_path / 'partitions' / 'TEST').exists()
+    assert cache.get_data_for_date_range('TEST', '2024-01-01', '2024-02-01') is None
+    assert cache.get_stats()['total_size_mb'] == 0
+
+
+def test_uncovered_ranges_report_exact_gaps(tmp_path):
+    cache = DataFetchCache(cache_dir=str(tmp_path))
+    cache.set('TEST', '2024-01-01', '2024-01-10', make_bars('2024-01-01', '2024-01-10'))
+    cache.set('TEST', '2024-01-10', '2024-01-15', make_bars('2024-01-10', '2024-01-15'))
+    cache.set('TEST', '2024-01-20', '2024-01-25', make_bars('2024-01-20', '2024-01-25'))
+
+    assert cache.get_uncovered_ranges('TEST', '2024-01-02', '2024-01-14') == []
+    assert cache.is_date_range_cached('TEST', '2024-01-01', '2024-01-15')
+    assert not cache.is_date_range_cached('TEST', '2024-01-01', '2024-01-21')
+    assert cache.get_uncovered_ranges('TEST', '2023-12-25', '2024-01-31') == [
+        ('2023-12-25', '2023-12-31'),
+        ('2024-01-16', '2024-01-19'),
+        ('2024-01-26', '2024-01-31'),
+    ]
+    assert cache.get_uncovered_ranges('TEST', '2024-01-15', '2024-01-20') == [('2024-01-16', '2024-01-19')]
+    assert cache.get_uncovered_ranges('OTHER', '2024-01-01', '2024-01-05') == [('2024-01-01', '2024-01-05')]
+    assert len(cache.get_covering_cache_entries('TEST', '2024-01-12', '2024-01-21')) == 2
+
+
+def test_adjacent_batches_leave_no_gap(tmp_path):
+    cache = DataFetchCache(cache_dir=str(tmp_path))
+    cache.set('TEST', '2024-01-01', '2024-01-10', make_bars('2024-01-01', '2024-01-11'))
+    cache.set('TEST', '2024-01-11', '2024-01-20', make_bars('2024-01-11', '2024-01-21'))
+
+    assert cache.get_uncovered_ranges('TEST', '2024-01-01', '2024-01-20') == []
+    assert cache.is_date_range_cached('TEST', '2024-01-05', '2024-01-15')
+    assert cache.get_uncovered_ranges('TEST', '2024-01-01', '2024-01-22') == [('2024-01-21', '2024-01-22')]
+
+
+def test_coverage_index_survives_reload_and_clear(tmp_path):
+    cache = DataFetchCache(cache_dir=str(tmp_path))
+    cache.set('TEST', '2024-01-01', '2024-01-10', make_bars('2024-01-01', '2024-01-10'))
+
+    reloaded = DataFetchCache(cache_dir=str(tmp_path))
+    assert reloaded.is_date_range_cached('TEST', '2024-01-03', '2024-01-08')
+
+    reloaded.clear_symbol('TEST')
+    assert reloaded.get_covering_cache_entries('TEST', '2024-01-01', '2024-01-10') == []
+
+
+def test_expired_entries_drop_out_of_coverage(tmp_path):
+    cache = DataFetchCache(cache_dir=str(tmp_path), ttl_hours=1)
+    cache.set('TEST', '2024-01-01', '2024-01-10', make_bars('2024-01-01', '2024-01-10'))
+    key = cache.get_covering_cache_entries('TEST', '2024-01-01', '2024-01-10')[0]
+
+    later = pd.Timestamp.now().timestamp() + 2 * 3600
+    assert cache.coverage_index.covering('TEST', '2024-01-01', '2024-01-10', now=later) == []
+    assert key in cache.metadata
+
+
+def test_empty_ranges_count_as_covered(tmp_path):
+    cache = DataFetchCache(cache_dir=str(tmp_path))
+    assert cache.mark_empty('TEST', '2024-01-01', '2024-01-10')
+    cache.set('TEST', '2024-01-10', '2024-01-12', make_bars('2024-01-10', '2024-01-12'))
+
+    reloaded = DataFetchCache(cache_dir=str(tmp_path))
+    assert reloaded.get_uncovered_ranges('TEST', '2024-01-01', '2024-01-12') == []
+    assert reloaded.get_data_for_date_range('TEST', '2024-01-02', '2024-01-05').empty
+    assert reloaded.get('TEST', '2024-01-01', '2024-01-10').empty
+    assert len(reloaded.get_data_for_date_range('TEST', '2024-01-01', '2024-01-12')) == len(make_bars('2024-01-10', '2024-01-12'))
+
+
+def test_size_limit_eviction_scans_the_disk_once(tmp_path, monkeypatch):
+    cache = DataFetchCache(cache_dir=str(tmp_path))
+    for month in range(1, 7):
+        start = f'2024-{month:02d}-01'
+        cache.set('TEST', start, f'2024-{month:02d}-10', make_bars(start, f'2024-{month:02d}-11'))
+    total = cache._total_size_bytes()
+
+    scans = []
+    real_total = cache._total_size_bytes
+    monkeypatch.setattr(cache, '_total_size_bytes', lambda: scans.append(1) or real_total())
+    cache.max_size_bytes = total // 2
+    cache._check_size_limit()
+
+    assert len(scans) == 1
+    assert real_total() <= cache.max_size_bytes
+    assert cache.get_uncovered_ranges('TEST', '2024-06-01', '2024-06-10') == []
+    assert cache.get_uncovered_ranges('TEST', '2024-01-01', '2024-01-10') == [('2024-01-01', '2024-01-10')]
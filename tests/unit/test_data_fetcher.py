@@ -0,0 +1,187 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import threading
+import time
+from datetime import datetime
+import pandas as pd
+import numpy as np
+import pytest
+
+pytest.importorskip('pyarrow')
+
+import dashboard.services.data_fetch_cache as data_fetch_cache
+from dashboard.services.data_fetch_cache import DataFetchCache
+from data_fetcher import EODHDDataFetcher
+from utils.rate_limiter import AdaptiveRateLimiter
+
+
+def make_bars(start, end):
+    dt_index = pd.date_range(start, end, freq='1min', inclusive='left')
+    close = 100 + np.arange(len(dt_index)) * 0.01
+    return pd.DataFrame({
+        'datetime': dt_index,
+        'open': close,
+        'high': close + 0.1,
+        'low': close - 0.1,
+        'close': close,
+        'volume': 1000
+    })
+
+
+@pytest.fixture
+def fetcher(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_fetch_cache, '_cache_instance', DataFetchCache(cache_dir=str(tmp_path)))
+    fetcher = EODHDDataFetcher(api_key='test')
+    fetcher.api_requests = []
+
+    def fake_range(symbol, interval, exchange, from_date, to_date, allow_fallback=True):
+        fetcher.api_requests.append((from_date, to_date))
+        # The end date is a whole day
+        return make_bars(from_date, pd.Timestamp(to_date) + pd.Timedelta(days=1))
+
+    monkeypatch.setattr(fetcher, '_fetch_intraday_range', fake_range)
+    return fetcher
+
+
+def test_only_uncovered_ranges_hit_the_api(fetcher):
+    fetcher.fetch_intraday_data('TEST', from_date='2024-01-01', to_date='2024-01-10')
+    fetcher.fetch_intraday_data('TEST', from_date='2024-01-20', to_date='2024-01-25')
+    fetcher.api_requests.clear()
+
+    df = fetcher.fetch_intraday_data('TEST', from_date='2024-01-05', to_date='2024-01-28')
+
+    assert fetcher.api_requests == [('2024-01-11', '2024-01-19'), ('2024-01-26', '2024-01-28')]
+    expected = make_bars('2024-01-05', '2024-01-29')
+    assert len(df) == len(expected)
+    assert df['datetime'].is_monotonic_increasing
+    assert df['datetime'].is_unique
+
+
+def test_fully_cached_range_makes_no_api_calls(fetcher):
+    fetcher.fetch_intraday_data('TEST', from_date='2024-01-01', to_date='2024-01-10')
+    fetcher.api_requests.clear()
+
+    df = fetcher.fetch_intraday_data('TEST', from_date='2024-01-02', to_date='2024-01-09')
+
+    assert fetcher.api_requests == []
+    assert df['datetime'].min() == pd.Timestamp('2024-01-02')
+
+
+def test_fetch_windows_runs_concurrently_and_keeps_order(fetcher):
+    windows = [(pd.Timestamp('2024-01-01') + pd.Timedelta(days=2 * i),
+                pd.Timestamp('2024-01-01') + pd.Timedelta(days=2 * i + 3)) for i in range(8)]
+
+    def slow_fetch(start, end):
+        time.sleep(0.2)
+        return make_bars(start, end)
+
+    start = time.time()
+    df = fetcher.fetch_windows(windows, slow_fetch, max_concurrency=8)
+    assert time.time() - start < 1.0
+    assert df['datetime'].is_monotonic_increasing
+    assert df['datetime'].is_unique
+    assert len(df) == len(make_bars('2024-01-01', '2024-01-18'))
+
+
+def test_fetch_windows_stops_after_consecutive_empty(fetcher):
+    windows = [(pd.Timestamp('2024-03-01') - pd.Timedelta(days=i + 1),
+                pd.Timestamp('2024-03-01') - pd.Timedelta(days=i)) for i in range(20)]
+    seen = []
+
+    def fetch(start, end):
+        seen.append(start)
+        return make_bars(start, end) if start >= pd.Timestamp('2024-02-25') else pd.DataFrame()
+
+    df = fetcher.fetch_windows(windows, fetch, max_concurrency=2, stop_after_empty=3)
+    assert df['datetime'].min() == pd.Timestamp('2024-02-25')
+    assert len(seen) < len(windows)
+
+
+def full_limiter():
+    limiter = AdaptiveRateLimiter(calls_per_minute=2, calls_per_day=1000)
+    for _ in range(2):
+        limiter.minute_window.append(datetime.now())
+    return limiter
+
+
+def test_rate_limit_wait_does_not_hold_the_limiter_lock(fetcher):
+    fetcher.rate_limiter = full_limiter()
+    fetcher.cancel_event = threading.Event()
+    errors = []
+
+    def throttle():
+        try:
+            fetcher._throttle_before_call()
+        except RuntimeError as e:
+            errors.append(e)
+
+    waiter = threading.Thread(target=throttle)
+    waiter.start()
+    time.sleep(0.3)
+    assert fetcher._limiter_lock.acquire(timeout=0.5)
+    fetcher._limiter_lock.release()
+    fetcher.cancel_event.set()
+    waiter.join(timeout=5)
+    assert not waiter.is_alive()
+    assert len(errors) == 1
+
+
+def test_fetch_windows_stop_reaches_windows_waiting_for_quota(fetcher):
+    fetcher.rate_limiter = full_limiter()
+    windows = [(pd.Timestamp('2024-03-01') + pd.Timedelta(days=i),
+                pd.Timestamp('2024-03-01') + pd.Timedelta(days=i + 1)) for i in range(6)]
+    sent = []
+
+    def fetch(start, end):
+        if start == windows[0][0]:
+            time.sleep(0.3)
+            return pd.DataFrame()
+        fetcher._throttle_before_call()
+        sent.append(start)
+        return make_bars(start, end)
+
+    started = time.time()
+    df = fetcher.fetch_windows(windows, fetch, max_concurrency=3, stop_after_empty=1)
+    assert df.empty
+    assert sent == []
+    assert time.time() - started < 5
+
+
+def test_empty_gaps_are_not_requested_again(fetcher, monkeypatch):
+    listed = pd.Timestamp('2024-01-10')
+
+    def fake_range(symbol, interval, exchange, from_date, to_date, allow_fallback=True):
+        fetcher.api_requests.append((from_date, to_date))
+        end = pd.Timestamp(to_date) + pd.Timedelta(days=1)
+        return make_bars(max(pd.Timestamp(from_date), listed), end) if end > listed else pd.DataFrame()
+
+    monkeypatch.setattr(fetcher, '_fetch_intraday_range', fake_range)
+    fetcher.fetch_intraday_data('TEST', from_date='2024-01-09', to_date='2024-01-20')
+    fetcher.fetch_intraday_data('TEST', from_date='2024-01-01', to_date='2024-01-20')
+    assert fetcher.api_requests[-1] == ('2024-01-01', '2024-01-08')
+    fetcher.api_requests.clear()
+
+    df = fetcher.fetch_intraday_data('TEST', from_date='2024-01-01', to_date='2024-01-20')
+    assert fetcher.api_requests == []
+    assert df['datetime'].min() == listed
+    assert fetcher.fetch_intraday_data('TEST', from_date='2024-01-02', to_date='2024-01-08').empty
+    assert fetcher.api_requests == []
+
+
+def test_end_date_bars_are_fetched_and_today_stays_uncovered(fetcher):
+    today = pd.Timestamp.now().normalize()
+    from_date, to_date = (today - pd.Timedelta(days=2)).strftime('%Y-%m-%d'), today.strftime('%Y-%m-%d')
+    cache = data_fetch_cache.get_data_cache()
+
+    df = fetcher.fetch_intraday_data('TEST', from_date=from_date, to_date=to_date)
+    assert df['datetime'].max() == today + pd.Timedelta(hours=23, minutes=59)
+    assert cache.is_date_range_cached('TEST', from_date, (today - pd.Timedelta(days=1)).strftime('%Y-%m-%d'))
+    assert not cache.is_date_range_cached('TEST', to_date, to_date)
+
+    fetcher.api_requests.clear()
+    fetcher.fetch_intraday_data('TEST', from_date=from_date, to_date=to_date)
+    assert fetcher.api_requests and fetcher.api_requests[0][1] == to_date
@@ -0,0 +1,124 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import threading
+import time
+from types import SimpleNamespace
+
+from dashboard.controllers import database_controller
+from dashboard.controllers.database_controller import DatabaseController
+
+
+class SlowStorage:
+    """Storage double whose reads block until released"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.reads = []
+        self.pings = 0
+        self.healthy = True
+        self.docs = {}
+        self.client = SimpleNamespace(admin=SimpleNamespace(command=self._ping))
+
+    def _ping(self, cmd):
+        self.pings += 1
+        if not self.healthy:
+            raise ConnectionError('server selection timeout')
+        return {'ok': 1}
+
+    def count_profiles(self, query=None):
+        return 3
+
+    def get_profile(self, symbol):
+        self.reads.append(symbol)
+        doc = dict(self.docs.get(symbol, {'symbol': symbol}))  # the state when the read started
+        self.release.wait(5)
+        return doc
+
+    def update_profile(self, symbol, profile):
+        self.docs[symbol] = dict(profile)
+
+
+def wait_until(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        qapp.processEvents()
+        time.sleep(0.005)
+    assert condition()
+
+
+def make_controller(monkeypatch):
+    storage = SlowStorage()
+    monkeypatch.setattr(database_controller, 'MongoDBStorage', lambda: storage)
+    controller = DatabaseController()
+    time.sleep(0.1)  # a panel builds its UI before connecting; the first status must still reach it
+    statuses = []
+    controller.signals.connection_status.connect(lambda ok, msg: statuses.append((ok, msg)))
+    return controller, storage, statuses
+
+
+def test_identical_queries_share_one_background_read(qapp, monkeypatch):
+    controller, storage, _ = make_controller(monkeypatch)
+    results = []
+
+    def on_result(profile):
+        results.append((profile['symbol'], threading.current_thread() is threading.main_thread()))
+
+    first = controller.submit('get_profile', 'AAPL', callback=on_result)
+    second = controller.submit('get_profile', 'AAPL', callback=on_result)
+    other = controller.submit('get_profile', 'MSFT', callback=on_result)
+    assert first is second and other is not first
+    assert not first.done()  # the GUI thread did not wait
+
+    storage.release.set()
+    wait_until(qapp, lambda: len(results) == 3)
+    assert sorted(storage.reads) == ['AAPL', 'MSFT']
+    assert sorted(results) == [('AAPL', True), ('AAPL', True), ('MSFT', True)]
+
+    # Served from the profile cache now; no new in-flight entry is left behind
+    controller.submit('get_profile', 'AAPL').result(5)
+    assert sorted(storage.reads) == ['AAPL', 'MSFT'] and not controller._inflight
+    controller.close()
+
+
+def test_reads_after_a_write_see_the_written_profile(qapp, monkeypatch):
+    controller, storage, _ = make_controller(monkeypatch)
+    storage.docs['AAPL'] = {'symbol': 'AAPL', 'sector': 'old'}
+    written = {'symbol': 'AAPL', 'sector': 'new'}
+
+    before = controller.submit('get_profile', 'AAPL', use_cache=False)
+    wait_until(qapp, lambda: storage.reads)  # read under way with the old document
+    write = controller.submit('update_profile', 'AAPL', written)
+    assert controller.submit('update_profile', 'AAPL', written) is not write  # writes are never shared
+    after = controller.submit('get_profile', 'AAPL', use_cache=False)
+    assert after is not before
+
+    storage.release.set()
+    assert before.result(5)['sector'] == 'old'
+    assert after.result(5)['sector'] == 'new'
+    # The read that overlapped the write must not have cached the old document
+    assert controller.get_profile('AAPL')['sector'] == 'new'
+    controller.close()
+
+
+def test_connection_health_is_checked_on_the_timer_only(qapp, monkeypatch):
+    controller, storage, statuses = make_controller(monkeypatch)
+    wait_until(qapp, lambda: statuses)
+    assert statuses[-1] == (True, 'Connected (3 profiles)')
+
+    storage.release.set()
+    pings = storage.pings
+    for symbol in ('A', 'B', 'C'):
+        controller.get_profile(symbol)
+    assert storage.pings == pings  # queries do not ping
+
+    storage.healthy = False
+    controller.check_connection()
+    wait_until(qapp, lambda: not statuses[-1][0])
+    assert 'server selection timeout' in statuses[-1][1]
+    assert controller.health_timer.isActive()
+    controller.close()
+    assert not controller.health_timer.isActive()
@@ -0,0 +1,57 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import math
+
+import numpy as np
+import pytest
+from utils.downsample import downsample, lttb, minmax
+
+
+def reference_lttb(x, y, threshold):
+    """Point-by-point LTTB as published (Steinarsson, 2013)"""
+    n = len(x)
+    every = (n - 2) / (threshold - 2)
+    a, selected = 0, [0]
+    for i in range(threshold - 2):
+        avg_start, avg_end = math.floor((i + 1) * every) + 1, min(math.floor((i + 2) * every) + 1, n)
+        avg_x = sum(x[avg_start:avg_end]) / (avg_end - avg_start)
+        avg_y = sum(y[avg_start:avg_end]) / (avg_end - avg_start)
+        best, best_area = None, -1.0
+        for j in range(math.floor(i * every) + 1, math.floor((i + 1) * every) + 1):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    return selected + [n - 1]
+
+
+@pytest.mark.parametrize('n,threshold', [(1000, 50), (1003, 97), (500, 499), (10, 3)])
+def test_lttb_matches_reference(n, threshold):
+    rng = np.random.default_rng(n)
+    x = np.arange(n) * 60000.0
+    y = np.cumsum(rng.normal(size=n))
+    assert lttb(x, y, threshold).tolist() == reference_lttb(x.tolist(), y.tolist(), threshold)
+
+
+def test_downsampling_keeps_spikes_and_bounds():
+    n = 100_000
+    x = np.arange(n, dtype=float)
+    y = np.sin(x / 5000)
+    y[54321] = 25.0
+    y[:20] = np.nan  # warm-up
+
+    for method in ('lttb', 'minmax'):
+        xs, ys = downsample(x, y, 1000, method=method)
+        assert len(xs) <= 1002
+        assert xs[0] == 20 and xs[-1] == n - 1
+        assert 54321 in xs and ys.max() == 25.0
+        assert (np.diff(xs) > 0).all()
+
+    assert len(lttb(x[:10], y[:10], 1000)) == 10
+    idx = minmax(y, 10)
+    assert np.nanargmin(y) in idx and np.nanargmax(y) in idx
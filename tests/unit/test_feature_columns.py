@@ -0,0 +1,61 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+import pandas as pd
+from utils.feature_columns import FeatureColumns
+from feature_engineering import FeatureEngineer
+
+
+def make_bars(n=300):
+    rng = np.random.default_rng(3)
+    close = 100 + rng.standard_normal(n).cumsum()
+    return pd.DataFrame({
+        'datetime': pd.date_range('2024-01-02 09:30', periods=n, freq='1min'),
+        'open': close + rng.normal(0, 0.05, n),
+        'high': close + 0.2,
+        'low': close - 0.2,
+        'close': close,
+        'volume': rng.integers(100, 1000, n)
+    })
+
+
+def test_columns_share_one_block_and_keep_order():
+    df = make_bars(50)
+    columns = FeatureColumns(df, capacity=2)
+    columns['a'] = df['close'] * 2
+    columns['flag'] = (df['close'] > 100).astype(int)
+    columns['close'] = df['close'] + 1  # overwrite keeps the position
+    columns['b'] = df['close'] * 3      # beyond capacity: block grows
+    columns['c'] = np.zeros(len(df))
+
+    frame = columns.to_frame()
+    assert list(frame.columns) == list(df.columns) + ['a', 'flag', 'b', 'c']
+    assert frame['flag'].dtype == np.int64
+    assert frame['volume'].dtype == df['volume'].dtype
+    np.testing.assert_allclose(frame['close'], df['close'] + 1)
+    np.testing.assert_allclose(frame['b'], df['close'] * 3)
+    assert len([b for b in frame._mgr.blocks if b.dtype == np.float64]) == 1
+    # Source untouched
+    assert list(df.columns) == ['datetime', 'open', 'high', 'low', 'close', 'volume']
+
+
+def test_single_block_assembly_matches_column_inserts():
+    df = make_bars()
+    engineer = FeatureEngineer()
+    enriched = engineer.calculate_ml_features(engineer.calculate_technical_indicators(df))
+
+    expected = df.copy()
+    close = expected['close']
+    expected['sma_5'] = close.rolling(5).mean()
+    expected['bb_width_20'] = (4 * close.rolling(20).std()) / close.rolling(20).mean()
+    expected['upper_shadow'] = expected['high'] - expected[['open', 'close']].max(axis=1)
+    expected['higher_high'] = ((expected['high'] > expected['high'].shift(1)) &
+                               (expected['high'].shift(1) > expected['high'].shift(2))).astype(int)
+    for col in ['sma_5', 'bb_width_20', 'upper_shadow', 'higher_high']:
+        pd.testing.assert_series_equal(enriched[col], expected[col], check_exact=False)
+    assert enriched.columns.get_loc('sma_5') == len(df.columns)
+    assert enriched.columns[-1] == 'shadow_ratio'
@@ -148,6 +148,42 @@ def test_trend_regime_on_uptrend():
     trend = res['regime_features'].get('trend_regime')
     assert trend in ['strong_uptrend','weak_trend','choppy'], "Unexpected trend classification"
 
+def test_predictive_labels_match_reference_loops():
+    fe = FeatureEngineer()
+    df = make_df(600)
+    out = fe.generate_predictive_label_series(df, horizons=[5, 15])
+    close = df['close'].astype(float)
+    returns = close.pct_change()
+    future_prices = close.shift(-1).ffill().values
+    for h in [5, 15]:
+        expected_md = np.full(len(close), np.nan)
+        for i in range(len(close) - h):
+            window = future_prices[i:i+h]
+            cum = np.cumprod(1 + np.diff(window, prepend=window[0])/np.maximum(window[0], 1e-10))
+            run_max = np.maximum.accumulate(cum)
+            expected_md[i] = np.min((cum - run_max) / np.maximum(run_max, 1e-10))
+        assert np.allclose(out[f'next_{h}m_max_drawdown'], expected_md, equal_nan=True)
+        expected_var = returns.rolling(h).apply(lambda x: np.nanquantile(x, 0.05), raw=False).shift(1)
+        assert np.allclose(out[f'next_{h}m_var_95'], expected_var, equal_nan=True)
+        direction = out[f'next_{h}m_direction']
+        assert direction.iloc[-h:].isna().all()
+        assert set(direction.dropna().unique()) <= {-1.0, 0.0, 1.0}
+
+def test_compact_dtypes_halve_processed_df():
+    df = make_df(2000)
+    full = FeatureEngineer().process_full_pipeline(df.copy())
+    compact = FeatureEngineer(compact_dtypes=True).process_full_pipeline(df.copy())
+    full_df, compact_df = full['processed_df'], compact['processed_df']
+
+    assert list(compact_df.columns) == list(full_df.columns)
+    assert compact_df['rsi_14'].dtype == np.float32
+    assert compact_df['higher_high'].dtype == np.int8
+    assert compact_df['close'].dtype == np.float64
+    assert compact_df.memory_usage().sum() < 0.6 * full_df.memory_usage().sum()
+    assert np.allclose(compact_df['sma_50'], full_df['sma_50'], rtol=1e-6, equal_nan=True)
+    # Aggregates are still computed in float64
+    assert compact['statistical_features'] == full['statistical_features']
+
 if __name__ == '__main__':
     # Simple manual run
     test_empty_df()
@@ -162,4 +198,6 @@ if __name__ == '__main__':
     test_multi_timeframe_alignment_no_future_peek()
     test_volatility_regime_consistency()
     test_trend_regime_on_uptrend()
+    test_predictive_labels_match_reference_loops()
+    test_compact_dtypes_halve_processed_df()
     print('All feature engineering tests passed.')
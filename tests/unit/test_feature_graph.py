@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import pandas as pd
+import pytest
+from utils.feature_graph import FeatureGraph
+from feature_engineering import SHARED_FEATURES
+
+
+def test_nodes_computed_once_per_run():
+    calls = []
+    graph = FeatureGraph()
+    graph.add('close', lambda df: calls.append('close') or df['close'], ['df'])
+    graph.add('returns', lambda close: calls.append('returns') or close.pct_change(), ['close'])
+    graph.add('vol', lambda returns: calls.append('vol') or returns.std(), ['returns'])
+    graph.add('mean', lambda returns: calls.append('mean') or returns.mean(), ['returns'])
+
+    run = graph.run(pd.DataFrame({'close': [1.0, 2.0, 4.0]}))
+    run.get('vol')
+    run.get('mean')
+    run.get('vol')
+    assert calls == ['close', 'returns', 'vol', 'mean']
+    assert set(run.profile()) == {'close', 'returns', 'vol', 'mean'}
+
+
+def test_plan_orders_dependencies_and_rejects_cycles():
+    graph = FeatureGraph()
+    graph.add('c', lambda a, b: a + b, ['a', 'b'])
+    graph.add('b', lambda a: a, ['a'])
+    graph.add('a', lambda df: df, ['df'])
+    assert graph.plan(['c']) == ['a', 'b', 'c']
+
+    graph.add('x', lambda y: y, ['y'])
+    graph.add('y', lambda x: x, ['x'])
+    with pytest.raises(ValueError):
+        graph.plan(['x'])
+    with pytest.raises(KeyError):
+        graph.plan(['missing'])
+
+
+def test_stage_timing_excludes_shared_nodes():
+    run = SHARED_FEATURES.run(pd.DataFrame({'close': [1.0, 2.0, 3.0, 2.0]}))
+    with run.timed('stage'):
+        run.get('returns')
+    profile = run.profile()
+    assert {'stage', 'returns', 'close'} <= set(profile)
@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+import utils.indicator_kernels as kernels
+
+
+def reference_kama(close: pd.Series) -> np.ndarray:
+    change = abs(close - close.shift(10))
+    volatility = close.diff().abs().rolling(10).sum()
+    er = (change / volatility).replace([np.inf, -np.inf], np.nan)
+    sc = (er * (2/(2+1) - 2/(30+1)) + 2/(30+1))**2
+    out = []
+    prev = close.iloc[0]
+    for i, (price, s) in enumerate(zip(close, sc)):
+        if i == 0 or pd.isna(s):
+            out.append(price)
+        else:
+            prev = prev + s * (price - prev)
+            out.append(prev)
+    return np.array(out)
+
+
+@pytest.fixture(params=[True, False], ids=['numba', 'numpy'])
+def backend(request, monkeypatch):
+    if request.param and not kernels.NUMBA_AVAILABLE:
+        pytest.skip('numba not installed')
+    monkeypatch.setattr(kernels, 'NUMBA_AVAILABLE', request.param)
+
+
+def test_kama_matches_reference_loop(backend):
+    np.random.seed(0)
+    close = pd.Series(100 + np.cumsum(np.random.normal(0, 0.05, 5000)))
+    close.iloc[2000:2012] = close.iloc[1999]  # flat stretch -> undefined efficiency ratio
+    assert np.allclose(kernels.kama(close.to_numpy()), reference_kama(close), rtol=0, atol=1e-9)
+
+
+def test_adaptive_ema_continues_from_state(backend):
+    np.random.seed(1)
+    x = np.random.normal(size=1000)
+    alpha = np.random.uniform(0.01, 0.5, size=1000)
+    full = kernels.adaptive_ema(x, alpha)
+    head = kernels.adaptive_ema(x[:400], alpha[:400])
+    tail = kernels.adaptive_ema(x[400:], alpha[400:], initial=head[-1])
+    assert np.allclose(np.concatenate([head, tail]), full, rtol=0, atol=1e-12)
+
+
+def test_obv_matches_pandas():
+    np.random.seed(2)
+    df = pd.DataFrame({
+        'close': np.round(100 + np.cumsum(np.random.normal(0, 0.05, 500)), 1),
+        'volume': np.random.randint(100, 1000, 500).astype(float)
+    })
+    df.loc[50, 'volume'] = np.nan
+    direction = df['close'].diff().apply(lambda x: 1 if x > 0 else (-1 if x < 0 else 0))
+    expected = (direction * df['volume']).cumsum()
+    out = kernels.obv(df['close'].to_numpy(), df['volume'].to_numpy())
+    assert np.allclose(out, expected.to_numpy(), equal_nan=True)
+
+    tail = kernels.obv(df['close'].to_numpy()[300:], df['volume'].to_numpy()[300:],
+                       initial=out[299], prev_close=df['close'].iloc[299])
+    assert np.allclose(tail, out[300:])
+
+
+def test_ema_matches_pandas_and_resumes(backend):
+    np.random.seed(3)
+    close = pd.Series(100 + np.cumsum(np.random.normal(0, 0.05, 2000)))
+    close.iloc[:3] = np.nan
+    expected = close.ewm(span=26, adjust=False).mean().to_numpy()
+    out, state = kernels.ema(close.to_numpy(), 26, return_state=True)
+    assert np.allclose(out, expected, rtol=0, atol=1e-9, equal_nan=True)
+
+    head, head_state = kernels.ema(close.to_numpy()[:1200], 26, return_state=True)
+    tail, tail_state = kernels.ema(close.to_numpy()[1200:], 26, initial=head_state, return_state=True)
+    assert np.allclose(tail, out[1200:], rtol=0, atol=1e-12)
+    assert tail_state == pytest.approx(state)
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import json
+import numpy as np
+import pandas as pd
+from utils.intraday_parser import parse_intraday_chunks
+
+
+def make_body(rows=500):
+    bars = [{
+        'timestamp': 1704186000 + 60 * i,
+        'gmtoffset': 0,
+        'datetime': str(pd.Timestamp(1704186000 + 60 * i, unit='s')),
+        'open': 100 + i * 0.01,
+        'high': 100.5 + i * 0.01,
+        'low': 99.5 + i * 0.01,
+        'close': 100.1 + i * 0.01,
+        'volume': 1000 + i
+    } for i in range(rows)]
+    return bars, json.dumps(bars).encode()
+
+
+def test_chunked_parse_matches_reference():
+    bars, body = make_body()
+    # Odd chunk size splits objects and numbers across chunks
+    df = parse_intraday_chunks(body[i:i + 97] for i in range(0, len(body), 97))
+
+    reference = pd.DataFrame(bars)
+    reference['datetime'] = pd.to_datetime(reference['datetime'])
+    assert len(df) == len(reference)
+    assert df['timestamp'].dtype == np.int64
+    assert (df['datetime'].values == reference['datetime'].values).all()
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        assert df[col].dtype == np.float64
+        assert np.allclose(df[col].values, reference[col].values)
+
+
+def test_unsorted_and_bad_values():
+    body = json.dumps([
+        {'timestamp': 1704186120, 'open': '1.5', 'high': None, 'low': 1, 'close': 'bad', 'volume': 10},
+        {'timestamp': 1704186060, 'open': 1, 'high': 2, 'low': 1, 'close': 1, 'volume': 5},
+        {'timestamp': None, 'open': 1},
+    ]).encode()
+    df = parse_intraday_chunks([body])
+    assert list(df['timestamp']) == [1704186060, 1704186120]
+    assert df['open'].iloc[1] == 1.5
+    assert np.isnan(df['high'].iloc[1]) and np.isnan(df['close'].iloc[1])
+
+
+def test_empty_and_error_bodies():
+    assert parse_intraday_chunks([b'[]']).empty
+    assert parse_intraday_chunks([b'{"error": "limit"}']).empty
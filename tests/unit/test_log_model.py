@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from dashboard.models.log_model import LogBuffer, LogTableModel, categorize, extract_symbol
+
+
+def entries(start, stop):
+    levels = ['INFO', 'INFO', 'WARNING', 'ERROR']
+    symbols = ['AAPL', 'MSFT', 'NVDA']
+    return [(levels[i % 4], f'{symbols[i % 3]}: step {i}' if i % 5 else f'MongoDB write {i}')
+            for i in range(start, stop)]
+
+
+def test_buffer_is_bounded_and_indexes_follow_evictions():
+    buffer = LogBuffer(capacity=100)
+    for start in range(0, 1000, 70):
+        buffer.extend(entries(start, min(start + 70, 1000)))
+
+    assert len(buffer) == 100 and buffer.first_seq == 900
+    assert buffer.record(900).message == 'MongoDB write 900'
+    assert extract_symbol('⏸ BRK.B: NOW PAUSED') == 'BRK.B' and extract_symbol('Pipeline resumed') == ''
+    assert categorize('MongoDB write 1') == 'MongoDB'
+
+    expected = {
+        (level, category, symbol): [r.seq for r in map(buffer.record, range(900, 1000))
+                                    if (not level or r.level == level) and (not category or r.category == category)
+                                    and (not symbol or r.symbol == symbol)]
+        for level in (None, 'ERROR') for category in (None, 'MongoDB', 'General') for symbol in (None, 'MSFT', 'TSLA')
+    }
+    for (level, category, symbol), seqs in expected.items():
+        selected = buffer.select(level, category, symbol)
+        assert [selected[i] for i in range(len(selected))] == seqs
+    assert buffer.count('symbol', 'MSFT') == len(expected[(None, None, 'MSFT')])
+
+
+def test_model_updates_filtered_rows_incrementally(qapp):
+    model = LogTableModel(capacity=50)
+    events = []
+    model.rowsInserted.connect(lambda parent, first, last: events.append(('insert', first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: events.append(('remove', first, last)))
+    model.modelReset.connect(lambda: events.append(('reset',)))
+
+    model.append(entries(0, 40))
+    model.set_filter(symbol='AAPL')
+    rows = model.rowCount()
+    assert all(model.record(r).symbol == 'AAPL' for r in range(rows))
+
+    events.clear()
+    model.append(entries(40, 60))  # evicts 10 records
+    assert ('reset',) not in events and events[0][0] == 'remove' and events[-1][0] == 'insert'
+    assert len(model.buffer) == 50
+    visible = [model.record(r).seq for r in range(model.rowCount())]
+    assert visible == [r.seq for r in map(model.buffer.record, range(10, 60)) if r.symbol == 'AAPL']
+    assert model.data(model.index(0, 3)) == 'AAPL'
+
+    model.set_filter()
+    assert model.rowCount() == 50 and model.data(model.index(49, 4)) == 'NVDA: step 59'
+    model.append(entries(60, 200))  # larger than capacity
+    assert model.rowCount() == 50 and model.record(0).seq == 150
+
+    model.clear()
+    assert model.rowCount() == 0 and len(model.buffer) == 0
@@ -0,0 +1,109 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import kurtosis, skew
+from feature_engineering import FeatureEngineer
+from dashboard.services.incremental_update import IncrementalUpdateStrategy
+from utils.mergeable_stats import RunningMoments, StatisticalSketches, TDigest
+
+APPROXIMATE = {'price_median', 'volume_median'}
+
+
+def make_bars(n=6000):
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0.001, 0.05, n))
+    return pd.DataFrame({
+        'datetime': pd.date_range('2024-01-02 09:30', periods=n, freq='1min'),
+        'open': close + rng.normal(0, 0.02, n),
+        'high': close + 0.1,
+        'low': close - 0.1,
+        'close': close,
+        'volume': rng.lognormal(7, 1, n)
+    })
+
+
+def test_merged_sketches_match_full_history_statistics():
+    df = make_bars()
+    expected = FeatureEngineer().calculate_statistical_features(df)
+
+    merged = None
+    for start in range(0, len(df), 1700):
+        chunk = df.iloc[start:start + 1700]
+        prev_close = df['close'].iloc[start - 1] if start else None
+        sketch = StatisticalSketches.from_frame(chunk, prev_close=prev_close)
+        # Stored form round-trips through plain dicts
+        merged = sketch if merged is None else StatisticalSketches.from_dict(merged.to_dict()).merge(sketch)
+
+    features = merged.features()
+    assert set(features) == set(expected)
+    for key, value in expected.items():
+        rtol = 1e-2 if key in APPROXIMATE else 1e-7
+        assert features[key] == pytest.approx(value, rel=rtol, abs=1e-12), key
+
+    returns = df['close'].pct_change().dropna()
+    risk = merged.risk_metrics()
+    assert risk['var_95'] == pytest.approx(returns.quantile(0.05), rel=0.02)
+    assert risk['cvar_99'] == pytest.approx(returns[returns <= returns.quantile(0.01)].mean(), rel=0.02)
+
+
+def test_incremental_merge_uses_stored_sketches():
+    df = make_bars(3000)
+    engineer = FeatureEngineer()
+    old = engineer.process_full_pipeline(df.iloc[:2000].copy())
+    profile = {
+        'statistical_features': old['statistical_features'],
+        'statistical_sketches': old['statistical_sketches'].to_dict(),
+        'data_date_range': {'start': str(df['datetime'].iloc[0]), 'end': str(df['datetime'].iloc[1999])},
+        'data_points_count': 2000
+    }
+    new = engineer.process_full_pipeline(df.copy(), indicator_state=old['indicator_state'])
+    merged = IncrementalUpdateStrategy().merge_historical_features(profile, new)
+
+    expected = engineer.calculate_statistical_features(df)
+    for key in ['returns_std', 'returns_kurtosis', 'sharpe_ratio', 'price_min', 'trend_slope', 'opening_price']:
+        assert merged['statistical_features'][key] == pytest.approx(expected[key], rel=1e-7), key
+    assert merged['cumulative_data_range']['total_points'] == 3000
+
+
+def test_legacy_profile_updates_do_not_seed_sketches_from_a_slice():
+    df = make_bars(3000)
+    engineer = FeatureEngineer()
+    strategy = IncrementalUpdateStrategy()
+    # Written before sketches existed: aggregates only
+    profile = {
+        'statistical_features': engineer.calculate_statistical_features(df.iloc[:1000]),
+        'data_date_range': {'start': str(df['datetime'].iloc[0]), 'end': str(df['datetime'].iloc[999])},
+        'data_points_count': 1000
+    }
+
+    for start, end in [(1000, 2000), (2000, 3000)]:
+        new = engineer.process_full_pipeline(df.iloc[start:end].copy())
+        assert new['statistical_sketches'] is not None
+        merged = strategy.merge_historical_features(profile, new)
+        assert merged['statistical_sketches'] is None
+        profile = {**profile, **merged, 'data_points_count': end,
+                   'data_date_range': {'start': profile['data_date_range']['start'],
+                                       'end': str(df['datetime'].iloc[end - 1])}}
+
+    # The stored aggregates keep folding in; nothing claims to be a full-history sketch
+    assert merged['statistical_features']['price_min'] == pytest.approx(df['close'].min())
+    assert 'returns_std_historical' in merged['statistical_features']
+
+
+def test_moments_and_digest_primitives():
+    x = np.random.default_rng(2).standard_t(5, 20000)
+    moments = RunningMoments().update(x[:5000]).merge(RunningMoments().update(x[5000:]))
+    assert moments.skewness == pytest.approx(skew(x), rel=1e-9)
+    assert moments.kurtosis == pytest.approx(kurtosis(x), rel=1e-9)
+    assert (moments.min, moments.max) == (x.min(), x.max())
+
+    digest = TDigest(compression=300).update(x[:7000]).merge(TDigest(compression=300).update(x[7000:]))
+    assert digest.count == len(x)
+    for q in [0.01, 0.05, 0.5, 0.95]:
+        assert abs(np.mean(x <= digest.quantile(q)) - q) < 0.01, q
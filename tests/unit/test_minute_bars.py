@@ -0,0 +1,99 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+import pandas as pd
+from mongodb_storage import BARS_COLLECTION, MongoDBStorage
+
+
+class BarsCollection:
+    """In-memory stand-in for the minute_bars collection"""
+
+    def __init__(self):
+        self.docs = []
+        self.inserts = 0
+
+    def insert_many(self, docs, ordered=True):
+        self.inserts += 1
+        self.docs.extend(docs)
+
+    def delete_many(self, query):
+        self.docs = [d for d in self.docs if d['symbol'] != query['symbol']]
+
+    def find(self, query, projection=None, sort=None, batch_size=0):
+        rng = query.get('datetime', {})
+        docs = [
+            d for d in self.docs
+            if d['symbol'] == query['symbol']
+            and ('$gte' not in rng or d['datetime'] >= rng['$gte'])
+            and ('$lt' not in rng or d['datetime'] < rng['$lt'])
+        ]
+        docs.sort(key=lambda d: d['datetime'], reverse=bool(sort) and sort[0][1] < 0)
+        if projection and any(v == 1 for v in projection.values()):
+            return [{k: v for k, v in d.items() if projection.get(k) == 1} for d in docs]
+        return [{k: v for k, v in d.items() if k not in ('_id', 'symbol')} for d in docs]
+
+    def find_one(self, query, projection=None, sort=None):
+        docs = self.find(query, projection, sort)
+        return docs[0] if docs else None
+
+
+def make_storage():
+    storage = object.__new__(MongoDBStorage)
+    storage.client = None
+    storage.db = {BARS_COLLECTION: BarsCollection()}
+    return storage
+
+
+def make_bars(start, rows):
+    times = pd.date_range(start, periods=rows, freq='1min')
+    close = 100 + np.arange(rows, dtype=float)
+    return pd.DataFrame({
+        'datetime': times, 'open': close, 'high': close + 1, 'low': close - 1, 'close': close,
+        'volume': np.full(rows, 1000, dtype=np.int64),
+        'sma_20': np.r_[np.full(min(rows, 5), np.nan), close[5:]],
+        'body': close  # not a stored feature column
+    })
+
+
+def test_save_and_read_back_columnar_bars():
+    storage = make_storage()
+    df = make_bars('2024-01-02 14:30', 25)
+
+    assert storage.save_bars('AAPL', df, columns=['sma_20'], batch_size=10) == 25
+    assert storage.db[BARS_COLLECTION].inserts == 3
+    assert 'sma_20' not in storage.db[BARS_COLLECTION].docs[0]  # NaN warm-up left out
+
+    bars = storage.get_bars('AAPL')
+    assert list(bars) == ['datetime', 'open', 'high', 'low', 'close', 'volume', 'sma_20']
+    assert bars['datetime'].dtype == np.dtype('datetime64[ns]')
+    np.testing.assert_array_equal(bars['datetime'], df['datetime'].to_numpy())
+    np.testing.assert_array_equal(bars['close'], df['close'].to_numpy())
+    np.testing.assert_array_equal(bars['sma_20'], df['sma_20'].to_numpy())
+
+    window = storage.get_bars('AAPL', start='2024-01-02 14:35', end='2024-01-02 14:40', columns=['close'])
+    assert list(window) == ['datetime', 'close']
+    np.testing.assert_array_equal(window['close'], df['close'].to_numpy()[5:10])
+
+    chunks = list(storage.iter_bars('AAPL', chunk_size=10))
+    assert [len(c['datetime']) for c in chunks] == [10, 10, 5]
+
+
+def test_reruns_and_backfills_do_not_duplicate_bars():
+    storage = make_storage()
+    storage.save_bars('AAPL', make_bars('2024-01-02 15:00', 10), columns=[])
+
+    # Overlapping update: only the bars after the stored range are new
+    assert storage.save_bars('AAPL', make_bars('2024-01-02 15:05', 10), columns=[]) == 5
+    # Backfill of earlier bars
+    assert storage.save_bars('AAPL', make_bars('2024-01-02 14:50', 15), columns=[]) == 10
+    times = storage.get_bars('AAPL')['datetime']
+    assert len(times) == 25 and (np.diff(times) > np.timedelta64(0)).all()
+
+    # Full rebuild replaces the stored bars
+    assert storage.save_bars('AAPL', make_bars('2024-01-03 14:30', 3), columns=[], replace=True) == 3
+    assert len(storage.get_bars('AAPL')['datetime']) == 3
+    assert storage.get_bars('MSFT') == {}
@@ -0,0 +1,95 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from datetime import datetime
+from types import SimpleNamespace
+
+from dashboard.controllers import database_controller
+from dashboard.controllers.database_controller import DatabaseController
+from mongodb_storage import PROFILE_SUMMARY_FIELDS, MongoDBStorage
+
+FULL_PROFILE = {
+    'symbol': 'AAPL', 'exchange': 'US', 'sector': 'Technology', 'data_points_count': 1000,
+    'data_date_range': {'start': '2024-01-02', 'end': '2024-06-28'},
+    'last_updated': datetime(2024, 6, 28), 'fundamental_data': {'blob': 'x' * 1000},
+    'statistical_features': {'price_mean': 1.0}
+}
+
+
+class RecordingCollection:
+    """Collection double recording find/aggregate arguments"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.finds = []
+
+    def find(self, query, projection, sort=None, skip=0):
+        self.finds.append({'query': query, 'projection': projection, 'sort': sort, 'skip': skip})
+        docs = [{k: v for k, v in d.items() if projection.get(k)} for d in self.docs[skip:]]
+
+        class Cursor(list):
+            def limit(self, n):
+                return Cursor(self[:n])
+
+        return Cursor(docs)
+
+    def estimated_document_count(self):
+        return len(self.docs)
+
+    def distinct(self, field):
+        return [d[field] for d in self.docs]
+
+    def aggregate(self, pipeline):
+        assert '$facet' in pipeline[0]
+        return iter([{
+            'totals': [{'_id': None, 'count': 2, 'data_points': 1500,
+                        'oldest_update': datetime(2024, 5, 1), 'most_recent_update': datetime(2024, 6, 28)}],
+            'sectors': [{'_id': 'Technology', 'count': 1}, {'_id': 'Unknown', 'count': 1}]
+        }])
+
+
+def make_storage(docs):
+    storage = object.__new__(MongoDBStorage)
+    storage.client = None
+    storage.collection = RecordingCollection(docs)
+    return storage
+
+
+def test_summaries_use_projection_and_paging():
+    storage = make_storage([FULL_PROFILE, {**FULL_PROFILE, 'symbol': 'MSFT'}, {**FULL_PROFILE, 'symbol': 'NVDA'}])
+
+    page = storage.list_profile_summaries(skip=1, limit=1)
+    call = storage.collection.finds[0]
+    assert call['projection'] == {'_id': 0, **{f: 1 for f in PROFILE_SUMMARY_FIELDS}}
+    assert call['skip'] == 1 and call['sort'] == [('symbol', 1)]
+    assert [p['symbol'] for p in page] == ['MSFT']
+    assert 'fundamental_data' not in page[0]
+
+    assert storage.count_profiles() == 3
+    assert storage.list_symbols() == ['AAPL', 'MSFT', 'NVDA']
+    stats = storage.get_profile_stats()
+    assert stats['total_profiles'] == 2 and stats['total_data_points'] == 1500
+    assert stats['sector_distribution'] == {'Technology': 1, 'Unknown': 1}
+    assert stats['most_recent_update'] == datetime(2024, 6, 28)
+
+
+def test_controller_lists_summaries_and_loads_full_profiles_on_demand(monkeypatch):
+    storage = make_storage([FULL_PROFILE])
+    storage.get_profile = lambda symbol: dict(FULL_PROFILE) if symbol == 'AAPL' else None
+    storage.client = SimpleNamespace(admin=SimpleNamespace(command=lambda cmd: {'ok': 1}))
+    monkeypatch.setattr(database_controller, 'MongoDBStorage', lambda: storage)
+
+    controller = DatabaseController()
+    summaries = controller.load_all_profiles()
+    assert summaries and 'fundamental_data' not in summaries[0]
+    assert controller.load_symbols() == ['AAPL']
+    assert [p['symbol'] for p in controller.search_profiles('aa')] == ['AAPL']
+
+    # A cached summary must not stand in for the full document
+    assert controller.get_profile('AAPL')['fundamental_data'] == FULL_PROFILE['fundamental_data']
+
+    stats = controller.get_database_stats()
+    assert stats['total_profiles'] == 2 and stats['total_data_points'] == 1500
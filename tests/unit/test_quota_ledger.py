@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import sqlite3
+import threading
+import time
+from utils.quota_ledger import QuotaLedger
+from utils.rate_limiter import AdaptiveRateLimiter, TokenBucketRateLimiter
+
+
+def test_minute_window_shared_between_connections(tmp_path):
+    db = tmp_path / 'quota.db'
+    a, b = QuotaLedger(db), QuotaLedger(db)
+    now = 1_000_000.0
+    assert a.try_acquire(3, 100, now=now) == 0
+    assert b.try_acquire(3, 100, now=now + 1) == 0
+    assert a.try_acquire(3, 100, now=now + 2) == 0
+    wait = b.try_acquire(3, 100, now=now + 10)
+    assert abs(wait - 50) < 1e-6
+    assert b.try_acquire(3, 100, now=now + 60) == 0
+    assert a.counts(now=now + 60) == (3, 4)
+
+
+def test_daily_window_slides(tmp_path):
+    ledger = QuotaLedger(tmp_path / 'quota.db')
+    now = 1_000_000.0
+    for i in range(2):
+        assert ledger.try_acquire(100, 2, now=now + i * 100) == 0
+    wait = ledger.try_acquire(100, 2, now=now + 1000)
+    assert abs(wait - (86400 - 1000)) < 1e-6
+    assert ledger.try_acquire(100, 2, now=now + 86400) == 0
+
+
+def test_backoff_propagates_to_other_limiters(tmp_path):
+    db = tmp_path / 'quota.db'
+    first = AdaptiveRateLimiter(calls_per_minute=100, calls_per_day=1000, ledger=QuotaLedger(db))
+    second = TokenBucketRateLimiter(calls_per_minute=100, calls_per_day=1000, ledger=QuotaLedger(db))
+    first.record_error(initial_delay=1, max_delay=16)
+    start = time.time()
+    second.wait_if_needed()
+    assert time.time() - start >= 0.9
+    first.record_call()
+    assert first.ledger.try_acquire(100, 1000) == 0
+
+
+def test_limiters_report_combined_usage(tmp_path):
+    db = tmp_path / 'quota.db'
+    first = AdaptiveRateLimiter(calls_per_minute=100, calls_per_day=10, ledger=QuotaLedger(db))
+    second = AdaptiveRateLimiter(calls_per_minute=100, calls_per_day=10, ledger=QuotaLedger(db))
+    for limiter in (first, second, second):
+        limiter.wait_if_needed()
+        limiter.record_call()
+    assert first.get_stats()['daily_calls'] == 3
+    assert second.get_stats()['daily_remaining'] == 7
+
+
+def test_busy_ledger_does_not_block_the_limiter_lock(tmp_path):
+    db = tmp_path / 'quota.db'
+    limiter = TokenBucketRateLimiter(calls_per_minute=100, calls_per_day=1000, ledger=QuotaLedger(db))
+    other_process = sqlite3.connect(db, isolation_level=None)
+    other_process.execute('BEGIN IMMEDIATE')
+    waiter = threading.Thread(target=limiter.wait_if_needed)
+    waiter.start()
+    time.sleep(0.2)
+
+    start = time.time()
+    limiter.record_call()
+    assert time.time() - start < 0.5
+
+    other_process.execute('ROLLBACK')
+    waiter.join(timeout=5)
+    assert not waiter.is_alive()
+    assert limiter.daily_calls == 1
@@ -4,8 +4,9 @@ from pathlib import Path
 # Add parent directory to Python path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+import threading
 import time
-from utils.rate_limiter import AdaptiveRateLimiter
+from utils.rate_limiter import AdaptiveRateLimiter, TokenBucketRateLimiter
 
 def test_per_minute_throttling():
     limiter = AdaptiveRateLimiter(calls_per_minute=5, calls_per_day=1000)
@@ -49,3 +50,46 @@ def test_backoff_reset_on_success():
     assert limiter.current_delay == 0
     assert limiter.consecutive_errors == 0
 
+
+def test_token_bucket_burst_then_refill():
+    limiter = TokenBucketRateLimiter(calls_per_minute=600, calls_per_day=1000, burst=5)
+    start = time.time()
+    for _ in range(5):
+        assert limiter.wait_if_needed()
+    assert time.time() - start < 0.5
+    limiter.wait_if_needed()
+    # 600/min refills one token every 0.1s
+    assert time.time() - start >= 0.05
+
+def test_token_bucket_shared_across_threads():
+    limiter = TokenBucketRateLimiter(calls_per_minute=20, calls_per_day=1000, burst=20)
+
+    def worker():
+        for _ in range(5):
+            limiter.wait_if_needed(should_abort=lambda: time.time() - start > 1.0)
+
+    start = time.time()
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = limiter.get_stats()
+    assert stats['minute_calls'] == 20
+    assert stats['daily_calls'] == 20
+    assert stats['waiting_workers'] == 0
+
+def test_token_bucket_abort_while_waiting():
+    limiter = TokenBucketRateLimiter(calls_per_minute=100, calls_per_day=1)
+    assert limiter.wait_if_needed()
+    assert limiter.wait_if_needed(should_abort=lambda: True) is False
+    assert limiter.get_stats()['daily_remaining'] == 0
+
+def test_token_bucket_error_backoff_is_global():
+    limiter = TokenBucketRateLimiter(calls_per_minute=100, calls_per_day=1000)
+    limiter.record_error(initial_delay=1, max_delay=16)
+    start = time.time()
+    limiter.wait_if_needed()
+    assert time.time() - start >= 0.9
+    limiter.record_call()
+    assert limiter.current_delay == 0
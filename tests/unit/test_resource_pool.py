@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import threading
+import time
+
+import pytest
+from pymongo import ASCENDING, MongoClient
+from pymongo.errors import ConnectionFailure
+from data_fetcher import EODHDDataFetcher
+from utils import resource_pool
+from utils.resource_pool import ensure_indexes, get_http_session, get_mongo_client
+
+
+def test_fetchers_share_one_http_session():
+    first = EODHDDataFetcher(api_key='test')
+    second = EODHDDataFetcher(api_key='test')
+    assert first.session is second.session
+    assert get_http_session() is first.session
+    adapter = first.session.get_adapter('https://eodhd.com')
+    assert adapter._pool_maxsize >= 10
+
+
+def test_indexes_created_once_per_collection():
+    client = MongoClient('mongodb://127.0.0.1:1', connect=False)
+    collection = client['pool_test_db']['profiles']
+    calls = []
+    collection.create_index = lambda keys, **options: calls.append((keys, options))
+
+    indexes = [([('symbol', ASCENDING)], {'unique': True}), ([('last_updated', ASCENDING)], {})]
+    try:
+        assert ensure_indexes(collection, indexes)
+        assert not ensure_indexes(collection, indexes)
+        assert calls == [(keys, options) for keys, options in indexes]
+    finally:
+        resource_pool._indexed.discard((id(client), collection.full_name))
+        client.close()
+
+
+def test_unreachable_server_is_not_cached():
+    uri = 'mongodb://127.0.0.1:1/'
+    with pytest.raises(ConnectionFailure):
+        get_mongo_client(uri, server_selection_timeout_ms=100)
+    assert uri not in resource_pool._mongo_clients
+
+
+def test_slow_server_does_not_block_other_resources():
+    uri = 'mongodb://10.255.255.1:1/'
+    started = threading.Event()
+
+    def connect():
+        started.set()
+        try:
+            get_mongo_client(uri, server_selection_timeout_ms=1500)
+        except ConnectionFailure:
+            pass
+
+    connecting = threading.Thread(target=connect)
+    connecting.start()
+    started.wait()
+    time.sleep(0.2)
+    begin = time.time()
+    get_http_session()
+    with pytest.raises(ConnectionFailure):
+        get_mongo_client('mongodb://127.0.0.1:1/', server_selection_timeout_ms=100)
+    assert time.time() - begin < 1.0
+    connecting.join()
+    assert uri not in resource_pool._mongo_clients
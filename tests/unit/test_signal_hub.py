@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import threading
+
+from dashboard.utils.qt_signals import PipelineSignals
+from dashboard.utils.signal_hub import SignalHub
+
+
+def progress(symbol, pct):
+    return (symbol, 'Engineering', pct, f'stage {pct}', 1000, 3, 1.5, False, '-')
+
+
+def test_hub_coalesces_worker_updates_into_one_ordered_frame(qapp):
+    source = PipelineSignals()
+    hub = SignalHub(source, interval_ms=60000)
+    frames = []
+    hub.signals.symbol_started.connect(lambda s: frames.append(('started', s)))
+    hub.progress_batch.connect(lambda batch: frames.append(('progress', batch)))
+    hub.log_batch.connect(lambda logs: frames.append(('logs', len(logs))))
+    hub.signals.symbol_completed.connect(lambda s, profile: frames.append(('completed', s)))
+
+    def worker(symbol):
+        source.symbol_started.emit(symbol)
+        for pct in range(0, 101, 2):
+            source.symbol_progress.emit(*progress(symbol, pct))
+            source.log_message.emit('INFO', f'{symbol} {pct}%')
+        source.symbol_completed.emit(symbol, {'symbol': symbol})
+
+    threads = [threading.Thread(target=worker, args=(f'S{i}',)) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert frames == []  # nothing reaches the UI from the worker threads
+
+    hub.flush()
+    kinds = [f[0] for f in frames]
+    assert kinds == ['started'] * 20 + ['progress', 'logs'] + ['completed'] * 20
+    batch = {b[0]: b for b in frames[20][1]}
+    assert len(batch) == 20 and {b[1] for b in batch.values()} == {'Engineering'}
+    assert all(b[2] == 100 for b in batch.values())
+    assert frames[21][1] == 20 * 51
+
+    frames.clear()
+    hub.flush()
+    assert frames == [] and hub.pending == 0
+    hub.close()
+
+
+def test_hub_bounds_pending_logs_and_detaches(qapp):
+    source = PipelineSignals()
+    hub = SignalHub(source, interval_ms=60000, max_pending_logs=100)
+    logs = []
+    hub.log_batch.connect(logs.extend)
+
+    for i in range(250):
+        source.log_message.emit('INFO', str(i))
+    hub.flush()
+    assert logs[0] == ('WARNING', '150 log lines dropped (UI could not keep up)')
+    assert logs[1:] == [('INFO', str(i)) for i in range(150, 250)]
+
+    source.log_message.emit('ERROR', 'late')
+    hub.clear()
+    hub.close()
+    source.log_message.emit('ERROR', 'after close')
+    assert hub.pending == 0 and len(logs) == 101
@@ -0,0 +1,105 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import threading
+import time
+from utils.stage_pipeline import Stage, StagedPipeline
+
+
+def run_items(stages, items):
+    results, errors = [], []
+    done = threading.Semaphore(0)
+
+    def on_result(item):
+        results.append(item)
+        done.release()
+
+    def on_error(item, exc, stage):
+        errors.append((item, str(exc), stage))
+        done.release()
+
+    pipeline = StagedPipeline(stages, on_result, on_error).start()
+    for item in items:
+        pipeline.submit(item)
+    for _ in items:
+        assert done.acquire(timeout=10)
+    pipeline.close()
+    return results, errors
+
+
+def test_items_flow_through_stages_with_early_exit_and_errors():
+    def parse(n):
+        if n == 3:
+            raise ValueError('bad item')
+        return None if n % 5 == 0 else n * 10  # multiples of 5 finish early
+
+    stages = [
+        Stage('parse', parse, workers=3),
+        Stage('double', lambda n: n * 2, workers=2, queue_size=2),
+        Stage('label', lambda n: f'item-{n}', workers=1, queue_size=2),
+    ]
+    results, errors = run_items(stages, list(range(1, 11)))
+
+    expected = {f'item-{n * 20}' for n in range(1, 11) if n != 3 and n % 5} | {5, 10}
+    assert set(results) == expected
+    assert errors == [(3, 'bad item', 'parse')]
+
+
+def test_bounded_queue_applies_backpressure():
+    produced = []
+    release = threading.Event()
+    stages = [
+        Stage('produce', lambda n: produced.append(n) or n, workers=4),
+        Stage('consume', lambda n: release.wait(10) and n, workers=1, queue_size=2),
+    ]
+    pipeline = StagedPipeline(stages, lambda item: None, lambda *args: None).start()
+    for n in range(20):
+        pipeline.submit(n)
+    time.sleep(0.3)
+
+    # One item in the consumer, two queued, one blocked producer per worker
+    assert len(produced) <= 1 + 2 + 4
+    depths = pipeline.depths()
+    assert depths['consume'] == {'queued': 2, 'active': 1, 'workers': 1}
+    assert depths['produce']['queued'] == 20 - len(produced)
+
+    release.set()
+    pipeline.close()
+    assert len(produced) == 20
+
+
+def test_abort_returns_queued_items():
+    release = threading.Event()
+    stages = [Stage('slow', lambda n: release.wait(10) and n, workers=1)]
+    pipeline = StagedPipeline(stages, lambda item: None, lambda *args: None).start()
+    for n in range(5):
+        pipeline.submit(n)
+    time.sleep(0.1)
+    assert pipeline.abort() == [1, 2, 3, 4]
+    release.set()
+
+
+def test_abort_releases_items_blocked_on_a_full_queue():
+    release = threading.Event()
+    results, released = [], []
+    stages = [
+        Stage('produce', lambda n: n, workers=2),
+        Stage('consume', lambda n: release.wait(10) and n, workers=1, queue_size=1),
+    ]
+    pipeline = StagedPipeline(stages, results.append, lambda *args: None, released.append).start()
+    for n in range(6):
+        pipeline.submit(n)
+    time.sleep(0.2)
+
+    # One item in the consumer, one queued for it, one held by each producer
+    dropped = pipeline.abort()
+    time.sleep(0.2)
+    release.set()
+    time.sleep(0.2)
+
+    assert len(released) == 2
+    assert sorted(dropped + released + results) == list(range(6))
+    assert all(stage.queue.qsize() == 0 for stage in stages)
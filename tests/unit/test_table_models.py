@@ -0,0 +1,96 @@
+import sys
+from pathlib import Path
+
+# Add parent directory to Python path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import numpy as np
+import pandas as pd
+from PyQt6.QtCore import QModelIndex, Qt
+from dashboard.models.table_models import (SORT_ROLE, Column, ColumnarTableModel, PagedTableModel,
+                                           sort_filter_proxy)
+
+ROWS = [{'symbol': f'S{i:04d}', 'points': (i * 7919) % 1000} for i in range(450)]
+
+
+def make_paged(calls):
+    def fetch_page(skip, limit):
+        calls.append((skip, limit))
+        return ROWS[skip:skip + limit]
+
+    columns = [Column('Symbol', lambda r: r['symbol']),
+               Column('Points', lambda r: r['points'], display=lambda v: f"{v:,}")]
+    return PagedTableModel(columns, fetch_page, page_size=200)
+
+
+def test_paged_model_loads_pages_on_demand(qapp):
+    calls = []
+    model = make_paged(calls)
+    model.reset()
+    assert calls == [(0, 200)] and model.rowCount() == 200
+
+    while model.canFetchMore(QModelIndex()):
+        model.fetchMore(QModelIndex())
+    assert calls == [(0, 200), (200, 200), (400, 200)]
+    assert model.rowCount() == 450
+    assert model.data(model.index(3, 0)) == 'S0003'
+    assert model.row_data(3) is ROWS[3]
+
+
+def test_proxy_sorts_on_raw_values_and_filters(qapp):
+    model = make_paged([])
+    model.reset()
+    proxy = sort_filter_proxy(model)
+
+    proxy.sort(1, Qt.SortOrder.DescendingOrder)
+    points = [proxy.data(proxy.index(r, 1), SORT_ROLE) for r in range(proxy.rowCount())]
+    assert points == sorted((r['points'] for r in ROWS[:200]), reverse=True)
+
+    proxy.setFilterFixedString('s001')
+    assert proxy.rowCount() == 10
+    symbol = model.row_data(proxy.mapToSource(proxy.index(0, 0)).row())['symbol']
+    assert symbol.startswith('S001')
+
+
+def test_columnar_model_formats_visible_cells(qapp):
+    df = pd.DataFrame({
+        'datetime': pd.date_range('2024-01-02 14:30', periods=2500, freq='1min'),
+        'close': np.r_[np.nan, np.arange(1, 2500) / 3],
+        'volume': np.arange(2500, dtype=np.int64),
+    })
+    model = ColumnarTableModel(batch_rows=1000)
+    model.set_frame(df, ['datetime', 'close', 'volume', 'missing'])
+    assert model.columnCount() == 3 and model.rowCount() == 1000
+
+    model.fetchMore(QModelIndex())
+    model.fetchMore(QModelIndex())
+    assert model.rowCount() == 2500 and not model.canFetchMore(QModelIndex())
+
+    assert model.data(model.index(0, 0)) == '2024-01-02 14:30:00'
+    assert model.data(model.index(0, 1)) == 'N/A'
+    assert model.data(model.index(1, 1)) == '0.33'
+    assert model.data(model.index(7, 2), SORT_ROLE) == 7
+    assert model.headerData(2, Qt.Orientation.Horizontal) == 'volume'
+
+    model.set_frame(None)
+    assert model.rowCount() == 0
+
+
+def test_paged_model_async_pages_and_stale_results(qapp):
+    requests = []
+    model = PagedTableModel([Column('Symbol', lambda r: r['symbol'])],
+                            lambda skip, limit, deliver: requests.append((skip, deliver)),
+                            page_size=200, asynchronous=True)
+    model.reset()
+    assert model.rowCount() == 0 and model.loading and not model.canFetchMore(QModelIndex())
+
+    stale = requests.pop()
+    model.reset()  # e.g. the sort order changed before the first page arrived
+    stale[1](ROWS[:200])
+    assert model.rowCount() == 0 and model.loading
+
+    skip, deliver = requests.pop()
+    deliver(ROWS[:200])
+    assert model.rowCount() == 200 and not model.loading and model.canFetchMore(QModelIndex())
+    model.fetchMore(QModelIndex())
+    assert requests[-1][0] == 200
@@ -0,0 +1,232 @@
+"""
+Write-behind batching of MongoDB upserts
+
+Saving a symbol costs three single-document upserts, one round-trip each.
+BulkWriteBatcher collects upserts from every worker thread and flushes them
+per collection as unordered ``bulk_write`` batches, when a batch is full or
+the oldest pending write reaches the flush interval. Each queued write gets a
+Future that resolves to True/False for that document alone: a failing
+document does not fail its batch. Batches are retried on connection errors.
+"""
+import atexit
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, ConnectionFailure
+
+import utils.resource_pool  # noqa: F401  (its atexit hook must run after the final flush)
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingUpsert:
+    """Upsert waiting for the next flush (later writes to the same document merge into it)"""
+
+    __slots__ = ('filter', 'fields', 'futures', 'queued_at')
+
+    def __init__(self, filter: Dict, fields: Dict):
+        self.filter = filter
+        self.fields = dict(fields)
+        self.futures: List[Future] = []
+        self.queued_at = time.monotonic()
+
+
+class BulkWriteBatcher:
+    """
+    Collects upserts and writes them as unordered bulk batches
+
+    Writes to the same document (same collection and filter) made before a
+    flush are merged, later fields winning, since an unordered batch does not
+    guarantee their order. Batches are written one at a time, so a document is
+    never in two concurrent batches.
+    """
+
+    def __init__(self, database, batch_size: int = 100, flush_interval: float = 0.5,
+                 max_retries: int = 3, retry_delay: float = 0.5):
+        """
+        Args:
+            database: pymongo Database the collections belong to
+            batch_size: Pending documents that trigger a flush
+            flush_interval: Maximum seconds a write waits before being flushed
+            max_retries: Retries of a batch after connection errors
+            retry_delay: Initial retry delay in seconds (doubles per retry)
+        """
+        self.database = database
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.stats = {'documents': 0, 'batches': 0, 'retries': 0, 'failed': 0}
+
+        self._pending: Dict[str, Dict[Tuple, _PendingUpsert]] = {}
+        self._count = 0
+        self._cond = threading.Condition()
+        self._flush_requested = False
+        self._taken_batches = 0
+        self._written_batches = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='mongo-bulk-writer', daemon=True)
+        self._thread.start()
+
+    def upsert(self, collection: str, filter: Dict, fields: Dict) -> Future:
+        """
+        Queue ``update_one(filter, {'$set': fields}, upsert=True)``
+
+        Returns:
+            Future resolving to True once written, False if the document failed
+        """
+        future = Future()
+        key = tuple(sorted(filter.items()))
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BulkWriteBatcher is closed")
+            pending = self._pending.setdefault(collection, {})
+            op = pending.get(key)
+            if op is None:
+                op = pending[key] = _PendingUpsert(filter, fields)
+                self._count += 1
+            else:
+                op.fields.update(fields)
+            op.futures.append(future)
+            if self._count >= self.batch_size:
+                self._cond.notify_all()
+        return future
+
+    @property
+    def pending(self) -> int:
+        """Documents waiting for a flush"""
+        with self._cond:
+            return self._count
+
+    def _take(self) -> Dict[str, List[_PendingUpsert]]:
+        """Detach every pending upsert (caller holds the condition)"""
+        taken = {name: list(ops.values()) for name, ops in self._pending.items() if ops}
+        self._pending = {}
+        self._count = 0
+        return taken
+
+    def _oldest(self) -> Optional[float]:
+        return min((op.queued_at for ops in self._pending.values() for op in ops.values()), default=None)
+
+    def _due(self) -> bool:
+        """A flush is due (caller holds the condition)"""
+        if self._flush_requested or self._count >= self.batch_size:
+            return self._count > 0
+        oldest = self._oldest()
+        return oldest is not None and time.monotonic() - oldest >= self.flush_interval
+
+    def _run(self):
+        # Only this thread writes, so batches reach the server in queue order
+        while True:
+            with self._cond:
+                while not self._due() and not self._closed:
+                    oldest = self._oldest()
+                    wait = self.flush_interval if oldest is None else self.flush_interval - (time.monotonic() - oldest)
+                    self._cond.wait(max(wait, 0.01))
+                if self._closed and not self._count:
+                    self._cond.notify_all()
+                    return
+                taken = self._take()
+                self._flush_requested = False
+                self._taken_batches += 1
+                generation = self._taken_batches
+            self._write(taken)
+            with self._cond:
+                self._written_batches = generation
+                self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write everything queued so far and wait for it
+
+        Returns:
+            False if the writes did not finish within ``timeout``
+        """
+        with self._cond:
+            target = self._taken_batches + (1 if self._count else 0)
+            if self._count:
+                self._flush_requested = True
+                self._cond.notify_all()
+            return self._cond.wait_for(lambda: self._written_batches >= target or not self._thread.is_alive(),
+                                       timeout)
+
+    def _write(self, taken: Dict[str, List[_PendingUpsert]]):
+        for name, ops in taken.items():
+            for start in range(0, len(ops), self.batch_size):
+                self._write_batch(name, ops[start:start + self.batch_size])
+
+    def _write_batch(self, name: str, ops: List[_PendingUpsert]):
+        requests = [UpdateOne(op.filter, {'$set': op.fields}, upsert=True) for op in ops]
+        failed: Dict[int, str] = {}
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.database[name].bulk_write(requests, ordered=False)
+                break
+            except BulkWriteError as e:
+                # Unordered: every other document was written
+                failed = {err['index']: err.get('errmsg', str(err)) for err in e.details.get('writeErrors', [])}
+                break
+            except ConnectionFailure as e:
+                if attempt == self.max_retries:
+                    failed = {i: str(e) for i in range(len(ops))}
+                    break
+                self.stats['retries'] += 1
+                delay = self.retry_delay * 2 ** attempt
+                logger.warning(f"Bulk write to {name} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+            except Exception as e:
+                if len(ops) > 1:
+                    # e.g. a document that cannot be encoded: isolate it by writing one by one
+                    for op in ops:
+                        self._write_batch(name, [op])
+                    return
+                failed = {0: str(e)}
+                break
+
+        self.stats['batches'] += 1
+        self.stats['documents'] += len(ops)
+        self.stats['failed'] += len(failed)
+        for i, op in enumerate(ops):
+            if i in failed:
+                logger.error(f"Bulk write to {name} failed for {op.filter}: {failed[i]}")
+            for future in op.futures:
+                future.set_result(i not in failed)
+
+    def close(self):
+        """Flush the remaining writes and stop the background thread"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+
+
+_batchers: Dict[Tuple[int, str], BulkWriteBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_bulk_writer(database, batch_size: int = 100, flush_interval: float = 0.5) -> BulkWriteBatcher:
+    """Process-wide batcher for ``database`` (settings of the first call apply)"""
+    key = (id(database.client), database.name)
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = _batchers[key] = BulkWriteBatcher(database, batch_size, flush_interval)
+        return batcher
+
+
+def close_all():
+    """Flush and stop every batcher (registered to run at exit)"""
+    with _batchers_lock:
+        batchers = list(_batchers.values())
+        _batchers.clear()
+    for batcher in batchers:
+        batcher.close()
+
+
+atexit.register(close_all)
@@ -0,0 +1,115 @@
+"""
+Downsampling of long series for charting
+
+A multi-year minute series has millions of points, far more than a chart has
+pixels. These helpers pick the few thousand points worth drawing:
+
+- lttb: Largest-Triangle-Three-Buckets keeps the points that preserve the
+  visual shape of the line (peaks, troughs and trend changes).
+- minmax: the minimum and maximum of every bucket, so no spike is lost.
+
+Both return indices into the input, so the same selection can be applied to
+any parallel array.
+"""
+from typing import Tuple
+
+import numpy as np
+
+
+def lttb(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets point selection
+
+    Args:
+        x: Increasing x values (e.g. epoch milliseconds)
+        y: Values (finite)
+        threshold: Points to keep (all points if it is >= len(x) or < 3)
+
+    Returns:
+        Increasing indices of the kept points (first and last always included)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket i covers [edges[i], edges[i + 1]); the first and last points are buckets of their own
+    every = (n - 2) / (threshold - 2)
+    edges = (np.arange(threshold - 1) * every).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    # Mean of every bucket (the last one is the last point), used as the third triangle vertex
+    counts = np.diff(np.append(edges, n))
+    avg_x = np.add.reduceat(x, edges) / counts
+    avg_y = np.add.reduceat(y, edges) / counts
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        cx, cy = avg_x[i + 1], avg_y[i + 1]
+        # Twice the triangle area (a, point, next bucket mean); the factor does not change the argmax
+        area = np.abs((ax - cx) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (cy - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax(y: np.ndarray, buckets: int) -> np.ndarray:
+    """
+    Minimum and maximum of each of ``buckets`` equal-width index buckets
+
+    NaN values are never selected.
+
+    Returns:
+        Increasing unique indices (first and last point included)
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= 2 * buckets or buckets < 1:
+        return np.arange(n)
+
+    size = -(-n // buckets)
+    padded = np.full(buckets * size, np.nan)
+    padded[:n] = y
+    grid = padded.reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    low = np.argmin(np.where(np.isnan(grid), np.inf, grid), axis=1) + offsets
+    high = np.argmax(np.where(np.isnan(grid), -np.inf, grid), axis=1) + offsets
+
+    indices = np.concatenate(([0, n - 1], low, high))
+    indices = indices[indices < n]
+    return np.unique(indices[~np.isnan(y[indices])])
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int, method: str = 'lttb') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to at most ``max_points`` points for drawing
+
+    Points with a non-finite y (e.g. indicator warm-up) are dropped first.
+
+    Args:
+        x: Increasing x values
+        y: Values
+        max_points: Point budget (e.g. a few per horizontal pixel)
+        method: 'lttb' or 'minmax'
+
+    Returns:
+        (x, y) of the kept points
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    finite = np.isfinite(y)
+    if not finite.all():
+        x, y = x[finite], y[finite]
+
+    if method == 'lttb':
+        indices = lttb(x, y, max_points)
+    elif method == 'minmax':
+        indices = minmax(y, max_points // 2)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return x[indices], y[indices]
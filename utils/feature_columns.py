@@ -0,0 +1,117 @@
+"""
+Single-allocation assembly of derived feature columns
+
+Adding indicators to a DataFrame one ``df[name] = ...`` at a time copies the
+frame up front and then grows (and re-consolidates) its block manager once per
+column. FeatureColumns instead writes every float column - the source's and
+the derived ones - into one preallocated 2-D block and builds the enriched
+frame from it in a single step. The block can be float32 for compact frames.
+"""
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+class FeatureColumns:
+    """
+    Column sink backed by one preallocated float block
+
+    Source columns already of the block dtype occupy the leading slots of a
+    Fortran-ordered ``(rows, capacity)`` array (each column contiguous) and
+    derived float columns fill the following slots, cast to the block dtype.
+    Columns of any other dtype (e.g. datetimes, int pattern flags, float64
+    prices under a float32 block) are kept aside and inserted at their position
+    when the frame is built. Assigning an existing name overwrites it in place,
+    like ``df[name] = ...`` would.
+    """
+
+    def __init__(self, source: pd.DataFrame, capacity: int = 16, dtype=np.float64):
+        """
+        Args:
+            source: Frame the columns are derived from (copied, never modified)
+            capacity: Expected number of derived float columns (the block grows if exceeded)
+            dtype: Storage dtype of the block (float64, or float32 for compact frames)
+        """
+        self.index = source.index
+        self.dtype = np.dtype(dtype)
+        n_block = int((source.dtypes == self.dtype).sum())
+        self._block = np.empty((len(source), n_block + max(int(capacity), 1)), dtype=self.dtype, order='F')
+        self._used = 0
+        self._slots: Dict[str, int] = {}
+        self._other: Dict[str, object] = {}
+        self._order: List[str] = []
+        for col in source.columns:
+            if source[col].dtype == self.dtype:
+                self[col] = source[col]
+            else:
+                self._order.append(col)
+                self._other[col] = source[col].copy()
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._slots or name in self._other
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._order)
+
+    def _grow(self):
+        block = np.empty((self._block.shape[0], self._block.shape[1] * 2), dtype=self.dtype, order='F')
+        block[:, :self._used] = self._block[:, :self._used]
+        self._block = block
+
+    def __setitem__(self, name: str, values):
+        if len(values) != len(self.index):
+            raise ValueError(f"Column '{name}' has {len(values)} rows, expected {len(self.index)}")
+        if name not in self._order:
+            self._order.append(name)
+
+        dtype = getattr(values, 'dtype', None)
+        if dtype is None:
+            values = np.asarray(values)
+            dtype = values.dtype
+        if dtype.kind != 'f':
+            self._slots.pop(name, None)
+            self._other[name] = values
+            return
+
+        self._other.pop(name, None)
+        slot = self._slots.get(name)
+        if slot is None:
+            if self._used == self._block.shape[1]:
+                self._grow()
+            slot = self._slots[name] = self._used
+            self._used += 1
+        self._block[:, slot] = values.to_numpy() if isinstance(values, pd.Series) else values
+
+    def __getitem__(self, name: str) -> pd.Series:
+        """Column as a Series (block columns are views into the block)"""
+        if name in self._other:
+            return pd.Series(self._other[name], index=self.index, name=name)
+        return pd.Series(self._block[:, self._slots[name]], index=self.index, name=name, copy=False)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Build the enriched frame
+
+        The float block is handed to the DataFrame without copying; other
+        columns are inserted at their insertion-order position.
+
+        Returns:
+            DataFrame with the source columns followed by the derived ones
+        """
+        float_names = [name for name in self._order if name in self._slots]
+        slots = [self._slots[name] for name in float_names]
+        if slots == list(range(len(slots))):
+            block = self._block[:, :len(slots)]
+        else:
+            # Only after a column changed dtype: gather the live slots
+            block = self._block[:, slots]
+        frame = pd.DataFrame(block, index=self.index, columns=float_names, copy=False)
+        for pos, name in enumerate(self._order):
+            if name in self._other:
+                frame.insert(pos, name, self._other[name])
+        return frame
@@ -0,0 +1,286 @@
+"""
+Kernels for path-dependent (recursive) indicators
+
+Recursive filters such as KAMA cannot be expressed as a single pandas rolling
+or cumulative call. These kernels run them over NumPy arrays: compiled with
+numba when it is installed, otherwise with a blocked parallel scan that only
+loops in Python over the block width, never over rows.
+
+All kernels accept an optional carried-in state so they can continue a series
+from a previous run.
+"""
+import numpy as np
+from typing import Optional
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # safe fallback
+    njit = None
+    NUMBA_AVAILABLE = False
+
+# Block width for the NumPy scan (Python iterations per level)
+SCAN_BLOCK = 32
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _linear_recurrence_nb(a, b, initial):
+        out = np.empty(b.shape[0])
+        prev = initial
+        for i in range(b.shape[0]):
+            prev = a[i] * prev + b[i]
+            out[i] = prev
+        return out
+
+
+def _linear_recurrence_np(a: np.ndarray, b: np.ndarray, initial: float) -> np.ndarray:
+    """Blocked scan: solve each block from a zero state, then carry block ends across"""
+    n = b.shape[0]
+    if n <= SCAN_BLOCK:
+        out = np.empty(n)
+        prev = initial
+        for i in range(n):
+            prev = a[i] * prev + b[i]
+            out[i] = prev
+        return out
+
+    blocks = -(-n // SCAN_BLOCK)
+    pad = blocks * SCAN_BLOCK - n
+    a_blk = np.concatenate([a, np.ones(pad)]).reshape(blocks, SCAN_BLOCK)
+    b_blk = np.concatenate([b, np.zeros(pad)]).reshape(blocks, SCAN_BLOCK)
+
+    # Partial solutions with zero carried-in state (vectorized across blocks)
+    partial = np.empty_like(b_blk)
+    partial[:, 0] = b_blk[:, 0]
+    for j in range(1, SCAN_BLOCK):
+        partial[:, j] = a_blk[:, j] * partial[:, j - 1] + b_blk[:, j]
+    gain = np.cumprod(a_blk, axis=1)
+
+    # State entering each block is itself a linear recurrence over block ends
+    block_end = _linear_recurrence_np(gain[:, -1], partial[:, -1], initial)
+    carried = np.concatenate([[initial], block_end[:-1]])
+    out = partial + gain * carried[:, None]
+    return out.reshape(-1)[:n]
+
+
+def linear_recurrence(a: np.ndarray, b: np.ndarray, initial: float = 0.0) -> np.ndarray:
+    """
+    Solve y[i] = a[i] * y[i-1] + b[i] with y[-1] = initial
+
+    Args:
+        a: Per-step multipliers
+        b: Per-step additive terms
+        initial: State before the first element
+
+    Returns:
+        float64 array of states
+    """
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    b = np.ascontiguousarray(b, dtype=np.float64)
+    if b.shape[0] == 0:
+        return np.empty(0)
+    if NUMBA_AVAILABLE:
+        return _linear_recurrence_nb(a, b, float(initial))
+    return _linear_recurrence_np(a, b, float(initial))
+
+
+def adaptive_ema(values: np.ndarray, alpha: np.ndarray, initial: Optional[float] = None,
+                 return_state: bool = False):
+    """
+    Variable-rate EMA: y[i] = y[i-1] + alpha[i] * (x[i] - y[i-1])
+
+    Where alpha is NaN the input passes through unchanged and the filter state
+    is carried over untouched. Without ``initial`` the first value seeds the
+    filter and is emitted as-is.
+
+    Args:
+        values: Input series
+        alpha: Per-step smoothing constants
+        initial: Filter state carried in from a previous run
+        return_state: Also return the filter state after the last element
+
+    Returns:
+        float64 array of filtered values (and the final state if requested)
+    """
+    x = np.asarray(values, dtype=np.float64)
+    alpha = np.asarray(alpha, dtype=np.float64)
+    if x.shape[0] == 0:
+        return (np.empty(0), initial) if return_state else np.empty(0)
+    skip = np.isnan(alpha)
+    if initial is None:
+        initial = x[0]
+        skip = skip.copy()
+        skip[0] = True
+    a = np.where(skip, 1.0, 1.0 - alpha)
+    b = np.where(skip, 0.0, alpha * x)
+    state = linear_recurrence(a, b, initial)
+    out = np.where(skip, x, state)
+    return (out, float(state[-1])) if return_state else out
+
+
+def ema(values: np.ndarray, span: int, initial: Optional[float] = None, return_state: bool = False):
+    """
+    Exponential moving average matching ``ewm(span=span, adjust=False).mean()``
+
+    Leading NaNs stay NaN until the first value seeds the filter; later NaNs
+    repeat the previous value.
+
+    Args:
+        values: Input series
+        span: EMA span (alpha = 2 / (span + 1))
+        initial: EMA carried in from a previous run
+        return_state: Also return the EMA after the last element
+
+    Returns:
+        float64 array (and the final state if requested)
+    """
+    x = np.asarray(values, dtype=np.float64)
+    alpha = 2.0 / (span + 1.0)
+    out = np.full(x.shape[0], np.nan)
+    start = 0
+    if initial is None or np.isnan(initial):
+        valid = np.flatnonzero(~np.isnan(x))
+        if valid.size == 0:
+            return (out, initial) if return_state else out
+        start = int(valid[0])
+        initial = x[start]
+        out[start] = initial
+        start += 1
+    rest = x[start:]
+    if rest.shape[0]:
+        missing = np.isnan(rest)
+        out[start:] = linear_recurrence(np.where(missing, 1.0, 1.0 - alpha),
+                                        np.where(missing, 0.0, alpha * rest), initial)
+    state = float(out[-1]) if x.shape[0] else initial
+    return (out, state) if return_state else out
+
+
+def kama_smoothing(close: np.ndarray, window: int = 10, fast: int = 2, slow: int = 30) -> np.ndarray:
+    """Kaufman smoothing constants ((ER * (fast_sc - slow_sc) + slow_sc) ** 2); NaN during warm-up"""
+    close = np.asarray(close, dtype=np.float64)
+    n = close.shape[0]
+    change = np.full(n, np.nan)
+    volatility = np.full(n, np.nan)
+    if n > window:
+        change[window:] = np.abs(close[window:] - close[:-window])
+        # Sum of |diff| over the last `window` steps (NaN if any step is NaN)
+        step = np.abs(np.diff(close))
+        volatility[window:] = np.lib.stride_tricks.sliding_window_view(step, window).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        er = change / volatility
+    er[~np.isfinite(er)] = np.nan
+    fast_sc, slow_sc = 2 / (fast + 1), 2 / (slow + 1)
+    return (er * (fast_sc - slow_sc) + slow_sc) ** 2
+
+
+def kama(close: np.ndarray, window: int = 10, fast: int = 2, slow: int = 30,
+         initial: Optional[float] = None, return_state: bool = False):
+    """
+    Kaufman Adaptive Moving Average
+
+    Args:
+        close: Close prices
+        window: Efficiency ratio lookback
+        fast: Fast EMA period
+        slow: Slow EMA period
+        initial: KAMA state carried in from a previous run
+        return_state: Also return the KAMA state after the last element
+
+    Returns:
+        float64 array (warm-up rows pass the close through), plus the state if requested
+    """
+    return adaptive_ema(close, kama_smoothing(close, window, fast, slow), initial, return_state)
+
+
+def obv(close: np.ndarray, volume: np.ndarray, initial: float = 0.0,
+        prev_close: Optional[float] = None) -> np.ndarray:
+    """
+    On-Balance Volume: cumulative volume signed by the close-to-close direction
+
+    NaN volumes yield NaN at their position and are skipped by the running total
+    (pandas cumsum semantics).
+
+    Args:
+        close: Close prices
+        volume: Volumes
+        initial: OBV carried in from a previous run
+        prev_close: Last close of the previous run (first bar counts as flat if None)
+
+    Returns:
+        float64 array
+    """
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    if close.shape[0] == 0:
+        return np.empty(0)
+    diff = np.diff(close, prepend=np.nan if prev_close is None else prev_close)
+    direction = np.sign(diff)
+    direction[np.isnan(direction)] = 0.0
+    signed = direction * volume
+    missing = np.isnan(signed)
+    out = initial + np.cumsum(np.where(missing, 0.0, signed))
+    out[missing] = np.nan
+    return out
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _forward_max_drawdown_nb(prices, window, out):
+        for i in range(prices.shape[0] - window):
+            base = max(prices[i], 1e-10)
+            if np.isnan(prices[i]):
+                base = np.nan
+            cum = 1.0
+            run_max = 1.0
+            worst = 0.0
+            for k in range(1, window):
+                cum *= 1 + (prices[i + k] - prices[i + k - 1]) / base
+                if np.isnan(cum):
+                    worst = np.nan
+                    break
+                if cum > run_max:
+                    run_max = cum
+                dd = (cum - run_max) / max(run_max, 1e-10)
+                if dd < worst:
+                    worst = dd
+            if np.isnan(prices[i]):
+                worst = np.nan
+            out[i] = worst
+        return out
+
+
+def forward_max_drawdown(prices: np.ndarray, window: int, block_rows: int = 65536) -> np.ndarray:
+    """
+    Max drawdown inside each forward window ``prices[i:i + window]``
+
+    Within a window the equity curve compounds the step changes relative to the
+    window's first price: cum[k] = prod(1 + diff[j] / p0); the result is the most
+    negative (cum - running_max) / running_max. Compiled with numba, otherwise
+    evaluated for all windows at once on strided views, ``block_rows`` windows
+    at a time to bound memory.
+
+    Args:
+        prices: Price series (already aligned to the future bars)
+        window: Window length
+        block_rows: Windows evaluated per block
+
+    Returns:
+        float64 array; NaN for the last ``window`` rows
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    n = prices.shape[0]
+    out = np.full(n, np.nan)
+    if window < 1 or n <= window:
+        return out
+    if NUMBA_AVAILABLE:
+        return _forward_max_drawdown_nb(prices, window, out)
+    views = np.lib.stride_tricks.sliding_window_view(prices, window)[:n - window]
+    for start in range(0, views.shape[0], block_rows):
+        w = views[start:start + block_rows]
+        base = np.maximum(w[:, :1], 1e-10)
+        cum = np.cumprod(1 + np.diff(w, axis=1, prepend=w[:, :1]) / base, axis=1)
+        run_max = np.maximum.accumulate(cum, axis=1)
+        dd = (cum - run_max) / np.maximum(run_max, 1e-10)
+        out[start:start + w.shape[0]] = dd.min(axis=1)
+    return out
@@ -0,0 +1,129 @@
+"""
+Serializable streaming state for the frame indicators
+
+An incremental update only fetches the minutes after the last stored bar.
+Running the indicators on that slice alone restarts every recursion cold, so
+the profile keeps an IndicatorState next to its features: the EMA, MACD-signal
+and KAMA filter states, running OBV and VWAP sums, Welford moments of the
+returns and the last TAIL_ROWS raw bars (enough history for every rolling
+window). FeatureEngineer resumes from it in O(new rows).
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from utils.mergeable_stats import RunningMoments
+
+STATE_VERSION = 1
+
+# Longest lookback of any windowed frame indicator (sma_200)
+TAIL_ROWS = 200
+
+# Spans of the EMAs carried across updates (ema_* columns plus the MACD legs)
+EMA_SPANS = (5, 10, 12, 20, 26, 50, 100, 200)
+
+TAIL_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _float(value) -> Optional[float]:
+    return None if value is None or pd.isna(value) else float(value)
+
+
+class IndicatorState:
+    """
+    Carried-over state of the recursive and windowed frame indicators
+
+    Attributes:
+        tail: Last TAIL_ROWS raw bars (datetime + OHLCV)
+        ema: Close EMA per span (EMA_SPANS)
+        macd_signal: EMA-9 of the MACD line
+        kama: KAMA filter state
+        obv: Running On-Balance Volume
+        vwap_pv: Running sum of typical price * volume
+        vwap_volume: Running sum of volume
+        returns: Running moments of the 1-minute returns
+        rows: Bars folded into the state so far
+    """
+
+    def __init__(self, tail: Optional[pd.DataFrame] = None, ema: Optional[Dict[int, float]] = None,
+                 macd_signal: Optional[float] = None, kama: Optional[float] = None, obv: float = 0.0,
+                 vwap_pv: float = 0.0, vwap_volume: float = 0.0,
+                 returns: Optional[RunningMoments] = None, rows: int = 0):
+        self.tail = tail if tail is not None else pd.DataFrame(columns=['datetime', *TAIL_COLUMNS])
+        self.ema = dict(ema or {})
+        self.macd_signal = macd_signal
+        self.kama = kama
+        self.obv = obv
+        self.vwap_pv = vwap_pv
+        self.vwap_volume = vwap_volume
+        self.returns = returns if returns is not None else RunningMoments()
+        self.rows = rows
+
+    @property
+    def last_datetime(self) -> Optional[pd.Timestamp]:
+        return None if self.tail.empty else pd.Timestamp(self.tail['datetime'].iloc[-1])
+
+    def new_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Bars of ``df`` after the last bar folded into the state (re-indexed from 0)"""
+        if self.last_datetime is not None and 'datetime' in df.columns:
+            df = df[pd.to_datetime(df['datetime']) > self.last_datetime]
+        return df.reset_index(drop=True)
+
+    def warm_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Prepend the stored tail to new bars so windowed indicators start warm
+
+        Columns the tail does not carry (e.g. timestamp) are filled with the
+        first new bar's values; those rows are dropped after computing.
+        """
+        tail = self.tail
+        if tail.empty:
+            return df.reset_index(drop=True)
+        tail = tail.reindex(columns=df.columns)
+        for col in df.columns:
+            if col == 'datetime' or col in TAIL_COLUMNS:
+                tail[col] = tail[col].astype(df[col].dtype)
+            else:
+                tail[col] = np.repeat(df[col].iloc[:1].to_numpy(), len(tail))
+        return pd.concat([tail, df], ignore_index=True)
+
+    def to_dict(self) -> Dict:
+        """Plain (JSON/BSON-safe) representation for storing with the profile"""
+        tail = self.tail
+        return {
+            'version': STATE_VERSION,
+            'tail': {
+                'datetime': pd.to_datetime(tail['datetime']).astype('int64').tolist(),
+                **{col: [_float(v) for v in tail[col]] for col in TAIL_COLUMNS}
+            },
+            'ema': {str(span): _float(value) for span, value in self.ema.items()},
+            'macd_signal': _float(self.macd_signal),
+            'kama': _float(self.kama),
+            'obv': float(self.obv),
+            'vwap_pv': float(self.vwap_pv),
+            'vwap_volume': float(self.vwap_volume),
+            'returns': self.returns.to_dict(),
+            'rows': int(self.rows)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> Optional['IndicatorState']:
+        """Rebuild a stored state (None if missing or from another state version)"""
+        if not data or data.get('version') != STATE_VERSION:
+            return None
+        tail = pd.DataFrame({
+            'datetime': pd.to_datetime(np.asarray(data['tail']['datetime'], dtype=np.int64)),
+            **{col: np.asarray(data['tail'][col], dtype=np.float64) for col in TAIL_COLUMNS}
+        })
+        return cls(
+            tail=tail,
+            ema={int(span): value for span, value in data.get('ema', {}).items()},
+            macd_signal=data.get('macd_signal'),
+            kama=data.get('kama'),
+            obv=data.get('obv', 0.0),
+            vwap_pv=data.get('vwap_pv', 0.0),
+            vwap_volume=data.get('vwap_volume', 0.0),
+            returns=RunningMoments.from_dict(data.get('returns')),
+            rows=data.get('rows', 0)
+        )
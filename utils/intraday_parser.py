@@ -0,0 +1,184 @@
+"""
+Streaming parser for EODHD intraday JSON responses
+
+Decodes the response body one bar at a time straight into typed column
+buffers (int64 epoch seconds, float64 OHLCV), instead of building a list of
+dicts, an object DataFrame and then re-parsing every column.
+"""
+import codecs
+import json
+from array import array
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\r\n'
+
+
+def _as_float(value) -> float:
+    if value is None:
+        return np.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class IntradayStreamParser:
+    """
+    Incremental parser for a JSON array of intraday bars
+
+    Feed text chunks as they arrive with ``feed()``; complete bar objects are
+    decoded immediately into compact ``array`` buffers, so memory is bounded by
+    the typed columns plus one partial object. ``to_frame()`` returns the bars as
+    a DataFrame with a ``datetime`` column derived from the epoch timestamp.
+    """
+
+    def __init__(self):
+        self.timestamps = array('q')
+        self.gmtoffsets = array('q')
+        self.prices = {col: array('d') for col in PRICE_COLUMNS}
+        # Only used when bars carry a datetime string but no epoch timestamp
+        self.datetime_strings: Optional[list] = None
+        self._buffer = ''
+        self._started = False
+        self._finished = False
+        self._non_list = None
+
+    def _add_bar(self, bar: dict):
+        ts = bar.get('timestamp')
+        if ts is None:
+            dt = bar.get('datetime') or bar.get('date')
+            if dt is None:
+                return
+            if self.datetime_strings is None:
+                self.datetime_strings = [None] * len(self.timestamps)
+            self.datetime_strings.append(dt)
+            ts = 0
+        elif self.datetime_strings is not None:
+            self.datetime_strings.append(None)
+        try:
+            self.timestamps.append(int(ts))
+        except (TypeError, ValueError):
+            # Unparseable timestamp: skip the bar (old path coerced it to NaT and dropped it)
+            if self.datetime_strings is not None:
+                self.datetime_strings.pop()
+            return
+        self.gmtoffsets.append(int(bar.get('gmtoffset') or 0))
+        for col in PRICE_COLUMNS:
+            self.prices[col].append(_as_float(bar.get(col)))
+
+    def feed(self, text: str):
+        """Consume the next chunk of the response body"""
+        if self._finished or self._non_list is not None:
+            if self._non_list is not None:
+                self._non_list += text
+            return
+        buf = self._buffer + text
+        pos = 0
+        n = len(buf)
+        while True:
+            while pos < n and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= n:
+                break
+            if not self._started:
+                if buf[pos] != '[':
+                    # Not an array (e.g. an error object): keep it for to_frame()
+                    self._non_list = buf[pos:]
+                    self._buffer = ''
+                    return
+                self._started = True
+                pos += 1
+                continue
+            ch = buf[pos]
+            if ch == ',':
+                pos += 1
+                continue
+            if ch == ']':
+                self._finished = True
+                pos = n
+                break
+            try:
+                obj, end = _decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Object split across chunks; wait for more data
+                break
+            if isinstance(obj, dict):
+                self._add_bar(obj)
+            pos = end
+        self._buffer = buf[pos:]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Build the typed DataFrame (sorted by datetime, unparseable bars dropped)"""
+        if self._non_list is not None:
+            data = json.loads(self._non_list)
+            if not isinstance(data, list):
+                return pd.DataFrame()
+            for bar in data:
+                if isinstance(bar, dict):
+                    self._add_bar(bar)
+        elif self._buffer.strip():
+            raise ValueError('Truncated intraday JSON response')
+
+        if len(self.timestamps) == 0:
+            return pd.DataFrame()
+
+        timestamps = np.frombuffer(self.timestamps, dtype=np.int64)
+        datetimes = timestamps.astype('datetime64[s]').astype('datetime64[ns]')
+        if self.datetime_strings is not None:
+            parsed = pd.to_datetime(pd.Series(self.datetime_strings, dtype=object), errors='coerce').to_numpy()
+            has_string = np.array([s is not None for s in self.datetime_strings])
+            datetimes = np.where(has_string, parsed, datetimes)
+
+        df = pd.DataFrame({
+            'timestamp': timestamps,
+            'gmtoffset': np.frombuffer(self.gmtoffsets, dtype=np.int64),
+            'datetime': datetimes,
+            **{col: np.frombuffer(buf, dtype=np.float64) for col, buf in self.prices.items()}
+        })
+        df = df[df['datetime'].notna()]
+        if not df['datetime'].is_monotonic_increasing:
+            df = df.sort_values('datetime', kind='stable')
+        return df.reset_index(drop=True)
+
+
+def parse_intraday_chunks(chunks: Iterable[bytes], encoding: str = 'utf-8') -> pd.DataFrame:
+    """
+    Parse an intraday JSON body delivered as byte chunks
+
+    Args:
+        chunks: Iterable of raw body chunks (e.g. ``response.iter_content()``)
+        encoding: Body encoding
+
+    Returns:
+        DataFrame with timestamp, gmtoffset, datetime and float64 OHLCV columns
+    """
+    parser = IntradayStreamParser()
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    for chunk in chunks:
+        if chunk:
+            parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b'', final=True))
+    return parser.to_frame()
+
+
+def parse_intraday_response(response, chunk_size: int = 64 * 1024) -> pd.DataFrame:
+    """
+    Stream-parse a ``requests`` response (ideally requested with ``stream=True``)
+
+    Args:
+        response: requests.Response for the intraday endpoint
+        chunk_size: Bytes read per chunk
+
+    Returns:
+        Parsed DataFrame (empty if the body holds no bars)
+    """
+    try:
+        return parse_intraday_chunks(response.iter_content(chunk_size=chunk_size), response.encoding or 'utf-8')
+    finally:
+        response.close()
@@ -0,0 +1,444 @@
+"""
+Mergeable sufficient statistics for the statistical feature stage
+
+Each sketch summarizes a batch of bars in O(1) space and two sketches of
+consecutive batches combine in O(1) (O(compression) for quantiles), so a
+profile can keep full-history statistics current from the new bars alone:
+
+* RunningMoments - count, mean, central moments M2..M4, min and max
+  (Welford/Pebay merge): mean, std, skewness, kurtosis, Sharpe are exact
+* RegressionMoments - co-moments of (row index, close): trend slope, r^2 and
+  p-value are exact
+* TDigest - merging t-digest: medians, VaR and CVaR are approximate
+"""
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+
+def _num(value) -> Optional[float]:
+    return None if value is None or pd.isna(value) else float(value)
+
+
+def _nan(value) -> float:
+    return np.nan if value is None else float(value)
+
+
+class RunningMoments:
+    """
+    Running count, mean, central moments (M2, M3, M4), min and max
+
+    Batches are folded in with the parallel-merge formulas (Chan / Pebay), so
+    updating with n values costs one vectorized pass over those values only.
+    """
+
+    def __init__(self, count: int = 0, mean: float = 0.0, m2: float = 0.0, m3: float = 0.0,
+                 m4: float = 0.0, min: float = np.nan, max: float = np.nan):
+        self.count = int(count)
+        self.mean = float(mean)
+        self.m2 = float(m2)
+        self.m3 = float(m3)
+        self.m4 = float(m4)
+        self.min = _nan(min)
+        self.max = _nan(max)
+
+    def copy(self) -> 'RunningMoments':
+        return RunningMoments(self.count, self.mean, self.m2, self.m3, self.m4, self.min, self.max)
+
+    def merge(self, other: 'RunningMoments') -> 'RunningMoments':
+        """Fold another set of moments into this one (in place)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2, self.m3, self.m4 = other.count, other.mean, other.m2, other.m3, other.m4
+            self.min, self.max = other.min, other.max
+            return self
+        na, nb = self.count, other.count
+        n = na + nb
+        delta = other.mean - self.mean
+        m2 = self.m2 + other.m2 + delta ** 2 * na * nb / n
+        m3 = (self.m3 + other.m3 + delta ** 3 * na * nb * (na - nb) / n ** 2
+              + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+        m4 = (self.m4 + other.m4 + delta ** 4 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+              + 6 * delta ** 2 * (na * na * other.m2 + nb * nb * self.m2) / n ** 2
+              + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+        self.count, self.mean, self.m2, self.m3, self.m4 = n, self.mean + delta * nb / n, m2, m3, m4
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        return self
+
+    def update(self, values) -> 'RunningMoments':
+        """Fold a batch of values (NaNs ignored) into the moments"""
+        x = np.asarray(values, dtype=np.float64)
+        x = x[~np.isnan(x)]
+        if x.size == 0:
+            return self
+        mean = float(x.mean())
+        d = x - mean
+        d2 = d * d
+        return self.merge(RunningMoments(x.size, mean, d2.sum(), (d2 * d).sum(), (d2 * d2).sum(),
+                                         x.min(), x.max()))
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (ddof=1)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.variance))
+
+    @property
+    def skewness(self) -> float:
+        """Biased sample skewness (scipy.stats.skew default)"""
+        if self.count == 0 or self.m2 == 0:
+            return np.nan
+        return float(np.sqrt(self.count) * self.m3 / self.m2 ** 1.5)
+
+    @property
+    def kurtosis(self) -> float:
+        """Biased excess kurtosis (scipy.stats.kurtosis default)"""
+        if self.count == 0 or self.m2 == 0:
+            return np.nan
+        return float(self.count * self.m4 / self.m2 ** 2 - 3.0)
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'm3': self.m3, 'm4': self.m4,
+                'min': _num(self.min), 'max': _num(self.max)}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'RunningMoments':
+        data = data or {}
+        return cls(data.get('count', 0), data.get('mean', 0.0), data.get('m2', 0.0), data.get('m3', 0.0),
+                   data.get('m4', 0.0), data.get('min'), data.get('max'))
+
+
+class RegressionMoments:
+    """
+    Co-moments of (x, y) for an ordinary least-squares line
+
+    Centered sums are shift invariant, so a later batch indexed from 0 is
+    merged by offsetting only its x mean.
+    """
+
+    def __init__(self, count: int = 0, mean_x: float = 0.0, mean_y: float = 0.0,
+                 cxx: float = 0.0, cxy: float = 0.0, cyy: float = 0.0):
+        self.count = int(count)
+        self.mean_x = float(mean_x)
+        self.mean_y = float(mean_y)
+        self.cxx = float(cxx)
+        self.cxy = float(cxy)
+        self.cyy = float(cyy)
+
+    def merge(self, other: 'RegressionMoments', x_offset: float = 0.0) -> 'RegressionMoments':
+        """Fold in another batch whose x values are shifted by ``x_offset`` (in place)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean_x, self.mean_y = other.count, other.mean_x + x_offset, other.mean_y
+            self.cxx, self.cxy, self.cyy = other.cxx, other.cxy, other.cyy
+            return self
+        na, nb = self.count, other.count
+        n = na + nb
+        dx = other.mean_x + x_offset - self.mean_x
+        dy = other.mean_y - self.mean_y
+        factor = na * nb / n
+        self.cxx += other.cxx + dx * dx * factor
+        self.cxy += other.cxy + dx * dy * factor
+        self.cyy += other.cyy + dy * dy * factor
+        self.mean_x += dx * nb / n
+        self.mean_y += dy * nb / n
+        self.count = n
+        return self
+
+    def update(self, x, y, x_offset: float = 0.0) -> 'RegressionMoments':
+        """Fold a batch of points (pairs with a NaN are ignored)"""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        valid = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[valid], y[valid]
+        if x.size == 0:
+            return self
+        mx, my = x.mean(), y.mean()
+        dx, dy = x - mx, y - my
+        return self.merge(RegressionMoments(x.size, mx, my, (dx * dx).sum(), (dx * dy).sum(), (dy * dy).sum()),
+                          x_offset)
+
+    def linregress(self) -> Optional[Dict]:
+        """slope, intercept, r_squared and two-sided p_value (as scipy.stats.linregress)"""
+        if self.count < 2 or self.cxx == 0:
+            return None
+        slope = self.cxy / self.cxx
+        r = 0.0 if self.cyy == 0 else float(np.clip(self.cxy / np.sqrt(self.cxx * self.cyy), -1.0, 1.0))
+        df = self.count - 2
+        if df <= 0 or abs(r) == 1.0:
+            p_value = 0.0 if df > 0 else 1.0
+        else:
+            t = r * np.sqrt(df / ((1.0 - r) * (1.0 + r)))
+            p_value = float(2 * stats.t.sf(abs(t), df))
+        return {'slope': slope, 'intercept': self.mean_y - slope * self.mean_x,
+                'r_squared': r * r, 'p_value': p_value}
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count, 'mean_x': self.mean_x, 'mean_y': self.mean_y,
+                'cxx': self.cxx, 'cxy': self.cxy, 'cyy': self.cyy}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'RegressionMoments':
+        data = data or {}
+        return cls(data.get('count', 0), data.get('mean_x', 0.0), data.get('mean_y', 0.0),
+                   data.get('cxx', 0.0), data.get('cxy', 0.0), data.get('cyy', 0.0))
+
+
+class TDigest:
+    """
+    Merging t-digest quantile sketch
+
+    Values are kept as weighted centroids, sorted by mean; compression packs
+    neighbours whose k1 scale (compression / 2pi * asin(2q - 1)) falls in the
+    same unit bucket, so centroids are small in the tails (accurate VaR) and
+    the digest holds at most ~compression / 2 of them. Both adding a batch and
+    merging digests are vectorized sort + reduce passes.
+    """
+
+    def __init__(self, compression: float = 200, means=None, weights=None,
+                 min: float = np.nan, max: float = np.nan):
+        self.compression = float(compression)
+        self.means = np.asarray(means if means is not None else [], dtype=np.float64)
+        self.weights = np.asarray(weights if weights is not None else [], dtype=np.float64)
+        self.min = _nan(min)
+        self.max = _nan(max)
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def _buckets(self, left_q: np.ndarray) -> np.ndarray:
+        """Start positions of the k1-scale unit buckets over sorted cumulative quantiles"""
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * left_q - 1)
+        bucket = np.floor(k - k[0]).astype(np.int64)
+        return np.flatnonzero(np.diff(bucket, prepend=-1))
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        cum = np.cumsum(weights)
+        starts = self._buckets((cum - weights) / cum[-1])
+        merged_weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / merged_weights
+        self.weights = merged_weights
+
+    def update(self, values) -> 'TDigest':
+        """Add a batch of values (NaNs ignored)"""
+        x = np.asarray(values, dtype=np.float64)
+        x = x[~np.isnan(x)]
+        if x.size == 0:
+            return self
+        # Unit weights: sort once and bucket by rank, then merge the small result
+        x = np.sort(x)
+        starts = self._buckets(np.arange(x.size) / x.size)
+        batch = TDigest(self.compression, np.add.reduceat(x, starts) / np.diff(np.append(starts, x.size)),
+                        np.diff(np.append(starts, x.size)).astype(np.float64), x[0], x[-1])
+        return self.merge(batch)
+
+    def merge(self, other: 'TDigest') -> 'TDigest':
+        """Fold another digest into this one (in place)"""
+        if other.weights.size == 0:
+            return self
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        if self.weights.size == 0:
+            self.means, self.weights = other.means.copy(), other.weights.copy()
+            return self
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (linear between centroid centres, min/max at the ends)"""
+        if self.weights.size == 0:
+            return np.nan
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(q * total, np.concatenate([[0.0], centers, [total]]),
+                               np.concatenate([[self.min], self.means, [self.max]])))
+
+    def lower_tail_mean(self, q: float) -> float:
+        """Approximate mean of the values at or below the q-quantile (CVaR)"""
+        if self.weights.size == 0:
+            return np.nan
+        target = q * self.weights.sum()
+        cum = np.cumsum(self.weights)
+        take = np.clip(target - (cum - self.weights), 0.0, self.weights)
+        if take.sum() == 0:
+            return float(self.min)
+        return float((take * self.means).sum() / take.sum())
+
+    def to_dict(self) -> Dict:
+        return {'compression': self.compression, 'means': self.means.tolist(), 'weights': self.weights.tolist(),
+                'min': _num(self.min), 'max': _num(self.max)}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> 'TDigest':
+        data = data or {}
+        return cls(data.get('compression', 200), data.get('means'), data.get('weights'),
+                   data.get('min'), data.get('max'))
+
+
+class StatisticalSketches:
+    """
+    Mergeable summary behind FeatureEngineer.calculate_statistical_features
+
+    ``merge`` expects the other sketch to cover the bars right after this one.
+    ``features()`` returns the same keys as the statistical stage.
+    """
+
+    VERSION = 1
+    ANNUALIZATION = np.sqrt(252 * 390)
+
+    def __init__(self, rows: int = 0, price: Optional[RunningMoments] = None,
+                 returns: Optional[RunningMoments] = None, volume: Optional[RunningMoments] = None,
+                 intraday_range: Optional[RunningMoments] = None, trend: Optional[RegressionMoments] = None,
+                 price_digest: Optional[TDigest] = None, volume_digest: Optional[TDigest] = None,
+                 returns_digest: Optional[TDigest] = None, first_open: Optional[float] = None,
+                 last_close: Optional[float] = None):
+        self.rows = int(rows)
+        self.price = price or RunningMoments()
+        self.returns = returns or RunningMoments()
+        self.volume = volume or RunningMoments()
+        self.intraday_range = intraday_range or RunningMoments()
+        self.trend = trend or RegressionMoments()
+        self.price_digest = price_digest or TDigest()
+        self.volume_digest = volume_digest or TDigest()
+        self.returns_digest = returns_digest or TDigest(compression=500)
+        self.first_open = first_open
+        self.last_close = last_close
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, returns: Optional[pd.Series] = None,
+                   prev_close: Optional[float] = None) -> 'StatisticalSketches':
+        """
+        Summarize a batch of bars
+
+        Args:
+            df: Bars with open/high/low/close/volume
+            returns: Close-to-close returns of df (computed if omitted)
+            prev_close: Close of the bar before df, so the first return is not lost
+        """
+        close = df['close'].to_numpy(dtype=np.float64)
+        if returns is None:
+            returns = df['close'].pct_change()
+        returns = returns.to_numpy(dtype=np.float64)
+        if prev_close is not None and len(returns) and prev_close != 0:
+            returns = returns.copy()
+            returns[0] = close[0] / prev_close - 1.0
+        volume = df['volume'].to_numpy(dtype=np.float64)
+        sketches = cls(rows=len(df))
+        sketches.price.update(close)
+        sketches.returns.update(returns)
+        sketches.volume.update(volume)
+        sketches.intraday_range.update(((df['high'] - df['low']) / df['close']).to_numpy(dtype=np.float64))
+        sketches.trend.update(np.arange(len(df)), close)
+        sketches.price_digest.update(close)
+        sketches.volume_digest.update(volume)
+        sketches.returns_digest.update(returns)
+        if len(df):
+            sketches.first_open = _num(df['open'].iloc[0])
+            sketches.last_close = _num(close[-1])
+        return sketches
+
+    def merge(self, other: 'StatisticalSketches') -> 'StatisticalSketches':
+        """Fold in the sketch of the bars following this one (in place)"""
+        if other.rows == 0:
+            return self
+        self.trend.merge(other.trend, x_offset=self.rows)
+        for name in ('price', 'returns', 'volume', 'intraday_range',
+                     'price_digest', 'volume_digest', 'returns_digest'):
+            getattr(self, name).merge(getattr(other, name))
+        if self.rows == 0:
+            self.first_open = other.first_open
+        self.last_close = other.last_close
+        self.rows += other.rows
+        return self
+
+    def features(self) -> Dict:
+        """Statistical features over every bar folded in so far"""
+        if self.rows == 0:
+            return {}
+        price, returns, volume = self.price, self.returns, self.volume
+        features = {
+            'price_mean': price.mean,
+            'price_median': self.price_digest.quantile(0.5),
+            'price_std': price.std,
+            'price_var': price.variance,
+            'price_min': price.min,
+            'price_max': price.max,
+            'price_range': price.max - price.min,
+            'price_skewness': price.skewness,
+            'price_kurtosis': price.kurtosis,
+            'returns_mean': returns.mean,
+            'returns_std': returns.std,
+            'returns_skewness': returns.skewness,
+            'returns_kurtosis': returns.kurtosis,
+            'sharpe_ratio': (returns.mean / returns.std) * self.ANNUALIZATION if returns.std != 0 else 0,
+            'volume_mean': volume.mean,
+            'volume_median': self.volume_digest.quantile(0.5),
+            'volume_std': volume.std,
+            'volume_skewness': volume.skewness,
+            'volatility_intraday': self.intraday_range.mean if self.intraday_range.count else np.nan,
+            'volatility_close_to_close': returns.std
+        }
+        trend = self.trend.linregress() if self.rows > 1 else None
+        if trend is not None:
+            features['trend_slope'] = trend['slope']
+            features['trend_r_squared'] = trend['r_squared']
+            features['trend_p_value'] = trend['p_value']
+        features['current_price'] = self.last_close
+        features['opening_price'] = self.first_open
+        features['closing_price'] = self.last_close
+        features['intraday_return'] = ((self.last_close - self.first_open) / self.first_open
+                                       if self.first_open else 0)
+        return features
+
+    def risk_metrics(self) -> Dict:
+        """VaR / CVaR of the 1-minute returns from the returns digest"""
+        if self.returns_digest.weights.size == 0:
+            return {}
+        return {
+            'var_95': self.returns_digest.quantile(0.05),
+            'var_99': self.returns_digest.quantile(0.01),
+            'cvar_95': self.returns_digest.lower_tail_mean(0.05),
+            'cvar_99': self.returns_digest.lower_tail_mean(0.01)
+        }
+
+    def to_dict(self) -> Dict:
+        """Plain (JSON/BSON-safe) representation for storing with the profile"""
+        return {
+            'version': self.VERSION,
+            'rows': self.rows,
+            **{name: getattr(self, name).to_dict() for name in
+               ('price', 'returns', 'volume', 'intraday_range', 'trend',
+                'price_digest', 'volume_digest', 'returns_digest')},
+            'first_open': self.first_open,
+            'last_close': self.last_close
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict]) -> Optional['StatisticalSketches']:
+        """Rebuild stored sketches (None if missing or from another version)"""
+        if not data or data.get('version') != cls.VERSION:
+            return None
+        return cls(
+            rows=data.get('rows', 0),
+            price=RunningMoments.from_dict(data.get('price')),
+            returns=RunningMoments.from_dict(data.get('returns')),
+            volume=RunningMoments.from_dict(data.get('volume')),
+            intraday_range=RunningMoments.from_dict(data.get('intraday_range')),
+            trend=RegressionMoments.from_dict(data.get('trend')),
+            price_digest=TDigest.from_dict(data.get('price_digest')),
+            volume_digest=TDigest.from_dict(data.get('volume_digest')),
+            returns_digest=TDigest.from_dict(data.get('returns_digest')),
+            first_open=data.get('first_open'),
+            last_close=data.get('last_close')
+        )
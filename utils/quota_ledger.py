@@ -0,0 +1,148 @@
+"""
+Cross-process API quota ledger
+
+Every process on the machine (dashboard, backfill script, quick_start) records
+its EODHD calls in one SQLite file, so they all share a single sliding-window
+budget instead of each assuming it owns the full daily quota.
+"""
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Optional, Tuple
+
+MINUTE_WINDOW = 60
+DAY_WINDOW = 24 * 3600
+
+
+class QuotaLedger:
+    """
+    SQLite-backed sliding-window ledger of API calls
+
+    One row per call (wall-clock timestamp). Reservations run inside
+    ``BEGIN IMMEDIATE`` transactions, so check-and-record is atomic across
+    threads and processes. A shared ``blocked_until`` timestamp propagates
+    error backoff (e.g. HTTP 429) to every process.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Args:
+            db_path: Path to the ledger database. Defaults to ~/.pipeline_api_quota.db
+        """
+        if db_path is None:
+            db_path = str(Path.home() / '.pipeline_api_quota.db')
+        self.db_path = str(db_path)
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        if self.db_path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS api_calls (ts REAL NOT NULL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_api_calls_ts ON api_calls (ts)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS ledger_state (key TEXT PRIMARY KEY, value REAL)')
+
+    def _count_since(self, since: float) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM api_calls WHERE ts > ?', (since,)).fetchone()[0]
+
+    def _nth_since(self, since: float, offset: int) -> float:
+        """Timestamp of the offset-th call (0-based) after ``since``"""
+        row = self._conn.execute(
+            'SELECT ts FROM api_calls WHERE ts > ? ORDER BY ts LIMIT 1 OFFSET ?', (since, offset)
+        ).fetchone()
+        return row[0] if row else since
+
+    def _blocked_until(self) -> float:
+        row = self._conn.execute("SELECT value FROM ledger_state WHERE key = 'blocked_until'").fetchone()
+        return row[0] if row else 0.0
+
+    def try_acquire(self, calls_per_minute: int, calls_per_day: int, now: Optional[float] = None) -> float:
+        """
+        Atomically reserve one call if both windows have room
+
+        Args:
+            calls_per_minute: Budget for any 60s window
+            calls_per_day: Budget for any 24h window
+            now: Override current time (epoch seconds)
+
+        Returns:
+            0 if the call was recorded, otherwise seconds to wait before retrying
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                blocked_until = self._blocked_until()
+                if now < blocked_until:
+                    return blocked_until - now
+
+                minute_start = now - MINUTE_WINDOW
+                minute_calls = self._count_since(minute_start)
+                if minute_calls >= calls_per_minute:
+                    # Wait until enough calls age out of the window
+                    oldest = self._nth_since(minute_start, minute_calls - calls_per_minute)
+                    return max(oldest + MINUTE_WINDOW - now, 0.01)
+
+                day_start = now - DAY_WINDOW
+                day_calls = self._count_since(day_start)
+                if day_calls >= calls_per_day:
+                    oldest = self._nth_since(day_start, day_calls - calls_per_day)
+                    return max(oldest + DAY_WINDOW - now, 0.01)
+
+                self._conn.execute('INSERT INTO api_calls (ts) VALUES (?)', (now,))
+                # Calls older than the daily window are never needed again
+                self._conn.execute('DELETE FROM api_calls WHERE ts <= ?', (day_start,))
+                return 0.0
+            finally:
+                self._conn.execute('COMMIT')
+
+    def block_until(self, until: float):
+        """Pause every process sharing the ledger until ``until`` (epoch seconds)"""
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                if until > self._blocked_until():
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO ledger_state (key, value) VALUES ('blocked_until', ?)", (until,)
+                    )
+            finally:
+                self._conn.execute('COMMIT')
+
+    def clear_block(self):
+        """Lift a shared backoff after a successful call"""
+        with self._lock:
+            self._conn.execute("DELETE FROM ledger_state WHERE key = 'blocked_until'")
+
+    def counts(self, now: Optional[float] = None) -> Tuple[int, int]:
+        """Return (calls in the last minute, calls in the last 24h) across all processes"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return self._count_since(now - MINUTE_WINDOW), self._count_since(now - DAY_WINDOW)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_ledgers = {}
+_ledgers_lock = threading.Lock()
+
+
+def get_quota_ledger(db_path: Optional[str] = None) -> Optional[QuotaLedger]:
+    """
+    Get the process-wide ledger for ``db_path`` (one connection per file)
+
+    Returns:
+        QuotaLedger, or None if the ledger file cannot be opened
+    """
+    key = str(db_path) if db_path else str(Path.home() / '.pipeline_api_quota.db')
+    with _ledgers_lock:
+        if key not in _ledgers:
+            try:
+                _ledgers[key] = QuotaLedger(key)
+            except sqlite3.Error as e:
+                logging.getLogger(__name__).warning(f"Quota ledger unavailable ({key}): {e}")
+                return None
+        return _ledgers[key]
@@ -1,5 +1,6 @@
 import time
 import logging
+import threading
 from collections import deque
 from datetime import datetime, timedelta
 
@@ -10,8 +11,9 @@ class AdaptiveRateLimiter:
     - Daily quota tracking
     - Exponential backoff on errors
     - Automatic recovery
+    - Optional cross-process QuotaLedger (shared budget for every process on the box)
     """
-    def __init__(self, calls_per_minute=80, calls_per_day=95000):
+    def __init__(self, calls_per_minute=80, calls_per_day=95000, ledger=None):
         self.calls_per_minute = calls_per_minute
         self.calls_per_day = calls_per_day
         self.minute_window = deque(maxlen=calls_per_minute)
@@ -19,9 +21,41 @@ class AdaptiveRateLimiter:
         self.daily_reset_time = datetime.now() + timedelta(days=1)
         self.consecutive_errors = 0
         self.current_delay = 0
+        self.ledger = ledger
         self.logger = logging.getLogger(__name__)
 
+    def _wait_for_ledger(self):
+        """Block until the shared ledger grants (and records) one call"""
+        while True:
+            wait = self.ledger.try_acquire(self.calls_per_minute, self.calls_per_day)
+            if wait <= 0:
+                return
+            if wait > 60:
+                self.logger.warning(f"Shared API quota exhausted. Waiting {wait:.0f}s")
+            else:
+                self.logger.debug(f"Rate limit (shared): sleeping {wait:.1f}s")
+            time.sleep(min(wait, 30))
+
+    def pending_delay(self) -> float:
+        """Seconds until the per-minute and daily budgets admit another call (0 if now, backoff excluded)"""
+        now = datetime.now()
+        if now >= self.daily_reset_time:
+            self.daily_calls = 0
+            self.daily_reset_time = now + timedelta(days=1)
+            self.logger.info("Daily API quota reset")
+        if self.daily_calls >= self.calls_per_day:
+            return (self.daily_reset_time - now).total_seconds()
+        if len(self.minute_window) >= self.calls_per_minute:
+            elapsed = (now - self.minute_window[0]).total_seconds()
+            if elapsed < 60:
+                return 60 - elapsed + 0.5
+        return 0.0
+
     def wait_if_needed(self):
+        if self.ledger is not None:
+            # Backoff is propagated through the ledger as well
+            self._wait_for_ledger()
+            return
         now = datetime.now()
         if now >= self.daily_reset_time:
             self.daily_calls = 0
@@ -50,20 +84,169 @@ class AdaptiveRateLimiter:
             self.logger.info("API call successful, resetting backoff")
             self.consecutive_errors = 0
             self.current_delay = 0
+            if self.ledger is not None:
+                self.ledger.clear_block()
 
     def record_error(self, initial_delay=5, max_delay=300):
         self.consecutive_errors += 1
         self.current_delay = min(initial_delay * (2 ** (self.consecutive_errors - 1)), max_delay)
+        if self.ledger is not None:
+            self.ledger.block_until(time.time() + self.current_delay)
         self.logger.warning(
             f"API error #{self.consecutive_errors}. Next delay: {self.current_delay}s"
         )
 
     def get_stats(self):
+        if self.ledger is not None:
+            minute_calls, daily_calls = self.ledger.counts()
+        else:
+            minute_calls, daily_calls = len(self.minute_window), self.daily_calls
         return {
-            'daily_calls': self.daily_calls,
-            'daily_remaining': self.calls_per_day - self.daily_calls,
-            'minute_calls': len(self.minute_window),
+            'daily_calls': daily_calls,
+            'daily_remaining': self.calls_per_day - daily_calls,
+            'minute_calls': minute_calls,
             'consecutive_errors': self.consecutive_errors,
             'current_delay': self.current_delay
         }
 
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token-bucket limiter shared by all pipeline workers:
+    - Burst capacity with steady refill at calls_per_minute / 60 tokens per second
+    - Exact sliding 60s window and daily accounting across every worker
+    - FIFO (fair) queuing of waiting threads
+    - Global exponential backoff on errors (one 429 slows everybody down)
+    - Optional cross-process QuotaLedger consulted after the local checks
+
+    Slots are reserved in wait_if_needed(), so concurrent workers can never
+    overshoot the quota between waiting and recording their call. Ledger
+    I/O (SQLite transactions) runs outside the condition lock, so a busy
+    ledger never stalls record_call()/get_stats() of the other workers.
+    """
+    def __init__(self, calls_per_minute=80, calls_per_day=95000, burst=None, ledger=None):
+        self.calls_per_minute = calls_per_minute
+        self.calls_per_day = calls_per_day
+        self.capacity = max(1, min(burst or max(1, calls_per_minute // 8), calls_per_minute))
+        self.refill_rate = calls_per_minute / 60.0
+        self.tokens = float(self.capacity)
+        self.last_refill = time.monotonic()
+        self.minute_window = deque()
+        self.daily_calls = 0
+        self.completed_calls = 0
+        self.daily_reset_time = datetime.now() + timedelta(days=1)
+        self.consecutive_errors = 0
+        self.current_delay = 0
+        self.blocked_until = 0.0  # monotonic time before which nobody may call
+        self.ledger = ledger
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self.logger = logging.getLogger(__name__)
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.refill_rate)
+        self.last_refill = now
+
+    def _seconds_until_available(self):
+        """0 if a call may be made now, else how long to wait (caller holds the lock)"""
+        now = time.monotonic()
+        wall = datetime.now()
+        if wall >= self.daily_reset_time:
+            self.daily_calls = 0
+            self.daily_reset_time = wall + timedelta(days=1)
+            self.logger.info("Daily API quota reset")
+        if self.daily_calls >= self.calls_per_day:
+            return (self.daily_reset_time - wall).total_seconds()
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        while self.minute_window and now - self.minute_window[0] >= 60:
+            self.minute_window.popleft()
+        if len(self.minute_window) >= self.calls_per_minute:
+            return 60 - (now - self.minute_window[0])
+        self._refill(now)
+        if self.tokens < 1:
+            return (1 - self.tokens) / self.refill_rate
+        return 0
+
+    def wait_if_needed(self, should_abort=None):
+        """
+        Block until this thread may make one API call and reserve it
+
+        Args:
+            should_abort: Optional callable polled while waiting; when it returns
+                True the thread leaves the queue without a slot
+
+        Returns:
+            True if a slot was reserved, False if aborted
+        """
+        ticket = object()
+        with self._cond:
+            self._queue.append(ticket)
+            try:
+                while True:
+                    if self._queue[0] is ticket:
+                        wait = self._seconds_until_available()
+                        if wait <= 0 and self.ledger is not None:
+                            # Still at the head of the queue, so nobody overtakes us meanwhile
+                            self._cond.release()
+                            try:
+                                wait = self.ledger.try_acquire(self.calls_per_minute, self.calls_per_day)
+                            finally:
+                                self._cond.acquire()
+                        if wait <= 0:
+                            self.tokens -= 1
+                            self.minute_window.append(time.monotonic())
+                            self.daily_calls += 1
+                            return True
+                    else:
+                        wait = 0.5  # not our turn; woken when the head is served
+                    if should_abort is not None and should_abort():
+                        return False
+                    if wait > 1:
+                        self.logger.debug(f"Rate limit: waiting {wait:.1f}s")
+                    self._cond.wait(min(wait, 0.5) if should_abort is not None else wait)
+            finally:
+                self._queue.remove(ticket)
+                self._cond.notify_all()
+
+    def record_call(self):
+        cleared = False
+        with self._cond:
+            self.completed_calls += 1
+            if self.consecutive_errors > 0:
+                self.logger.info("API call successful, resetting backoff")
+                self.consecutive_errors = 0
+                self.current_delay = 0
+                self.blocked_until = 0.0
+                cleared = True
+                self._cond.notify_all()
+        if cleared and self.ledger is not None:
+            self.ledger.clear_block()
+
+    def record_error(self, initial_delay=5, max_delay=300):
+        with self._cond:
+            self.consecutive_errors += 1
+            self.current_delay = delay = min(initial_delay * (2 ** (self.consecutive_errors - 1)), max_delay)
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            self.logger.warning(
+                f"API error #{self.consecutive_errors}. Next delay: {delay}s"
+            )
+        if self.ledger is not None:
+            self.ledger.block_until(time.time() + delay)
+
+    def get_stats(self):
+        with self._cond:
+            now = time.monotonic()
+            stats = {
+                'minute_calls': sum(1 for t in self.minute_window if now - t < 60),
+                'daily_calls': self.daily_calls,
+                'completed_calls': self.completed_calls,
+                'waiting_workers': len(self._queue),
+                'consecutive_errors': self.consecutive_errors,
+                'current_delay': self.current_delay
+            }
+        if self.ledger is not None:
+            # Report usage of every process sharing the budget
+            stats['minute_calls'], stats['daily_calls'] = self.ledger.counts()
+        stats['daily_remaining'] = self.calls_per_day - stats['daily_calls']
+        return stats
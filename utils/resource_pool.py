@@ -0,0 +1,158 @@
+"""
+Process-wide shared connections
+
+MongoClient and requests.Session are thread-safe and keep their own connection
+pools, so one of each per process can serve every pipeline, storage and
+fetcher object. Creating them per symbol costs a TCP/TLS handshake, a server
+ping and index round-trips each time; these accessors hand out the shared
+instances instead and create collection indexes only once per process.
+
+``_lock`` only guards the registries. Network round-trips (ping, index and
+collection creation) run under a lock of their own per resource, so a slow or
+unreachable server never blocks callers of other resources or of the HTTP
+session.
+"""
+import atexit
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from pymongo import MongoClient
+from pymongo.errors import CollectionInvalid, OperationFailure
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_resource_locks: Dict[Tuple, threading.Lock] = {}
+_http_lock = threading.Lock()
+_mongo_clients: Dict[str, MongoClient] = {}
+_indexed: Set[Tuple[int, str]] = set()
+_http_session: Optional[requests.Session] = None
+
+
+def _resource_lock(key: Tuple) -> threading.Lock:
+    """Lock serializing the creation of one resource"""
+    with _lock:
+        return _resource_locks.setdefault(key, threading.Lock())
+
+
+def get_mongo_client(uri: str, server_selection_timeout_ms: int = 5000) -> MongoClient:
+    """
+    Shared MongoClient for ``uri`` (connected and pinged on first use)
+
+    Raises:
+        ConnectionFailure: the server is unreachable (nothing is cached then)
+    """
+    with _lock:
+        client = _mongo_clients.get(uri)
+    if client is not None:
+        return client
+    with _resource_lock(('mongo', uri)):
+        with _lock:
+            client = _mongo_clients.get(uri)
+        if client is not None:
+            return client
+        client = MongoClient(uri, serverSelectionTimeoutMS=server_selection_timeout_ms)
+        try:
+            client.admin.command('ping')
+        except Exception:
+            client.close()
+            raise
+        with _lock:
+            _mongo_clients[uri] = client
+        logger.info(f"Opened shared MongoDB client for {uri}")
+        return client
+
+
+def ensure_indexes(collection, indexes: Iterable[Tuple[list, dict]]) -> bool:
+    """
+    Create ``indexes`` on ``collection`` once per process
+
+    Args:
+        collection: pymongo Collection
+        indexes: (keys, create_index options) pairs
+
+    Returns:
+        True if the indexes were created by this call, False if already done
+    """
+    key = (id(collection.database.client), collection.full_name)
+    with _resource_lock(key):
+        with _lock:
+            if key in _indexed:
+                return False
+        for keys, options in indexes:
+            collection.create_index(keys, **options)
+        with _lock:
+            _indexed.add(key)
+        return True
+
+
+def ensure_timeseries(database, name: str, time_field: str, meta_field: str, granularity: str = 'minutes') -> bool:
+    """
+    Create the time-series collection ``name`` once per process
+
+    An existing collection is left as it is. Servers without time-series
+    support (MongoDB < 5.0) get a plain collection on first insert instead.
+
+    Returns:
+        True if the collection was created by this call
+    """
+    key = (id(database.client), f'timeseries:{database.name}.{name}')
+    with _resource_lock(key):
+        with _lock:
+            if key in _indexed:
+                return False
+        created = False
+        try:
+            database.create_collection(name, timeseries={
+                'timeField': time_field, 'metaField': meta_field, 'granularity': granularity
+            })
+            created = True
+        except CollectionInvalid:
+            pass  # already exists
+        except OperationFailure as e:
+            logger.warning(f"Time-series collection {name} not available ({e}); using a plain collection")
+        with _lock:
+            _indexed.add(key)
+        return created
+
+
+def get_http_session(pool_size: int = 10) -> requests.Session:
+    """
+    Shared keep-alive HTTP session
+
+    Args:
+        pool_size: Pooled connections per host (the largest size requested wins)
+    """
+    global _http_session
+    with _http_lock:
+        session = _http_session
+        if session is None or getattr(session, 'pool_size', 0) < pool_size:
+            new_session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            new_session.mount('https://', adapter)
+            new_session.mount('http://', adapter)
+            new_session.pool_size = pool_size
+            # A smaller session in use elsewhere stays open until process exit
+            _http_session = session = new_session
+        return session
+
+
+def close_all():
+    """Close the shared clients and session (registered to run at exit)"""
+    global _http_session
+    with _lock:
+        clients = list(_mongo_clients.values())
+        _mongo_clients.clear()
+        _indexed.clear()
+    for client in clients:
+        client.close()
+    with _http_lock:
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+
+
+atexit.register(close_all)
@@ -0,0 +1,190 @@
+"""
+Staged producer/consumer pipeline
+
+Work items flow through named stages connected by bounded queues. Every stage
+has its own worker threads, so an I/O-bound stage (waiting on the API quota)
+and a CPU-bound stage (feature engineering) make progress at the same time.
+A full queue blocks the stage feeding it: a slow stage throttles the ones
+before it instead of buffering unbounded work (and memory).
+"""
+import logging
+import queue
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class Stage:
+    """
+    One step of a StagedPipeline
+
+    ``func(item)`` returns the item to hand to the next stage, or None when
+    the item is finished early (it then leaves the pipeline as completed).
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1, queue_size: int = 0):
+        """
+        Args:
+            name: Stage name (used for thread names and queue depth reporting)
+            func: Work function
+            workers: Worker threads
+            queue_size: Capacity of the stage's input queue (0 = unbounded)
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, int(workers))
+        self.queue: queue.Queue = queue.Queue(maxsize=max(0, int(queue_size)))
+        self.active = 0
+        self.threads: List[threading.Thread] = []
+
+
+class StagedPipeline:
+    """
+    Stages connected by bounded queues, each drained by its own workers
+
+    Results are reported through callbacks from the worker threads:
+    ``on_result(item)`` when an item leaves the last stage (or finishes
+    early), ``on_error(item, exc, stage_name)`` when a stage raises and
+    ``on_release(item)`` for an item that finishes a stage after abort().
+    """
+
+    def __init__(self, stages: List[Stage], on_result: Callable[[Any], None],
+                 on_error: Callable[[Any, Exception, str], None],
+                 on_release: Optional[Callable[[Any], None]] = None):
+        if not stages:
+            raise ValueError("StagedPipeline needs at least one stage")
+        self.stages = stages
+        self.on_result = on_result
+        self.on_error = on_error
+        self.on_release = on_release
+        self._lock = threading.Lock()
+        # Signalled whenever a worker takes an item off a queue (or on abort)
+        self._space = threading.Condition(self._lock)
+        self._aborted = False
+        self._started = False
+
+    def start(self) -> 'StagedPipeline':
+        """Start the worker threads of every stage"""
+        if self._started:
+            return self
+        self._started = True
+        for pos, stage in enumerate(self.stages):
+            for i in range(stage.workers):
+                thread = threading.Thread(target=self._work, args=(pos,), name=f'{stage.name}-{i}', daemon=True)
+                stage.threads.append(thread)
+                thread.start()
+        return self
+
+    def submit(self, item: Any, timeout: Optional[float] = None):
+        """Queue an item for the first stage (blocks while its queue is full)"""
+        self.stages[0].queue.put(item, timeout=timeout)
+
+    def _work(self, pos: int):
+        stage = self.stages[pos]
+        following = self.stages[pos + 1] if pos + 1 < len(self.stages) else None
+        while True:
+            item = stage.queue.get()
+            with self._lock:
+                self._space.notify_all()
+                aborted = self._aborted
+                if item is not _STOP and not aborted:
+                    stage.active += 1
+            if item is _STOP:
+                break
+            if aborted:
+                self._release(item)
+                continue
+            try:
+                out = stage.func(item)
+            except Exception as e:
+                self._report(self.on_error, item, e, stage.name)
+                continue
+            finally:
+                with self._lock:
+                    stage.active -= 1
+            if out is None or following is None:
+                self._report(self.on_result, item if out is None else out)
+            elif not self._hand_off(following, out):
+                self._release(out)
+
+    def _hand_off(self, following: Stage, item: Any) -> bool:
+        """
+        Queue ``item`` for the next stage, waiting while it is saturated (backpressure)
+
+        Returns:
+            False if the pipeline was aborted first (the item was not queued)
+        """
+        # The check and the put happen under the lock abort() takes, so an item
+        # can never slip into a queue after abort() has drained it
+        with self._space:
+            while not self._aborted:
+                try:
+                    following.queue.put_nowait(item)
+                    return True
+                except queue.Full:
+                    self._space.wait()
+        return False
+
+    def _release(self, item: Any):
+        if self.on_release is not None:
+            self._report(self.on_release, item)
+
+    @staticmethod
+    def _report(callback, *args):
+        try:
+            callback(*args)
+        except Exception:
+            logger.exception("Stage pipeline callback failed")
+
+    def depths(self) -> Dict[str, Dict[str, int]]:
+        """Queued and in-progress items per stage"""
+        with self._lock:
+            return {
+                stage.name: {'queued': stage.queue.qsize(), 'active': stage.active, 'workers': stage.workers}
+                for stage in self.stages
+            }
+
+    def close(self):
+        """
+        Stop the workers once every queued item is done
+
+        Stages are shut down in order, so items already in flight still reach
+        the end. Blocks until all workers have exited.
+        """
+        for stage in self.stages:
+            for _ in stage.threads:
+                stage.queue.put(_STOP)
+            for thread in stage.threads:
+                thread.join()
+
+    def abort(self) -> List[Any]:
+        """
+        Drop every queued item and stop the workers without waiting
+
+        Items already being processed finish their current stage and are then
+        passed to ``on_release`` instead of the next stage.
+
+        Returns:
+            The dropped items (e.g. to release resources they hold)
+        """
+        with self._space:
+            self._aborted = True
+            self._space.notify_all()
+        dropped = []
+        for stage in self.stages:
+            while True:
+                try:
+                    item = stage.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    dropped.append(item)
+            for _ in stage.threads:
+                try:
+                    stage.queue.put_nowait(_STOP)
+                except queue.Full:
+                    pass
+        return dropped